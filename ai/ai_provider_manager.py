@@ -5,11 +5,22 @@ Connects existing Pollinations and OpenRouter clients to the resilience framewor
 
 import asyncio
 import time
+from collections import deque
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional
 
+from ai.clients.streaming import ChatCompletionAccumulator
 from ai.openrouter import OpenRouterAPI
 from ai.pollinations import PollinationsAPI
+from config import (
+    AI_HEDGE_DELAY,
+    AI_HEDGE_DELAY_MAX,
+    AI_HEDGE_DELAY_MIN,
+    AI_HEDGE_MIN_SAMPLES,
+    AI_HEDGE_PERCENTILE,
+    AI_HEDGING_ENABLED,
+    TIMEOUT_HISTORY_SIZE,
+)
 from utils.logging_config import get_logger
 
 logger = get_logger(__name__)
@@ -62,6 +73,16 @@ class SimpleAIProviderManager:
             "successful_requests": 0,
             "failover_count": 0,
             "provider_usage": {"pollinations": 0, "openrouter": 0},
+            "hedged_requests": 0,
+            "hedges_launched": 0,
+            "hedge_wins": 0,
+        }
+
+        # Hedged requests: race a delayed secondary against a slow primary
+        self.hedging_enabled = AI_HEDGING_ENABLED
+        self._latency_history = {
+            "pollinations": deque(maxlen=TIMEOUT_HISTORY_SIZE),
+            "openrouter": deque(maxlen=TIMEOUT_HISTORY_SIZE),
         }
 
         # Model state management
@@ -142,6 +163,9 @@ class SimpleAIProviderManager:
         """
         Generate text with automatic failover between providers.
 
+        With hedging enabled the fallback provider is raced against a slow
+        primary instead of waiting for the primary to time out.
+
         Args:
             messages: List of message dictionaries
             model: Model to use (optional)
@@ -158,17 +182,22 @@ class SimpleAIProviderManager:
         start_time = time.time()
         self.stats["total_requests"] += 1
 
-        # Determine provider order
-        providers_to_try = []
+        providers_to_try = self._get_provider_order(preferred_provider)
 
-        if preferred_provider and preferred_provider in ["pollinations", "openrouter"]:
-            providers_to_try.append(preferred_provider)
+        request = dict(
+            messages=messages,
+            model=model,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            tools=tools,
+            tool_choice=tool_choice,
+            **kwargs,
+        )
 
-        # Add remaining providers in order of preference
-        # OpenRouter is now primary, Pollinations is fallback
-        for provider in ["openrouter", "pollinations"]:
-            if provider not in providers_to_try:
-                providers_to_try.append(provider)
+        if self.hedging_enabled and len(providers_to_try) > 1:
+            return await self._generate_text_hedged(
+                providers_to_try[0], providers_to_try[1], request, start_time
+            )
 
         # Try each provider
         last_error = None
@@ -176,41 +205,7 @@ class SimpleAIProviderManager:
             try:
                 # Skip health check completely for fastest response - let API call failures trigger failover
                 # This eliminates the 5-10 second health check overhead on every request
-
-                # Make request directly without executor overhead
-                request_start = time.time()
-                if provider == "pollinations":
-                    logger.debug(
-                        f"🚀 Making direct Pollinations API call (attempt {attempt + 1})"
-                    )
-                    logger.debug(f"📤 Model being used: {model}")
-                    result = await asyncio.to_thread(
-                        self.pollinations_api.generate_text,
-                        messages=messages,
-                        model=model,
-                        temperature=temperature,
-                        max_tokens=max_tokens,
-                        tools=tools,
-                        tool_choice=tool_choice,
-                        **kwargs,
-                    )
-                else:  # openrouter
-                    logger.debug(
-                        f"🚀 Making direct OpenRouter API call (attempt {attempt + 1})"
-                    )
-                    result = await asyncio.to_thread(
-                        self.openrouter_api.generate_text,
-                        messages=messages,
-                        model=model,
-                        temperature=temperature,
-                        max_tokens=max_tokens,
-                        tools=tools,
-                        tool_choice=tool_choice,
-                        **kwargs,
-                    )
-
-                request_time = time.time() - request_start
-                logger.debug(f"⏱️ {provider} API call completed in {request_time:.2f}s")
+                result = await self._call_provider(provider, request, attempt)
 
                 # Check for errors in response
                 if isinstance(result, dict) and "error" in result:
@@ -245,6 +240,245 @@ class SimpleAIProviderManager:
 
         return {"error": error_msg}
 
+    def _get_provider_order(self, preferred_provider: Optional[str]) -> List[str]:
+        """Determine the order in which text providers are tried."""
+        providers_to_try = []
+
+        if preferred_provider and preferred_provider in ["pollinations", "openrouter"]:
+            providers_to_try.append(preferred_provider)
+
+        # Add remaining providers in order of preference
+        # OpenRouter is now primary, Pollinations is fallback
+        for provider in ["openrouter", "pollinations"]:
+            if provider not in providers_to_try:
+                providers_to_try.append(provider)
+
+        return providers_to_try
+
+    async def _call_provider(
+        self, provider: str, request: Dict[str, Any], attempt: int = 0
+    ) -> Dict[str, Any]:
+        """Make a single text generation call and record its latency on success."""
+        # Make request on the provider's shared keep-alive session
+        request_start = time.time()
+        if provider == "pollinations":
+            logger.debug(
+                f"🚀 Making direct Pollinations API call (attempt {attempt + 1})"
+            )
+            logger.debug(f"📤 Model being used: {request.get('model')}")
+            result = await self.pollinations_api.agenerate_text(**request)
+        else:  # openrouter
+            logger.debug(
+                f"🚀 Making direct OpenRouter API call (attempt {attempt + 1})"
+            )
+            result = await self.openrouter_api.agenerate_text(**request)
+
+        request_time = time.time() - request_start
+        logger.debug(f"⏱️ {provider} API call completed in {request_time:.2f}s")
+
+        if not (isinstance(result, dict) and "error" in result):
+            self._latency_history[provider].append(request_time)
+
+        return result
+
+    def get_hedge_delay(self, provider: str) -> float:
+        """
+        Get how long to wait on a provider before hedging to the next one.
+
+        Uses the configured percentile of the provider's recent successful
+        latencies once enough samples exist, otherwise the default delay.
+        """
+        samples = sorted(self._latency_history[provider])
+        if len(samples) < AI_HEDGE_MIN_SAMPLES:
+            return AI_HEDGE_DELAY
+
+        index = min(
+            len(samples) - 1, int(len(samples) * AI_HEDGE_PERCENTILE / 100)
+        )
+        return max(AI_HEDGE_DELAY_MIN, min(samples[index], AI_HEDGE_DELAY_MAX))
+
+    async def _generate_text_hedged(
+        self,
+        primary: str,
+        secondary: str,
+        request: Dict[str, Any],
+        start_time: float,
+    ) -> Dict[str, Any]:
+        """
+        Race the primary provider against a delayed secondary request.
+
+        The secondary is launched once the primary has been outstanding for
+        longer than its hedge delay (or as soon as the primary fails). The
+        first valid response wins and the other request is cancelled.
+        """
+        self.stats["hedged_requests"] += 1
+        hedge_at = start_time + self.get_hedge_delay(primary)
+
+        tasks = {
+            asyncio.create_task(self._call_provider(primary, request)): primary
+        }
+        pending = set(tasks)
+        hedge_launched = False
+        # Whether the secondary was started by the hedge timer rather than
+        # by a primary failure; only those count as hedges in the stats
+        hedged_by_timer = False
+        last_error = None
+
+        def launch_hedge():
+            task = asyncio.create_task(self._call_provider(secondary, request, 1))
+            tasks[task] = secondary
+            pending.add(task)
+
+        try:
+            while pending:
+                timeout = None
+                if not hedge_launched:
+                    timeout = max(0.0, hedge_at - time.time())
+
+                done, _ = await asyncio.wait(
+                    pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+                pending.difference_update(done)
+
+                if not done and not hedge_launched:
+                    # Primary is slower than usual, start the secondary
+                    launch_hedge()
+                    hedge_launched = hedged_by_timer = True
+                    self.stats["hedges_launched"] += 1
+                    logger.debug(f"Hedging {primary} with {secondary}")
+                    continue
+
+                for task in done:
+                    provider = tasks[task]
+                    try:
+                        result = task.result()
+                    except Exception as e:
+                        result = {"error": str(e)}
+
+                    if isinstance(result, dict) and "error" in result:
+                        last_error = result["error"]
+                        logger.warning(
+                            f"Provider {provider} returned error: {last_error}"
+                        )
+                        continue
+
+                    # Success
+                    response_time = time.time() - start_time
+                    self.stats["successful_requests"] += 1
+                    self.stats["provider_usage"][provider] += 1
+                    if provider == secondary:
+                        self.stats["failover_count"] += 1
+                        if hedged_by_timer:
+                            self.stats["hedge_wins"] += 1
+
+                    logger.info(
+                        f"Generated text via {provider} ({response_time:.2f}s, hedged)"
+                    )
+                    return result
+
+                if not hedge_launched:
+                    # Primary failed before the hedge delay, fail over right away
+                    launch_hedge()
+                    hedge_launched = True
+                    logger.debug(f"Failing over from {primary} to {secondary}")
+        finally:
+            for task in pending:
+                task.cancel()
+
+        error_msg = last_error or "All providers failed"
+        logger.error(f"Hedged text generation failed: {error_msg}")
+        return {"error": error_msg}
+
+    async def stream_text(
+        self,
+        messages: List[Dict[str, Any]],
+        model: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 1000,
+        tools: Optional[List[Dict]] = None,
+        tool_choice: str = "auto",
+        preferred_provider: Optional[str] = None,
+        **kwargs,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream text generation as an async iterator of events.
+
+        Yields ``{"type": "content", "text": ...}`` for each content delta,
+        then exactly one terminal event: ``{"type": "done", "response": ...}``
+        with the assembled OpenAI-format response (including any tool calls),
+        or ``{"type": "error", "error": ...}``. Failover to the next provider
+        only happens while nothing has been yielded yet.
+        """
+        start_time = time.time()
+        self.stats["total_requests"] += 1
+
+        providers_to_try = self._get_provider_order(preferred_provider)
+        request = dict(
+            messages=messages,
+            model=model,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            tools=tools,
+            tool_choice=tool_choice,
+            **kwargs,
+        )
+
+        last_error = None
+        for attempt, provider in enumerate(providers_to_try):
+            api = (
+                self.pollinations_api
+                if provider == "pollinations"
+                else self.openrouter_api
+            )
+            accumulator = ChatCompletionAccumulator()
+            streamed_text = False
+            error = None
+            provider_start = time.time()
+
+            try:
+                logger.debug(f"🚀 Streaming from {provider} (attempt {attempt + 1})")
+                async for chunk in api.astream_text(**request):
+                    if "error" in chunk:
+                        error = chunk["error"]
+                        break
+
+                    text = accumulator.add_chunk(chunk)
+                    if text:
+                        streamed_text = True
+                        yield {"type": "content", "text": text}
+            except Exception as e:
+                error = str(e)
+
+            if error is None and not accumulator.has_output:
+                error = "Empty streamed response"
+
+            if error is not None:
+                last_error = error
+                logger.warning(f"Provider {provider} stream failed: {error}")
+                if streamed_text:
+                    # Partial output was already delivered, can't switch provider
+                    yield {"type": "error", "error": error}
+                    return
+                continue
+
+            self._latency_history[provider].append(time.time() - provider_start)
+            response_time = time.time() - start_time
+            self.stats["successful_requests"] += 1
+            self.stats["provider_usage"][provider] += 1
+            if attempt > 0:
+                self.stats["failover_count"] += 1
+                logger.info(f"Failover: {provider} after {attempt} attempts")
+
+            logger.info(f"Streamed text via {provider} ({response_time:.2f}s)")
+            yield {"type": "done", "response": accumulator.to_response()}
+            return
+
+        error_msg = last_error or "All providers failed"
+        logger.error(
+            f"Streaming text generation failed after {len(providers_to_try)} attempts: {error_msg}"
+        )
+        yield {"type": "error", "error": error_msg}
+
     async def generate_image(
         self,
         prompt: str,
@@ -335,6 +569,16 @@ class SimpleAIProviderManager:
             "failover_count": self.stats["failover_count"],
             "success_rate": success_rate,
             "provider_usage": self.stats["provider_usage"].copy(),
+            "hedging": {
+                "enabled": self.hedging_enabled,
+                "hedged_requests": self.stats["hedged_requests"],
+                "hedges_launched": self.stats["hedges_launched"],
+                "hedge_wins": self.stats["hedge_wins"],
+                "hedge_delays": {
+                    provider: round(self.get_hedge_delay(provider), 2)
+                    for provider in self._latency_history
+                },
+            },
             "timeout_stats": {
                 "pollinations": self.pollinations_api.get_timeout_stats(),
                 "openrouter": {
@@ -350,9 +594,17 @@ class SimpleAIProviderManager:
             "successful_requests": 0,
             "failover_count": 0,
             "provider_usage": {"pollinations": 0, "openrouter": 0},
+            "hedged_requests": 0,
+            "hedges_launched": 0,
+            "hedge_wins": 0,
         }
         logger.info("AI Provider statistics reset")
 
+    async def close(self):
+        """Close the providers' shared HTTP sessions."""
+        await self.pollinations_api.aclose()
+        await self.openrouter_api.aclose()
+
     async def health_check_all(self) -> Dict[str, ProviderStatus]:
         """Perform health check on all providers."""
         results = {}
@@ -0,0 +1,67 @@
+"""Shared aiohttp session for provider HTTP calls"""
+import asyncio
+from typing import Optional
+
+import aiohttp
+
+from config import (
+    AI_HTTP_DNS_CACHE_TTL,
+    AI_HTTP_KEEPALIVE_TIMEOUT,
+    AI_HTTP_POOL_LIMIT,
+    AI_HTTP_POOL_LIMIT_PER_HOST,
+)
+
+# Configure logging
+from utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+class SharedClientSession:
+    """
+    Lazily created, long-lived aiohttp session owned by one provider.
+
+    All requests of the provider go through the same pooled connector, so
+    TLS handshakes and DNS lookups are paid once and connections are kept
+    alive between calls. The session is bound to the event loop it was
+    created on and is rebuilt if it gets used from a different loop.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        limit: int = AI_HTTP_POOL_LIMIT,
+        limit_per_host: int = AI_HTTP_POOL_LIMIT_PER_HOST,
+        dns_cache_ttl: int = AI_HTTP_DNS_CACHE_TTL,
+        keepalive_timeout: float = AI_HTTP_KEEPALIVE_TIMEOUT,
+    ):
+        self.name = name
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.dns_cache_ttl = dns_cache_ttl
+        self.keepalive_timeout = keepalive_timeout
+
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def get_session(self) -> aiohttp.ClientSession:
+        """Return the shared session, creating it on the running loop if needed"""
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._loop is not loop:
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                ttl_dns_cache=self.dns_cache_ttl,
+                keepalive_timeout=self.keepalive_timeout,
+            )
+            self._session = aiohttp.ClientSession(connector=connector)
+            self._loop = loop
+            logger.debug(f"Created shared HTTP session for {self.name}")
+        return self._session
+
+    async def close(self):
+        """Close the shared session and its pooled connections"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        self._loop = None
@@ -0,0 +1,143 @@
+"""Helpers for OpenAI-compatible streaming (SSE) chat completions"""
+import json
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+import aiohttp
+
+# Configure logging
+from utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+async def iter_sse_chunks(
+    response: aiohttp.ClientResponse,
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Yield decoded JSON chunks from a streaming chat completion response.
+
+    Providers that ignore ``stream=true`` and answer with a plain JSON body
+    are handled too: the full completion is yielded as a single chunk.
+    """
+    if response.content_type != "text/event-stream":
+        yield await response.json(content_type=None)
+        return
+
+    async for raw_line in response.content:
+        line = raw_line.decode("utf-8", errors="replace").strip()
+        if not line.startswith("data:"):
+            # Blank separators, comments (": keep-alive") and other fields
+            continue
+
+        data = line[len("data:") :].strip()
+        if data == "[DONE]":
+            return
+
+        try:
+            yield json.loads(data)
+        except json.JSONDecodeError:
+            logger.debug(f"Skipping malformed stream chunk: {data[:100]}")
+
+
+class ChatCompletionAccumulator:
+    """
+    Assemble streamed chat completion chunks into a regular response.
+
+    Content deltas are concatenated and tool-call deltas are merged by
+    their index, so the result can be fed to the existing tool execution
+    loop exactly like a non-streaming response.
+    """
+
+    def __init__(self):
+        self.model: Optional[str] = None
+        self.usage: Optional[Dict[str, Any]] = None
+        self.finish_reason: Optional[str] = None
+        self._content_parts: List[str] = []
+        self._tool_calls: Dict[int, Dict[str, Any]] = {}
+
+    @property
+    def content(self) -> str:
+        """Content received so far"""
+        return "".join(self._content_parts)
+
+    @property
+    def has_output(self) -> bool:
+        """Whether any content or tool call has been received"""
+        return bool(self._content_parts or self._tool_calls)
+
+    def add_chunk(self, chunk: Dict[str, Any]) -> str:
+        """Merge one chunk and return the new content text it carried"""
+        self.model = chunk.get("model") or self.model
+        if chunk.get("usage"):
+            self.usage = chunk["usage"]
+
+        new_text = ""
+        for choice in chunk.get("choices") or []:
+            if choice.get("index", 0) != 0:
+                continue
+
+            # Streaming chunks carry "delta", full completions carry "message"
+            delta = choice.get("delta") or choice.get("message") or {}
+
+            content = delta.get("content")
+            if content:
+                self._content_parts.append(content)
+                new_text += content
+
+            for position, tool_call in enumerate(delta.get("tool_calls") or []):
+                self._merge_tool_call(tool_call.get("index", position), tool_call)
+
+            if choice.get("finish_reason"):
+                self.finish_reason = choice["finish_reason"]
+
+        return new_text
+
+    def _merge_tool_call(self, index: int, tool_call: Dict[str, Any]):
+        """Merge a (partial) tool call delta into the call at ``index``"""
+        entry = self._tool_calls.setdefault(
+            index,
+            {
+                "id": "",
+                "type": "function",
+                "function": {"name": "", "arguments": ""},
+            },
+        )
+
+        if tool_call.get("id"):
+            entry["id"] = tool_call["id"]
+        if tool_call.get("type"):
+            entry["type"] = tool_call["type"]
+
+        function = tool_call.get("function") or {}
+        if function.get("name"):
+            entry["function"]["name"] = function["name"]
+
+        arguments = function.get("arguments")
+        if isinstance(arguments, dict):
+            entry["function"]["arguments"] = json.dumps(arguments)
+        elif arguments:
+            entry["function"]["arguments"] += arguments
+
+    def to_response(self) -> Dict[str, Any]:
+        """Build an OpenAI-format response from everything received"""
+        message: Dict[str, Any] = {"role": "assistant", "content": self.content}
+
+        if self._tool_calls:
+            tool_calls = []
+            for index in sorted(self._tool_calls):
+                tool_call = self._tool_calls[index]
+                if not tool_call["id"]:
+                    tool_call["id"] = f"call_{index}"
+                tool_calls.append(tool_call)
+            message["tool_calls"] = tool_calls
+
+        response: Dict[str, Any] = {
+            "choices": [
+                {"index": 0, "message": message, "finish_reason": self.finish_reason}
+            ]
+        }
+        if self.model:
+            response["model"] = self.model
+        if self.usage:
+            response["usage"] = self.usage
+        return response
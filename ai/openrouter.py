@@ -1,8 +1,14 @@
+import asyncio
 import requests
 import json
 import time
 import threading
-from typing import List, Dict, Any, Optional, Union
+from typing import AsyncIterator, List, Dict, Any, Optional, Union
+
+import aiohttp
+
+from ai.clients.http_session import SharedClientSession
+from ai.clients.streaming import iter_sse_chunks
 from config import (
     OPENROUTER_API_KEY,
     OPENROUTER_API_URL,
@@ -45,7 +51,10 @@ class OpenRouterAPI:
         self._models_cache = []
         self._models_cache_time = 0
         self._models_cache_duration = 3600  # cache for 1 hour
-        
+
+        # Shared keep-alive session for the async request path
+        self._http = SharedClientSession("openrouter")
+
         logger.info(f"OpenRouter API initialized: enabled={self.enabled}, model={self.default_model}, timeout={self.text_timeout}s")
 
     def _is_rate_limited(self, current_time: float) -> bool:
@@ -125,24 +134,16 @@ class OpenRouterAPI:
             logger.error(f"OpenRouter: Failed to fetch models: {e}")
             return []
 
-    def generate_text(
+    def _build_payload(
         self,
         messages: List[Dict[str, str]],
-        model: Optional[str] = None,
-        temperature: float = 0.7,
-        max_tokens: int = 1000,
-        tools: Optional[List[Dict[str, Any]]] = None,
-        tool_choice: Optional[str] = None,
+        model: Optional[str],
+        temperature: float,
+        max_tokens: int,
+        tools: Optional[List[Dict[str, Any]]],
+        tool_choice: Optional[str],
     ) -> Dict[str, Any]:
-        """Generate text using OpenRouter API"""
-        if not self.enabled:
-            return {"error": "OpenRouter is disabled or not configured"}
-        
-        # Check rate limiting
-        current_time = time.time()
-        if self._is_rate_limited(current_time):
-            return {"error": "Rate limit exceeded. Please try again later."}
-        
+        """Build the request payload for a chat completion"""
         # Use default model if none specified
         if not model:
             model = self.default_model
@@ -159,7 +160,32 @@ class OpenRouterAPI:
         if tools and tool_choice:
             payload["tools"] = tools
             payload["tool_choice"] = tool_choice
+
+        return payload
+
+    def generate_text(
+        self,
+        messages: List[Dict[str, str]],
+        model: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 1000,
+        tools: Optional[List[Dict[str, Any]]] = None,
+        tool_choice: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Generate text using OpenRouter API"""
+        if not self.enabled:
+            return {"error": "OpenRouter is disabled or not configured"}
         
+        # Check rate limiting
+        current_time = time.time()
+        if self._is_rate_limited(current_time):
+            return {"error": "Rate limit exceeded. Please try again later."}
+        
+        payload = self._build_payload(
+            messages, model, temperature, max_tokens, tools, tool_choice
+        )
+        model = payload["model"]
+
         try:
             logger.debug(f"OpenRouter: Making request to model {model}")
             response = requests.post(
@@ -208,6 +234,172 @@ class OpenRouterAPI:
             logger.error(f"OpenRouter: {error_msg}")
             return {"error": error_msg}
 
+    async def agenerate_text(
+        self,
+        messages: List[Dict[str, str]],
+        model: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 1000,
+        tools: Optional[List[Dict[str, Any]]] = None,
+        tool_choice: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Async version of generate_text running on the shared keep-alive session"""
+        if not self.enabled:
+            return {"error": "OpenRouter is disabled or not configured"}
+        
+        # Check rate limiting
+        current_time = time.time()
+        if self._is_rate_limited(current_time):
+            return {"error": "Rate limit exceeded. Please try again later."}
+        
+        payload = self._build_payload(
+            messages, model, temperature, max_tokens, tools, tool_choice
+        )
+        model = payload["model"]
+
+        try:
+            logger.debug(f"OpenRouter: Making async request to model {model}")
+            session = self._http.get_session()
+            async with session.post(
+                self.api_url,
+                headers=self._get_headers(),
+                json=payload,
+                timeout=aiohttp.ClientTimeout(total=self.text_timeout),
+            ) as response:
+                if response.status == 200:
+                    result = await response.json(content_type=None)
+                    logger.debug(f"OpenRouter: Successful response from {model}")
+                    return result
+                elif response.status == 401:
+                    error_msg = "Invalid OpenRouter API key"
+                    logger.error(f"OpenRouter: {error_msg}")
+                    return {"error": error_msg}
+                elif response.status == 429:
+                    error_msg = "OpenRouter rate limit exceeded"
+                    logger.error(f"OpenRouter: {error_msg}")
+                    return {"error": error_msg}
+                elif response.status == 400:
+                    error_data = await response.json(content_type=None)
+                    error_msg = error_data.get("error", {}).get("message", "Bad request")
+                    logger.error(f"OpenRouter: {error_msg}")
+                    return {"error": f"OpenRouter API error: {error_msg}"}
+                else:
+                    error_msg = f"OpenRouter HTTP {response.status}"
+                    logger.error(f"OpenRouter: {error_msg} - {await response.text()}")
+                    return {"error": error_msg}
+
+        except asyncio.TimeoutError:
+            error_msg = "OpenRouter request timeout"
+            logger.error(f"OpenRouter: {error_msg}")
+            return {"error": error_msg}
+        except aiohttp.ClientConnectionError:
+            error_msg = "Cannot connect to OpenRouter service"
+            logger.error(f"OpenRouter: {error_msg}")
+            return {"error": error_msg}
+        except aiohttp.ClientError as e:
+            error_msg = f"OpenRouter request error: {str(e)}"
+            logger.error(f"OpenRouter: {error_msg}")
+            return {"error": error_msg}
+        except json.JSONDecodeError as e:
+            error_msg = f"OpenRouter JSON decode error: {str(e)}"
+            logger.error(f"OpenRouter: {error_msg}")
+            return {"error": error_msg}
+
+    async def astream_text(
+        self,
+        messages: List[Dict[str, str]],
+        model: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 1000,
+        tools: Optional[List[Dict[str, Any]]] = None,
+        tool_choice: Optional[str] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream a chat completion with ``stream=true`` over server-sent events.
+
+        Yields raw OpenAI-format chunks; failures are yielded as a single
+        ``{"error": "..."}`` item.
+        """
+        if not self.enabled:
+            yield {"error": "OpenRouter is disabled or not configured"}
+            return
+
+        # Check rate limiting
+        current_time = time.time()
+        if self._is_rate_limited(current_time):
+            yield {"error": "Rate limit exceeded. Please try again later."}
+            return
+
+        payload = self._build_payload(
+            messages, model, temperature, max_tokens, tools, tool_choice
+        )
+        payload["stream"] = True
+        model = payload["model"]
+
+        try:
+            logger.debug(f"OpenRouter: Streaming request to model {model}")
+            session = self._http.get_session()
+            async with session.post(
+                self.api_url,
+                headers=self._get_headers(),
+                json=payload,
+                timeout=aiohttp.ClientTimeout(
+                    total=None,
+                    sock_connect=self.text_timeout,
+                    sock_read=self.text_timeout,
+                ),
+            ) as response:
+                if response.status == 401:
+                    error_msg = "Invalid OpenRouter API key"
+                    logger.error(f"OpenRouter: {error_msg}")
+                    yield {"error": error_msg}
+                    return
+                elif response.status == 429:
+                    error_msg = "OpenRouter rate limit exceeded"
+                    logger.error(f"OpenRouter: {error_msg}")
+                    yield {"error": error_msg}
+                    return
+                elif response.status != 200:
+                    error_msg = f"OpenRouter HTTP {response.status}"
+                    logger.error(f"OpenRouter: {error_msg} - {await response.text()}")
+                    yield {"error": error_msg}
+                    return
+
+                async for chunk in iter_sse_chunks(response):
+                    # Mid-stream failures arrive as an error object chunk
+                    if chunk.get("error"):
+                        error = chunk["error"]
+                        if isinstance(error, dict):
+                            error = error.get("message", "Stream error")
+                        error_msg = f"OpenRouter API error: {error}"
+                        logger.error(f"OpenRouter: {error_msg}")
+                        yield {"error": error_msg}
+                        return
+                    yield chunk
+
+            logger.debug(f"OpenRouter: Stream from {model} completed")
+
+        except asyncio.TimeoutError:
+            error_msg = "OpenRouter stream timeout"
+            logger.error(f"OpenRouter: {error_msg}")
+            yield {"error": error_msg}
+        except aiohttp.ClientConnectionError:
+            error_msg = "Cannot connect to OpenRouter service"
+            logger.error(f"OpenRouter: {error_msg}")
+            yield {"error": error_msg}
+        except aiohttp.ClientError as e:
+            error_msg = f"OpenRouter request error: {str(e)}"
+            logger.error(f"OpenRouter: {error_msg}")
+            yield {"error": error_msg}
+        except json.JSONDecodeError as e:
+            error_msg = f"OpenRouter JSON decode error: {str(e)}"
+            logger.error(f"OpenRouter: {error_msg}")
+            yield {"error": error_msg}
+
+    async def aclose(self):
+        """Close the shared HTTP session"""
+        await self._http.close()
+
     def get_free_models(self) -> List[str]:
         """Get list of free models from OpenRouter"""
         if not self.enabled:
@@ -1,13 +1,17 @@
+import asyncio
 import json
 import logging
 import random
 import threading
 import time
 import urllib.parse
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple, Union
 
+import aiohttp
 import requests
 
+from ai.clients.http_session import SharedClientSession
+from ai.clients.streaming import iter_sse_chunks
 from config import (
     DEFAULT_MODEL,
     DYNAMIC_TIMEOUT_ENABLED,
@@ -61,6 +65,9 @@ class PollinationsAPI:
         self.timeout_history_lock = threading.Lock()
         self.response_times = []
 
+        # Shared keep-alive session for the async request path
+        self._http = SharedClientSession("pollinations")
+
     def _is_rate_limited(self, request_type: str, current_time: float) -> bool:
         """Check if we're currently rate limited for the given request type"""
         with self._rate_lock:
@@ -178,22 +185,16 @@ class PollinationsAPI:
                 "dynamic_timeout_max": self.dynamic_timeout_max,
             }
 
-    def generate_text(
+    def _build_text_request(
         self,
-        messages: Optional[List[Dict]] = None,
-        model: Optional[str] = None,
-        temperature: float = 0.8,
-        max_tokens: int = 500,
-        tools: Optional[List[Dict]] = None,
-        tool_choice: str = "auto",
-        top_p: float = 0.95,
-        frequency_penalty: float = 0.2,
-        presence_penalty: float = 0.0,
-        stop: Optional[Union[str, List[str]]] = None,
-    ) -> Dict[str, Any]:
-        """
-        Generate text using Pollinations API with OpenAI-compatible format
-        """
+        messages: Optional[List[Dict]],
+        model: Optional[str],
+        temperature: float,
+        max_tokens: int,
+        tools: Optional[List[Dict]],
+        tool_choice: str,
+    ) -> Tuple[Dict[str, Any], Dict[str, str]]:
+        """Build the cleaned payload and headers for a text generation request"""
         # Handle case where messages is None
         if messages is None:
             messages = []
@@ -319,6 +320,30 @@ class PollinationsAPI:
         if self.api_token:
             headers["Authorization"] = f"Bearer {self.api_token}"
 
+        return payload, headers
+
+    def generate_text(
+        self,
+        messages: Optional[List[Dict]] = None,
+        model: Optional[str] = None,
+        temperature: float = 0.8,
+        max_tokens: int = 500,
+        tools: Optional[List[Dict]] = None,
+        tool_choice: str = "auto",
+        top_p: float = 0.95,
+        frequency_penalty: float = 0.2,
+        presence_penalty: float = 0.0,
+        stop: Optional[Union[str, List[str]]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Generate text using Pollinations API with OpenAI-compatible format
+        """
+        payload, headers = self._build_text_request(
+            messages, model, temperature, max_tokens, tools, tool_choice
+        )
+        model = payload["model"]
+        cleaned_messages = payload["messages"]
+
         try:
             current_time = time.time()
 
@@ -467,6 +492,198 @@ class PollinationsAPI:
             logger.error(f"Critical error calling Pollinations API: {e}")
             return {"error": str(e)}
 
+    async def agenerate_text(
+        self,
+        messages: Optional[List[Dict]] = None,
+        model: Optional[str] = None,
+        temperature: float = 0.8,
+        max_tokens: int = 500,
+        tools: Optional[List[Dict]] = None,
+        tool_choice: str = "auto",
+        top_p: float = 0.95,
+        frequency_penalty: float = 0.2,
+        presence_penalty: float = 0.0,
+        stop: Optional[Union[str, List[str]]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Async version of generate_text running on the shared keep-alive session
+        """
+        payload, headers = self._build_text_request(
+            messages, model, temperature, max_tokens, tools, tool_choice
+        )
+
+        try:
+            current_time = time.time()
+
+            # Check rate limiting before making request
+            if self._is_rate_limited("text", current_time):
+                logger.warning(f"🔥 Rate limit hit for text API - too many requests")
+                return {
+                    "error": "Rate limit exceeded for text generation. Please wait before making another request."
+                }
+
+            logger.debug(
+                f"📤 Sending async payload to {self.text_api_url} (model: {payload['model']})"
+            )
+
+            # Get dynamic timeout for this request
+            request_timeout = self._get_dynamic_timeout(self.text_timeout)
+            request_start_time = time.time()
+
+            session = self._http.get_session()
+            async with session.post(
+                self.text_api_url,
+                headers=headers,
+                json=payload,
+                timeout=aiohttp.ClientTimeout(total=request_timeout),
+            ) as response:
+                if response.status == 429:
+                    logger.warning(f"🔥 Rate limit hit from Pollinations API (429)")
+                    return {
+                        "error": "Rate limit exceeded from external API. Please wait a minute before trying again."
+                    }
+                if response.status == 502:
+                    logger.error(
+                        "🚨 Pollinations service appears to be experiencing an outage"
+                    )
+                    return {
+                        "error": f"HTTP 502: Pollinations AI service is currently down - try again later"
+                    }
+                if response.status >= 400:
+                    error_text = await response.text()
+                    logger.error(f"HTTP Error: HTTP {response.status}: {error_text}")
+                    return {
+                        "error": f"HTTP {response.status}: Bad request - check your message format"
+                    }
+
+                result = await response.json(content_type=None)
+
+            # Record successful request for rate limiting and performance monitoring
+            self._record_request("text", current_time)
+            response_time = time.time() - request_start_time
+            self._record_response_time(response_time, True)
+            logger.debug(
+                f"Pollinations response time: {response_time:.2f}s (timeout: {request_timeout}s)"
+            )
+            return result
+
+        except asyncio.TimeoutError:
+            response_time = time.time() - request_start_time
+            self._record_response_time(response_time, False)
+            logger.warning(
+                f"API timeout after {response_time:.2f}s (timeout: {request_timeout}s)"
+            )
+            return {"error": f"API timeout after 1 attempts (timeout: {request_timeout}s)"}
+        except aiohttp.ClientConnectionError:
+            logger.warning("Connection error - Pollinations API may be unreachable")
+            return {"error": "Connection error after 1 attempts"}
+        except aiohttp.ClientError as req_error:
+            logger.error(f"Request error: {req_error}")
+            return {"error": str(req_error)}
+        except Exception as e:
+            logger.error(f"Critical error calling Pollinations API: {e}")
+            return {"error": str(e)}
+
+    async def astream_text(
+        self,
+        messages: Optional[List[Dict]] = None,
+        model: Optional[str] = None,
+        temperature: float = 0.8,
+        max_tokens: int = 500,
+        tools: Optional[List[Dict]] = None,
+        tool_choice: str = "auto",
+        top_p: float = 0.95,
+        frequency_penalty: float = 0.2,
+        presence_penalty: float = 0.0,
+        stop: Optional[Union[str, List[str]]] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream a chat completion with ``stream=true`` over server-sent events.
+
+        Yields raw OpenAI-format chunks. Failures are reported as a single
+        ``{"error": ...}`` item so callers can handle them like the error
+        dicts returned by generate_text.
+        """
+        payload, headers = self._build_text_request(
+            messages, model, temperature, max_tokens, tools, tool_choice
+        )
+        payload["stream"] = True
+
+        current_time = time.time()
+        if self._is_rate_limited("text", current_time):
+            logger.warning(f"🔥 Rate limit hit for text API - too many requests")
+            yield {
+                "error": "Rate limit exceeded for text generation. Please wait before making another request."
+            }
+            return
+
+        logger.debug(
+            f"📤 Streaming payload to {self.text_api_url} (model: {payload['model']})"
+        )
+
+        # The dynamic timeout bounds the wait for the first and every
+        # following chunk rather than the whole (open-ended) stream
+        request_timeout = self._get_dynamic_timeout(self.text_timeout)
+        request_start_time = time.time()
+
+        try:
+            session = self._http.get_session()
+            async with session.post(
+                self.text_api_url,
+                headers=headers,
+                json=payload,
+                timeout=aiohttp.ClientTimeout(
+                    total=None, sock_connect=request_timeout, sock_read=request_timeout
+                ),
+            ) as response:
+                if response.status == 429:
+                    logger.warning(f"🔥 Rate limit hit from Pollinations API (429)")
+                    yield {
+                        "error": "Rate limit exceeded from external API. Please wait a minute before trying again."
+                    }
+                    return
+                if response.status == 502:
+                    logger.error(
+                        "🚨 Pollinations service appears to be experiencing an outage"
+                    )
+                    yield {
+                        "error": f"HTTP 502: Pollinations AI service is currently down - try again later"
+                    }
+                    return
+                if response.status >= 400:
+                    error_text = await response.text()
+                    logger.error(f"HTTP Error: HTTP {response.status}: {error_text}")
+                    yield {
+                        "error": f"HTTP {response.status}: Bad request - check your message format"
+                    }
+                    return
+
+                self._record_request("text", current_time)
+                async for chunk in iter_sse_chunks(response):
+                    yield chunk
+
+            response_time = time.time() - request_start_time
+            self._record_response_time(response_time, True)
+            logger.debug(f"Pollinations stream completed in {response_time:.2f}s")
+
+        except asyncio.TimeoutError:
+            response_time = time.time() - request_start_time
+            self._record_response_time(response_time, False)
+            logger.warning(
+                f"Stream timeout after {response_time:.2f}s (timeout: {request_timeout}s)"
+            )
+            yield {"error": f"API timeout while streaming (timeout: {request_timeout}s)"}
+        except aiohttp.ClientConnectionError:
+            logger.warning("Connection error - Pollinations API may be unreachable")
+            yield {"error": "Connection error while streaming"}
+        except aiohttp.ClientError as req_error:
+            logger.error(f"Stream request error: {req_error}")
+            yield {"error": str(req_error)}
+
+    async def aclose(self):
+        """Close the shared HTTP session"""
+        await self._http.close()
+
     def _enhance_image_prompt(self, user_prompt: str) -> str:
         """Enhance image prompt with stylistic additions for better results"""
         # If prompt is empty, return as is
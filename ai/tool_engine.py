@@ -0,0 +1,316 @@
+"""
+Agentic tool execution loop.
+
+Runs the model/tool conversation of a single turn: the model may request
+tools for several rounds, each round's tool calls are executed concurrently,
+and the loop ends as soon as the model answers with final content or the
+round, token or time budget is spent.
+"""
+import asyncio
+import json
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from config import (
+    TOOL_CALL_TIMEOUT,
+    TOOL_LOOP_MAX_ROUNDS,
+    TOOL_LOOP_TIME_BUDGET,
+    TOOL_LOOP_TOKEN_BUDGET,
+    TOOL_MAX_CONCURRENCY,
+)
+from utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Arguments that may be given as "current" and refer to the message's channel
+CHANNEL_ID_ARG_NAMES = ["channel_id", "channel"]
+
+
+@dataclass
+class ToolRoundTrace:
+    """Trace of one model call and the tool calls it requested."""
+
+    round_number: int
+    llm_time: float
+    tokens: int
+    tool_calls: List[str] = field(default_factory=list)
+    deduplicated: int = 0
+    tool_time: float = 0.0
+
+
+@dataclass
+class ToolLoopResult:
+    """Outcome of a tool loop run."""
+
+    content: str
+    response: Dict[str, Any]
+    stop_reason: str
+    rounds: List[ToolRoundTrace] = field(default_factory=list)
+    error: Optional[str] = None
+
+    @property
+    def tool_rounds(self) -> int:
+        """Number of rounds in which tools were executed"""
+        return sum(1 for trace in self.rounds if trace.tool_calls)
+
+
+class ToolExecutionEngine:
+    """
+    Multi-round tool execution engine for one AI turn.
+
+    ``generate`` is called with ``messages``, ``tools`` and ``tool_choice``
+    keyword arguments and must return an OpenAI-format response dict (or an
+    ``{"error": ...}`` dict). Identical tool calls (same name and arguments)
+    are executed only once per turn and their result is reused.
+    """
+
+    def __init__(
+        self,
+        tool_manager,
+        max_rounds: int = TOOL_LOOP_MAX_ROUNDS,
+        token_budget: int = TOOL_LOOP_TOKEN_BUDGET,
+        time_budget: float = TOOL_LOOP_TIME_BUDGET,
+        max_concurrency: int = TOOL_MAX_CONCURRENCY,
+        tool_timeout: float = TOOL_CALL_TIMEOUT,
+    ):
+        self.tool_manager = tool_manager
+        self.max_rounds = max_rounds
+        self.token_budget = token_budget
+        self.time_budget = time_budget
+        self.max_concurrency = max_concurrency
+        self.tool_timeout = tool_timeout
+
+    async def run(
+        self,
+        generate: Callable[..., Awaitable[Dict[str, Any]]],
+        messages: List[Dict[str, Any]],
+        tools: Optional[List[Dict]],
+        user_id: str,
+        channel_id: str,
+    ) -> ToolLoopResult:
+        """
+        Run the tool loop until the model produces its final answer.
+
+        ``messages`` is extended in place with the assistant tool-call
+        messages and tool results of every round.
+        """
+        start_time = time.monotonic()
+        traces: List[ToolRoundTrace] = []
+        results_cache: Dict[str, asyncio.Future] = {}
+        tokens_used = 0
+        stop_reason = "final_content"
+
+        round_number = 0
+        while True:
+            round_number += 1
+
+            # Once a budget is spent the model has to answer without tools
+            allow_tools = bool(tools)
+            if round_number > self.max_rounds:
+                allow_tools, stop_reason = False, "max_rounds"
+            elif tokens_used >= self.token_budget:
+                allow_tools, stop_reason = False, "token_budget"
+            elif time.monotonic() - start_time >= self.time_budget:
+                allow_tools, stop_reason = False, "time_budget"
+
+            llm_start = time.monotonic()
+            if allow_tools:
+                response = await generate(
+                    messages=messages, tools=tools, tool_choice="auto"
+                )
+            else:
+                response = await generate(messages=messages)
+            llm_time = time.monotonic() - llm_start
+
+            if response.get("error"):
+                self._log_trace(traces, "error", start_time)
+                return ToolLoopResult(
+                    content="",
+                    response=response,
+                    stop_reason="error",
+                    rounds=traces,
+                    error=response["error"],
+                )
+
+            tokens = self._count_tokens(response, messages)
+            tokens_used += tokens
+            trace = ToolRoundTrace(round_number, llm_time, tokens)
+            traces.append(trace)
+
+            content, tool_calls = self._parse_response(response)
+
+            # Short-circuit as soon as the model answers without tools
+            if not tool_calls or not allow_tools:
+                if allow_tools:
+                    stop_reason = "final_content"
+                self._log_trace(traces, stop_reason, start_time)
+                return ToolLoopResult(
+                    content=content,
+                    response=response,
+                    stop_reason=stop_reason,
+                    rounds=traces,
+                )
+
+            tool_start = time.monotonic()
+            tool_messages, deduplicated = await self.execute_tool_calls(
+                tool_calls, user_id, channel_id, results_cache
+            )
+            trace.tool_time = time.monotonic() - tool_start
+            trace.tool_calls = [call["function"]["name"] for call in tool_calls]
+            trace.deduplicated = deduplicated
+
+            logger.info(
+                f"🔧 Tool round {round_number}: {', '.join(trace.tool_calls)} "
+                f"(llm {llm_time:.2f}s, tools {trace.tool_time:.2f}s, "
+                f"{deduplicated} deduplicated, ~{tokens} tokens)"
+            )
+
+            # Add the assistant message with tool calls and the tool results
+            messages.append(
+                {
+                    "role": "assistant",
+                    "content": content,  # This might be empty if only tool calls were made
+                    "tool_calls": tool_calls,
+                }
+            )
+            messages.extend(tool_messages)
+
+    async def execute_tool_calls(
+        self,
+        tool_calls: List[Dict[str, Any]],
+        user_id: str,
+        channel_id: str,
+        results_cache: Optional[Dict[str, asyncio.Future]] = None,
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Execute the tool calls of one round concurrently.
+
+        At most ``max_concurrency`` calls run at once and each one is bounded
+        by ``tool_timeout``. The tool messages are returned in the order of
+        ``tool_calls`` so every result follows its tool_call_id, together
+        with the number of calls answered from ``results_cache``.
+        """
+        if results_cache is None:
+            results_cache = {}
+
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        deduplicated = 0
+        pending = []
+
+        for tool_call in tool_calls:
+            function_name = tool_call["function"]["name"]
+            try:
+                arguments = self._parse_arguments(tool_call, channel_id)
+            except Exception as e:
+                logger.error(f"Error executing tool {function_name}: {e}")
+                pending.append(
+                    self._completed(f"Error executing tool {function_name}: {str(e)}")
+                )
+                continue
+
+            key = f"{function_name}:{json.dumps(arguments, sort_keys=True, default=str)}"
+            if key in results_cache:
+                deduplicated += 1
+                logger.debug(f"Reusing result of duplicate tool call {function_name}")
+            else:
+                results_cache[key] = asyncio.ensure_future(
+                    self._run_tool(semaphore, function_name, arguments, user_id)
+                )
+            pending.append(results_cache[key])
+
+        results = await asyncio.gather(*pending)
+        tool_messages = [
+            {"role": "tool", "content": content, "tool_call_id": tool_call["id"]}
+            for tool_call, content in zip(tool_calls, results)
+        ]
+        return tool_messages, deduplicated
+
+    async def _run_tool(
+        self,
+        semaphore: asyncio.Semaphore,
+        function_name: str,
+        arguments: Dict[str, Any],
+        user_id: str,
+    ) -> str:
+        """Execute one tool call under the concurrency cap and timeout"""
+        async with semaphore:
+            start_time = time.monotonic()
+            timed_out = False
+            try:
+                logger.info(f"Executing tool: {function_name} with args: {arguments}")
+                result = await asyncio.wait_for(
+                    self.tool_manager.execute_tool(function_name, arguments, user_id),
+                    timeout=self.tool_timeout,
+                )
+                logger.info(f"Tool result: {function_name} -> {str(result)[:200]}")
+                content = str(result)
+            except asyncio.TimeoutError:
+                timed_out = True
+                logger.warning(
+                    f"Tool {function_name} timed out after {self.tool_timeout}s"
+                )
+                content = f"Error executing tool {function_name}: timed out after {self.tool_timeout}s"
+            except Exception as e:
+                logger.error(f"Error executing tool {function_name}: {e}")
+                content = f"Error executing tool {function_name}: {str(e)}"
+
+            elapsed = time.monotonic() - start_time
+            self.tool_manager.record_execution_time(function_name, elapsed, timed_out)
+            logger.debug(f"⏱️ Tool {function_name} took {elapsed:.2f}s")
+            return content
+
+    @staticmethod
+    async def _completed(content: str) -> str:
+        """Wrap an already known tool result for gathering"""
+        return content
+
+    @staticmethod
+    def _parse_arguments(tool_call: Dict[str, Any], channel_id: str) -> Dict[str, Any]:
+        """Decode tool call arguments and resolve the "current" channel"""
+        # Parse arguments - may already be a dict or may be JSON string
+        args = tool_call["function"]["arguments"]
+        arguments = json.loads(args) if isinstance(args, str) else dict(args or {})
+
+        # Convert "current" to the actual channel ID from the message context
+        for arg_name in CHANNEL_ID_ARG_NAMES:
+            if arguments.get(arg_name) == "current":
+                arguments[arg_name] = channel_id
+                logger.info(f"Replaced 'current' channel_id with actual ID: {channel_id}")
+
+        return arguments
+
+    @staticmethod
+    def _parse_response(response: Dict[str, Any]) -> Tuple[str, List[Dict[str, Any]]]:
+        """Extract the content and tool calls from an OpenAI-format response"""
+        if "choices" in response and len(response["choices"]) > 0:
+            ai_message = response["choices"][0].get("message", {})
+            content = ai_message.get("content") or ""
+            return content.strip(), ai_message.get("tool_calls") or []
+
+        content = response.get("content") or ""
+        return content.strip(), []
+
+    @staticmethod
+    def _count_tokens(response: Dict[str, Any], messages: List[Dict[str, Any]]) -> int:
+        """Tokens used by a call, estimated from the prompt if not reported"""
+        usage = response.get("usage") or {}
+        if usage.get("total_tokens"):
+            return int(usage["total_tokens"])
+
+        # Rough estimate of ~4 characters per token
+        return sum(len(str(message.get("content") or "")) for message in messages) // 4
+
+    def _log_trace(
+        self, traces: List[ToolRoundTrace], stop_reason: str, start_time: float
+    ):
+        """Log a summary of all rounds of the turn"""
+        rounds = ", ".join(
+            f"#{t.round_number}[{'+'.join(t.tool_calls) or 'answer'}] "
+            f"{t.llm_time + t.tool_time:.2f}s"
+            for t in traces
+        )
+        logger.info(
+            f"🔁 Tool loop finished ({stop_reason}) after {len(traces)} model calls "
+            f"in {time.monotonic() - start_time:.2f}s: {rounds or 'no rounds'}"
+        )
@@ -1,8 +1,6 @@
 import asyncio
-import json
 import logging
 import math
-import operator
 import random
 import re
 import threading
@@ -21,6 +19,7 @@ from discord.ext.commands.view import StringView
 from ai.anti_repetition_integrator import anti_repetition_integrator
 from ai.openrouter import openrouter_api
 from ai.pollinations import pollinations_api
+from ai.tool_engine import ToolExecutionEngine
 
 # Import response uniqueness system
 from ai.response_uniqueness import response_uniqueness
@@ -91,6 +90,9 @@ def handle_command_error(error: Exception, ctx, command_name: str) -> str:
 
 
 from config import (
+    AI_STREAM_EDIT_INTERVAL,
+    AI_STREAM_MIN_FIRST_CHUNK,
+    AI_STREAMING_ENABLED,
     AIRDROP_CPM_MAX,
     AIRDROP_CPM_MIN,
     AIRDROP_DELAY_MAX,
@@ -100,6 +102,7 @@ from config import (
     AIRDROP_DISABLE_PHRASEDROP,
     AIRDROP_DISABLE_REDPACKET,
     AIRDROP_DISABLE_TRIVIADROP,
+    AIRDROP_RESPONSE_TIMEOUT,
     AIRDROP_IGNORE_DROPS_UNDER,
     AIRDROP_IGNORE_TIME_UNDER,
     AIRDROP_IGNORE_USERS,
@@ -117,6 +120,7 @@ from config import (
     GENDER_ROLES_GUILD_ID,
     GUILD_BLACKLIST,
     IMAGE_API_RATE_LIMIT,
+    LOOP_MONITOR_ENABLED,
     RATE_LIMIT_COOLDOWN,
     RELAY_MENTION_ROLE_MAPPINGS,
     SYSTEM_PROMPT,
@@ -133,7 +137,12 @@ from data.database import db
 from media.image_generator import image_generator
 from tools.tool_manager import tool_manager
 from utils.gender_roles import get_user_pronouns
-from utils.helpers import send_long_message
+from utils.airdrop_correlator import TIPCC_BOT_ID, AirdropCorrelator, is_airdrop_trigger
+from utils.airdrop_metrics import AirdropMetrics
+from utils.helpers import StreamingReply, send_long_message
+from utils.loop_monitor import loop_monitor
+from utils.math_evaluator import math_evaluator
+from utils.reminder_scheduler import ReminderScheduler
 
 # Configure logging with colored output
 from utils.logging_config import get_logger
@@ -192,6 +201,9 @@ class JakeyBot(commands.Bot):
         # Flag to ensure commands are loaded only once
         self._commands_loaded = False
 
+        # Fires reminders at their trigger time, started in on_ready
+        self.reminder_scheduler = None
+
         # User rate limiting setup - OPTIMIZED with O(1) operations
         self.user_rate_limit = USER_RATE_LIMIT
         self.rate_limit_cooldown = RATE_LIMIT_COOLDOWN
@@ -205,6 +217,11 @@ class JakeyBot(commands.Bot):
             2.5  # Minimum 2.5 seconds between any responses (increased for stability)
         )
 
+        # Airdrop triggers waiting for tip.cc's embed, per channel
+        self.airdrop_correlator = AirdropCorrelator(AIRDROP_RESPONSE_TIMEOUT)
+        # Per-stage timings and outcome of every drop, stored in SQLite
+        self.airdrop_metrics = AirdropMetrics(self.db)
+
         # Wen command cooldown to prevent loops
         self.wen_cooldown = {}  # message_id -> timestamp
         self.wen_cooldown_duration = 600  # seconds (10 minutes)
@@ -478,6 +495,42 @@ class JakeyBot(commands.Bot):
     async def close(self):
         """Override close method for better cleanup"""
         logger.info("🛑 Closing bot connection...")
+        if hasattr(self, "_ai_manager"):
+            try:
+                await self._ai_manager.close()
+            except Exception as e:
+                logger.warning(f"Error closing AI provider sessions: {e}")
+        try:
+            await tool_manager.aclose()
+        except Exception as e:
+            logger.warning(f"Error closing tool HTTP session: {e}")
+        await loop_monitor.stop()
+        if self.reminder_scheduler is not None:
+            await self.reminder_scheduler.stop()
+        try:
+            from memory import memory_backend
+            if memory_backend is not None:
+                await memory_backend.wait_for_replication()
+        except Exception as e:
+            logger.warning(f"Error finishing memory replication: {e}")
+        try:
+            from tools.mcp_memory_client import mcp_memory_client
+            await mcp_memory_client.aclose()
+        except Exception as e:
+            logger.warning(f"Error closing MCP memory client session: {e}")
+        try:
+            from utils.trivia_manager import trivia_manager
+            await trivia_manager.flush()
+        except Exception as e:
+            logger.warning(f"Error flushing trivia usage statistics: {e}")
+        try:
+            await self.airdrop_metrics.flush()
+        except Exception as e:
+            logger.warning(f"Error storing airdrop metrics: {e}")
+        try:
+            await self.db.aflush_writes()
+        except Exception as e:
+            logger.warning(f"Error flushing buffered database writes: {e}")
         await super().close()
 
     async def on_ready(self):
@@ -503,9 +556,24 @@ class JakeyBot(commands.Bot):
         # Set up periodic memory cleanup
         await self.setup_periodic_memory_cleanup()
 
-        # Start the reminder background task
-        asyncio.create_task(self._check_due_reminders())
-        logger.info("Started reminder background task")
+        # Start sampling event loop lag
+        if LOOP_MONITOR_ENABLED:
+            loop_monitor.start()
+
+        # Load trivia answers into memory before the first trivia drop
+        if not AIRDROP_DISABLE_TRIVIADROP:
+            try:
+                from utils.trivia_manager import trivia_manager
+
+                if not trivia_manager.session:
+                    await trivia_manager.initialize()
+            except Exception as e:
+                logger.warning(f"Could not initialize trivia manager: {e}")
+
+        # Start the reminder scheduler (on_ready fires again after reconnects)
+        if self.reminder_scheduler is None:
+            self.reminder_scheduler = ReminderScheduler(self.db, self._send_reminder)
+            await self.reminder_scheduler.start()
 
         # Initialize message queue integration if enabled
         if self._message_queue_enabled:
@@ -536,16 +604,21 @@ class JakeyBot(commands.Bot):
             return
 
         # Handle tip.cc bot messages (special case - need to parse even from bots)
-        if (
-            message.author.bot and message.author.id == 617037497574359050
-        ):  # tip.cc bot ID
+        if message.author.bot and message.author.id == TIPCC_BOT_ID:
             logger.debug("Processing tip.cc bot message")
+            # Drop embeds go straight to the trigger waiting for them
+            if message.embeds:
+                self.airdrop_correlator.resolve(message)
             try:
                 await self.tipcc_manager.handle_tip_cc_response(message)
             except Exception as e:
                 logger.error(f"Error handling tip.cc message: {e}")
             return  # Don't process further as regular message
 
+        # Register drop triggers before anything below can delay them
+        if not message.author.bot and is_airdrop_trigger(message.content):
+            self.airdrop_correlator.register(message.channel.id, message.id)
+
         # WEBHOOK RELAY FUNCTIONALITY
         if USE_WEBHOOK_RELAY and WEBHOOK_RELAY_MAPPINGS:
             await self.process_webhook_relay(message)
@@ -706,21 +779,7 @@ class JakeyBot(commands.Bot):
             return  # Don't process as regular message
 
         # Check for airdrop commands
-        content = message.content.lower()
-        if content.startswith(
-            (
-                "$airdrop",
-                "$triviadrop",
-                "$mathdrop",
-                "$phrasedrop",
-                "$redpacket",
-                "$ airdrop",
-                "$ triviadrop",
-                "$ mathdrop",
-                "$ phrasedrop",
-                "$ redpacket",
-            )
-        ):
+        if is_airdrop_trigger(message.content):
             # This is an airdrop command, process it
             await self.process_airdrop_command(message)
             return  # Don't process as regular message
@@ -747,7 +806,7 @@ class JakeyBot(commands.Bot):
         elif "jakey" in message.content.lower():
             # Check if "jakey" is mentioned in the message
             should_respond = True
-        elif await self.db.acheck_message_for_keywords(message.content):
+        elif self.db.check_message_for_keywords(message.content):
             # Check if any configured keywords are in the message
             should_respond = True
 
@@ -853,143 +912,53 @@ class JakeyBot(commands.Bot):
 
             available_tools = tool_manager.get_available_tools()
 
-            logger.debug(f"Generating AI response with model: {self.current_model}")
-            response = await self._ai_manager.generate_text(
-                messages=valid_messages,
-                model=self.current_model,
-                temperature=0.7,
-                max_tokens=500,
-                tools=available_tools,
-                tool_choice="auto",
+            # Streamed content is shown early and edited in place; without
+            # streaming the reply is sent once the response is complete
+            reply = StreamingReply(
+                message.channel,
+                edit_interval=AI_STREAM_EDIT_INTERVAL,
+                min_first_chunk=AI_STREAM_MIN_FIRST_CHUNK,
+                max_length=JakeyConstants.DISCORD_MESSAGE_LIMIT,
+                render=sanitize_ai_response,
             )
 
-            if response.get("error"):
-                logger.error(f"AI generation error: {response['error']}")
-                await message.channel.send(
-                    "💀 **Sorry, I'm having trouble thinking right now. Try again later.**"
+            async def generate(**request):
+                return await self._generate_ai_response(
+                    reply,
+                    model=self.current_model,
+                    temperature=0.7,
+                    max_tokens=500,
+                    **request,
                 )
-                return
-
-            # Parse OpenAI-format response from providers
-            if "choices" in response and len(response["choices"]) > 0:
-                ai_message = response["choices"][0]["message"]
-                content = ai_message.get("content", "")
-                ai_response = content.strip() if content else ""
-
-                # Handle tool calls if present
-                tool_calls = ai_message.get("tool_calls", [])
-
-                if tool_calls:
-                    # Execute tool calls and build tool responses
-                    from tools.tool_manager import tool_manager
-
-                    # Create tool response messages for the AI
-                    tool_messages = []
-                    for tool_call in tool_calls:
-                        function_name = tool_call["function"]["name"]
-                        try:
-                            # Parse arguments - may already be a dict or may be JSON string
-                            import json
-
-                            args = tool_call["function"]["arguments"]
-                            if isinstance(args, str):
-                                arguments = json.loads(args)
-                            else:
-                                arguments = args
-
-                            # Handle special "current" channel_id for Discord tools
-                            # Convert "current" to the actual channel ID from the message context
-                            channel_id_arg_names = ["channel_id", "channel"]
-                            for arg_name in channel_id_arg_names:
-                                if arg_name in arguments and arguments[arg_name] == "current":
-                                    arguments[arg_name] = str(message.channel.id)
-                                    logger.info(f"Replaced 'current' channel_id with actual ID: {arguments[arg_name]}")
-
-                            # Execute the tool
-                            logger.info(
-                                f"Executing tool: {function_name} with args: {arguments}"
-                            )
-                            result = await tool_manager.execute_tool(
-                                function_name, arguments, str(message.author.id)
-                            )
-                            logger.info(
-                                f"Tool result: {function_name} -> {str(result)[:200]}"
-                            )
-
-                            # Add tool response
-                            tool_messages.append(
-                                {
-                                    "role": "tool",
-                                    "content": str(result),
-                                    "tool_call_id": tool_call["id"],
-                                }
-                            )
-                        except Exception as e:
-                            logger.error(f"Error executing tool {function_name}: {e}")
-                            tool_messages.append(
-                                {
-                                    "role": "tool",
-                                    "content": f"Error executing tool {function_name}: {str(e)}",
-                                    "tool_call_id": tool_call["id"],
-                                }
-                            )
-
-                    # Now make a follow-up call with tool results to get final response
-                    if tool_messages:
-                        # Add the original assistant message with tool calls to the conversation
-                        valid_messages.append(
-                            {
-                                "role": "assistant",
-                                "content": ai_response,  # This might be empty if only tool calls were made
-                                "tool_calls": tool_calls,
-                            }
-                        )
-
-                        # Add tool responses to the conversation
-                        valid_messages.extend(tool_messages)
-
-                        logger.info(
-                            f"Making follow-up AI call with {len(tool_messages)} tool results"
-                        )
-
-                        # Get the final response from AI based on tool results
-                        final_response = await self._ai_manager.generate_text(
-                            messages=valid_messages,
-                            model=self.current_model,
-                            temperature=0.7,
-                            max_tokens=500
-                        )
-                        logger.info(f"Follow-up AI response received: {str(final_response)[:200]}")
 
-                        if final_response.get("error"):
-                            logger.error(
-                                f"AI final response error: {final_response['error']}"
-                            )
-                            await message.channel.send(
-                                "💀 **Sorry, I'm having trouble getting the final response. Try again later.**"
-                            )
-                            return
+            # Let the model chain tool rounds until it answers or runs out of budget
+            logger.debug(f"Generating AI response with model: {self.current_model}")
+            engine = ToolExecutionEngine(tool_manager)
+            result = await engine.run(
+                generate,
+                valid_messages,
+                available_tools,
+                user_id=str(message.author.id),
+                channel_id=str(message.channel.id),
+            )
 
-                        # Extract the final AI response
-                        if (
-                            "choices" in final_response
-                            and len(final_response["choices"]) > 0
-                        ):
-                            content = final_response["choices"][0]["message"].get(
-                                "content", ""
-                            )
-                            ai_response = content.strip() if content else ""
-                        else:
-                            content = final_response.get("content", "")
-                            ai_response = content.strip() if content else ""
+            if result.error:
+                if result.tool_rounds:
+                    logger.error(f"AI final response error: {result.error}")
+                    await reply.finish(
+                        "💀 **Sorry, I'm having trouble getting the final response. Try again later.**"
+                    )
                 else:
-                    # No tool calls, continue with original response
-                    pass
-            else:
-                ai_response = response.get("content", "").strip()
+                    logger.error(f"AI generation error: {result.error}")
+                    await reply.finish(
+                        "💀 **Sorry, I'm having trouble thinking right now. Try again later.**"
+                    )
+                return
+
+            ai_response = result.content
 
             if not ai_response:
-                await message.channel.send("💀 **My mind went blank. Try again?**")
+                await reply.finish("💀 **My mind went blank. Try again?**")
                 return
 
             # Check for repetition
@@ -1008,12 +977,14 @@ class JakeyBot(commands.Bot):
             if not ai_response:
                 # Response was only tool call syntax with no actual message
                 logger.debug("AI response was empty after sanitization (contained only tool call syntax)")
+                await reply.discard()
                 return
 
             # Send the response with typing indicator (no artificial delay)
-            async with message.channel.typing():
-                pass  # Just show typing indicator without delay
-            await message.channel.send(ai_response)
+            if reply.message is None:
+                async with message.channel.typing():
+                    pass  # Just show typing indicator without delay
+            await reply.finish(ai_response)
 
             # Store the interaction
             try:
@@ -1039,6 +1010,29 @@ class JakeyBot(commands.Bot):
             # Silent fail - don't expose automation errors to Discord
             logger.error(f"Error in process_jakey_response: {e}")
 
+    async def _generate_ai_response(
+        self, reply: StreamingReply, **request
+    ) -> Dict[str, Any]:
+        """
+        Generate an AI response, streaming its content into ``reply`` if enabled.
+
+        Always returns the complete OpenAI-format response (or an error dict),
+        so tool calls are handled the same way with and without streaming.
+        """
+        if not AI_STREAMING_ENABLED:
+            return await self._ai_manager.generate_text(**request)
+
+        reply.reset()
+        response = {"error": "Stream ended without a response"}
+        async for event in self._ai_manager.stream_text(**request):
+            if event["type"] == "content":
+                await reply.append(event["text"])
+            elif event["type"] == "done":
+                response = event["response"]
+            elif event["type"] == "error":
+                response = {"error": event["error"]}
+        return response
+
     async def _extract_and_store_memories(
         self, user_id: str, user_message: str, bot_response: str
     ):
@@ -1046,11 +1040,8 @@ class JakeyBot(commands.Bot):
         Extract meaningful information from the conversation and store it in memory.
         """
         try:
-            # Import the memory extractor
-            from memory.auto_memory_extractor import AutoMemoryExtractor
-
-            # Initialize the extractor
-            extractor = AutoMemoryExtractor()
+            # Shared extractor with precompiled patterns
+            from memory.auto_memory_extractor import auto_memory_extractor as extractor
 
             # Extract memories from the conversation
             memories = await extractor.extract_memories_from_conversation(
@@ -1202,146 +1193,77 @@ class JakeyBot(commands.Bot):
             logger.error(f"Error in webhook relay: {e}")
             return
 
-    async def _check_due_reminders(self):
-        """Background task to periodically check for due reminders and send notifications"""
-        import datetime
-
-        from discord.ext import tasks
+    async def _send_reminder(self, reminder):
+        """Deliver a due reminder to its channel or the user's DMs"""
+        reminder_id = reminder["id"]
+        user_id = reminder["user_id"]
+
+        # Find the user and send the reminder
+        # Look for the Discord user in the bot's cache
+        discord_user = None
+        for guild in self.guilds:
+            discord_user = guild.get_member(int(user_id))
+            if discord_user:
+                break
 
-        while True:
+        # If user not found in cache, try to fetch directly
+        if not discord_user:
             try:
-                # Check for due reminders every 30 seconds
-                await asyncio.sleep(30)
-
-                # Use the check_due_reminders tool to find due reminders
-                due_reminders_result = self.tool_manager.check_due_reminders()
-
-                if "No reminders are currently due" in due_reminders_result:
-                    continue  # No reminders to process, continue loop
-
-                if "error" in due_reminders_result.lower():
-                    logger.error(
-                        f"Error checking due reminders: {due_reminders_result}"
-                    )
-                    continue
-
-                # Parse reminder IDs from the result
-                # The result format is "🔔 N reminder(s) are due:\n- title (ID: X, User: Y)\n"
-                import re
-
-                reminder_matches = re.findall(
-                    r"\(ID: (\d+), User: ([\w\d]+)\)", due_reminders_result
+                discord_user = await self.fetch_user(int(user_id))
+            except:
+                logger.warning(
+                    f"Could not find user {user_id} for reminder {reminder_id}"
                 )
+                return
 
-                for reminder_id, user_id in reminder_matches:
-                    try:
-                        # Get the full reminder details
-                        reminder = self.db.get_reminder(int(reminder_id))
-                        if not reminder:
-                            logger.warning(
-                                f"Could not find reminder with ID {reminder_id}"
-                            )
-                            continue
-
-                        # Update the reminder status to 'triggered'
-                        self.db.update_reminder_status(int(reminder_id), "triggered")
-
-                        # Find the user and send the reminder
-                        # Look for the Discord user in the bot's cache
-                        discord_user = None
-                        for guild in self.guilds:
-                            discord_user = guild.get_member(int(user_id))
-                            if discord_user:
-                                break
-
-                        # If user not found in cache, try to fetch directly
-                        if not discord_user:
-                            try:
-                                discord_user = await self.fetch_user(int(user_id))
-                            except:
-                                logger.warning(
-                                    f"Could not find user {user_id} for reminder {reminder_id}"
-                                )
-                                continue
-
-                        if discord_user:
-                            try:
-                                # Determine where to send the reminder
-                                target_channel = None
-
-                                if reminder["channel_id"]:
-                                    # Try to find the specific channel
-                                    for guild in self.guilds:
-                                        target_channel = guild.get_channel(
-                                            int(reminder["channel_id"])
-                                        )
-                                        if target_channel:
-                                            break
-
-                                # If no specific channel or channel not found, send to user directly
-                                if not target_channel:
-                                    target_channel = (
-                                        discord_user.dm_channel
-                                        or await discord_user.create_dm()
-                                    )
-
-                                # Send the reminder message
-                                reminder_msg = f"⏰ **REMINDER**: {reminder['title']}\n{reminder['description']}"
+        try:
+            # Determine where to send the reminder
+            target_channel = None
+
+            if reminder["channel_id"]:
+                # Try to find the specific channel
+                for guild in self.guilds:
+                    target_channel = guild.get_channel(int(reminder["channel_id"]))
+                    if target_channel:
+                        break
 
-                                # Check if the target channel is a valid messaging channel
-                                if isinstance(
-                                    target_channel,
-                                    (TextChannel, DMChannel, GroupChannel, Thread),
-                                ):
-                                    await target_channel.send(reminder_msg)
-                                else:
-                                    logger.warning(
-                                        f"Cannot send reminder to user {user_id}: target channel type {type(target_channel).__name__} does not support messaging"
-                                    )
-                                logger.info(
-                                    f"Sent reminder {reminder_id} to user {user_id}"
-                                )
+            # If no specific channel or channel not found, send to user directly
+            if not target_channel:
+                target_channel = (
+                    discord_user.dm_channel or await discord_user.create_dm()
+                )
 
-                            except discord.Forbidden:
-                                logger.warning(
-                                    f"No permission to send reminder to user {user_id}"
-                                )
-                            except Exception as e:
-                                logger.error(
-                                    f"Error sending reminder to user {user_id}: {e}"
-                                )
+            # Send the reminder message
+            reminder_msg = f"⏰ **REMINDER**: {reminder['title']}\n{reminder['description']}"
 
-                    except Exception as e:
-                        logger.error(f"Error processing reminder {reminder_id}: {e}")
-                        # If there's an error, make sure to update the status back to pending or handle appropriately
-                        continue
+            # Check if the target channel is a valid messaging channel
+            if isinstance(
+                target_channel,
+                (TextChannel, DMChannel, GroupChannel, Thread),
+            ):
+                await target_channel.send(reminder_msg)
+            else:
+                logger.warning(
+                    f"Cannot send reminder to user {user_id}: target channel type {type(target_channel).__name__} does not support messaging"
+                )
+            logger.info(f"Sent reminder {reminder_id} to user {user_id}")
 
-            except Exception as e:
-                logger.error(f"Error in _check_due_reminders background task: {e}")
-                # Wait a bit before continuing to avoid rapid error loops
-                await asyncio.sleep(60)
+        except discord.Forbidden:
+            logger.warning(f"No permission to send reminder to user {user_id}")
+        except Exception as e:
+            logger.error(f"Error sending reminder to user {user_id}: {e}")
 
     async def process_airdrop_command(self, original_message):
         """Process airdrop commands automatically"""
-        content = original_message.content.lower()
-
         # Check if this is an airdrop command we should process
-        if not content.startswith(
-            (
-                "$airdrop",
-                "$triviadrop",
-                "$mathdrop",
-                "$phrasedrop",
-                "$redpacket",
-                "$ airdrop",
-                "$ triviadrop",
-                "$ mathdrop",
-                "$ phrasedrop",
-                "$ redpacket",
-            )
-        ):
+        if not is_airdrop_trigger(original_message.content):
             return
 
+        # Claim tip.cc's answer to this trigger even if the drop is skipped
+        # below, so it can't be mistaken for the answer to a later trigger
+        channel_id = original_message.channel.id
+        self.airdrop_correlator.register(channel_id, original_message.id)
+
             # Check if server is in whitelist (if whitelist is enabled)
         if AIRDROP_SERVER_WHITELIST:
             whitelist_servers = [
@@ -1360,24 +1282,33 @@ class JakeyBot(commands.Bot):
         if str(original_message.author.id) in ignore_users_list:
             return
 
+        trace = self.airdrop_metrics.start(original_message)
+        try:
+            await self._enter_drop(original_message, trace)
+        except Exception as e:
+            trace.finish("failed", type(e).__name__)
+            raise
+        finally:
+            self.airdrop_metrics.record(trace)
+
+    async def _enter_drop(self, original_message, trace):
+        """Wait for tip.cc's embed and enter the drop, marking each stage on the trace"""
+        channel_id = original_message.channel.id
         logger.debug(f"Detected potential drop: {original_message.content}")
 
         try:
-            # Wait for the tip.cc bot response - reduced timeout for faster response
-            tip_cc_message = await self.wait_for(
-                "message",
-                timeout=8,  # Reduced from 15s for faster airdrops
-                check=lambda m: (
-                    m.author.id == 617037497574359050
-                    and m.channel.id == original_message.channel.id
-                    and m.embeds
-                ),
+            # Wait for the tip.cc bot response, resolved directly by on_message
+            tip_cc_message = await self.airdrop_correlator.wait(
+                channel_id, original_message.id
             )
         except asyncio.TimeoutError:
             logger.debug("Timeout waiting for tip.cc message.")
+            trace.finish("no_embed", "timeout")
             return
+        trace.mark("embed")
 
         if not tip_cc_message.embeds:
+            trace.finish("no_embed")
             return
 
         embed = tip_cc_message.embeds[0]
@@ -1390,6 +1321,7 @@ class JakeyBot(commands.Bot):
             logger.debug(
                 f"Ignoring drop with only {drop_ends_in:.1f}s remaining (threshold: {AIRDROP_IGNORE_TIME_UNDER}s)"
             )
+            trace.finish("skipped", "ending")
             return
 
         # Check if drop value is too low (extract from description if available)
@@ -1399,6 +1331,7 @@ class JakeyBot(commands.Bot):
                 logger.debug(
                     f"Ignoring drop worth ${drop_value:.2f} (threshold: ${AIRDROP_IGNORE_DROPS_UNDER:.2f})"
                 )
+                trace.finish("skipped", "value")
                 return
 
         # Apply delay logic - optimized for ultra-fast airdrops
@@ -1418,6 +1351,7 @@ class JakeyBot(commands.Bot):
         if delay > 0:
             logger.debug(f"Fast airdrop delay: {round(delay, 3)}s")
             await asyncio.sleep(delay)
+        trace.mark("delay")
 
         try:
             # Airdrop - Optimized for 1-10s window
@@ -1431,10 +1365,12 @@ class JakeyBot(commands.Bot):
                             # Skip most validations for speed - only check if button is disabled
                             if getattr(button, 'disabled', False):
                                 logger.debug("Airdrop button disabled - drop closed")
+                                trace.finish("failed", "closed")
                                 break
                             
                             # Fast click with minimal timeout
                             await asyncio.wait_for(button.click(), timeout=2.0)
+                            trace.finish("entered")
                             
                             logger.info(f"Entered airdrop in {original_message.channel.name}")
                             break  # Success
@@ -1465,33 +1401,42 @@ class JakeyBot(commands.Bot):
                             logger.debug(f"Airdrop unexpected error: {e}")
                             break
 
+                    trace.mark("submit")
+                    trace.finish("failed", "click")
+
 # Phrase drop
             elif (
                 "phrase drop" in embed.title.lower() and not AIRDROP_DISABLE_PHRASEDROP
             ):
                 phrase = clean_phrase_comprehensive(embed.description)
+                trace.mark("answer")
                 if phrase:
                     async with original_message.channel.typing():
                         await asyncio.sleep(self.typing_delay(phrase))
+                    trace.mark("typing")
                     await original_message.channel.send(phrase)
+                    trace.mark("submit")
+                    trace.finish("entered")
                     logger.info(f"Entered phrase drop in {original_message.channel.name}")
                 else:
                     logger.warning(f"Failed to extract phrase from embed: {embed.description}")
+                    trace.finish("no_answer")
 
             # Math drop
             elif "math" in embed.title.lower() and not AIRDROP_DISABLE_MATHDROP:
                 expr = embed.description.split("`")[1].strip()
                 answer = self.safe_eval_math(expr)
+                trace.mark("answer")
                 if answer is not None:
-                    answer = (
-                        int(answer)
-                        if isinstance(answer, float) and answer.is_integer()
-                        else answer
-                    )
                     async with original_message.channel.typing():
-                        await asyncio.sleep(self.typing_delay(str(answer)))
-                    await original_message.channel.send(str(answer))
+                        await asyncio.sleep(self.typing_delay(answer))
+                    trace.mark("typing")
+                    await original_message.channel.send(answer)
+                    trace.mark("submit")
+                    trace.finish("entered")
                     logger.info(f"Entered math drop in {original_message.channel.name}")
+                else:
+                    trace.finish("no_answer")
 
             # Trivia drop
             elif "trivia" in embed.title.lower() and not AIRDROP_DISABLE_TRIVIADROP:
@@ -1501,6 +1446,7 @@ class JakeyBot(commands.Bot):
                 # VALIDATE category input to prevent directory traversal and injection attacks
                 if not self._validate_trivia_category(category):
                     logger.warning(f"Invalid trivia category detected: {category}")
+                    trace.finish("skipped", "category")
                     return
 
                 # Use new trivia manager with database and caching
@@ -1521,6 +1467,7 @@ class JakeyBot(commands.Bot):
                     except Exception as e:
                         logger.error(f"Error during trivia lookup: {e}")
                         answer = None
+                    trace.mark("answer")
 
                     if answer and tip_cc_message.components:
                         for button in tip_cc_message.components[0].children:
@@ -1531,6 +1478,8 @@ class JakeyBot(commands.Bot):
                                         await asyncio.wait_for(
                                             button.click(), timeout=10.0
                                         )
+                                        trace.mark("submit")
+                                        trace.finish("entered")
                                         # Record successful trivia completion for learning with timeout
                                         try:
                                             await asyncio.wait_for(
@@ -1597,6 +1546,7 @@ class JakeyBot(commands.Bot):
                                         logger.error(
                                             f"HTTP error clicking trivia button: {e}"
                                         )
+                                        trace.finish("failed", "http")
                                         return  # Don't retry on HTTP errors
                                     except discord.ClientException as e:
                                         logger.warning(
@@ -1612,6 +1562,7 @@ class JakeyBot(commands.Bot):
                                         logger.error(
                                             f"Unexpected error clicking trivia button: {e}"
                                         )
+                                        trace.finish("failed", "click")
                                         return  # Don't retry on unexpected errors
 
                     # No answer found - try random button as fallback if enabled
@@ -1623,9 +1574,12 @@ class JakeyBot(commands.Bot):
                         logger.info(
                             f"No answer found for trivia question, trying random button in {original_message.channel.name}"
                         )
-                        await self._try_random_trivia_button(
+                        if await self._try_random_trivia_button(
                             tip_cc_message, original_message, category, question
-                        )
+                        ):
+                            trace.mark("submit")
+                            trace.finish("guessed")
+                    trace.finish("failed" if answer else "no_answer")
 
                 except ImportError:
                     # Fallback to original method if trivia manager not available
@@ -1658,6 +1612,8 @@ class JakeyBot(commands.Bot):
                                                                 button.click(),
                                                                 timeout=10.0,
                                                             )
+                                                            trace.mark("submit")
+                                                            trace.finish("entered")
                                                             # Record successful trivia completion for learning (fallback method)
                                                             try:
                                                                 from utils.trivia_manager import (
@@ -1727,9 +1683,12 @@ class JakeyBot(commands.Bot):
                                 logger.info(
                                     f"Fallback method also failed, trying random button in {original_message.channel.name}"
                                 )
-                                await self._try_random_trivia_button(
+                                if await self._try_random_trivia_button(
                                     tip_cc_message, original_message, category, question
-                                )
+                                ):
+                                    trace.mark("submit")
+                                    trace.finish("guessed")
+                    trace.finish("no_answer")
 
             # Redpacket
             elif "appeared" in embed.title.lower() and not AIRDROP_DISABLE_REDPACKET:
@@ -1740,6 +1699,7 @@ class JakeyBot(commands.Bot):
                         for attempt in range(3):  # Retry up to 3 times
                             try:
                                 await asyncio.wait_for(button.click(), timeout=10.0)
+                                trace.finish("entered")
                                 logger.info(
                                     f"Claimed redpacket in {original_message.channel.name}"
                                 )
@@ -1770,9 +1730,12 @@ class JakeyBot(commands.Bot):
                                     f"Unexpected error clicking redpacket button: {e}"
                                 )
                                 break  # Don't retry on unexpected errors
+                        trace.mark("submit")
+                        trace.finish("failed", "click")
 
         except (IndexError, AttributeError, discord.HTTPException, discord.NotFound):
             logger.debug("Something went wrong while handling drop.")
+            trace.finish("failed", "error")
             return
 
     def typing_delay(self, text: str) -> float:
@@ -1811,7 +1774,7 @@ class JakeyBot(commands.Bot):
     async def _try_random_trivia_button(
         self, tip_cc_message, original_message, category: str, question: str
     ):
-        """Try a random trivia button when no answer is known"""
+        """Try a random trivia button when no answer is known, returning whether it was clicked"""
         try:
             import random
 
@@ -1820,7 +1783,7 @@ class JakeyBot(commands.Bot):
                 or not tip_cc_message.components[0].children
             ):
                 logger.warning("No buttons available for random trivia selection")
-                return
+                return False
 
             # Get all available buttons
             buttons = list(tip_cc_message.components[0].children)
@@ -1854,7 +1817,7 @@ class JakeyBot(commands.Bot):
                     logger.info(
                         f"Entered random trivia answer in {original_message.channel.name} (guess)"
                     )
-                    return  # Success, exit function
+                    return True  # Success, exit function
 
                 except asyncio.TimeoutError:
                     logger.warning(
@@ -1865,7 +1828,7 @@ class JakeyBot(commands.Bot):
 
                 except discord.HTTPException as e:
                     logger.error(f"HTTP error clicking random trivia button: {e}")
-                    return  # Don't retry on HTTP errors
+                    return False  # Don't retry on HTTP errors
 
                 except discord.ClientException as e:
                     logger.warning(
@@ -1876,53 +1839,15 @@ class JakeyBot(commands.Bot):
 
                 except Exception as e:
                     logger.error(f"Unexpected error clicking random trivia button: {e}")
-                    return  # Don't retry on unexpected errors
+                    return False  # Don't retry on unexpected errors
 
         except Exception as e:
             logger.error(f"Error in random trivia button selection: {e}")
+        return False
 
-    def safe_eval_math(self, expr: str):
-        """Safely evaluate basic math expressions using AST-based evaluation."""
-        import ast
-        import operator
-
-        # Validate input characters first
-        if not re.match(r"^[\d\.\+\-\*/%\(\)\s]+$", expr):
-            return None
-
-        # Supported operators for AST evaluation
-        operators = {
-            ast.Add: operator.add,
-            ast.Sub: operator.sub,
-            ast.Mult: operator.mul,
-            ast.Div: operator.truediv,
-            ast.USub: operator.neg,
-            ast.UAdd: operator.pos,
-            ast.Pow: operator.pow,
-            ast.Mod: operator.mod,
-        }
-
-        def eval_expr(node):
-            """Recursively evaluate AST nodes."""
-            if isinstance(node, ast.Num):  # <number>
-                return node.n
-            elif isinstance(node, ast.Constant):  # <number> (Python 3.8+)
-                return node.value
-            elif isinstance(node, ast.BinOp):  # <left> <operator> <right>
-                left = eval_expr(node.left)
-                right = eval_expr(node.right)
-                return operators[type(node.op)](left, right)
-            elif isinstance(node, ast.UnaryOp):  # <operator> <operand> e.g., -1
-                operand = eval_expr(node.operand)
-                return operators[type(node.op)](operand)
-            else:
-                raise TypeError(f"Unsupported node type: {type(node)}")
-
-        try:
-            tree = ast.parse(expr, mode="eval")
-            return eval_expr(tree.body)
-        except (SyntaxError, TypeError, ValueError, ZeroDivisionError):
-            return None
+    def safe_eval_math(self, expr: str) -> Optional[str]:
+        """Answer to a math drop expression as tip.cc expects it typed, or None."""
+        return math_evaluator.solve(expr)
 
     async def maybe_delay(self, drop_ends_in: float):
         """Handle smart/range/manual delay before acting."""
@@ -195,6 +195,25 @@ def is_admin_with_role_check(ctx):
         return is_admin(ctx.author.id)
 
 
+def format_loop_lag(stats: dict) -> str:
+    """Format event loop lag stats for the stats/aistatus commands"""
+    lag = stats["lag"]
+    if not lag["samples"]:
+        return "🐢 **Loop Lag:** no samples yet\n"
+
+    text = (
+        f"🐢 **Loop Lag:** p50 {lag['p50'] * 1000:.0f}ms / p95 {lag['p95'] * 1000:.0f}ms"
+        f" / p99 {lag['p99'] * 1000:.0f}ms / max {lag['max'] * 1000:.0f}ms"
+        f" ({lag['samples']} samples)\n"
+    )
+    slow = stats["slow_callbacks"]
+    if slow["tracing"]:
+        text += f"  • Blocked >{slow['threshold']:g}s: {slow['count']} times\n"
+        for event in slow["recent"][-3:]:
+            text += f"  • {event['duration']:.2f}s in `{event['culprit']}`\n"
+    return text
+
+
 def setup_commands(bot):
     """Register all commands with the bot instance - Complete AGENTS.md Compliance"""
 
@@ -424,6 +443,41 @@ def setup_commands(bot):
             response += f"🧠 **Memories:** {memory_count}\n"
             response += f"🏰 **Servers:** {len(bot.guilds)}\n"
 
+            # Tool result cache metrics
+            from tools.tool_manager import tool_manager
+
+            cache_stats = tool_manager.result_cache.get_stats()
+            response += (
+                f"🗃️ **Tool Cache:** {cache_stats['hits']} hits / "
+                f"{cache_stats['misses']} misses / {cache_stats['coalesced']} coalesced "
+                f"({cache_stats['hit_rate']:.0%} hit rate, {cache_stats['entries']} cached)\n"
+            )
+            for tool_name, counts in cache_stats["tools"].items():
+                response += (
+                    f"  • {tool_name}: {counts['hits']} hits / {counts['misses']} misses"
+                    f" / {counts['coalesced']} coalesced\n"
+                )
+
+            # Wall time of tool calls made by the AI, slowest first
+            execution_stats = tool_manager.get_execution_stats()
+            if execution_stats:
+                response += "⏲️ **Tool Times (avg / max):**\n"
+                for tool_name, timing in sorted(
+                    execution_stats.items(), key=lambda item: item[1]["avg_time"], reverse=True
+                ):
+                    response += (
+                        f"  • {tool_name}: {timing['avg_time']:.2f}s / {timing['max_time']:.2f}s"
+                        f" over {timing['samples']} calls"
+                    )
+                    if timing["timeouts"]:
+                        response += f", {timing['timeouts']} timed out"
+                    response += "\n"
+
+            # Event loop lag
+            from utils.loop_monitor import loop_monitor
+
+            response += format_loop_lag(loop_monitor.get_stats())
+
             await ctx.send(response)
         except Exception as e:
             await ctx.send(f"💀 **Failed to get stats:** {str(e)}")
@@ -1024,6 +1078,19 @@ def setup_commands(bot):
                     "\n⚠️ **Warning**: Could not fetch model list from any provider\n"
                 )
 
+            # Request routing stats (only once the bot has generated a reply)
+            if hasattr(bot, "_ai_manager"):
+                ai_stats = bot._ai_manager.get_statistics()
+                hedging = ai_stats["hedging"]
+                response += f"\n📈 **Requests**: {ai_stats['total_requests']} ({ai_stats['success_rate']:.0%} success, {ai_stats['failover_count']} failovers)\n"
+                if hedging["enabled"]:
+                    response += f"🏁 **Hedging**: {hedging['hedges_launched']}/{hedging['hedged_requests']} hedged, fallback won {hedging['hedge_wins']}\n"
+
+            # Event loop stalls delay every provider call, show them here too
+            from utils.loop_monitor import loop_monitor
+
+            response += "\n" + format_loop_lag(loop_monitor.get_stats())
+
             await ctx.send(response)
 
         except Exception as e:
@@ -2516,6 +2583,46 @@ def setup_commands(bot):
         response += f"• Ignore time under: {AIRDROP_IGNORE_TIME_UNDER:.1f}s\n"
         response += f"• Ignored users: {AIRDROP_IGNORE_USERS if AIRDROP_IGNORE_USERS else 'None'}\n"
 
+        # Show how quickly tip.cc answers triggers
+        correlator = getattr(bot, "airdrop_correlator", None)
+        if correlator is not None:
+            stats = correlator.get_stats()
+            latency = stats["latency"]
+            response += "\n**tip.cc Response:**\n"
+            response += f"• Matched: {stats['resolved']} ({stats['early_embeds']} before registration)\n"
+            response += f"• Timeouts: {stats['timeouts']}, expired: {stats['expired']}, unmatched embeds: {stats['unmatched_embeds']}\n"
+            if latency["samples"]:
+                response += (
+                    f"• Trigger→embed: p50 {latency['p50'] * 1000:.0f}ms, "
+                    f"p95 {latency['p95'] * 1000:.0f}ms, max {latency['max'] * 1000:.0f}ms\n"
+                )
+
+        # Show where time goes in recent drops and how they ended
+        metrics = getattr(bot, "airdrop_metrics", None)
+        if metrics is not None:
+            summary = await metrics.get_summary()
+            if summary["drops"]:
+                response += f"\n**Recent Drops ({summary['drops']}):**\n"
+                response += f"• Entered: {summary['entered']}, missed: {summary['missed']}\n"
+                for drop_type, outcomes in sorted(summary["by_type"].items()):
+                    counts = ", ".join(
+                        f"{outcome} {count}" for outcome, count in sorted(outcomes.items())
+                    )
+                    response += f"• {drop_type}: {counts}\n"
+                response += "**Stage Latency (p50 / p95 / max):**\n"
+                for stage, histogram in summary["stages"].items():
+                    if histogram["samples"]:
+                        response += (
+                            f"• {stage}: {histogram['p50'] * 1000:.0f}ms / "
+                            f"{histogram['p95'] * 1000:.0f}ms / {histogram['max'] * 1000:.0f}ms "
+                            f"({histogram['samples']} drops)\n"
+                        )
+                total = summary["total"]
+                response += (
+                    f"• total: {total['p50'] * 1000:.0f}ms / "
+                    f"{total['p95'] * 1000:.0f}ms / {total['max'] * 1000:.0f}ms\n"
+                )
+
         # Send long message without truncation
         await send_long_message(ctx.channel, response)
 
@@ -2789,6 +2896,14 @@ def setup_commands(bot):
             for cat in top_categories[:5]:
                 stats_message += f"• {cat['name']}: {cat['count']} questions\n"
 
+            last_sync = overview.get("last_sync")
+            if last_sync:
+                stats_message += (
+                    f"\n🔄 **Last Sync:** {last_sync['updated']} updated, "
+                    f"{last_sync['not_modified']} unchanged, "
+                    f"{last_sync['missing'] + last_sync['failed']} unavailable\n"
+                )
+
             await ctx.send(stats_message)
 
         except Exception as e:
@@ -62,14 +62,75 @@ AIRDROP_DISABLE_PHRASEDROP = (
 AIRDROP_DISABLE_REDPACKET = (
     os.getenv("AIRDROP_DISABLE_REDPACKET", "false").lower() == "true"
 )
+AIRDROP_RESPONSE_TIMEOUT = float(
+    os.getenv("AIRDROP_RESPONSE_TIMEOUT") or "8"
+)  # Seconds a drop trigger waits for tip.cc's embed
+
+# Math Evaluator Configuration (math drops and the calculate tool)
+MATH_EVAL_CACHE_SIZE = int(
+    os.getenv("MATH_EVAL_CACHE_SIZE", "512")
+)  # recent expressions whose results are kept
+MATH_EVAL_MAX_LENGTH = int(
+    os.getenv("MATH_EVAL_MAX_LENGTH", "256")
+)  # longest expression evaluated, in characters
+MATH_EVAL_MAX_DIGITS = int(
+    os.getenv("MATH_EVAL_MAX_DIGITS", "1000")
+)  # powers with larger results are refused before being computed
 
 # Database Configuration
 DATABASE_PATH = os.getenv("DATABASE_PATH", "data/jakey.db")
+DATABASE_BUSY_TIMEOUT = float(
+    os.getenv("DATABASE_BUSY_TIMEOUT", "5.0")
+)  # seconds to wait on a locked database before failing
+DATABASE_CACHE_SIZE_KB = int(
+    os.getenv("DATABASE_CACHE_SIZE_KB", "16384")
+)  # SQLite page cache per pooled connection
+DATABASE_MMAP_SIZE = int(
+    os.getenv("DATABASE_MMAP_SIZE", str(64 * 1024 * 1024))
+)  # bytes of the database file to memory-map (0 disables)
+DATABASE_STATEMENT_CACHE_SIZE = int(
+    os.getenv("DATABASE_STATEMENT_CACHE_SIZE", "256")
+)  # prepared statements kept per pooled connection
+DATABASE_WRITE_BEHIND_ENABLED = (
+    os.getenv("DATABASE_WRITE_BEHIND_ENABLED", "true").lower() == "true"
+)  # buffer async conversation/memory writes and commit them in batches
+DATABASE_WRITE_BEHIND_MAX_LATENCY = float(
+    os.getenv("DATABASE_WRITE_BEHIND_MAX_LATENCY", "2.0")
+)  # seconds a buffered write may wait before it's committed
+DATABASE_WRITE_BEHIND_MAX_BATCH = int(
+    os.getenv("DATABASE_WRITE_BEHIND_MAX_BATCH", "100")
+)  # buffered writes that trigger an immediate flush
+CONVERSATION_CACHE_USERS = int(
+    os.getenv("CONVERSATION_CACHE_USERS", "1000")
+)  # users whose recent conversations are kept in memory (0 disables)
+CONVERSATION_CACHE_DEPTH = int(
+    os.getenv("CONVERSATION_CACHE_DEPTH", "10")
+)  # most recent conversations kept per cached user
 
 # MCP Memory Server Configuration
 MCP_MEMORY_ENABLED = os.getenv("MCP_MEMORY_ENABLED", "false").lower() == "true"
 # Server URL is determined dynamically at runtime
 MCP_MEMORY_SERVER_URL = None  # Will be set by client based on port file
+MCP_HTTP_TIMEOUT = float(
+    os.getenv("MCP_HTTP_TIMEOUT", "5")
+)  # seconds per MCP memory request
+MCP_HTTP_POOL_LIMIT_PER_HOST = int(
+    os.getenv("MCP_HTTP_POOL_LIMIT_PER_HOST", "10")
+)  # pooled keep-alive connections to the MCP memory server
+MCP_CIRCUIT_FAILURE_THRESHOLD = int(
+    os.getenv("MCP_CIRCUIT_FAILURE_THRESHOLD", "3")
+)  # consecutive connection failures before requests fail fast
+MCP_CIRCUIT_RESET_TIMEOUT = float(
+    os.getenv("MCP_CIRCUIT_RESET_TIMEOUT", "30")
+)  # seconds before a trial request is let through again
+
+# Unified Memory Backend Routing
+MEMORY_READ_MODE = os.getenv(
+    "MEMORY_READ_MODE", "first"
+).lower()  # "first": first healthy backend with a result wins, "priority": wait for all and prefer priority
+MEMORY_ASYNC_REPLICATION = (
+    os.getenv("MEMORY_ASYNC_REPLICATION", "true").lower() == "true"
+)  # writes return once the primary backend acks, the others are updated in the background
 
 # Automatic Memory Extraction Configuration
 AUTO_MEMORY_EXTRACTION_ENABLED = (
@@ -106,6 +167,97 @@ OPENROUTER_HEALTH_TIMEOUT = int(
     os.getenv("OPENROUTER_HEALTH_TIMEOUT") or "10"
 )  # seconds
 
+# Shared HTTP connection pool for AI providers
+AI_HTTP_POOL_LIMIT = int(
+    os.getenv("AI_HTTP_POOL_LIMIT", "20")
+)  # maximum open connections per provider
+AI_HTTP_POOL_LIMIT_PER_HOST = int(
+    os.getenv("AI_HTTP_POOL_LIMIT_PER_HOST", "10")
+)  # maximum open connections per provider host
+AI_HTTP_DNS_CACHE_TTL = int(
+    os.getenv("AI_HTTP_DNS_CACHE_TTL", "300")
+)  # seconds to cache DNS lookups
+AI_HTTP_KEEPALIVE_TIMEOUT = float(
+    os.getenv("AI_HTTP_KEEPALIVE_TIMEOUT", "60")
+)  # seconds to keep idle connections open
+
+# Hedged AI Requests
+AI_HEDGING_ENABLED = (
+    os.getenv("AI_HEDGING_ENABLED", "false").lower() == "true"
+)  # Launch the fallback provider if the primary is slower than usual
+AI_HEDGE_DELAY = float(
+    os.getenv("AI_HEDGE_DELAY", "4.0")
+)  # seconds to wait before hedging until enough latency samples exist
+AI_HEDGE_PERCENTILE = float(
+    os.getenv("AI_HEDGE_PERCENTILE", "95")
+)  # latency percentile of the primary provider used as the hedge delay
+AI_HEDGE_MIN_SAMPLES = int(
+    os.getenv("AI_HEDGE_MIN_SAMPLES", "20")
+)  # successful requests needed before using the percentile
+AI_HEDGE_DELAY_MIN = float(
+    os.getenv("AI_HEDGE_DELAY_MIN", "1.0")
+)  # lower bound for the percentile-based hedge delay
+AI_HEDGE_DELAY_MAX = float(
+    os.getenv("AI_HEDGE_DELAY_MAX", "15.0")
+)  # upper bound for the percentile-based hedge delay
+
+# Streaming responses (progressive Discord message edits)
+AI_STREAMING_ENABLED = (
+    os.getenv("AI_STREAMING_ENABLED", "false").lower() == "true"
+)
+AI_STREAM_EDIT_INTERVAL = float(
+    os.getenv("AI_STREAM_EDIT_INTERVAL", "1.2")
+)  # minimum seconds between message edits (Discord allows ~5 edits per 5s)
+AI_STREAM_MIN_FIRST_CHUNK = int(
+    os.getenv("AI_STREAM_MIN_FIRST_CHUNK", "20")
+)  # characters to buffer before the first message is sent
+
+# Tool Execution Configuration
+TOOL_MAX_CONCURRENCY = int(
+    os.getenv("TOOL_MAX_CONCURRENCY", "4")
+)  # tool calls run in parallel within one AI turn
+TOOL_CALL_TIMEOUT = float(
+    os.getenv("TOOL_CALL_TIMEOUT", "20")
+)  # seconds before a single tool call is abandoned
+TOOL_LOOP_MAX_ROUNDS = int(
+    os.getenv("TOOL_LOOP_MAX_ROUNDS", "3")
+)  # rounds of tool calls the model may chain before it must answer
+TOOL_LOOP_TOKEN_BUDGET = int(
+    os.getenv("TOOL_LOOP_TOKEN_BUDGET", "12000")
+)  # total tokens per turn after which no more tool rounds are allowed
+TOOL_LOOP_TIME_BUDGET = float(
+    os.getenv("TOOL_LOOP_TIME_BUDGET", "45")
+)  # seconds per turn after which no more tool rounds are allowed
+TOOL_IO_POOL_SIZE = int(
+    os.getenv("TOOL_IO_POOL_SIZE", "8")
+)  # threads for blocking I/O tools (kept apart from the default executor)
+TOOL_CPU_POOL_SIZE = int(
+    os.getenv("TOOL_CPU_POOL_SIZE", "2")
+)  # threads for CPU-bound tools
+
+# Tool Result Cache (TTL in seconds, 0 disables caching for that tool)
+TOOL_CACHE_ENABLED = os.getenv("TOOL_CACHE_ENABLED", "true").lower() == "true"
+TOOL_CACHE_MAX_ENTRIES = int(os.getenv("TOOL_CACHE_MAX_ENTRIES", "1000"))
+TOOL_CACHE_TTL_CRYPTO_PRICE = float(os.getenv("TOOL_CACHE_TTL_CRYPTO_PRICE", "30"))
+TOOL_CACHE_TTL_STOCK_PRICE = float(os.getenv("TOOL_CACHE_TTL_STOCK_PRICE", "60"))
+TOOL_CACHE_TTL_WEB_SEARCH = float(os.getenv("TOOL_CACHE_TTL_WEB_SEARCH", "600"))
+TOOL_CACHE_TTL_COMPANY_RESEARCH = float(
+    os.getenv("TOOL_CACHE_TTL_COMPANY_RESEARCH", "1800")
+)
+TOOL_CACHE_TTL_CRAWLING = float(os.getenv("TOOL_CACHE_TTL_CRAWLING", "3600"))
+
+# Event Loop Monitoring
+LOOP_MONITOR_ENABLED = os.getenv("LOOP_MONITOR_ENABLED", "true").lower() == "true"
+LOOP_MONITOR_INTERVAL = float(
+    os.getenv("LOOP_MONITOR_INTERVAL", "0.5")
+)  # seconds between loop lag samples
+SLOW_CALLBACK_TRACING_ENABLED = (
+    os.getenv("SLOW_CALLBACK_TRACING_ENABLED", "false").lower() == "true"
+)  # log the stack of whatever blocks the loop longer than the threshold
+SLOW_CALLBACK_THRESHOLD = float(
+    os.getenv("SLOW_CALLBACK_THRESHOLD", "0.25")
+)  # seconds the loop may be blocked before it's reported
+
 # Timeout Performance Monitoring
 TIMEOUT_MONITORING_ENABLED = (
     os.getenv("TIMEOUT_MONITORING_ENABLED", "true").lower() == "true"
@@ -289,6 +441,21 @@ ARTA_API_KEY = os.getenv("ARTA_API_KEY")
 TRIVIA_RANDOM_FALLBACK = (
     os.getenv("TRIVIA_RANDOM_FALLBACK", "true").lower() == "true"
 )  # Enable random answer guess when no answer found
+TRIVIA_FUZZY_MATCH_THRESHOLD = float(
+    os.getenv("TRIVIA_FUZZY_MATCH_THRESHOLD") or "0.92"
+)  # Minimum trigram similarity for a fuzzy question match; one-word differences score ~0.9
+TRIVIA_SYNC_ENABLED = (
+    os.getenv("TRIVIA_SYNC_ENABLED", "true").lower() == "true"
+)  # Keep every category synced from the external CSV source in the background
+TRIVIA_SYNC_INTERVAL = int(
+    os.getenv("TRIVIA_SYNC_INTERVAL") or "21600"
+)  # Seconds between conditional (ETag/If-Modified-Since) refreshes
+TRIVIA_SYNC_RETRY_INTERVAL = int(
+    os.getenv("TRIVIA_SYNC_RETRY_INTERVAL") or "300"
+)  # First retry delay for categories that failed or never synced; doubles up to TRIVIA_SYNC_INTERVAL
+TRIVIA_SYNC_CONCURRENCY = int(
+    os.getenv("TRIVIA_SYNC_CONCURRENCY") or "4"
+)  # Category CSVs downloaded at once
 
 # System Prompt
 SYSTEM_PROMPT = """Your name is **Jakey** (or Jake) a Discord chat bot in a degenerate gambling Discord community. Your purpose is to be a conversational member of the community.
@@ -3,18 +3,48 @@ import datetime
 import json
 import logging
 import os
+import re
 import sqlite3
+import threading
 import time
+from collections import OrderedDict, deque
 from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Dict, List, Optional
 
-from config import DATABASE_PATH
+from config import (
+    CONVERSATION_CACHE_DEPTH,
+    CONVERSATION_CACHE_USERS,
+    DATABASE_BUSY_TIMEOUT,
+    DATABASE_CACHE_SIZE_KB,
+    DATABASE_MMAP_SIZE,
+    DATABASE_PATH,
+    DATABASE_STATEMENT_CACHE_SIZE,
+    DATABASE_WRITE_BEHIND_ENABLED,
+    DATABASE_WRITE_BEHIND_MAX_BATCH,
+    DATABASE_WRITE_BEHIND_MAX_LATENCY,
+)
 
 # Configure logging with colored output
 from utils.logging_config import get_logger
 
 logger = get_logger(__name__)
 
+# Columns of an airdrop_drops record, as produced by utils.airdrop_metrics
+AIRDROP_DROP_COLUMNS = (
+    "drop_type",
+    "channel_id",
+    "guild_id",
+    "trigger_id",
+    "outcome",
+    "detail",
+    "embed_ms",
+    "delay_ms",
+    "answer_ms",
+    "typing_ms",
+    "submit_ms",
+    "total_ms",
+)
+
 
 class DatabaseManager:
     def __init__(self):
@@ -27,11 +57,244 @@ class DatabaseManager:
         self._executor = ThreadPoolExecutor(
             max_workers=4, thread_name_prefix="db-worker"
         )
+        # Per-thread connection pool (one long-lived connection per worker)
+        self._local = threading.local()
+        self._pool_lock = threading.Lock()
+        self._connections: List[sqlite3.Connection] = []
+        self._pool_generation = 0
+        # Compiled keyword trigger pattern, rebuilt when the keywords table changes
+        self._keyword_pattern: Optional[re.Pattern] = None
+        # Objects notified when pending reminders are added or removed
+        self._reminder_listeners: List[Any] = []
+        # Write-behind buffer for async conversation inserts and memory upserts
+        self.write_behind_enabled = DATABASE_WRITE_BEHIND_ENABLED
+        self.write_behind_max_latency = DATABASE_WRITE_BEHIND_MAX_LATENCY
+        self.write_behind_max_batch = DATABASE_WRITE_BEHIND_MAX_BATCH
+        self._pending_lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._pending_conversations: List[tuple] = []
+        self._pending_memories: Dict[tuple, str] = {}  # (user_id, key) -> value
+        self._flush_timer: Optional[asyncio.TimerHandle] = None
+        self._flush_timer_loop: Optional[asyncio.AbstractEventLoop] = None
+        # Hot cache of each user's most recent conversations (newest last),
+        # LRU over users. A cached deque always holds the user's newest rows.
+        self.conversation_cache_users = CONVERSATION_CACHE_USERS
+        self.conversation_cache_depth = CONVERSATION_CACHE_DEPTH
+        self._conversation_cache: "OrderedDict[str, deque]" = OrderedDict()
+        self._conversation_cache_lock = threading.Lock()
+        # Bumped on every conversation write so stale loads aren't cached
+        self._conversation_cache_version = 0
         self.init_database()
+        self._rebuild_keyword_index()
+
+    def _get_connection(self) -> sqlite3.Connection:
+        """Get the calling thread's pooled connection, opening it on first use.
+
+        Connections stay open for the lifetime of the manager so WAL mode,
+        page cache and sqlite3's prepared statement cache are reused across
+        calls instead of being rebuilt for every query.
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is not None and self._local.generation == self._pool_generation:
+            if conn.in_transaction:
+                # A previous call on this thread failed before committing
+                conn.rollback()
+            return conn
+
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=DATABASE_BUSY_TIMEOUT,
+            check_same_thread=False,
+            cached_statements=DATABASE_STATEMENT_CACHE_SIZE,
+        )
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute(f"PRAGMA cache_size=-{int(DATABASE_CACHE_SIZE_KB)}")
+        conn.execute(f"PRAGMA mmap_size={int(DATABASE_MMAP_SIZE)}")
+
+        with self._pool_lock:
+            self._connections.append(conn)
+        self._local.conn = conn
+        self._local.generation = self._pool_generation
+        return conn
+
+    def _close_connections(self):
+        """Close every pooled connection; threads reconnect lazily afterwards"""
+        with self._pool_lock:
+            connections, self._connections = self._connections, []
+            self._pool_generation += 1
+        for conn in connections:
+            try:
+                conn.close()
+            except sqlite3.Error as e:
+                logger.warning(f"Error closing database connection: {e}")
+
+    def _pending_write_count(self) -> int:
+        return len(self._pending_conversations) + len(self._pending_memories)
+
+    def _flush_pending_writes(self):
+        """Commit all buffered writes in one transaction.
+
+        Called before every read or delete of conversations and memories so
+        buffered writes are always visible to the caller that made them.
+        """
+        with self._flush_lock:
+            with self._pending_lock:
+                conversations, self._pending_conversations = (
+                    self._pending_conversations,
+                    [],
+                )
+                memories, self._pending_memories = self._pending_memories, {}
+            if not conversations and not memories:
+                return
+
+            memory_rows = [(user_id, key, value) for (user_id, key), value in memories.items()]
+            try:
+                conn = self._get_connection()
+                with conn:
+                    if conversations:
+                        conn.executemany(
+                            """
+                            INSERT INTO conversations (user_id, channel_id, message_history, created_at)
+                            VALUES (?, ?, ?, ?)
+                        """,
+                            conversations,
+                        )
+                    if memory_rows:
+                        conn.executemany(
+                            """
+                            UPDATE memories SET value = ?, updated_at = CURRENT_TIMESTAMP
+                            WHERE user_id = ? AND key = ?
+                        """,
+                            [(value, user_id, key) for user_id, key, value in memory_rows],
+                        )
+                        conn.executemany(
+                            """
+                            INSERT INTO memories (user_id, key, value)
+                            SELECT ?, ?, ?
+                            WHERE NOT EXISTS (SELECT 1 FROM memories WHERE user_id = ? AND key = ?)
+                        """,
+                            [
+                                (user_id, key, value, user_id, key)
+                                for user_id, key, value in memory_rows
+                            ],
+                        )
+            except sqlite3.Error as e:
+                # Put the writes back so the next flush retries them
+                logger.error(
+                    f"Error flushing {len(conversations) + len(memory_rows)} buffered writes: {e}"
+                )
+                with self._pending_lock:
+                    self._pending_conversations[:0] = conversations
+                    for memory_key, value in memories.items():
+                        self._pending_memories.setdefault(memory_key, value)
+                # Retry within the latency bound rather than on the next write
+                loop = self._flush_timer_loop
+                if loop is not None:
+                    try:
+                        loop.call_soon_threadsafe(self._arm_flush_timer, loop)
+                    except RuntimeError:
+                        # Loop already closed, close() flushes the remaining writes
+                        pass
+                return
+
+            logger.debug(
+                f"Flushed {len(conversations)} conversations and {len(memory_rows)} memories"
+            )
+
+    async def _buffer_write(self):
+        """Make sure buffered writes are flushed within the latency bound"""
+        loop = asyncio.get_running_loop()
+        if self._pending_write_count() >= self.write_behind_max_batch:
+            await loop.run_in_executor(self._executor, self._flush_pending_writes)
+            return
+
+        self._arm_flush_timer(loop)
+
+    def _arm_flush_timer(self, loop: asyncio.AbstractEventLoop):
+        """Schedule a flush on the loop unless one is already scheduled there"""
+        if self._flush_timer is None or self._flush_timer_loop is not loop:
+            self._flush_timer_loop = loop
+            self._flush_timer = loop.call_later(
+                self.write_behind_max_latency, self._on_flush_timer, loop
+            )
+
+    def _on_flush_timer(self, loop: asyncio.AbstractEventLoop):
+        self._flush_timer = None
+        try:
+            loop.run_in_executor(self._executor, self._flush_pending_writes)
+        except RuntimeError:
+            # Executor already shut down, close() flushes the remaining writes
+            pass
+
+    async def aflush_writes(self):
+        """Commit all buffered writes now (call before shutdown)"""
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+        loop = asyncio.get_event_loop()
+        await loop.run_in_executor(self._executor, self._flush_pending_writes)
+
+    def _cached_conversations(self, user_id: str, limit: int) -> Optional[List[Dict]]:
+        """Newest-first conversations from the hot cache, or None on a miss"""
+        if limit > self.conversation_cache_depth:
+            return None
+        with self._conversation_cache_lock:
+            entries = self._conversation_cache.get(user_id)
+            if entries is None:
+                return None
+            self._conversation_cache.move_to_end(user_id)
+            recent = list(entries)[-limit:] if limit > 0 else []
+        return [dict(entry) for entry in reversed(recent)]
+
+    def _cache_conversation(self, user_id: str, entry: Dict[str, Any]):
+        """Append a new conversation to the user's cached ring buffer"""
+        with self._conversation_cache_lock:
+            self._conversation_cache_version += 1
+            entries = self._conversation_cache.get(user_id)
+            if entries is not None:
+                # Without a cached window older rows are unknown, so only
+                # users that are already cached are updated
+                entries.append(entry)
+
+    def _store_conversation_cache(
+        self, user_id: str, rows: List[Dict], version: int
+    ):
+        """Cache rows loaded from SQLite unless a write happened meanwhile"""
+        if self.conversation_cache_users <= 0:
+            return
+        with self._conversation_cache_lock:
+            if version != self._conversation_cache_version:
+                return
+            self._conversation_cache[user_id] = deque(
+                reversed(rows), maxlen=self.conversation_cache_depth
+            )
+            self._conversation_cache.move_to_end(user_id)
+            while len(self._conversation_cache) > self.conversation_cache_users:
+                self._conversation_cache.popitem(last=False)
+
+    def _invalidate_conversation_cache(
+        self, user_id: Optional[str] = None, channel_id: Optional[str] = None
+    ):
+        """Drop cached conversations affected by a delete (all if no filter)"""
+        with self._conversation_cache_lock:
+            self._conversation_cache_version += 1
+            if user_id is not None:
+                self._conversation_cache.pop(user_id, None)
+            elif channel_id is not None:
+                for cached_user in [
+                    cached_user
+                    for cached_user, entries in self._conversation_cache.items()
+                    if any(entry["channel_id"] == channel_id for entry in entries)
+                ]:
+                    del self._conversation_cache[cached_user]
+            else:
+                self._conversation_cache.clear()
 
     def init_database(self):
         """Initialize the database with required tables"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._get_connection()
         cursor = conn.cursor()
 
         # Create users table
@@ -94,6 +357,9 @@ class DatabaseManager:
             "CREATE INDEX IF NOT EXISTS idx_users_username ON users(username)"
         )
 
+        # Full-text index mirroring memories, kept in sync by triggers
+        self.memory_fts_enabled = self._init_memory_fts(cursor)
+
         # Create settings table for bot configuration
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS settings (
@@ -172,6 +438,29 @@ class DatabaseManager:
             )
         """)
 
+        # Create airdrop drops table for per-stage latency metrics
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS airdrop_drops (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                drop_type TEXT NOT NULL,
+                channel_id TEXT,
+                guild_id TEXT,
+                trigger_id TEXT,
+                outcome TEXT NOT NULL,
+                detail TEXT,
+                embed_ms REAL,
+                delay_ms REAL,
+                answer_ms REAL,
+                typing_ms REAL,
+                submit_ms REAL,
+                total_ms REAL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_airdrop_drops_created ON airdrop_drops(created_at)"
+        )
+
         # Add performance indexes for reminders
         cursor.execute(
             "CREATE INDEX IF NOT EXISTS idx_reminders_user_status ON reminders(user_id, status)"
@@ -190,7 +479,48 @@ class DatabaseManager:
             cursor.execute("ALTER TABLE tipcc_transactions ADD COLUMN sender TEXT")
 
         conn.commit()
-        conn.close()
+
+    def _init_memory_fts(self, cursor) -> bool:
+        """Create the memories_fts table and its triggers, backfilling once"""
+        try:
+            cursor.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'memories_fts'"
+            )
+            exists = cursor.fetchone() is not None
+
+            cursor.execute("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS memories_fts USING fts5(
+                    key, value,
+                    content='memories', content_rowid='id',
+                    tokenize='unicode61 remove_diacritics 2'
+                )
+            """)
+            cursor.execute("""
+                CREATE TRIGGER IF NOT EXISTS memories_fts_insert AFTER INSERT ON memories BEGIN
+                    INSERT INTO memories_fts(rowid, key, value) VALUES (new.id, new.key, new.value);
+                END
+            """)
+            cursor.execute("""
+                CREATE TRIGGER IF NOT EXISTS memories_fts_delete AFTER DELETE ON memories BEGIN
+                    INSERT INTO memories_fts(memories_fts, rowid, key, value)
+                    VALUES ('delete', old.id, old.key, old.value);
+                END
+            """)
+            cursor.execute("""
+                CREATE TRIGGER IF NOT EXISTS memories_fts_update AFTER UPDATE OF key, value ON memories BEGIN
+                    INSERT INTO memories_fts(memories_fts, rowid, key, value)
+                    VALUES ('delete', old.id, old.key, old.value);
+                    INSERT INTO memories_fts(rowid, key, value) VALUES (new.id, new.key, new.value);
+                END
+            """)
+
+            if not exists:
+                # Index memories stored before the FTS table existed
+                cursor.execute("INSERT INTO memories_fts(memories_fts) VALUES ('rebuild')")
+            return True
+        except sqlite3.OperationalError as e:
+            logger.warning(f"SQLite FTS5 unavailable, memory search falls back to LIKE: {e}")
+            return False
 
     def _is_cache_valid(self, timestamp):
         """Check if cache entry is still valid"""
@@ -220,7 +550,7 @@ class DatabaseManager:
                 return cached_data
 
         # Fetch from database with parameterized query
-        conn = sqlite3.connect(self.db_path)
+        conn = self._get_connection()
         cursor = conn.cursor()
 
         cursor.execute("SELECT * FROM users WHERE user_id = ?", (user_id.strip(),))
@@ -237,10 +567,8 @@ class DatabaseManager:
             }
             # Update cache
             self.user_cache[user_id] = (user_data, time.time())
-            conn.close()
             return user_data
 
-        conn.close()
         return None
 
     def create_or_update_user(
@@ -251,7 +579,7 @@ class DatabaseManager:
         important_facts: Optional[Dict[str, Any]] = None,
     ):
         """Create or update user data with cache invalidation"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._get_connection()
         cursor = conn.cursor()
 
         cursor.execute(
@@ -268,7 +596,6 @@ class DatabaseManager:
         )
 
         conn.commit()
-        conn.close()
 
         # Invalidate cache
         if user_id in self.user_cache:
@@ -281,53 +608,78 @@ class DatabaseManager:
         channel_id: Optional[str] = None,
     ):
         """Add a conversation entry for a user in a specific channel"""
-        conn = sqlite3.connect(self.db_path)
+        # Keep the order of writes relative to buffered ones
+        self._flush_pending_writes()
+        created_at = datetime.datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S")
+        conn = self._get_connection()
         cursor = conn.cursor()
 
         cursor.execute(
             """
-            INSERT INTO conversations (user_id, channel_id, message_history)
-            VALUES (?, ?, ?)
+            INSERT INTO conversations (user_id, channel_id, message_history, created_at)
+            VALUES (?, ?, ?, ?)
         """,
-            (user_id, channel_id or None, json.dumps(message_history)),
+            (user_id, channel_id or None, json.dumps(message_history), created_at),
         )
 
         conn.commit()
-        conn.close()
+        self._cache_conversation(
+            user_id,
+            {
+                "messages": message_history,
+                "timestamp": created_at,
+                "channel_id": channel_id or None,
+            },
+        )
 
     def get_recent_conversations(self, user_id: str, limit: int = None) -> List[Dict]:
-        """Get recent conversations for a user with optimized query"""
+        """Get recent conversations for a user with optimized query
+
+        Served from the per-user hot cache when possible; on a miss a full
+        cache window is loaded so later calls don't touch SQLite.
+        """
         from config import CONVERSATION_HISTORY_LIMIT
 
         if limit is None:
             limit = CONVERSATION_HISTORY_LIMIT
-        conn = sqlite3.connect(self.db_path)
+        cached = self._cached_conversations(user_id, limit)
+        if cached is not None:
+            return cached
+
+        fetch_limit = max(limit, self.conversation_cache_depth)
+        with self._conversation_cache_lock:
+            version = self._conversation_cache_version
+        self._flush_pending_writes()
+        conn = self._get_connection()
         cursor = conn.cursor()
 
         cursor.execute(
             """
             SELECT message_history, created_at, channel_id FROM conversations
             WHERE user_id = ?
-            ORDER BY created_at DESC
+            ORDER BY created_at DESC, id DESC
             LIMIT ?
         """,
-            (user_id, limit),
+            (user_id, fetch_limit),
         )
 
         rows = cursor.fetchall()
-        conn.close()
 
-        return [{"messages": json.loads(row[0]), "timestamp": row[1], "channel_id": row[2]} for row in rows]
+        conversations = [{"messages": json.loads(row[0]), "timestamp": row[1], "channel_id": row[2]} for row in rows]
+        if fetch_limit == self.conversation_cache_depth:
+            self._store_conversation_cache(user_id, conversations, version)
+        return [dict(entry) for entry in conversations[:limit]]
 
     def get_recent_channel_conversations(
         self, channel_id: str, limit: int = None
     ) -> List[Dict]:
         """Get recent conversations for a channel with optimized query"""
+        self._flush_pending_writes()
         from config import CONVERSATION_HISTORY_LIMIT
 
         if limit is None:
             limit = CONVERSATION_HISTORY_LIMIT
-        conn = sqlite3.connect(self.db_path)
+        conn = self._get_connection()
         cursor = conn.cursor()
 
         cursor.execute(
@@ -341,7 +693,6 @@ class DatabaseManager:
         )
 
         rows = cursor.fetchall()
-        conn.close()
 
         return [{"messages": json.loads(row[0]), "timestamp": row[1]} for row in rows]
 
@@ -349,11 +700,12 @@ class DatabaseManager:
         self, user_id: str, channel_id: str, limit: int = None
     ) -> List[Dict]:
         """Get recent conversations for a user in a specific channel"""
+        self._flush_pending_writes()
         from config import CONVERSATION_HISTORY_LIMIT
 
         if limit is None:
             limit = CONVERSATION_HISTORY_LIMIT
-        conn = sqlite3.connect(self.db_path)
+        conn = self._get_connection()
         cursor = conn.cursor()
 
         cursor.execute(
@@ -367,53 +719,142 @@ class DatabaseManager:
         )
 
         rows = cursor.fetchall()
-        conn.close()
 
         return [{"messages": json.loads(row[0]), "timestamp": row[1]} for row in rows]
 
     def add_memory(self, user_id: str, key: str, value: str):
-        """Add a memory entry for a user"""
-        conn = sqlite3.connect(self.db_path)
+        """Add a memory entry for a user, replacing the value of an existing key"""
+        # Keep the order of writes relative to buffered ones
+        self._flush_pending_writes()
+        conn = self._get_connection()
         cursor = conn.cursor()
 
+        # Same upsert as the write-behind flush, so both paths keep one row per key
         cursor.execute(
             """
-            INSERT INTO memories (user_id, key, value)
-            VALUES (?, ?, ?)
+            UPDATE memories SET value = ?, updated_at = CURRENT_TIMESTAMP
+            WHERE user_id = ? AND key = ?
         """,
-            (user_id, key, value),
+            (value, user_id, key),
         )
+        if cursor.rowcount == 0:
+            cursor.execute(
+                """
+                INSERT INTO memories (user_id, key, value)
+                VALUES (?, ?, ?)
+            """,
+                (user_id, key, value),
+            )
 
         conn.commit()
-        conn.close()
 
     def get_memories(self, user_id: str) -> Dict[str, str]:
         """Get all memories for a user"""
-        conn = sqlite3.connect(self.db_path)
+        self._flush_pending_writes()
+        conn = self._get_connection()
         cursor = conn.cursor()
 
         cursor.execute("SELECT key, value FROM memories WHERE user_id = ?", (user_id,))
         rows = cursor.fetchall()
-        conn.close()
 
         return {row[0]: row[1] for row in rows}
 
     def get_memory(self, user_id: str, key: str) -> Optional[str]:
         """Get a specific memory for a user"""
-        conn = sqlite3.connect(self.db_path)
+        self._flush_pending_writes()
+        conn = self._get_connection()
         cursor = conn.cursor()
 
         cursor.execute(
             "SELECT value FROM memories WHERE user_id = ? AND key = ?", (user_id, key)
         )
         row = cursor.fetchone()
-        conn.close()
 
         return row[0] if row else None
 
+    def get_memory_rows(self, user_id: str, limit: int = None) -> List[Dict[str, Any]]:
+        """Get a user's memories with timestamps, most recently updated first"""
+        self._flush_pending_writes()
+        conn = self._get_connection()
+        cursor = conn.cursor()
+
+        cursor.execute(
+            """
+            SELECT key, value, created_at, updated_at FROM memories
+            WHERE user_id = ?
+            ORDER BY updated_at DESC, id DESC
+            LIMIT ?
+        """,
+            (user_id, -1 if limit is None else limit),
+        )
+        rows = cursor.fetchall()
+
+        return [
+            {"key": row[0], "value": row[1], "created_at": row[2], "updated_at": row[3]}
+            for row in rows
+        ]
+
+    def search_memories(
+        self, user_id: str, terms: List[str], limit: int = 10
+    ) -> List[Dict[str, Any]]:
+        """Search a user's memories for any of the terms, best match first.
+
+        Uses BM25 ranking over the memories_fts index; without FTS5 the terms
+        are matched with LIKE and results are ordered by recency.
+        """
+        if not terms:
+            return []
+
+        self._flush_pending_writes()
+        conn = self._get_connection()
+        cursor = conn.cursor()
+
+        if self.memory_fts_enabled:
+            # Quote every term so user text can't inject FTS query syntax
+            match = " OR ".join(
+                '"{}"{}'.format(term.replace('"', '""'), "*" if len(term) >= 3 else "")
+                for term in terms
+            )
+            cursor.execute(
+                """
+                SELECT m.key, m.value, m.created_at, m.updated_at, bm25(memories_fts) AS rank
+                FROM memories_fts
+                JOIN memories m ON m.id = memories_fts.rowid
+                WHERE memories_fts MATCH ? AND m.user_id = ?
+                ORDER BY rank
+                LIMIT ?
+            """,
+                (match, user_id, limit),
+            )
+        else:
+            conditions = " OR ".join(["key LIKE ? OR value LIKE ?"] * len(terms))
+            params = [f"%{term}%" for term in terms for _ in range(2)]
+            cursor.execute(
+                f"""
+                SELECT key, value, created_at, updated_at, 0 AS rank FROM memories
+                WHERE user_id = ? AND ({conditions})
+                ORDER BY updated_at DESC
+                LIMIT ?
+            """,
+                (user_id, *params, limit),
+            )
+        rows = cursor.fetchall()
+
+        return [
+            {
+                "key": row[0],
+                "value": row[1],
+                "created_at": row[2],
+                "updated_at": row[3],
+                "rank": row[4],
+            }
+            for row in rows
+        ]
+
     def delete_memories(self, user_id: str) -> int:
         """Delete all memories for a user and return the count of deleted memories"""
-        conn = sqlite3.connect(self.db_path)
+        self._flush_pending_writes()
+        conn = self._get_connection()
         cursor = conn.cursor()
 
         # Count memories before deletion
@@ -424,14 +865,14 @@ class DatabaseManager:
         cursor.execute("DELETE FROM memories WHERE user_id = ?", (user_id,))
 
         conn.commit()
-        conn.close()
 
         return count
 
     def delete_old_memories(self, user_id: str, cutoff_date: str) -> int:
         """Delete memories for a user older than a cutoff date and return the count of deleted memories.
         If user_id is empty, deletes old memories for all users."""
-        conn = sqlite3.connect(self.db_path)
+        self._flush_pending_writes()
+        conn = self._get_connection()
         cursor = conn.cursor()
 
         # Count memories before deletion
@@ -460,13 +901,13 @@ class DatabaseManager:
             )
 
         conn.commit()
-        conn.close()
 
         return count
 
     def clear_user_history(self, user_id: str):
         """Clear conversation history for a user"""
-        conn = sqlite3.connect(self.db_path)
+        self._flush_pending_writes()
+        conn = self._get_connection()
         cursor = conn.cursor()
 
         # Delete all conversations for this user
@@ -476,26 +917,28 @@ class DatabaseManager:
         cursor.execute("DELETE FROM memories WHERE user_id = ?", (user_id,))
 
         conn.commit()
-        conn.close()
 
         # Clear cache if this user is cached
         if user_id in self.user_cache:
             del self.user_cache[user_id]
+        self._invalidate_conversation_cache(user_id=user_id)
 
     def clear_channel_history(self, channel_id: str):
         """Clear conversation history for a channel"""
-        conn = sqlite3.connect(self.db_path)
+        self._flush_pending_writes()
+        conn = self._get_connection()
         cursor = conn.cursor()
 
         # Delete all conversations for this channel
         cursor.execute("DELETE FROM conversations WHERE channel_id = ?", (channel_id,))
 
         conn.commit()
-        conn.close()
+        self._invalidate_conversation_cache(channel_id=channel_id)
 
     def clear_user_channel_history(self, user_id: str, channel_id: str):
         """Clear conversation history for a user in a specific channel"""
-        conn = sqlite3.connect(self.db_path)
+        self._flush_pending_writes()
+        conn = self._get_connection()
         cursor = conn.cursor()
 
         # Delete all conversations for this user in this channel
@@ -505,11 +948,12 @@ class DatabaseManager:
         )
 
         conn.commit()
-        conn.close()
+        self._invalidate_conversation_cache(user_id=user_id)
 
     def clear_all_history(self):
         """Clear all conversation history (admin/debug function)"""
-        conn = sqlite3.connect(self.db_path)
+        self._flush_pending_writes()
+        conn = self._get_connection()
         cursor = conn.cursor()
 
         # Delete all conversations
@@ -519,24 +963,33 @@ class DatabaseManager:
         cursor.execute("DELETE FROM memories")
 
         conn.commit()
-        conn.close()
 
         # Clear entire cache
         self.user_cache.clear()
+        self._invalidate_conversation_cache()
 
     def flush_database(self):
         """Completely flush and recreate the database (destructive operation)"""
         logger.warning(f"Flushing database at {self.db_path}")
 
-        # Close any existing connections and delete the file
-        if os.path.exists(self.db_path):
-            os.remove(self.db_path)
+        # Buffered writes belong to the database being destroyed
+        with self._pending_lock:
+            self._pending_conversations = []
+            self._pending_memories = {}
+
+        # Close any existing connections and delete the file (plus WAL files)
+        self._close_connections()
+        for path in (self.db_path, f"{self.db_path}-wal", f"{self.db_path}-shm"):
+            if os.path.exists(path):
+                os.remove(path)
 
         # Clear cache
         self.user_cache.clear()
+        self._invalidate_conversation_cache()
 
         # Reinitialize the database with empty tables
         self.init_database()
+        self._rebuild_keyword_index()
 
         logger.info("Database flushed and recreated")
 
@@ -570,7 +1023,27 @@ class DatabaseManager:
         message_history: List[Dict],
         channel_id: Optional[str] = None,
     ):
-        """Async version of add_conversation"""
+        """Async version of add_conversation
+
+        With write-behind enabled the insert is buffered and committed in a
+        batch within DATABASE_WRITE_BEHIND_MAX_LATENCY seconds.
+        """
+        if self.write_behind_enabled:
+            created_at = datetime.datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S")
+            with self._pending_lock:
+                self._pending_conversations.append(
+                    (user_id, channel_id or None, json.dumps(message_history), created_at)
+                )
+            self._cache_conversation(
+                user_id,
+                {
+                    "messages": message_history,
+                    "timestamp": created_at,
+                    "channel_id": channel_id or None,
+                },
+            )
+            await self._buffer_write()
+            return
         loop = asyncio.get_event_loop()
         return await loop.run_in_executor(
             self._executor, self.add_conversation, user_id, message_history, channel_id
@@ -580,6 +1053,14 @@ class DatabaseManager:
         self, user_id: str, limit: int = None
     ) -> List[Dict]:
         """Async version of get_recent_conversations"""
+        from config import CONVERSATION_HISTORY_LIMIT
+
+        # Cache hits are answered without an executor round trip
+        cached = self._cached_conversations(
+            user_id, CONVERSATION_HISTORY_LIMIT if limit is None else limit
+        )
+        if cached is not None:
+            return cached
         loop = asyncio.get_event_loop()
         return await loop.run_in_executor(
             self._executor, self.get_recent_conversations, user_id, limit
@@ -608,7 +1089,16 @@ class DatabaseManager:
         )
 
     async def aadd_memory(self, user_id: str, key: str, value: str):
-        """Async version of add_memory"""
+        """Async version of add_memory
+
+        With write-behind enabled the write is buffered as an upsert of the
+        user's key and committed in a batch.
+        """
+        if self.write_behind_enabled:
+            with self._pending_lock:
+                self._pending_memories[(user_id, key)] = value
+            await self._buffer_write()
+            return
         loop = asyncio.get_event_loop()
         return await loop.run_in_executor(
             self._executor, self.add_memory, user_id, key, value
@@ -624,6 +1114,22 @@ class DatabaseManager:
         loop = asyncio.get_event_loop()
         return await loop.run_in_executor(self._executor, self.get_memory, user_id, key)
 
+    async def aget_memory_rows(self, user_id: str, limit: int = None) -> List[Dict[str, Any]]:
+        """Async version of get_memory_rows"""
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(
+            self._executor, self.get_memory_rows, user_id, limit
+        )
+
+    async def asearch_memories(
+        self, user_id: str, terms: List[str], limit: int = 10
+    ) -> List[Dict[str, Any]]:
+        """Async version of search_memories"""
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(
+            self._executor, self.search_memories, user_id, terms, limit
+        )
+
     async def adelete_memories(self, user_id: str) -> int:
         """Async version of delete_memories"""
         loop = asyncio.get_event_loop()
@@ -653,7 +1159,7 @@ class DatabaseManager:
     # tip.cc balance management methods
     def update_balance(self, currency: str, amount: float, usd_value: float):
         """Update or insert a cryptocurrency balance"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._get_connection()
         cursor = conn.cursor()
 
         cursor.execute(
@@ -665,11 +1171,10 @@ class DatabaseManager:
         )
 
         conn.commit()
-        conn.close()
 
     def get_balance(self, currency: str) -> Optional[Dict[str, Any]]:
         """Get balance for a specific currency"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._get_connection()
         cursor = conn.cursor()
 
         cursor.execute(
@@ -682,7 +1187,6 @@ class DatabaseManager:
         )
 
         row = cursor.fetchone()
-        conn.close()
 
         if row:
             return {
@@ -695,7 +1199,7 @@ class DatabaseManager:
 
     def get_all_balances(self) -> List[Dict[str, Any]]:
         """Get all cryptocurrency balances"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._get_connection()
         cursor = conn.cursor()
 
         cursor.execute("""
@@ -705,7 +1209,6 @@ class DatabaseManager:
         """)
 
         rows = cursor.fetchall()
-        conn.close()
 
         return [
             {
@@ -720,11 +1223,10 @@ class DatabaseManager:
     def clear_balances(self) -> bool:
         """Clear all cryptocurrency balances from database"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self._get_connection()
             cursor = conn.cursor()
             cursor.execute("DELETE FROM tipcc_balances")
             conn.commit()
-            conn.close()
             return True
         except Exception as e:
             logger.error(f"Error clearing balances: {e}")
@@ -733,11 +1235,10 @@ class DatabaseManager:
     def clear_tipcc_transactions(self) -> bool:
         """Clear all tip.cc transactions from database"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self._get_connection()
             cursor = conn.cursor()
             cursor.execute("DELETE FROM tipcc_transactions")
             conn.commit()
-            conn.close()
             return True
         except Exception as e:
             logger.error(f"Error clearing tip.cc transactions: {e}")
@@ -745,12 +1246,11 @@ class DatabaseManager:
 
     def get_total_usd_balance(self) -> float:
         """Get total USD value of all balances"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._get_connection()
         cursor = conn.cursor()
 
         cursor.execute("SELECT SUM(usd_value) FROM tipcc_balances")
         result = cursor.fetchone()
-        conn.close()
 
         return result[0] if result and result[0] else 0.0
 
@@ -765,7 +1265,7 @@ class DatabaseManager:
         sender: Optional[str] = None,
     ):
         """Add a tip.cc transaction record"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._get_connection()
         cursor = conn.cursor()
 
         cursor.execute(
@@ -785,11 +1285,10 @@ class DatabaseManager:
         )
 
         conn.commit()
-        conn.close()
 
     def get_recent_transactions(self, limit: int = 20) -> List[Dict[str, Any]]:
         """Get recent tip.cc transactions"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._get_connection()
         cursor = conn.cursor()
 
         cursor.execute(
@@ -803,7 +1302,6 @@ class DatabaseManager:
         )
 
         rows = cursor.fetchall()
-        conn.close()
 
         return [
             {
@@ -821,7 +1319,7 @@ class DatabaseManager:
 
     def get_transaction_stats(self) -> Dict[str, Any]:
         """Get transaction statistics"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._get_connection()
         cursor = conn.cursor()
 
         # Get total received from airdrops
@@ -852,7 +1350,6 @@ class DatabaseManager:
         """)
         type_counts = dict(cursor.fetchall())
 
-        conn.close()
 
         return {
             "total_airdrops_usd": total_airdrops,
@@ -931,9 +1428,49 @@ class DatabaseManager:
         loop = asyncio.get_event_loop()
         return await loop.run_in_executor(self._executor, self.get_transaction_stats)
 
+    def record_airdrop_drop(self, drop: Dict[str, Any]):
+        """Store the stage timings and outcome of one airdrop"""
+        conn = self._get_connection()
+        with conn:
+            conn.execute(
+                """
+                INSERT INTO airdrop_drops (drop_type, channel_id, guild_id, trigger_id, outcome, detail,
+                                           embed_ms, delay_ms, answer_ms, typing_ms, submit_ms, total_ms)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+                tuple(drop.get(column) for column in AIRDROP_DROP_COLUMNS),
+            )
+
+    def get_recent_airdrop_drops(self, limit: int = 500) -> List[Dict[str, Any]]:
+        """Get the most recent airdrop records, newest first"""
+        conn = self._get_connection()
+        cursor = conn.execute(
+            f"""
+            SELECT {", ".join(AIRDROP_DROP_COLUMNS)}, created_at FROM airdrop_drops
+            ORDER BY id DESC LIMIT ?
+        """,
+            (limit,),
+        )
+        columns = [column[0] for column in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+    async def arecord_airdrop_drop(self, drop: Dict[str, Any]):
+        """Async version of record_airdrop_drop"""
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(self._executor, self.record_airdrop_drop, drop)
+
+    async def aget_recent_airdrop_drops(self, limit: int = 500) -> List[Dict[str, Any]]:
+        """Async version of get_recent_airdrop_drops"""
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(
+            self._executor, self.get_recent_airdrop_drops, limit
+        )
+
     def close(self):
         """Cleanup resources"""
         self._executor.shutdown(wait=True)
+        self._flush_pending_writes()
+        self._close_connections()
         logger.info("Database executor shut down")
 
     def add_reminder(
@@ -947,7 +1484,7 @@ class DatabaseManager:
         recurring_pattern: str = None,
     ):
         """Add a new reminder"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._get_connection()
         cursor = conn.cursor()
 
         cursor.execute(
@@ -967,12 +1504,50 @@ class DatabaseManager:
         )
 
         conn.commit()
-        conn.close()
-        return cursor.lastrowid
+        reminder_id = cursor.lastrowid
+
+        self._notify_reminder_added(
+            {
+                "id": reminder_id,
+                "user_id": user_id,
+                "reminder_type": reminder_type,
+                "title": title,
+                "description": description,
+                "trigger_time": trigger_time,
+                "status": "pending",
+                "channel_id": channel_id,
+                "recurring_pattern": recurring_pattern,
+            }
+        )
+        return reminder_id
+
+    def add_reminder_listener(self, listener):
+        """Register an object with reminder_added(reminder) and
+        reminder_removed(reminder_id) methods to track pending reminders"""
+        self._reminder_listeners.append(listener)
+
+    def remove_reminder_listener(self, listener):
+        """Unregister a reminder listener"""
+        if listener in self._reminder_listeners:
+            self._reminder_listeners.remove(listener)
+
+    def _notify_reminder_added(self, reminder: Dict[str, Any]):
+        for listener in self._reminder_listeners:
+            try:
+                listener.reminder_added(reminder)
+            except Exception as e:
+                logger.error(f"Reminder listener failed on add: {e}")
+
+    def _notify_reminder_removed(self, reminder_id: int):
+        for listener in self._reminder_listeners:
+            try:
+                listener.reminder_removed(reminder_id)
+            except Exception as e:
+                logger.error(f"Reminder listener failed on remove: {e}")
 
     def get_reminder(self, reminder_id: int) -> Optional[Dict[str, Any]]:
         """Get a specific reminder by ID"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._get_connection()
         cursor = conn.cursor()
 
         cursor.execute(
@@ -983,7 +1558,6 @@ class DatabaseManager:
             (reminder_id,),
         )
         row = cursor.fetchone()
-        conn.close()
 
         if row:
             return {
@@ -1004,7 +1578,7 @@ class DatabaseManager:
         self, user_id: str, status: str = "pending"
     ) -> List[Dict[str, Any]]:
         """Get all reminders for a user with a specific status (default: pending)"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._get_connection()
         cursor = conn.cursor()
 
         cursor.execute(
@@ -1017,7 +1591,6 @@ class DatabaseManager:
             (user_id, status),
         )
         rows = cursor.fetchall()
-        conn.close()
 
         return [
             {
@@ -1037,7 +1610,7 @@ class DatabaseManager:
 
     def get_due_reminders(self) -> List[Dict[str, Any]]:
         """Get all reminders that are due (current time >= trigger_time and status = pending)"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._get_connection()
         cursor = conn.cursor()
 
         cursor.execute(
@@ -1049,7 +1622,6 @@ class DatabaseManager:
             (datetime.datetime.now().isoformat(),),
         )
         rows = cursor.fetchall()
-        conn.close()
 
         return [
             {
@@ -1069,7 +1641,7 @@ class DatabaseManager:
 
     def update_reminder_status(self, reminder_id: int, status: str):
         """Update the status of a reminder (pending, triggered, cancelled, etc.)"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._get_connection()
         cursor = conn.cursor()
 
         cursor.execute(
@@ -1082,11 +1654,68 @@ class DatabaseManager:
         )
 
         conn.commit()
-        conn.close()
+
+        if status == "pending":
+            reminder = self.get_reminder(reminder_id)
+            if reminder:
+                self._notify_reminder_added(reminder)
+        else:
+            self._notify_reminder_removed(reminder_id)
+
+    def update_reminder_statuses(self, reminder_ids: List[int], status: str):
+        """Update the status of several reminders in a single transaction"""
+        if not reminder_ids:
+            return
+
+        conn = self._get_connection()
+        with conn:
+            conn.executemany(
+                """
+                UPDATE reminders
+                SET status = ?, updated_at = CURRENT_TIMESTAMP
+                WHERE id = ?
+            """,
+                [(status, reminder_id) for reminder_id in reminder_ids],
+            )
+
+        if status != "pending":
+            for reminder_id in reminder_ids:
+                self._notify_reminder_removed(reminder_id)
+
+    def get_pending_reminders(self) -> List[Dict[str, Any]]:
+        """Get every pending reminder regardless of its trigger time"""
+        conn = self._get_connection()
+        cursor = conn.cursor()
+
+        cursor.execute(
+            """
+            SELECT id, user_id, reminder_type, title, description, trigger_time, status, channel_id, recurring_pattern, created_at
+            FROM reminders
+            WHERE status = 'pending'
+            ORDER BY trigger_time ASC
+        """
+        )
+        rows = cursor.fetchall()
+
+        return [
+            {
+                "id": row[0],
+                "user_id": row[1],
+                "reminder_type": row[2],
+                "title": row[3],
+                "description": row[4],
+                "trigger_time": row[5],
+                "status": row[6],
+                "channel_id": row[7],
+                "recurring_pattern": row[8],
+                "created_at": row[9],
+            }
+            for row in rows
+        ]
 
     def cancel_reminder(self, reminder_id: int, user_id: str = None) -> bool:
         """Cancel a reminder by updating its status to 'cancelled'"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._get_connection()
         cursor = conn.cursor()
 
         if user_id:
@@ -1112,8 +1741,9 @@ class DatabaseManager:
 
         rows_affected = cursor.rowcount
         conn.commit()
-        conn.close()
 
+        if rows_affected > 0:
+            self._notify_reminder_removed(reminder_id)
         return rows_affected > 0
 
     # Reaction roles methods
@@ -1121,7 +1751,7 @@ class DatabaseManager:
         self, message_id: str, channel_id: str, emoji: str, role_id: str, guild_id: str
     ):
         """Add a reaction role mapping to the database"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._get_connection()
         cursor = conn.cursor()
 
         cursor.execute(
@@ -1133,11 +1763,10 @@ class DatabaseManager:
         )
 
         conn.commit()
-        conn.close()
 
     def remove_reaction_role(self, message_id: str, emoji: str):
         """Remove a reaction role mapping from the database"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._get_connection()
         cursor = conn.cursor()
 
         cursor.execute(
@@ -1148,11 +1777,10 @@ class DatabaseManager:
         )
 
         conn.commit()
-        conn.close()
 
     def get_reaction_roles_for_message(self, message_id: str):
         """Get all reaction roles for a specific message"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._get_connection()
         cursor = conn.cursor()
 
         cursor.execute(
@@ -1162,13 +1790,12 @@ class DatabaseManager:
             (message_id,),
         )
         rows = cursor.fetchall()
-        conn.close()
 
         return {row[0]: row[1] for row in rows}
 
     def get_reaction_role(self, message_id: str, emoji: str):
         """Get a specific reaction role for a message and emoji"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._get_connection()
         cursor = conn.cursor()
 
         cursor.execute(
@@ -1178,13 +1805,12 @@ class DatabaseManager:
             (message_id, emoji),
         )
         row = cursor.fetchone()
-        conn.close()
 
         return row[0] if row else None
 
     def get_all_reaction_roles(self, guild_id: str):
         """Get all reaction roles for a guild"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._get_connection()
         cursor = conn.cursor()
 
         cursor.execute(
@@ -1194,7 +1820,6 @@ class DatabaseManager:
             (guild_id,),
         )
         rows = cursor.fetchall()
-        conn.close()
 
         return [
             {
@@ -1303,6 +1928,18 @@ class DatabaseManager:
             self._executor, self.update_reminder_status, reminder_id, status
         )
 
+    async def aupdate_reminder_statuses(self, reminder_ids: List[int], status: str):
+        """Async version of update_reminder_statuses"""
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(
+            self._executor, self.update_reminder_statuses, reminder_ids, status
+        )
+
+    async def aget_pending_reminders(self) -> List[Dict[str, Any]]:
+        """Async version of get_pending_reminders"""
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(self._executor, self.get_pending_reminders)
+
     async def acancel_reminder(self, reminder_id: int, user_id: str = None) -> bool:
         """Async version of cancel_reminder"""
         loop = asyncio.get_event_loop()
@@ -1313,7 +1950,7 @@ class DatabaseManager:
     # Keyword management methods
     def add_keyword(self, keyword: str) -> bool:
         """Add a new trigger keyword"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._get_connection()
         cursor = conn.cursor()
 
         try:
@@ -1325,16 +1962,15 @@ class DatabaseManager:
             success = cursor.rowcount > 0
             if success:
                 logger.info(f"Added keyword: {keyword}")
+                self._rebuild_keyword_index()
             return success
         except sqlite3.Error as e:
             logger.error(f"Error adding keyword {keyword}: {e}")
             return False
-        finally:
-            conn.close()
 
     def remove_keyword(self, keyword: str) -> bool:
         """Remove a trigger keyword"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._get_connection()
         cursor = conn.cursor()
 
         try:
@@ -1343,16 +1979,15 @@ class DatabaseManager:
             success = cursor.rowcount > 0
             if success:
                 logger.info(f"Removed keyword: {keyword}")
+                self._rebuild_keyword_index()
             return success
         except sqlite3.Error as e:
             logger.error(f"Error removing keyword {keyword}: {e}")
             return False
-        finally:
-            conn.close()
 
     def get_keywords(self) -> List[str]:
         """Get all enabled keywords"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._get_connection()
         cursor = conn.cursor()
 
         try:
@@ -1364,12 +1999,10 @@ class DatabaseManager:
         except sqlite3.Error as e:
             logger.error(f"Error getting keywords: {e}")
             return []
-        finally:
-            conn.close()
 
     def enable_keyword(self, keyword: str) -> bool:
         """Enable a keyword"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._get_connection()
         cursor = conn.cursor()
 
         try:
@@ -1381,16 +2014,15 @@ class DatabaseManager:
             success = cursor.rowcount > 0
             if success:
                 logger.info(f"Enabled keyword: {keyword}")
+                self._rebuild_keyword_index()
             return success
         except sqlite3.Error as e:
             logger.error(f"Error enabling keyword {keyword}: {e}")
             return False
-        finally:
-            conn.close()
 
     def disable_keyword(self, keyword: str) -> bool:
         """Disable a keyword"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._get_connection()
         cursor = conn.cursor()
 
         try:
@@ -1402,32 +2034,33 @@ class DatabaseManager:
             success = cursor.rowcount > 0
             if success:
                 logger.info(f"Disabled keyword: {keyword}")
+                self._rebuild_keyword_index()
             return success
         except sqlite3.Error as e:
             logger.error(f"Error disabling keyword {keyword}: {e}")
             return False
-        finally:
-            conn.close()
+
+    def _rebuild_keyword_index(self):
+        """Compile all enabled keywords into a single alternation pattern"""
+        alternatives = []
+        for keyword in self.get_keywords():
+            if " " in keyword:
+                # Multi-word phrases match anywhere in the message
+                alternatives.append(re.escape(keyword))
+            elif re.fullmatch(r"\w+", keyword):
+                # Single words must match a whole word
+                alternatives.append(rf"(?<!\w){re.escape(keyword)}(?!\w)")
+
+        self._keyword_pattern = (
+            re.compile("|".join(alternatives)) if alternatives else None
+        )
 
     def check_message_for_keywords(self, message_content: str) -> bool:
         """Check if message contains any enabled keywords"""
-        keywords = self.get_keywords()
-        message_lower = message_content.lower()
-
-        # Split message into words and check for exact keyword matches
-        import re
-
-        words = re.findall(r"\b\w+\b", message_lower)
-
-        # Check for exact matches
-        for keyword in keywords:
-            if keyword in words:
-                return True
-            # Also check for multi-word phrases
-            if " " in keyword and keyword in message_lower:
-                return True
-
-        return False
+        pattern = self._keyword_pattern
+        if pattern is None:
+            return False
+        return pattern.search(message_content.lower()) is not None
 
     # Async versions of keyword methods
     async def aadd_keyword(self, keyword: str) -> bool:
@@ -1456,17 +2089,20 @@ class DatabaseManager:
         return await loop.run_in_executor(self._executor, self.disable_keyword, keyword)
 
     async def acheck_message_for_keywords(self, message_content: str) -> bool:
-        """Async version of check_message_for_keywords"""
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(
-            self._executor, self.check_message_for_keywords, message_content
-        )
+        """Async version of check_message_for_keywords
+
+        The keyword index lives in memory, so this runs inline without an
+        executor hop.
+        """
+        return self.check_message_for_keywords(message_content)
 
     def __del__(self):
         """Cleanup resources"""
         if hasattr(self, "_executor"):
             self._executor.shutdown(wait=True)
             logger.info("Database executor shut down")
+        if hasattr(self, "_connections"):
+            self._close_connections()
 
 
 # Global database instance
@@ -98,10 +98,24 @@ class TriviaDatabase:
             )
         """)
 
+        # Create trivia sync state table for conditional CSV refreshes
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS trivia_sync_state (
+                category_name TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                question_count INTEGER DEFAULT 0,
+                last_synced TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+
         # Create indexes for performance
         cursor.execute(
             "CREATE INDEX IF NOT EXISTS idx_questions_category ON trivia_questions(category_id)"
         )
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_questions_category_text ON trivia_questions(category_id, question_text)"
+        )
         cursor.execute(
             "CREATE INDEX IF NOT EXISTS idx_questions_active ON trivia_questions(is_active)"
         )
@@ -501,6 +515,46 @@ class TriviaDatabase:
             self._executor, _get_questions
         )
 
+    async def get_all_questions(self) -> List[Tuple[str, str, str, int]]:
+        """Get (category, question, answer, id) for every active question"""
+
+        def _get_all():
+            conn = sqlite3.connect(self.db_path)
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT c.name, q.question_text, q.answer_text, q.id
+                FROM trivia_questions q
+                JOIN trivia_categories c ON q.category_id = c.id
+                WHERE q.is_active = 1
+                ORDER BY q.id
+            """)
+            results = cursor.fetchall()
+            conn.close()
+            return results
+
+        return await asyncio.get_event_loop().run_in_executor(
+            self._executor, _get_all
+        )
+
+    async def record_question_usage(self, usage: Dict[int, int]):
+        """Add deferred times_asked increments, question_id -> count, in one transaction"""
+
+        def _record_usage():
+            conn = sqlite3.connect(self.db_path)
+            cursor = conn.cursor()
+            cursor.executemany(
+                """
+                UPDATE trivia_questions
+                SET times_asked = times_asked + ?, last_used = CURRENT_TIMESTAMP
+                WHERE id = ?
+            """,
+                [(count, question_id) for question_id, count in usage.items()],
+            )
+            conn.commit()
+            conn.close()
+
+        await asyncio.get_event_loop().run_in_executor(self._executor, _record_usage)
+
     # Statistics
     async def record_trivia_attempt(
         self,
@@ -631,14 +685,98 @@ class TriviaDatabase:
             self._executor, _get_cached
         )
 
+    async def get_all_cached_questions(self) -> Dict[str, List[Dict]]:
+        """Get unexpired cached questions of every category"""
+
+        def _get_all_cached():
+            conn = sqlite3.connect(self.db_path)
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT category_name, questions_json FROM trivia_cache
+                WHERE expires_at > CURRENT_TIMESTAMP
+            """)
+            results = cursor.fetchall()
+            conn.close()
+
+            cached = {}
+            for category_name, questions_json in results:
+                try:
+                    cached[category_name] = json.loads(questions_json)
+                except json.JSONDecodeError:
+                    continue
+            return cached
+
+        return await asyncio.get_event_loop().run_in_executor(
+            self._executor, _get_all_cached
+        )
+
+    async def get_all_sync_states(self) -> Dict[str, Dict]:
+        """Get the stored ETag/Last-Modified validators of every synced category"""
+
+        def _get_states():
+            conn = sqlite3.connect(self.db_path)
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT category_name, etag, last_modified, question_count, last_synced
+                FROM trivia_sync_state
+            """)
+            results = cursor.fetchall()
+            conn.close()
+
+            return {
+                row[0]: {
+                    "etag": row[1],
+                    "last_modified": row[2],
+                    "question_count": row[3],
+                    "last_synced": row[4],
+                }
+                for row in results
+            }
+
+        return await asyncio.get_event_loop().run_in_executor(
+            self._executor, _get_states
+        )
+
+    async def set_sync_state(
+        self,
+        category_name: str,
+        etag: Optional[str],
+        last_modified: Optional[str],
+        question_count: int,
+    ):
+        """Store the validators of a category's last successful sync"""
+
+        def _set_state():
+            conn = sqlite3.connect(self.db_path)
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                INSERT OR REPLACE INTO trivia_sync_state
+                (category_name, etag, last_modified, question_count, last_synced)
+                VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)
+            """,
+                (category_name, etag, last_modified, question_count),
+            )
+            conn.commit()
+            conn.close()
+
+        await asyncio.get_event_loop().run_in_executor(self._executor, _set_state)
+
     # Bulk Operations
     async def bulk_import_questions(self, questions_data: List[Dict]) -> int:
-        """Import multiple questions in bulk"""
+        """
+        Import multiple questions in bulk.
+
+        Existing questions are matched on (category, question text); ones
+        still holding UNKNOWN_ANSWER get the imported answer. Returns how
+        many questions were inserted or answered.
+        """
 
         def _bulk_import():
             conn = sqlite3.connect(self.db_path)
             cursor = conn.cursor()
             imported_count = 0
+            category_ids: Dict[str, int] = {}
 
             try:
                 for question_data in questions_data:
@@ -653,32 +791,46 @@ class TriviaDatabase:
                         continue
 
                     # Get or create category
-                    cursor.execute(
-                        "SELECT id FROM trivia_categories WHERE name = ?",
-                        (category_name,),
-                    )
-                    category_result = cursor.fetchone()
-                    if not category_result:
+                    category_id = category_ids.get(category_name)
+                    if category_id is None:
                         cursor.execute(
-                            """
-                            INSERT INTO trivia_categories (name, display_name)
-                            VALUES (?, ?)
-                        """,
-                            (category_name, category_name),
+                            "SELECT id FROM trivia_categories WHERE name = ?",
+                            (category_name,),
                         )
-                        category_id = cursor.lastrowid
-                    else:
-                        category_id = category_result[0]
-
-                    # Insert question (avoid duplicates)
+                        category_result = cursor.fetchone()
+                        if not category_result:
+                            cursor.execute(
+                                """
+                                INSERT INTO trivia_categories (name, display_name)
+                                VALUES (?, ?)
+                            """,
+                                (category_name, category_name),
+                            )
+                            category_id = cursor.lastrowid
+                        else:
+                            category_id = category_result[0]
+                        category_ids[category_name] = category_id
+
+                    # Insert question (avoid duplicates), answering unknown ones
                     cursor.execute(
                         """
-                        SELECT id FROM trivia_questions
+                        SELECT id, answer_text FROM trivia_questions
                         WHERE category_id = ? AND question_text = ?
                     """,
                         (category_id, question_text),
                     )
-                    if not cursor.fetchone():
+                    existing = cursor.fetchone()
+                    if existing and existing[1] == "UNKNOWN_ANSWER":
+                        cursor.execute(
+                            """
+                            UPDATE trivia_questions SET answer_text = ?, source = ?
+                            WHERE category_id = ? AND question_text = ?
+                            AND answer_text = 'UNKNOWN_ANSWER'
+                        """,
+                            (answer_text, source, category_id, question_text),
+                        )
+                        imported_count += 1
+                    elif not existing:
                         cursor.execute(
                             """
                             INSERT INTO trivia_questions
@@ -0,0 +1,178 @@
+"""
+In-memory trivia answer index
+
+Answers are looked up by (category, normalized question) with a dict hit;
+a character trigram index per category finds close matches when the
+wording differs slightly from the stored question.
+"""
+
+import html
+import math
+import re
+import unicodedata
+from dataclasses import dataclass
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+_NON_WORD = re.compile(r"[\W_]+")
+
+# Stored answer for questions seen in a drop that nobody has answered yet
+UNKNOWN_ANSWER = "UNKNOWN_ANSWER"
+
+
+def normalize_text(text: str) -> str:
+    """
+    Normalize a question or category for matching.
+
+    HTML entities are decoded, accents and compatibility forms folded,
+    case folded, and punctuation and runs of whitespace collapsed to single
+    spaces, so "Who wrote “Hamlet”?" and "who wrote hamlet" are equal.
+    """
+    text = unicodedata.normalize("NFKD", html.unescape(text))
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    return _NON_WORD.sub(" ", text.casefold()).strip()
+
+
+def trigrams(normalized: str) -> Set[str]:
+    """Character trigrams of a normalized string, padded at the ends"""
+    padded = f" {normalized} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+@dataclass
+class IndexedQuestion:
+    """One question held by the index"""
+
+    category: str
+    question: str
+    answer: str
+    question_id: Optional[int] = None
+
+
+class TriviaAnswerIndex:
+    """
+    Normalized answer index over every known trivia question.
+
+    Exact lookups are a dict hit keyed by (category, normalized question),
+    relying on the string hash of the normalized text. Fuzzy lookups score
+    the questions sharing trigrams with the query by Dice coefficient.
+    The index is only touched from the event loop; a full rebuild is done
+    on a fresh instance off the loop and swapped in with merge().
+    """
+
+    def __init__(self, fuzzy_threshold: float = 0.92):
+        self.fuzzy_threshold = fuzzy_threshold
+        self.ready = False
+        self._entries: Dict[Tuple[str, str], IndexedQuestion] = {}
+        # category -> trigram -> normalized questions containing it
+        self._grams: Dict[str, Dict[str, Set[str]]] = {}
+        self._gram_counts: Dict[Tuple[str, str], int] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(
+        self,
+        category: str,
+        question: str,
+        answer: str,
+        question_id: Optional[int] = None,
+    ) -> Optional[IndexedQuestion]:
+        """Add or replace a question, keeping a known id if none is given"""
+        category_key = normalize_text(category)
+        question_key = normalize_text(question)
+        if not question_key or not answer:
+            return None
+
+        key = (category_key, question_key)
+        existing = self._entries.get(key)
+        if existing is not None:
+            existing.answer = answer
+            if question_id is not None:
+                existing.question_id = question_id
+            return existing
+
+        entry = IndexedQuestion(category, question, answer, question_id)
+        self._entries[key] = entry
+        grams = trigrams(question_key)
+        postings = self._grams.setdefault(category_key, {})
+        for gram in grams:
+            postings.setdefault(gram, set()).add(question_key)
+        self._gram_counts[key] = len(grams)
+        return entry
+
+    def add_many(self, rows: Iterable[Tuple[str, str, str, Optional[int]]]) -> int:
+        """Add (category, question, answer, question_id) rows, returning how many were new"""
+        before = len(self._entries)
+        for category, question, answer, question_id in rows:
+            self.add(category, question, answer, question_id)
+        return len(self._entries) - before
+
+    def merge(self, other: "TriviaAnswerIndex"):
+        """Apply every entry of another index on top of this one"""
+        for entry in other._entries.values():
+            self.add(entry.category, entry.question, entry.answer, entry.question_id)
+
+    def get(self, category: str, question: str) -> Optional[IndexedQuestion]:
+        """Exact lookup after normalization, unknown questions included"""
+        return self._entries.get((normalize_text(category), normalize_text(question)))
+
+    def lookup(self, category: str, question: str) -> Optional[IndexedQuestion]:
+        """
+        Answer lookup: exact, falling back to the closest fuzzy match.
+
+        Questions recorded with UNKNOWN_ANSWER have no answer to give, so
+        they are never returned.
+        """
+        category_key = normalize_text(category)
+        question_key = normalize_text(question)
+        entry = self._entries.get((category_key, question_key))
+        if entry is not None and entry.answer != UNKNOWN_ANSWER:
+            return entry
+        if not question_key:
+            return None
+        return self._fuzzy(category_key, question_key)
+
+    def _fuzzy(self, category_key: str, question_key: str) -> Optional[IndexedQuestion]:
+        """Best trigram match, or a stored question containing the query"""
+        postings = self._grams.get(category_key)
+        if not postings:
+            return None
+
+        # A match shares at least min_overlap of the query's trigrams, so it
+        # must contain one of the rarest len - min_overlap + 1 of them; only
+        # those posting lists are needed to find every candidate
+        query_grams = sorted(trigrams(question_key), key=lambda gram: len(postings.get(gram, ())))
+        min_overlap = min(
+            math.ceil(self.fuzzy_threshold * len(query_grams) / (2 - self.fuzzy_threshold)),
+            len(query_grams) - 2,
+        )
+        candidates: Set[str] = set()
+        for gram in query_grams[:len(query_grams) - max(min_overlap, 1) + 1]:
+            candidates.update(postings.get(gram, ()))
+
+        allowed_misses = len(query_grams) - min_overlap
+        best_key, best_score = None, 0.0
+        for candidate in candidates:
+            if self._entries[(category_key, candidate)].answer == UNKNOWN_ANSWER:
+                continue
+            misses = 0
+            for gram in query_grams:
+                if candidate not in postings.get(gram, ()):
+                    misses += 1
+                    if misses > allowed_misses:
+                        break
+            if misses > allowed_misses:
+                continue
+            overlap = len(query_grams) - misses
+            score = 2 * overlap / (len(query_grams) + self._gram_counts[(category_key, candidate)])
+            # A stored question containing the whole query always qualifies,
+            # matching the old LIKE '%question%' lookup; only the two padded
+            # edge trigrams of the query can be missing from such a question
+            if overlap >= len(query_grams) - 2 and question_key in candidate:
+                score = max(score, self.fuzzy_threshold)
+            if score > best_score:
+                best_key, best_score = candidate, score
+
+        if best_key is None or best_score < self.fuzzy_threshold:
+            return None
+        return self._entries[(category_key, best_key)]
@@ -112,36 +112,26 @@ def main():
         release_lock()
         sys.exit(1)
 
+    # Configure asyncio event loop
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+
     # Check MCP Memory Server if enabled
     from config import MCP_MEMORY_ENABLED
-    from tools.mcp_memory_client import get_mcp_server_url
+    from tools.mcp_memory_client import mcp_memory_client
 
     if MCP_MEMORY_ENABLED:
-        mcp_server_url = get_mcp_server_url()
-        import aiohttp
-
-        async def check_mcp_server():
-            try:
-                async with aiohttp.ClientSession(
-                    timeout=aiohttp.ClientTimeout(total=5)
-                ) as session:
-                    async with session.get(f"{mcp_server_url}/health") as response:
-                        return response.status == 200
-            except Exception:
-                return False
-
-        # Run the check synchronously
+        # Checked on the bot's loop so the shared client's pooled
+        # connection is reused afterwards
         try:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            mcp_available = loop.run_until_complete(check_mcp_server())
-            loop.close()
+            health = loop.run_until_complete(mcp_memory_client.health_check())
+            mcp_available = "error" not in health
 
             if mcp_available:
                 logger.info("✅ MCP Memory Server is accessible")
             else:
                 logger.warning(
-                    f"⚠️  MCP Memory Server not accessible at {mcp_server_url}"
+                    f"⚠️  MCP Memory Server not accessible at {mcp_memory_client.server_url}"
                 )
                 logger.info(
                     "💡 Run './start_mcp_server.sh' to start the MCP server, or set MCP_MEMORY_ENABLED=false"
@@ -168,6 +158,7 @@ def main():
         from tools.tool_manager import tool_manager
 
         tool_manager.set_discord_tools(bot)
+        tool_manager.set_event_loop(loop)
 
         # Set up message queue initialization flag for bot to use in on_ready
         from config import MESSAGE_QUEUE_ENABLED
@@ -184,10 +175,6 @@ def main():
     signal.signal(signal.SIGINT, signal_handler)
     signal.signal(signal.SIGTERM, signal_handler)
 
-    # Configure asyncio event loop
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-
     reconnect_delay = 1.0  # Start with 1 second delay
 
     while running:
@@ -9,12 +9,107 @@ import json
 import datetime
 import asyncio
 import logging
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Iterable, Optional, Set, Tuple
 import hashlib
 
 logger = logging.getLogger(__name__)
 
 
+class _ExtractionEngine:
+    """
+    Compiled form of an extractor's pattern set.
+    
+    Every pattern is compiled once. The trigger phrases of all patterns are
+    combined into a single case-insensitive scanner, factored by common
+    prefix with one named group per phrase, so one pass over a message
+    tells which patterns can match at all; the others are skipped without
+    running them.
+    """
+
+    def __init__(self, extractor: "AutoMemoryExtractor"):
+        def compile_ci(pattern: str) -> "re.Pattern":
+            return re.compile(pattern, re.IGNORECASE)
+        
+        self.personal_info = [
+            (info_type, [(pattern, compile_ci(pattern)) for pattern in patterns])
+            for info_type, patterns in extractor.PERSONAL_INFO_PATTERNS.items()
+        ]
+        self.preferences = [(p, compile_ci(p)) for p in extractor.PREFERENCE_PATTERNS]
+        self.context = [(p, compile_ci(p)) for p in extractor.CONTEXT_PATTERNS]
+        self.relationships = [(p, compile_ci(p)) for p in extractor.RELATIONSHIP_PATTERNS]
+        self.facts = re.compile("|".join(extractor.FACT_PATTERNS))
+        self.importance_keywords = self._literal_matcher(extractor.IMPORTANCE_KEYWORDS)
+        self.important_topics = self._literal_matcher(extractor.IMPORTANT_TOPICS)
+        self.sentence_split = re.compile(r'[.!?]+')
+        
+        all_patterns = (
+            [p for _, patterns in self.personal_info for p, _ in patterns]
+            + extractor.PREFERENCE_PATTERNS
+            + extractor.CONTEXT_PATTERNS
+            + extractor.RELATIONSHIP_PATTERNS
+        )
+        self.always_active = {p for p in all_patterns if p not in extractor.PATTERN_TRIGGERS}
+        
+        # A phrase that starts with a shorter trigger phrase is covered by
+        # it; keeping only the shortest makes the scanner prefix-free, so no
+        # occurrence is hidden behind another phrase at the same position
+        phrases = sorted({t.lower() for ts in extractor.PATTERN_TRIGGERS.values() for t in ts}, key=len)
+        shortest: Dict[str, str] = {}
+        for phrase in phrases:
+            shortest[phrase] = next(
+                (kept for kept in shortest.values() if phrase.startswith(kept)), phrase
+            )
+        kept_phrases = sorted(set(shortest.values()))
+        group_names = {phrase: f"t{i}" for i, phrase in enumerate(kept_phrases)}
+        
+        self.trigger_scanner = re.compile(
+            "(?=" + self._trie_pattern(kept_phrases, group_names) + ")", re.IGNORECASE
+        )
+        # group name -> patterns enabled by that phrase
+        self.patterns_by_group: Dict[str, Set[str]] = {}
+        for pattern, triggers in extractor.PATTERN_TRIGGERS.items():
+            for trigger in triggers:
+                group = group_names[shortest[trigger.lower()]]
+                self.patterns_by_group.setdefault(group, set()).add(pattern)
+
+    @staticmethod
+    def _trie_pattern(phrases: List[str], group_names: Dict[str, str]) -> str:
+        """
+        Alternation of the phrases factored by common prefix.
+        
+        A flat alternation makes the regex engine try every phrase at every
+        position; factored, it only follows the branches of the characters
+        actually seen. Each phrase ends in an empty named group, so the
+        match's lastgroup tells which phrase was found.
+        """
+        trie: Dict[str, Any] = {}
+        for phrase in phrases:
+            node = trie
+            for char in phrase:
+                node = node.setdefault(char, {})
+            node[""] = group_names[phrase]
+        
+        def emit(node: Dict[str, Any]) -> str:
+            if "" in node:
+                return f"(?P<{node['']}>)"
+            branches = [re.escape(char) + emit(child) for char, child in sorted(node.items())]
+            return branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        
+        return emit(trie)
+
+    @staticmethod
+    def _literal_matcher(words: List[str]) -> "re.Pattern":
+        """Matcher for any of the words as a plain substring"""
+        return re.compile("|".join(re.escape(word) for word in sorted(words, key=len, reverse=True)))
+
+    def active_patterns(self, text: str) -> Set[str]:
+        """Patterns that can match somewhere in the text"""
+        active = set(self.always_active)
+        for group in {match.lastgroup for match in self.trigger_scanner.finditer(text)}:
+            active |= self.patterns_by_group[group]
+        return active
+
+
 class AutoMemoryExtractor:
     """
     Extracts meaningful information from conversations for automatic memory storage.
@@ -78,8 +173,67 @@ class AutoMemoryExtractor:
         r"(?:i want|i'd like)\s+\w+\s+to",
     ]
 
+    # Patterns for preferences and opinions
+    PREFERENCE_PATTERNS = [
+        r"(?:i love|i really like|i enjoy|i prefer)\s+([^.!?]+)",
+        r"(?:i hate|i dislike|i can't stand)\s+([^.!?]+)",
+        r"(?:my favorite|favorite)\s+([^.!?]+)",
+        r"(?:i think|i feel|i believe)\s+([^.!?]+)",
+    ]
+
+    # Patterns for relationships
+    RELATIONSHIP_PATTERNS = [
+        r"(?:my \w+)\s+(?:is|are)\s+([^.!?]+)",
+        r"(?:i have a|i have an)\s+(?:\w+\s+)?(friend|brother|sister|mother|father|son|daughter|husband|wife|partner|girlfriend|boyfriend)\s+([^.!?]+)?",
+    ]
+
+    # Sentences stating possessions or plans are facts even without keywords
+    FACT_PATTERNS = [
+        r"(?:i have|i own|i bought|i got|i created)",
+        r"(?:i will|i am going|i plan to)",
+    ]
+
+    # Literal phrases (case-insensitive) at least one of which must occur in
+    # the text for a pattern to be able to match. Patterns without an entry
+    # are always run.
+    PATTERN_TRIGGERS = {
+        PERSONAL_INFO_PATTERNS["name"][0]: ("my name is", "i'm", "i am", "call me"),
+        PERSONAL_INFO_PATTERNS["name"][1]: ("i'm", "i am"),
+        PERSONAL_INFO_PATTERNS["location"][0]: ("i live in", "from"),
+        PERSONAL_INFO_PATTERNS["location"][1]: ("live in", "located in"),
+        PERSONAL_INFO_PATTERNS["age"][0]: ("i am", "i'm"),
+        PERSONAL_INFO_PATTERNS["age"][1]: ("age",),
+        PERSONAL_INFO_PATTERNS["birthday"][0]: ("birthday",),
+        PERSONAL_INFO_PATTERNS["birthday"][1]: ("born",),
+        PERSONAL_INFO_PATTERNS["occupation"][0]: ("i work as", "i'm a", "i am a", "my job is"),
+        PERSONAL_INFO_PATTERNS["occupation"][1]: ("occupation", "job", "profession"),
+        PERSONAL_INFO_PATTERNS["hobbies"][0]: ("i like", "i enjoy", "my hobby is", "hobb"),
+        PERSONAL_INFO_PATTERNS["hobbies"][1]: ("hobb",),
+        PERSONAL_INFO_PATTERNS["preferences"][0]: ("i love", "i really like", "i prefer"),
+        PERSONAL_INFO_PATTERNS["preferences"][1]: ("fav",),
+        PERSONAL_INFO_PATTERNS["dislikes"][0]: ("i hate", "i dislike", "i can't stand"),
+        PERSONAL_INFO_PATTERNS["dislikes"][1]: ("don't like", "do not like"),
+        CONTEXT_PATTERNS[0]: ("i have", "i've got"),
+        CONTEXT_PATTERNS[1]: ("my ",),
+        CONTEXT_PATTERNS[2]: ("i'm going", "i am going", "i will"),
+        CONTEXT_PATTERNS[3]: ("i need", "i must", "i should"),
+        CONTEXT_PATTERNS[4]: ("i want", "i'd like"),
+        PREFERENCE_PATTERNS[0]: ("i love", "i really like", "i enjoy", "i prefer"),
+        PREFERENCE_PATTERNS[1]: ("i hate", "i dislike", "i can't stand"),
+        PREFERENCE_PATTERNS[2]: ("favorite",),
+        PREFERENCE_PATTERNS[3]: ("i think", "i feel", "i believe"),
+        RELATIONSHIP_PATTERNS[0]: ("my ",),
+        RELATIONSHIP_PATTERNS[1]: ("i have a",),
+    }
+
+    # Compiled engine shared by every instance, built on first use
+    _engine: Optional["_ExtractionEngine"] = None
+
     def __init__(self):
         self.logger = logging.getLogger(__name__)
+        if AutoMemoryExtractor._engine is None:
+            AutoMemoryExtractor._engine = _ExtractionEngine(self)
+        self.engine = AutoMemoryExtractor._engine
 
     async def extract_memories_from_conversation(
         self, user_message: str, bot_response: str, user_id: str
@@ -89,50 +243,87 @@ class AutoMemoryExtractor:
         
         Returns a list of memory objects to be stored.
         """
-        memories = []
-        
+        filtered_memories = self._filter_memories(self.extract(user_message, bot_response))
+        return self._finalize(filtered_memories, user_id)
+
+    def extract(self, user_message: str, bot_response: str) -> List[Dict[str, Any]]:
+        """Extract unfiltered candidate memories from one exchange"""
         # Combine user message and bot response for context
         full_context = f"{user_message} {bot_response}"
+        # Patterns whose trigger phrases occur in the exchange, found in one
+        # scan (the user message is a prefix of the full context)
+        active = self.engine.active_patterns(full_context)
         
-        # Extract personal information
-        personal_memories = self._extract_personal_info(user_message, user_id)
-        memories.extend(personal_memories)
-        
-        # Extract important facts
-        fact_memories = self._extract_important_facts(full_context, user_id)
-        memories.extend(fact_memories)
+        memories = []
+        memories.extend(self._extract_personal_info(user_message, active))
+        memories.extend(self._extract_important_facts(full_context))
+        memories.extend(self._extract_preferences(full_context, active))
+        memories.extend(self._extract_context(full_context, active))
+        memories.extend(self._extract_relationships(full_context, active))
+        return memories
+
+    def extract_batch(
+        self, exchanges: Iterable[Tuple[str, str, str]]
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Extract memories from many (user_id, user_message, bot_response) exchanges.
         
-        # Extract preferences and opinions
-        preference_memories = self._extract_preferences(full_context, user_id)
-        memories.extend(preference_memories)
+        Memories are filtered and de-duplicated per user across the whole
+        batch, so a backlog yields each fact once. Returns user_id -> memories.
+        """
+        candidates: Dict[str, List[Dict[str, Any]]] = {}
+        for user_id, user_message, bot_response in exchanges:
+            candidates.setdefault(user_id, []).extend(self.extract(user_message, bot_response))
         
-        # Extract context about what user is doing
-        context_memories = self._extract_context(full_context, user_id)
-        memories.extend(context_memories)
+        return {
+            user_id: self._finalize(self._filter_memories(memories), user_id)
+            for user_id, memories in candidates.items()
+        }
+
+    async def extract_from_conversation_history(
+        self, user_id: str, db=None, limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Extract memories from a user's stored conversations.
         
-        # Extract relationships
-        relationship_memories = self._extract_relationships(full_context, user_id)
-        memories.extend(relationship_memories)
+        Conversations are read from the conversations table and processed as
+        one batch on the default executor, off the event loop.
+        """
+        if db is None:
+            from data.database import db
         
-        # Filter out memories that are too short or not meaningful
-        filtered_memories = self._filter_memories(memories)
+        conversations = await db.aget_recent_conversations(user_id, limit)
+        exchanges = [
+            (user_id, turn.get("user", ""), turn.get("assistant", ""))
+            for conversation in conversations
+            for turn in conversation.get("messages", [])
+            if isinstance(turn, dict) and turn.get("user")
+        ]
+        if not exchanges:
+            return []
         
-        # Generate unique IDs and timestamps
-        for memory in filtered_memories:
+        loop = asyncio.get_event_loop()
+        results = await loop.run_in_executor(None, self.extract_batch, exchanges)
+        return results.get(user_id, [])
+
+    def _finalize(self, memories: List[Dict[str, Any]], user_id: str) -> List[Dict[str, Any]]:
+        """Generate unique IDs and timestamps"""
+        timestamp = datetime.datetime.utcnow().isoformat()
+        for memory in memories:
             memory['id'] = self._generate_memory_id(memory, user_id)
-            memory['timestamp'] = datetime.datetime.utcnow().isoformat()
+            memory['timestamp'] = timestamp
             memory['confidence'] = memory.get('confidence', 1.0)
-        
-        return filtered_memories
+        return memories
 
-    def _extract_personal_info(self, text: str, user_id: str) -> List[Dict[str, Any]]:
+    def _extract_personal_info(self, text: str, active: Set[str]) -> List[Dict[str, Any]]:
         """Extract personal information from text."""
         memories = []
-        text_lower = text.lower()
         
-        for info_type, patterns in self.PERSONAL_INFO_PATTERNS.items():
-            for pattern in patterns:
-                match = re.search(pattern, text, re.IGNORECASE)
+        for info_type, patterns in self.engine.personal_info:
+            for pattern, regex in patterns:
+                if pattern not in active:
+                    continue
+                match = regex.search(text)
                 if match:
                     value = match.group(1).strip()
                     if len(value) > 2:  # Filter out very short matches
@@ -147,34 +338,29 @@ class AutoMemoryExtractor:
         
         return memories
 
-    def _extract_important_facts(self, text: str, user_id: str) -> List[Dict[str, Any]]:
+    def _extract_important_facts(self, text: str) -> List[Dict[str, Any]]:
         """Extract important facts from text."""
         memories = []
         text_lower = text.lower()
         
         # Check for importance indicators
-        has_importance_indicator = any(keyword in text_lower for keyword in self.IMPORTANCE_KEYWORDS)
+        has_importance_indicator = bool(self.engine.importance_keywords.search(text_lower))
         
         # Check for important topics
-        has_important_topic = any(topic in text_lower for topic in self.IMPORTANT_TOPICS)
+        has_important_topic = bool(self.engine.important_topics.search(text_lower))
         
-        # Extract sentences that might contain important facts
-        sentences = re.split(r'[.!?]+', text)
-        for sentence in sentences:
+        # Sentences are substrings of the text, so they can only contain a
+        # keyword or topic if the whole text does
+        for sentence in self.engine.sentence_split.split(text):
             sentence = sentence.strip()
             if len(sentence) < 10:  # Skip very short sentences
                 continue
-                
-            sentence_lower = sentence.lower()
             
             # Check if sentence contains important information
             important = (
                 has_importance_indicator or
                 has_important_topic or
-                any(topic in sentence_lower for topic in self.IMPORTANT_TOPICS) or
-                any(keyword in sentence_lower for keyword in self.IMPORTANCE_KEYWORDS) or
-                re.search(r'(?:i have|i own|i bought|i got|i created)', sentence_lower) or
-                re.search(r'(?:i will|i am going|i plan to)', sentence_lower)
+                self.engine.facts.search(sentence.lower())
             )
             
             if important:
@@ -188,21 +374,14 @@ class AutoMemoryExtractor:
         
         return memories
 
-    def _extract_preferences(self, text: str, user_id: str) -> List[Dict[str, Any]]:
+    def _extract_preferences(self, text: str, active: Set[str]) -> List[Dict[str, Any]]:
         """Extract user preferences and opinions."""
         memories = []
         
-        # Preference patterns
-        preference_patterns = [
-            r"(?:i love|i really like|i enjoy|i prefer)\s+([^.!?]+)",
-            r"(?:i hate|i dislike|i can't stand)\s+([^.!?]+)",
-            r"(?:my favorite|favorite)\s+([^.!?]+)",
-            r"(?:i think|i feel|i believe)\s+([^.!?]+)",
-        ]
-        
-        for pattern in preference_patterns:
-            matches = re.finditer(pattern, text, re.IGNORECASE)
-            for match in matches:
+        for pattern, regex in self.engine.preferences:
+            if pattern not in active:
+                continue
+            for match in regex.finditer(text):
                 preference = match.group(1).strip()
                 if len(preference) > 3:
                     # Determine if it's a like or dislike
@@ -224,14 +403,14 @@ class AutoMemoryExtractor:
         
         return memories
 
-    def _extract_context(self, text: str, user_id: str) -> List[Dict[str, Any]]:
+    def _extract_context(self, text: str, active: Set[str]) -> List[Dict[str, Any]]:
         """Extract contextual information about what user is doing."""
         memories = []
         
-        # Context patterns
-        for pattern in self.CONTEXT_PATTERNS:
-            matches = re.finditer(pattern, text, re.IGNORECASE)
-            for match in matches:
+        for pattern, regex in self.engine.context:
+            if pattern not in active:
+                continue
+            for match in regex.finditer(text):
                 context = match.group(0).strip()
                 if len(context) > 10:
                     memories.append({
@@ -244,20 +423,14 @@ class AutoMemoryExtractor:
         
         return memories
 
-    def _extract_relationships(self, text: str, user_id: str) -> List[Dict[str, Any]]:
+    def _extract_relationships(self, text: str, active: Set[str]) -> List[Dict[str, Any]]:
         """Extract information about relationships."""
         memories = []
-        text_lower = text.lower()
-        
-        # Relationship keywords
-        relationship_patterns = [
-            r"(?:my \w+)\s+(?:is|are)\s+([^.!?]+)",
-            r"(?:i have a|i have an)\s+(?:\w+\s+)?(friend|brother|sister|mother|father|son|daughter|husband|wife|partner|girlfriend|boyfriend)\s+([^.!?]+)?",
-        ]
         
-        for pattern in relationship_patterns:
-            matches = re.finditer(pattern, text, re.IGNORECASE)
-            for match in matches:
+        for pattern, regex in self.engine.relationships:
+            if pattern not in active:
+                continue
+            for match in regex.finditer(text):
                 relationship_info = match.group(0).strip()
                 if len(relationship_info) > 5:
                     memories.append({
@@ -311,8 +484,6 @@ class AutoMemoryExtractor:
         
         Returns a list of success indicators for each memory.
         """
-        results = []
-        
         try:
             # Import here to avoid circular dependencies
             from memory import memory_backend
@@ -321,40 +492,29 @@ class AutoMemoryExtractor:
                 logger.warning("Memory backend not available, skipping auto memory storage")
                 return [False] * len(memories)
             
+            extracted_at = datetime.datetime.utcnow().isoformat()
+            items = []
             for memory in memories:
-                try:
-                    # Create a unique memory key from type, category, and timestamp/hash
-                    import hashlib
-                    import time
-                    # Create a short hash from the information content to ensure uniqueness
-                    content_hash = hashlib.md5(memory.get("information", "").encode()).hexdigest()[:8]
-                    memory_key = f"{memory['type']}_{memory['category']}_{content_hash}"
-                    
-                    # Store additional metadata
-                    metadata = {
-                        "source": memory.get("source", "auto_extracted"),
-                        "confidence": memory.get("confidence", 1.0),
-                        "extracted_at": datetime.datetime.utcnow().isoformat()
-                    }
-                    
-                    # Store the memory
-                    success = await memory_backend.store(
-                        user_id=user_id,
-                        key=memory_key,
-                        value=memory.get("information", ""),
-                        metadata=metadata
-                    )
-                    
-                    results.append(success)
-                    
-                    if success:
-                        logger.debug(f"Stored auto-extracted memory for user {user_id}: {memory_key}")
-                    else:
-                        logger.warning(f"Failed to store memory for user {user_id}: {memory_key}")
-                        
-                except Exception as e:
-                    logger.error(f"Error storing individual memory: {e}")
-                    results.append(False)
+                # Create a short hash from the information content to ensure uniqueness
+                content_hash = hashlib.md5(memory.get("information", "").encode()).hexdigest()[:8]
+                memory_key = f"{memory['type']}_{memory['category']}_{content_hash}"
+                
+                # Store additional metadata
+                metadata = {
+                    "source": memory.get("source", "auto_extracted"),
+                    "confidence": memory.get("confidence", 1.0),
+                    "extracted_at": extracted_at
+                }
+                items.append((memory_key, memory.get("information", ""), metadata))
+            
+            # Store every memory of the message in one batch
+            results = await memory_backend.store_many(user_id, items)
+            
+            for (memory_key, _, _), success in zip(items, results):
+                if success:
+                    logger.debug(f"Stored auto-extracted memory for user {user_id}: {memory_key}")
+                else:
+                    logger.warning(f"Failed to store memory for user {user_id}: {memory_key}")
                     
         except ImportError as e:
             logger.error(f"Memory backend import error: {e}")
@@ -366,6 +526,10 @@ class AutoMemoryExtractor:
         return results
 
 
+# Shared extractor instance, its compiled patterns are reused across messages
+auto_memory_extractor = AutoMemoryExtractor()
+
+
 class MemoryCleanupManager:
     """
     Manages cleanup of old memories to prevent bloat.
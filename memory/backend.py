@@ -5,7 +5,7 @@ This module provides a unified interface for all memory operations,
 supporting multiple backend implementations with automatic failover.
 """
 from abc import ABC, abstractmethod
-from typing import Dict, Optional, Any, List
+from typing import Dict, Optional, Any, List, Tuple
 from dataclasses import dataclass
 import time
 import logging
@@ -53,6 +53,22 @@ class MemoryEntry:
             metadata=data.get("metadata", {})
         )
 
+def entry_confidence(entry: MemoryEntry) -> float:
+    """Confidence of an entry, memories without one are fully trusted"""
+    if entry.metadata:
+        return entry.metadata.get('confidence', 1.0)
+    return 1.0
+
+
+def filter_entries(
+    entries: List[MemoryEntry], min_confidence: float = 0.0, limit: Optional[int] = None
+) -> List[MemoryEntry]:
+    """Drop entries below min_confidence and order the rest by recency"""
+    entries = [entry for entry in entries if entry_confidence(entry) >= min_confidence]
+    entries.sort(key=lambda x: x.updated_at, reverse=True)
+    return entries[:limit] if limit is not None else entries
+
+
 class MemoryBackend(ABC):
     """Abstract base class for all memory backends"""
 
@@ -69,6 +85,28 @@ class MemoryBackend(ABC):
         """Retrieve a specific memory entry"""
         pass
 
+    async def store_many(
+        self, user_id: str, items: List[Tuple[str, str, Optional[Dict]]]
+    ) -> List[bool]:
+        """Store several (key, value, metadata) entries for a user
+
+        Backends with a bulk write should override this; the default stores
+        the entries one at a time.
+        """
+        return [await self.store(user_id, key, value, metadata) for key, value, metadata in items]
+
+    async def retrieve_many(self, user_id: str, keys: List[str]) -> Dict[str, MemoryEntry]:
+        """Retrieve several entries of a user, keyed by memory key
+
+        Missing keys are left out. The default retrieves them one at a time.
+        """
+        entries = {}
+        for key in keys:
+            entry = await self.retrieve(user_id, key)
+            if entry is not None:
+                entries[key] = entry
+        return entries
+
     @abstractmethod
     async def search(self, user_id: str, query: Optional[str] = None, limit: int = 10) -> List[MemoryEntry]:
         """Search memory entries for a user"""
@@ -79,6 +117,17 @@ class MemoryBackend(ABC):
         """Get all memory entries for a user as key-value pairs"""
         pass
 
+    async def get_entries(
+        self, user_id: str, min_confidence: float = 0.0, limit: Optional[int] = None
+    ) -> List[MemoryEntry]:
+        """Get a user's memories as full entries, most recently updated first
+
+        Backends should override this with a single bulk query; the default
+        lists entries through search().
+        """
+        entries = await self.search(user_id, None, limit or 1000)
+        return filter_entries(entries, min_confidence, limit)
+
     @abstractmethod
     async def delete(self, user_id: str, key: Optional[str] = None) -> bool:
         """Delete memory entries (specific key or all for user)"""
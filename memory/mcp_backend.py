@@ -5,9 +5,10 @@ Implements the MemoryBackend interface using the MCP Memory Server.
 """
 import time
 import logging
-from typing import Dict, Optional, Any, List
+from datetime import datetime, timezone
+from typing import Dict, Optional, Any, List, Tuple
 
-from .backend import MemoryBackend, MemoryConfig, MemoryEntry
+from .backend import MemoryBackend, MemoryConfig, MemoryEntry, filter_entries
 
 logger = logging.getLogger(__name__)
 
@@ -36,6 +37,39 @@ class MCPMemoryBackend(MemoryBackend):
             logger.error(f"MCP memory store failed: {e}")
             return False
 
+    async def store_many(
+        self, user_id: str, items: List[Tuple[str, str, Optional[Dict]]]
+    ) -> List[bool]:
+        """Store several memory entries with a single batch request"""
+        try:
+            result = await self.mcp_client.batch_store_memories(
+                [
+                    {"user_id": user_id, "information_type": key, "information": value}
+                    for key, value, _ in items
+                ]
+            )
+            success = "error" not in result
+        except Exception as e:
+            logger.error(f"MCP memory batch store failed: {e}")
+            success = False
+        return [success] * len(items)
+
+    async def retrieve_many(self, user_id: str, keys: List[str]) -> Dict[str, MemoryEntry]:
+        """Retrieve several memory entries with a single batch request"""
+        entries: Dict[str, MemoryEntry] = {}
+        try:
+            results = await self.mcp_client.batch_get_memories(
+                [user_id], information_types=keys, limit=1000
+            )
+            user_results = (results or {}).get("results", {}).get(user_id, {})
+            # Memories are newest first, keep the latest value of each key
+            for memory in user_results.get("memories", []):
+                entry = self._to_entry(user_id, memory)
+                entries.setdefault(entry.key, entry)
+        except Exception as e:
+            logger.error(f"MCP memory batch retrieve failed: {e}")
+        return entries
+
     async def retrieve(self, user_id: str, key: str) -> Optional[MemoryEntry]:
         """Retrieve a specific memory entry from MCP server"""
         try:
@@ -44,15 +78,9 @@ class MCPMemoryBackend(MemoryBackend):
             results = await self.mcp_client.search_user_memory(user_id, key)
             if results and "memories" in results:
                 for memory in results["memories"]:
-                    if memory.get("key") == key:
-                        return MemoryEntry(
-                            user_id=user_id,
-                            key=memory["key"],
-                            value=memory.get("value", ""),
-                            created_at=memory.get("created_at", time.time()),
-                            updated_at=memory.get("updated_at", time.time()),
-                            metadata=memory.get("metadata", {})
-                        )
+                    entry = self._to_entry(user_id, memory)
+                    if entry.key == key:
+                        return entry
         except Exception as e:
             logger.error(f"MCP memory retrieve failed: {e}")
         return None
@@ -60,37 +88,76 @@ class MCPMemoryBackend(MemoryBackend):
     async def search(self, user_id: str, query: Optional[str] = None, limit: int = 10) -> List[MemoryEntry]:
         """Search memory entries in MCP server"""
         try:
-            results = await self.mcp_client.search_user_memory(user_id, query)
+            results = await self.mcp_client.search_user_memory(user_id, query, limit=limit)
             entries = []
 
             if results and "memories" in results:
                 for memory in results["memories"][:limit]:
-                    entries.append(MemoryEntry(
-                        user_id=user_id,
-                        key=memory.get("key", ""),
-                        value=memory.get("value", ""),
-                        created_at=memory.get("created_at", time.time()),
-                        updated_at=memory.get("updated_at", time.time()),
-                        metadata=memory.get("metadata", {})
-                    ))
+                    entries.append(self._to_entry(user_id, memory))
 
             return entries
         except Exception as e:
             logger.error(f"MCP memory search failed: {e}")
             return []
 
+    async def get_entries(
+        self, user_id: str, min_confidence: float = 0.0, limit: Optional[int] = None
+    ) -> List[MemoryEntry]:
+        """Get all of a user's memories with metadata in one request"""
+        try:
+            results = await self.mcp_client.get_user_memories(user_id, limit=limit or 1000)
+            entries = [
+                self._to_entry(user_id, memory)
+                for memory in (results or {}).get("memories", [])
+            ]
+            return filter_entries(
+                [entry for entry in entries if entry.key], min_confidence, limit
+            )
+        except Exception as e:
+            logger.error(f"MCP get_entries failed: {e}")
+            return []
+
+    @staticmethod
+    def _to_entry(user_id: str, memory: Dict[str, Any]) -> MemoryEntry:
+        """Build a MemoryEntry from a memory returned by the MCP server
+
+        The server stores memories as information_type/information with ISO
+        timestamps, older responses used key/value.
+        """
+        def timestamp(value) -> float:
+            if isinstance(value, (int, float)):
+                return float(value)
+            try:
+                parsed = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+            except ValueError:
+                return time.time()
+            if parsed.tzinfo is None:
+                parsed = parsed.replace(tzinfo=timezone.utc)
+            return parsed.timestamp()
+
+        created_at = timestamp(memory.get("created_at", time.time()))
+        return MemoryEntry(
+            user_id=user_id,
+            key=memory.get("key") or memory.get("information_type", ""),
+            value=memory.get("value") or memory.get("information", ""),
+            created_at=created_at,
+            updated_at=timestamp(memory.get("updated_at") or memory.get("timestamp") or created_at),
+            metadata=memory.get("metadata", {})
+        )
+
     async def get_all(self, user_id: str) -> Dict[str, str]:
         """Get all memory entries for a user from MCP server"""
         try:
+            # Unchanged memories are revalidated by ETag instead of re-sent
             results = await self.mcp_client.get_user_memories(user_id, limit=1000)
             memories = {}
 
             if results and "memories" in results:
+                # Memories are newest first, keep the latest value of each key
                 for memory in results["memories"]:
-                    key = memory.get("key", "")
-                    value = memory.get("value", "")
-                    if key:
-                        memories[key] = value
+                    entry = self._to_entry(user_id, memory)
+                    if entry.key:
+                        memories.setdefault(entry.key, entry.value)
 
             return memories
         except Exception as e:
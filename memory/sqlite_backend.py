@@ -3,14 +3,54 @@ SQLite Memory Backend
 
 Implements the MemoryBackend interface using the existing SQLite database.
 """
+import re
 import time
 import logging
+from datetime import datetime, timezone
 from typing import Dict, Optional, Any, List
 
-from .backend import MemoryBackend, MemoryConfig, MemoryEntry
+from .backend import MemoryBackend, MemoryConfig, MemoryEntry, filter_entries
 
 logger = logging.getLogger(__name__)
 
+# Words too common to say anything about which memory is relevant
+SEARCH_STOP_WORDS = frozenset({
+    'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for',
+    'of', 'with', 'by', 'is', 'are', 'was', 'were', 'be', 'been', 'have',
+    'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could', 'should',
+    'i', 'you', 'he', 'she', 'it', 'we', 'they', 'me', 'him', 'her', 'us',
+    'them', 'my', 'your', 'his', 'its', 'our', 'their', 'what', 'when',
+    'where', 'why', 'how', 'who', 'which', 'that', 'this', 'these', 'those',
+    'can', 'may', 'might', 'must', 'shall', 'hi', 'hello', 'hey', 'thanks',
+    'thank', 'yes', 'no', 'ok', 'okay', 'yeah', 'yep', 'nope', 'about',
+    'just', 'so', 'not', 'if', 'im', 'dont', 'know', 'tell', 'any',
+})
+
+# Upper bound on terms per query, long messages add little beyond this
+MAX_SEARCH_TERMS = 16
+
+
+def tokenize_query(query: str) -> List[str]:
+    """Split a free-text query into distinct search terms"""
+    terms = []
+    for word in re.findall(r"\w+", query.lower()):
+        if len(word) > 1 and word not in SEARCH_STOP_WORDS and word not in terms:
+            terms.append(word)
+    return terms[:MAX_SEARCH_TERMS]
+
+
+def parse_db_timestamp(value: Optional[str]) -> float:
+    """Convert a SQLite CURRENT_TIMESTAMP string (UTC) into a Unix timestamp"""
+    if not value:
+        return time.time()
+    try:
+        parsed = datetime.fromisoformat(str(value))
+    except ValueError:
+        return time.time()
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
 class SQLiteMemoryBackend(MemoryBackend):
     """SQLite-based memory backend using existing database"""
 
@@ -45,31 +85,44 @@ class SQLiteMemoryBackend(MemoryBackend):
         return None
 
     async def search(self, user_id: str, query: Optional[str] = None, limit: int = 10) -> List[MemoryEntry]:
-        """Search memory entries in SQLite (basic implementation)"""
+        """Search memory entries in SQLite, ranked by BM25 relevance
+
+        Without a query the most recently updated memories are returned.
+        """
         try:
-            # Get all memories for user
-            all_memories = await self.db.aget_memories(user_id)
-            entries = []
-
-            # Filter by query if provided
-            for key, value in all_memories.items():
-                if not query or query.lower() in key.lower() or query.lower() in value.lower():
-                    entries.append(MemoryEntry(
-                        user_id=user_id,
-                        key=key,
-                        value=value,
-                        created_at=time.time(),
-                        updated_at=time.time(),
-                        metadata=None
-                    ))
-
-            # Sort by key (basic ordering) and limit
-            entries.sort(key=lambda x: x.key)
-            return entries[:limit]
+            if query:
+                rows = await self.db.asearch_memories(user_id, tokenize_query(query), limit)
+            else:
+                rows = await self.db.aget_memory_rows(user_id, limit)
+            return [self._to_entry(user_id, row) for row in rows]
         except Exception as e:
             logger.error(f"SQLite memory search failed: {e}")
             return []
 
+    @staticmethod
+    def _to_entry(user_id: str, row: Dict[str, Any]) -> MemoryEntry:
+        """Build a MemoryEntry from a memories row"""
+        return MemoryEntry(
+            user_id=user_id,
+            key=row["key"],
+            value=row["value"],
+            created_at=parse_db_timestamp(row["created_at"]),
+            updated_at=parse_db_timestamp(row["updated_at"]),
+            metadata=None  # SQLite doesn't support metadata
+        )
+
+    async def get_entries(
+        self, user_id: str, min_confidence: float = 0.0, limit: Optional[int] = None
+    ) -> List[MemoryEntry]:
+        """Get all of a user's memories with timestamps in one query"""
+        try:
+            rows = await self.db.aget_memory_rows(user_id, limit)
+            entries = [self._to_entry(user_id, row) for row in rows]
+            return filter_entries(entries, min_confidence, limit)
+        except Exception as e:
+            logger.error(f"SQLite get_entries failed: {e}")
+            return []
+
     async def get_all(self, user_id: str) -> Dict[str, str]:
         """Get all memory entries for a user as key-value pairs"""
         try:
@@ -6,26 +6,68 @@ Manages multiple memory backends with automatic failover and load balancing.
 import asyncio
 import time
 import logging
-from typing import Dict, Optional, Any, List, Tuple
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, List, Tuple
 
-from .backend import MemoryBackend, MemoryConfig, MemoryEntry
+from .backend import MemoryBackend, MemoryConfig, MemoryEntry, filter_entries
 
 logger = logging.getLogger(__name__)
 
+# Health scores are an exponential moving average of call outcomes (1 = ok)
+HEALTH_SCORE_DECAY = 0.8
+# Backends scoring below this are routed after the healthy ones
+HEALTHY_SCORE_THRESHOLD = 0.5
+
+
+@dataclass
+class BackendHealth:
+    """Rolling health of one backend, fed by every routed call"""
+    score: float = 1.0
+    latency: float = 0.0
+    failures: int = 0
+    timeouts: int = 0
+
+    @property
+    def healthy(self) -> bool:
+        return self.score >= HEALTHY_SCORE_THRESHOLD
+
+
 class UnifiedMemoryBackend:
     """
     Unified memory backend that manages multiple backends with automatic failover
     and load balancing capabilities.
+
+    Operations fan out to all backends concurrently, each bounded by its
+    MemoryConfig.timeout, so a slow backend never delays the others. Calls
+    are routed through a cached table ordered by health and priority.
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        backends: Optional[Dict[str, MemoryBackend]] = None,
+        read_mode: Optional[str] = None,
+        async_replication: Optional[bool] = None,
+    ):
+        from config import MEMORY_ASYNC_REPLICATION, MEMORY_READ_MODE
+
+        self.read_mode = read_mode or MEMORY_READ_MODE
+        self.async_replication = (
+            MEMORY_ASYNC_REPLICATION if async_replication is None else async_replication
+        )
+        self.health: Dict[str, BackendHealth] = {}
+        self._routing_table: Optional[List[Tuple[str, MemoryBackend]]] = None
+        self._replication_tasks: set = set()
+
         self.backends: Dict[str, MemoryBackend] = {}
-        self._initialize_backends()
+        if backends is None:
+            self._initialize_backends()
+        else:
+            self.backends.update(backends)
 
     def _initialize_backends(self):
         """Initialize all available memory backends"""
         from data.database import db
-        from tools.mcp_memory_client import MCPMemoryClient
+        from tools.mcp_memory_client import mcp_memory_client
         from config import MCP_MEMORY_ENABLED
 
         # Always add SQLite backend (primary/fallback)
@@ -35,9 +77,8 @@ class UnifiedMemoryBackend:
         # Add MCP backend if enabled (higher priority)
         if MCP_MEMORY_ENABLED:
             try:
-                mcp_client = MCPMemoryClient()
                 mcp_config = MemoryConfig(enabled=True, priority=2)  # Higher priority
-                self.backends["mcp"] = self._create_mcp_backend(mcp_config, mcp_client)
+                self.backends["mcp"] = self._create_mcp_backend(mcp_config, mcp_memory_client)
                 logger.info("MCP memory backend initialized")
             except Exception as e:
                 logger.warning(f"Failed to initialize MCP memory backend: {e}")
@@ -58,48 +99,229 @@ class UnifiedMemoryBackend:
         mcp_module = importlib.import_module('memory.mcp_backend')
         return mcp_module.MCPMemoryBackend(config, mcp_client)
 
+    async def _call(
+        self, name: str, backend: MemoryBackend, operation: str, *args
+    ) -> Any:
+        """Run one backend operation under its timeout and record its health"""
+        health = self.health.setdefault(name, BackendHealth())
+        was_healthy = health.healthy
+        start_time = time.monotonic()
+        ok = False
+        cancelled = False
+        try:
+            result = await asyncio.wait_for(
+                getattr(backend, operation)(*args), timeout=backend.config.timeout
+            )
+            ok = result is not False
+        except asyncio.CancelledError:
+            # A losing read in "first" mode; says nothing about its health
+            cancelled = True
+            raise
+        except asyncio.TimeoutError:
+            health.timeouts += 1
+            logger.warning(f"Memory backend {name} timed out on {operation} after {backend.config.timeout}s")
+            raise
+        finally:
+            if not cancelled:
+                self._record_health(name, health, was_healthy, ok, time.monotonic() - start_time)
+        return result
+
+    def _record_health(
+        self, name: str, health: BackendHealth, was_healthy: bool, ok: bool, elapsed: float
+    ):
+        """Fold one call's outcome and latency into the backend's health"""
+        health.latency = (
+            HEALTH_SCORE_DECAY * health.latency
+            + (1 - HEALTH_SCORE_DECAY) * elapsed
+        )
+        health.score = HEALTH_SCORE_DECAY * health.score + (1 - HEALTH_SCORE_DECAY) * (1.0 if ok else 0.0)
+        if not ok:
+            health.failures += 1
+        if health.healthy != was_healthy:
+            logger.info(
+                f"Memory backend {name} is now {'healthy' if health.healthy else 'unhealthy'} "
+                f"(score {health.score:.2f})"
+            )
+            self._routing_table = None
+
+    async def _fan_out(self, operation: str, *args) -> List[Tuple[str, Any]]:
+        """Run an operation on every backend concurrently
+
+        Returns (backend_name, result) in routing order; failed backends
+        are logged and left out.
+        """
+        routes = self._get_backends_by_priority()
+        results = await asyncio.gather(
+            *(self._call(name, backend, operation, *args) for name, backend in routes),
+            return_exceptions=True,
+        )
+
+        succeeded = []
+        for (name, _), result in zip(routes, results):
+            if isinstance(result, BaseException):
+                if not isinstance(result, asyncio.TimeoutError):
+                    logger.error(f"Error in {operation} on {name}: {result}")
+            else:
+                succeeded.append((name, result))
+        return succeeded
+
+    async def _first_result(
+        self, operation: str, *args, accept: Callable[[Any], bool] = bool
+    ) -> Optional[Any]:
+        """Return the first accepted result of a read operation
+
+        With read_mode "first" the fastest backend with a result wins and
+        the others are cancelled; otherwise all backends are awaited and the
+        first accepted result in routing order is used.
+        """
+        if self.read_mode != "first":
+            for _, result in await self._fan_out(operation, *args):
+                if accept(result):
+                    return result
+            return None
+
+        pending = {
+            asyncio.ensure_future(self._call(name, backend, operation, *args)): name
+            for name, backend in self._get_backends_by_priority()
+        }
+        try:
+            while pending:
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    name = pending.pop(task)
+                    try:
+                        result = task.result()
+                    except asyncio.TimeoutError:
+                        continue
+                    except Exception as e:
+                        logger.error(f"Error in {operation} on {name}: {e}")
+                        continue
+                    if accept(result):
+                        logger.debug(f"{operation} answered by {name}")
+                        return result
+            return None
+        finally:
+            for task in pending:
+                task.cancel()
+
     async def store(self, user_id: str, key: str, value: str, metadata: Optional[Dict] = None) -> bool:
-        """Store to all available backends"""
-        success_count = 0
+        """Store to all available backends
+
+        With async replication the call returns once the primary (first
+        healthy) backend has stored the memory; the other backends are
+        written in the background. If the primary fails, the remaining
+        backends are written directly.
+        """
+        results = await self._write("store", (user_id, key, value, metadata), accept=bool)
+        return any(results)
+
+    async def store_many(
+        self, user_id: str, items: List[Tuple[str, str, Optional[Dict]]]
+    ) -> List[bool]:
+        """Store several (key, value, metadata) entries with one call per backend
+
+        Replicated like store(); an entry counts as stored if any backend
+        that was awaited stored it.
+        """
+        if not items:
+            return []
+        results = await self._write("store_many", (user_id, items), accept=any)
+        return [any(stored) for stored in zip(*results)] if results else [False] * len(items)
+
+    async def _write(
+        self, operation: str, args: tuple, accept: Callable[[Any], bool]
+    ) -> List[Any]:
+        """Run a write on the primary backend and replicate it to the others
+
+        Returns the results of the backends that were awaited.
+        """
+        routes = self._get_backends_by_priority()
+        if not routes:
+            return []
+
+        if self.async_replication:
+            primary_name, primary = routes[0]
+            try:
+                result = await self._call(primary_name, primary, operation, *args)
+                if accept(result):
+                    logger.debug(f"Successfully ran {operation} on {primary_name}")
+                    for name, backend in routes[1:]:
+                        self._replicate(name, backend, operation, args, accept)
+                    return [result]
+                logger.warning(f"Failed to {operation} to {primary_name}")
+            except Exception as e:
+                logger.error(f"Error in {operation} on {primary_name}: {e}")
+            routes = routes[1:]
 
-        for backend_name, backend in self._get_backends_by_priority():
-            if backend.config.enabled:
-                try:
-                    if await backend.store(user_id, key, value, metadata):
-                        success_count += 1
-                        logger.debug(f"Successfully stored to {backend_name}")
-                    else:
-                        logger.warning(f"Failed to store to {backend_name}")
-                except Exception as e:
-                    logger.error(f"Error storing to {backend_name}: {e}")
+        results = await asyncio.gather(
+            *(self._call(name, backend, operation, *args) for name, backend in routes),
+            return_exceptions=True,
+        )
+        succeeded = []
+        for (name, _), result in zip(routes, results):
+            if isinstance(result, BaseException):
+                logger.error(f"Error in {operation} on {name}: {result}")
+            elif accept(result):
+                succeeded.append(result)
+                logger.debug(f"Successfully ran {operation} on {name}")
+            else:
+                logger.warning(f"Failed to {operation} to {name}")
 
-        return success_count > 0
+        return succeeded
 
-    async def retrieve(self, user_id: str, key: str) -> Optional[MemoryEntry]:
-        """Retrieve from highest priority healthy backend"""
-        for backend_name, backend in self._get_backends_by_priority():
-            if backend.config.enabled:
-                try:
-                    result = await backend.retrieve(user_id, key)
-                    if result:
-                        logger.debug(f"Retrieved from {backend_name}")
-                        return result
-                except Exception as e:
-                    logger.error(f"Error retrieving from {backend_name}: {e}")
+    def _replicate(
+        self, name: str, backend: MemoryBackend, operation: str, args: tuple, accept: Callable[[Any], bool]
+    ):
+        """Run a write on a secondary backend in the background"""
+        async def replicate():
+            try:
+                if not accept(await self._call(name, backend, operation, *args)):
+                    logger.warning(f"Failed to replicate {operation} to {name}")
+            except Exception as e:
+                logger.error(f"Error replicating {operation} to {name}: {e}")
 
-        return None
+        task = asyncio.ensure_future(replicate())
+        self._replication_tasks.add(task)
+        task.add_done_callback(self._replication_tasks.discard)
 
-    async def search(self, user_id: str, query: Optional[str] = None, limit: int = 10) -> List[MemoryEntry]:
-        """Search across all backends and merge results"""
-        all_results = []
+    async def wait_for_replication(self):
+        """Wait until background replication writes have finished"""
+        if self._replication_tasks:
+            await asyncio.gather(*list(self._replication_tasks), return_exceptions=True)
 
-        for backend_name, backend in self._get_backends_by_priority():
-            if backend.config.enabled:
-                try:
-                    results = await backend.search(user_id, query, limit)
-                    all_results.extend(results)
-                except Exception as e:
-                    logger.error(f"Error searching {backend_name}: {e}")
+    async def retrieve(self, user_id: str, key: str) -> Optional[MemoryEntry]:
+        """Retrieve from the first (or highest priority) backend that has the key"""
+        return await self._first_result("retrieve", user_id, key)
+
+    async def retrieve_many(self, user_id: str, keys: List[str]) -> Dict[str, MemoryEntry]:
+        """Retrieve several keys with one call per backend
+
+        In "first" read mode the first backend with any of the keys answers;
+        otherwise higher priority backends win for keys found in several.
+        """
+        if not keys:
+            return {}
+        if self.read_mode == "first":
+            return await self._first_result("retrieve_many", user_id, keys) or {}
+
+        merged: Dict[str, MemoryEntry] = {}
+        for _, entries in await self._fan_out("retrieve_many", user_id, keys):
+            for key, entry in entries.items():
+                merged.setdefault(key, entry)
+        return merged
+
+    async def search(self, user_id: str, query: Optional[str] = None, limit: int = 10) -> List[MemoryEntry]:
+        """Search backends for matching memories
+
+        In "first" read mode the first backend returning matches answers;
+        otherwise the results of all backends are merged.
+        """
+        if self.read_mode == "first":
+            all_results = await self._first_result("search", user_id, query, limit) or []
+        else:
+            all_results = []
+            for _, results in await self._fan_out("search", user_id, query, limit):
+                all_results.extend(results)
 
         # Remove duplicates (same user_id + key) and sort by priority/backend
         seen_keys = set()
@@ -111,8 +333,10 @@ class UnifiedMemoryBackend:
                 seen_keys.add(key)
                 unique_results.append(result)
 
-        # Sort by updated_at (most recent first)
-        unique_results.sort(key=lambda x: x.updated_at, reverse=True)
+        # Query results are already ranked by relevance, plain listings
+        # are ordered by updated_at (most recent first)
+        if not query:
+            unique_results.sort(key=lambda x: x.updated_at, reverse=True)
 
         return unique_results[:limit]
 
@@ -120,28 +344,40 @@ class UnifiedMemoryBackend:
         """Get all memories, merging from all backends"""
         all_memories = {}
 
-        for backend_name, backend in self._get_backends_by_priority():
-            if backend.config.enabled:
-                try:
-                    memories = await backend.get_all(user_id)
-                    all_memories.update(memories)  # Later backends override earlier ones
-                except Exception as e:
-                    logger.error(f"Error getting all from {backend_name}: {e}")
+        # Apply lowest priority first so higher priority backends override
+        for _, memories in reversed(await self._fan_out("get_all", user_id)):
+            all_memories.update(memories)
 
         return all_memories
 
+    async def get_entries(
+        self, user_id: str, min_confidence: float = 0.0, limit: Optional[int] = None
+    ) -> List[MemoryEntry]:
+        """Get full memory entries with one call per backend
+
+        In "first" read mode the first backend with entries answers;
+        otherwise entries of higher priority backends win for duplicate
+        keys. The result is filtered by confidence and ordered by recency.
+        """
+        if self.read_mode == "first":
+            entries = await self._first_result("get_entries", user_id, min_confidence) or []
+            return filter_entries(entries, min_confidence, limit)
+
+        merged: Dict[str, MemoryEntry] = {}
+        for _, entries in await self._fan_out("get_entries", user_id, min_confidence):
+            for entry in entries:
+                merged.setdefault(entry.key, entry)
+
+        return filter_entries(list(merged.values()), min_confidence, limit)
+
     async def delete(self, user_id: str, key: Optional[str] = None) -> bool:
         """Delete from all backends"""
         success_count = 0
 
-        for backend_name, backend in self._get_backends_by_priority():
-            if backend.config.enabled:
-                try:
-                    if await backend.delete(user_id, key):
-                        success_count += 1
-                        logger.debug(f"Successfully deleted from {backend_name}")
-                except Exception as e:
-                    logger.error(f"Error deleting from {backend_name}: {e}")
+        for name, result in await self._fan_out("delete", user_id, key):
+            if result:
+                success_count += 1
+                logger.debug(f"Successfully deleted from {name}")
 
         return success_count > 0
 
@@ -170,36 +406,50 @@ class UnifiedMemoryBackend:
 
     async def cleanup(self, max_age_days: int = 30) -> Dict[str, int]:
         """Clean up old entries in all backends"""
-        cleanup_results = {}
+        cleanup_results = {name: 0 for name, _ in self._get_backends_by_priority()}
 
-        for backend_name, backend in self.backends.items():
-            if backend.config.enabled:
-                try:
-                    cleaned = await backend.cleanup(max_age_days)
-                    cleanup_results[backend_name] = cleaned
-                except Exception as e:
-                    logger.error(f"Cleanup failed for {backend_name}: {e}")
-                    cleanup_results[backend_name] = 0
+        for name, cleaned in await self._fan_out("cleanup", max_age_days):
+            cleanup_results[name] = cleaned
 
         return cleanup_results
 
     def _get_backends_by_priority(self) -> List[Tuple[str, MemoryBackend]]:
-        """Get backends sorted by priority (highest first)"""
-        return sorted(
-            self.backends.items(),
-            key=lambda x: x[1].config.priority,
-            reverse=True
-        )
+        """Get enabled backends, healthy ones first, then by priority
+
+        The table is cached and only rebuilt when a backend's health flips
+        or the set of backends changes.
+        """
+        if self._routing_table is None or len(self._routing_table) != sum(
+            1 for backend in self.backends.values() if backend.config.enabled
+        ):
+            self._routing_table = sorted(
+                (
+                    (name, backend)
+                    for name, backend in self.backends.items()
+                    if backend.config.enabled
+                ),
+                key=lambda x: (
+                    self.health.get(x[0], BackendHealth()).healthy,
+                    x[1].config.priority,
+                ),
+                reverse=True,
+            )
+        return self._routing_table
 
     def get_backend_status(self) -> Dict[str, Dict]:
         """Get detailed status of all backends"""
         status = {}
         for name, backend in self.backends.items():
+            health = self.health.get(name, BackendHealth())
             status[name] = {
                 "enabled": backend.config.enabled,
                 "priority": backend.config.priority,
                 "type": backend.__class__.__name__,
-                "healthy": None  # Will be filled by health_check
+                "healthy": None,  # Will be filled by health_check
+                "health_score": round(health.score, 3),
+                "avg_latency": round(health.latency, 3),
+                "failures": health.failures,
+                "timeouts": health.timeouts,
             }
         return status
 
@@ -216,4 +466,4 @@ class UnifiedMemoryBackend:
             "total_backends": len(self.backends),
             "healthy_backends": sum(health.values()),
             "timestamp": time.time()
-        }
\ No newline at end of file
+        }
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Offline replay benchmark for the airdrop pipeline
+
+Replays recorded tip.cc embeds (tests/performance/fixtures/airdrop_embeds.json)
+through JakeyBot.process_airdrop_command using fake Discord objects. Each
+fixture's embed arrives after its recorded latency and button clicks take
+their recorded time, so the per-stage timings match what a live drop would
+see. Pass --no-delay to skip maybe_delay and typing_delay; the short smart
+delay of drops ending within 10s still applies.
+
+Usage: python tests/performance/benchmark_airdrop_replay.py [--rounds N] [--no-delay] [--fixtures PATH]
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+# Keep the replay's drop records and trivia writes out of the real databases
+os.environ["DATABASE_PATH"] = os.path.join(tempfile.mkdtemp(prefix="airdrop-replay-"), "jakey.db")
+os.environ["AIRDROP_SERVER_WHITELIST"] = ""
+os.environ["AIRDROP_IGNORE_USERS"] = ""
+
+# Add the project root to the path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+
+from bot.client import JakeyBot
+from data.database import db
+from data.trivia_index import TriviaAnswerIndex
+from utils.airdrop_correlator import AirdropCorrelator
+from utils.airdrop_metrics import STAGES, AirdropMetrics, summarize_drops
+from utils.trivia_manager import trivia_manager
+
+DEFAULT_FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "airdrop_embeds.json")
+DISCORD_EPOCH_MS = 1420070400000
+_increment = itertools.count()
+
+
+def snowflake_now() -> int:
+    """Unique snowflake ID for the current time"""
+    return int(time.time() * 1000 - DISCORD_EPOCH_MS) << 22 | next(_increment) % (1 << 22)
+
+
+class FakeButton:
+    def __init__(self, label: str, latency: float):
+        self.label = label
+        self.disabled = False
+        self.latency = latency
+        self.clicks = 0
+
+    async def click(self):
+        await asyncio.sleep(self.latency)
+        self.clicks += 1
+
+
+class FakeTyping:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class FakeChannel:
+    def __init__(self, channel_id: int, send_latency: float):
+        self.id = channel_id
+        self.name = f"replay-{channel_id}"
+        self.send_latency = send_latency
+        self.sent = []
+
+    def typing(self):
+        return FakeTyping()
+
+    async def send(self, content):
+        await asyncio.sleep(self.send_latency)
+        self.sent.append(content)
+
+
+class FakeEmbed:
+    def __init__(self, title: str, description: str, ends_in: float):
+        self.title = title
+        self.description = description
+        self.timestamp = datetime.now(timezone.utc) + timedelta(seconds=ends_in)
+
+
+class FakeRow:
+    def __init__(self, children):
+        self.children = children
+
+
+class FakeMessage:
+    def __init__(self, message_id, content, channel, guild_id=1, author_id=2, embeds=(), components=()):
+        self.id = message_id
+        self.content = content
+        self.channel = channel
+        self.guild = FakeGuild(guild_id)
+        self.author = FakeUser(author_id)
+        self.embeds = list(embeds)
+        self.components = list(components)
+
+
+class FakeGuild:
+    def __init__(self, guild_id):
+        self.id = guild_id
+
+
+class FakeUser:
+    def __init__(self, user_id):
+        self.id = user_id
+
+
+def make_bot(no_delay: bool) -> JakeyBot:
+    """A JakeyBot with only the state the airdrop handler uses"""
+    bot = JakeyBot.__new__(JakeyBot)
+    bot.db = db
+    bot.airdrop_correlator = AirdropCorrelator(8.0)
+    bot.airdrop_metrics = AirdropMetrics(db)
+    if no_delay:
+        async def no_wait(drop_ends_in):
+            return None
+
+        bot.maybe_delay = no_wait
+        bot.typing_delay = lambda text: 0
+    return bot
+
+
+def seed_trivia(fixtures):
+    """Make the fixture questions known to the trivia index"""
+    index = TriviaAnswerIndex(trivia_manager.index.fuzzy_threshold)
+    for fixture in fixtures:
+        if "known_answer" in fixture:
+            category = fixture["embed"]["title"].split("Trivia time - ")[1].strip()
+            question = fixture.get("known_question") or (
+                fixture["embed"]["description"].replace("**", "").split("*")[1].strip()
+            )
+            index.add(category, question, fixture["known_answer"])
+    index.ready = True
+    trivia_manager.index = index
+
+
+async def replay(bot: JakeyBot, fixture, channel_id: int):
+    """Replay one fixture, returning whether the bot gave the expected entry"""
+    channel = FakeChannel(channel_id, fixture["click_latency_ms"] / 1000)
+    trigger = FakeMessage(snowflake_now(), fixture["trigger"], channel)
+    bot.airdrop_correlator.register(channel_id, trigger.id)
+    handler = asyncio.create_task(bot.process_airdrop_command(trigger))
+
+    await asyncio.sleep(fixture["embed_latency_ms"] / 1000)
+    buttons = [FakeButton(label, fixture["click_latency_ms"] / 1000) for label in fixture["buttons"]]
+    embed = fixture["embed"]
+    tip_cc_message = FakeMessage(
+        snowflake_now(),
+        "",
+        channel,
+        embeds=[FakeEmbed(embed["title"], embed["description"], embed["ends_in"])],
+        components=[FakeRow(buttons)] if buttons else [],
+    )
+    bot.airdrop_correlator.resolve(tip_cc_message)
+    await handler
+
+    expect = fixture["expect"]
+    if "click" in expect:
+        return any(button.clicks and button.label == expect["click"] for button in buttons)
+    return expect["send"] in channel.sent
+
+
+def print_summary(title, rows):
+    summary = summarize_drops(rows)
+    print(f"\n{title}: {summary['drops']} drops, entered {summary['entered']}, outcomes {summary['outcomes']}")
+    print(f"  {'stage':<8} {'samples':>7} {'p50':>9} {'p95':>9} {'max':>9}")
+    for stage in STAGES + ("total",):
+        histogram = summary["total"] if stage == "total" else summary["stages"][stage]
+        if histogram["samples"]:
+            print(
+                f"  {stage:<8} {histogram['samples']:>7} "
+                f"{histogram['p50'] * 1000:>7.1f}ms {histogram['p95'] * 1000:>7.1f}ms "
+                f"{histogram['max'] * 1000:>7.1f}ms"
+            )
+
+
+async def run(fixtures, rounds: int, no_delay: bool):
+    bot = make_bot(no_delay)
+    seed_trivia(fixtures)
+
+    correct = 0
+    started = time.perf_counter()
+    for round_number in range(rounds):
+        # Every fixture replays concurrently in its own channel, like a busy server
+        results = await asyncio.gather(
+            *(
+                replay(bot, fixture, 1000 + round_number * len(fixtures) + position)
+                for position, fixture in enumerate(fixtures)
+            )
+        )
+        correct += sum(results)
+        for fixture, ok in zip(fixtures, results):
+            if not ok:
+                print(f"round {round_number + 1}: {fixture['name']} did not produce the expected entry")
+    elapsed = time.perf_counter() - started
+
+    rows = await bot.airdrop_metrics.get_recent(len(fixtures) * rounds)
+    print(f"Replayed {len(fixtures) * rounds} drops in {elapsed:.2f}s, {correct} correct entries")
+    print_summary("All drops", rows)
+    for drop_type in sorted({row["drop_type"] for row in rows}):
+        print_summary(drop_type, [row for row in rows if row["drop_type"] == drop_type])
+
+    correlator = bot.airdrop_correlator.get_stats()["latency"]
+    print(f"\nTrigger->embed (snowflakes): p50 {correlator['p50'] * 1000:.0f}ms, p95 {correlator['p95'] * 1000:.0f}ms")
+    await trivia_manager.flush()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--no-delay", action="store_true", help="skip maybe_delay and typing_delay")
+    parser.add_argument("--fixtures", default=DEFAULT_FIXTURES)
+    args = parser.parse_args()
+
+    with open(args.fixtures) as fixtures_file:
+        fixtures = json.load(fixtures_file)
+    asyncio.run(run(fixtures, args.rounds, args.no_delay))
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for automatic memory extraction
+
+Compares the shared extractor with the trigger prefilter against running
+every pattern, the old per-message construction, and the batch API.
+
+Usage: python tests/performance/benchmark_auto_memory.py [exchanges]
+"""
+
+import asyncio
+import os
+import random
+import sys
+import time
+
+# Add the project root to the path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+
+from memory.auto_memory_extractor import AutoMemoryExtractor, auto_memory_extractor
+
+USER_MESSAGES = [
+    "yo jakey what's the odds on the cowboys tonight",
+    "gg that was rigged lol",
+    "my name is Alex and I live in Las Vegas",
+    "I really love playing blackjack but I hate slots.",
+    "btw my birthday is March 3rd, 1990",
+    "tip me some bitcoin pls",
+    "I'm going home for dinner, I will travel to Japan next month",
+    "I have a brother who plays poker. My dog is Rex.",
+    "what is 2+2",
+    "remember that I work as a nurse",
+]
+BOT_RESPONSES = [
+    "lmao nah",
+    "cowboys -3.5, eddie says rigged",
+    "bet. noted.",
+    "that's wild, slots are rigged anyway",
+    "4, obviously",
+    "",
+]
+
+
+def make_exchanges(count: int):
+    random.seed(42)
+    return [
+        (str(random.randint(1, 50)), random.choice(USER_MESSAGES), random.choice(BOT_RESPONSES))
+        for _ in range(count)
+    ]
+
+
+def bench(label: str, func, exchanges, repeat: int = 3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(exchanges)
+        best = min(best, time.perf_counter() - start)
+    per_message = best / len(exchanges) * 1e6
+    print(f"{label:<32} {best * 1000:8.1f} ms  {per_message:7.1f} us/message")
+    return best
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    exchanges = make_exchanges(count)
+    print(f"Extracting memories from {count} exchanges")
+    print("-" * 64)
+
+    async def extract_each(make_extractor, items):
+        for user_id, user_message, bot_response in items:
+            await make_extractor().extract_memories_from_conversation(
+                user_message, bot_response, user_id
+            )
+
+    def shared(items):
+        asyncio.run(extract_each(lambda: auto_memory_extractor, items))
+
+    def every_pattern(items):
+        engine = auto_memory_extractor.engine
+        all_patterns = set(auto_memory_extractor.PATTERN_TRIGGERS) | engine.always_active
+        original = engine.active_patterns
+        engine.active_patterns = lambda text: all_patterns
+        try:
+            shared(items)
+        finally:
+            engine.active_patterns = original
+
+    def per_message_instance(items):
+        asyncio.run(extract_each(AutoMemoryExtractor, items))
+
+    def batch(items):
+        auto_memory_extractor.extract_batch(items)
+
+    baseline = bench("every pattern, per message", every_pattern, exchanges)
+    bench("new instance per message", per_message_instance, exchanges)
+    prefiltered = bench("shared, trigger prefilter", shared, exchanges)
+    batched = bench("extract_batch", batch, exchanges)
+    print("-" * 64)
+    print(f"prefilter speedup: {baseline / prefiltered:.2f}x, batch speedup: {baseline / batched:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for math drop evaluation
+
+Compares the shared evaluator, cold and with its LRU, against the old
+per-call AST evaluator, and times how quickly pathological powers are
+refused.
+
+Usage: python tests/performance/benchmark_math_eval.py [iterations]
+"""
+
+import ast
+import operator
+import os
+import random
+import re
+import sys
+import time
+
+# Add the project root to the path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+
+from utils.math_evaluator import MathError, MathEvaluator
+
+PATHOLOGICAL = ["9**9**9", "2**10**10", "(10**999)**2", "2.5**1000.5"]
+
+
+def legacy_safe_eval_math(expr: str):
+    """The evaluator JakeyBot used before, rebuilt on every call"""
+    if not re.match(r"^[\d\.\+\-\*/%\(\)\s]+$", expr):
+        return None
+
+    operators = {
+        ast.Add: operator.add,
+        ast.Sub: operator.sub,
+        ast.Mult: operator.mul,
+        ast.Div: operator.truediv,
+        ast.USub: operator.neg,
+        ast.UAdd: operator.pos,
+        ast.Pow: operator.pow,
+        ast.Mod: operator.mod,
+    }
+
+    def eval_expr(node):
+        if isinstance(node, ast.Constant):
+            return node.value
+        elif isinstance(node, ast.BinOp):
+            return operators[type(node.op)](eval_expr(node.left), eval_expr(node.right))
+        elif isinstance(node, ast.UnaryOp):
+            return operators[type(node.op)](eval_expr(node.operand))
+        raise TypeError(f"Unsupported node type: {type(node)}")
+
+    try:
+        answer = eval_expr(ast.parse(expr, mode="eval").body)
+    except (SyntaxError, TypeError, ValueError, ZeroDivisionError):
+        return None
+    return str(int(answer) if isinstance(answer, float) and answer.is_integer() else answer)
+
+
+def make_expressions(count: int):
+    """Expressions shaped like tip.cc math drops"""
+    random.seed(42)
+    expressions = []
+    for _ in range(count):
+        a, b, c, d = (random.randint(1, 99) for _ in range(4))
+        expressions.append(
+            random.choice(
+                [
+                    f"{a} + {b} * {c}",
+                    f"({a} + {b}) * {c} - {d}",
+                    f"{a} * {b} - {c} / {d}",
+                    f"{a}.{b} * {c} + {d}",
+                    f"{a} % {c} + {b} ** 2",
+                    f"-{a} + ({b} - {c}) * {d}",
+                ]
+            )
+        )
+    return expressions
+
+
+def time_calls(function, expressions):
+    started = time.perf_counter()
+    for expression in expressions:
+        function(expression)
+    return time.perf_counter() - started
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    expressions = make_expressions(iterations)
+    print(f"Evaluating {iterations} math drop expressions")
+
+    legacy = time_calls(legacy_safe_eval_math, expressions)
+    print(f"  legacy AST evaluator:    {legacy * 1000:8.1f}ms ({legacy / iterations * 1e6:.1f}us each)")
+
+    cold = time_calls(MathEvaluator(cache_size=0).solve, expressions)
+    print(
+        f"  shared evaluator, cold:  {cold * 1000:8.1f}ms ({cold / iterations * 1e6:.1f}us each, "
+        f"{legacy / cold:.1f}x)"
+    )
+
+    evaluator = MathEvaluator()
+    repeated = expressions[:200] * (iterations // 200)
+    evaluator_time = time_calls(evaluator.solve, repeated)
+    legacy_repeated = time_calls(legacy_safe_eval_math, repeated)
+    print(
+        f"  repeated drops, LRU:     {evaluator_time * 1000:8.1f}ms vs legacy {legacy_repeated * 1000:.1f}ms "
+        f"({legacy_repeated / evaluator_time:.1f}x)"
+    )
+
+    corrected = mismatches = 0
+    for expression in expressions[:2000]:
+        old, new = legacy_safe_eval_math(expression), evaluator.solve(expression)
+        if old == new:
+            continue
+        if abs(float(old) - float(new)) <= 1e-9 * max(1.0, abs(float(new))):
+            corrected += 1
+        else:
+            mismatches += 1
+    print(f"  answers fixed from float noise (e.g. 0.30000000000000004): {corrected} of 2000")
+    print(f"  answers differing from legacy otherwise: {mismatches}")
+
+    guard = MathEvaluator(cache_size=0)
+    for expression in PATHOLOGICAL:
+        started = time.perf_counter()
+        try:
+            guard.evaluate(expression)
+            outcome = "evaluated"
+        except MathError as e:
+            outcome = str(e)
+        print(f"  {expression:<14} {outcome:<18} in {(time.perf_counter() - started) * 1e6:.0f}us")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,15 +3,23 @@
 Tests for AI integration functionality
 """
 
+import asyncio
+import json
 import unittest
 import sys
 import os
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, AsyncMock, MagicMock
+
+from aiohttp import web
 
 # Add the project root to the path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
+from ai.ai_provider_manager import SimpleAIProviderManager
+from ai.clients.streaming import ChatCompletionAccumulator
+from ai.openrouter import OpenRouterAPI
 from ai.pollinations import PollinationsAPI
+from utils.helpers import StreamingReply
 
 class TestPollinationsAPI(unittest.TestCase):
     """Test cases for the PollinationsAPI class"""
@@ -57,5 +65,331 @@ class TestPollinationsAPI(unittest.TestCase):
         # This would normally make an API call
         self.assertTrue(callable(self.api.list_image_models))
 
+
+class TestAsyncProviderRequests(unittest.TestCase):
+    """Test the async request path against a local HTTP server"""
+
+    async def _start_server(self, status=200, body=None):
+        """Start a local chat-completions server and return (runner, url, requests)"""
+        received = []
+
+        async def handler(request):
+            received.append(await request.json())
+            return web.json_response(
+                body if body is not None else {"choices": [{"message": {"content": "gm"}}]},
+                status=status,
+            )
+
+        app = web.Application()
+        app.router.add_post("/openai", handler)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        return runner, f"http://127.0.0.1:{port}/openai", received
+
+    def test_pollinations_reuses_shared_session(self):
+        """Test that consecutive async calls share one keep-alive session"""
+        async def run():
+            runner, url, received = await self._start_server()
+            api = PollinationsAPI()
+            api.text_api_url = url
+            try:
+                first = await api.agenerate_text(messages=[{"role": "user", "content": "hi"}])
+                session = api._http._session
+                second = await api.agenerate_text(messages=[{"role": "user", "content": "hi"}])
+                return first, second, session is api._http._session, received
+            finally:
+                await api.aclose()
+                await runner.cleanup()
+
+        first, second, same_session, received = asyncio.run(run())
+        self.assertEqual(first["choices"][0]["message"]["content"], "gm")
+        self.assertEqual(second, first)
+        self.assertTrue(same_session)
+        self.assertEqual(len(received), 2)
+        self.assertEqual(received[0]["messages"], [{"role": "user", "content": "hi"}])
+
+    def test_pollinations_rate_limit_response(self):
+        """Test that an upstream 429 is reported as an error dict"""
+        async def run():
+            runner, url, _ = await self._start_server(status=429, body={})
+            api = PollinationsAPI()
+            api.text_api_url = url
+            try:
+                return await api.agenerate_text(messages=[{"role": "user", "content": "hi"}])
+            finally:
+                await api.aclose()
+                await runner.cleanup()
+
+        result = asyncio.run(run())
+        self.assertIn("Rate limit exceeded", result["error"])
+
+    def test_openrouter_async_generate_text(self):
+        """Test OpenRouter's async path sends the same payload as the sync path"""
+        async def run():
+            runner, url, received = await self._start_server()
+            api = OpenRouterAPI()
+            api.enabled = True
+            api.api_url = url
+            try:
+                result = await api.agenerate_text(
+                    messages=[{"role": "user", "content": "hi"}], model="test-model"
+                )
+                return result, received
+            finally:
+                await api.aclose()
+                await runner.cleanup()
+
+        result, received = asyncio.run(run())
+        self.assertEqual(result["choices"][0]["message"]["content"], "gm")
+        self.assertEqual(received[0]["model"], "test-model")
+        self.assertNotIn("tools", received[0])
+
+
+class TestHedgedRequests(unittest.TestCase):
+    """Test hedged requests across providers in SimpleAIProviderManager"""
+
+    def setUp(self):
+        self.manager = SimpleAIProviderManager()
+        self.manager.hedging_enabled = True
+        self.cancelled = []
+
+    def _fake_provider(self, name, delay, result):
+        """Replace a provider's agenerate_text with a delayed canned result"""
+        async def agenerate_text(**kwargs):
+            try:
+                await asyncio.sleep(delay)
+            except asyncio.CancelledError:
+                self.cancelled.append(name)
+                raise
+            return result
+
+        api = getattr(self.manager, f"{name}_api")
+        api.agenerate_text = agenerate_text
+
+    def test_fast_primary_does_not_hedge(self):
+        """Test that a primary answering before the hedge delay wins alone"""
+        self._fake_provider("openrouter", 0.01, {"choices": ["primary"]})
+        self._fake_provider("pollinations", 0.01, {"choices": ["secondary"]})
+
+        with patch("ai.ai_provider_manager.AI_HEDGE_DELAY", 0.5):
+            result = asyncio.run(self.manager.generate_text(messages=[]))
+
+        self.assertEqual(result, {"choices": ["primary"]})
+        stats = self.manager.get_statistics()["hedging"]
+        self.assertEqual(stats["hedges_launched"], 0)
+        self.assertEqual(stats["hedge_wins"], 0)
+
+    def test_slow_primary_is_hedged_and_cancelled(self):
+        """Test that a slow primary loses to the hedge and gets cancelled"""
+        self._fake_provider("openrouter", 5, {"choices": ["primary"]})
+        self._fake_provider("pollinations", 0.01, {"choices": ["secondary"]})
+
+        with patch("ai.ai_provider_manager.AI_HEDGE_DELAY", 0.05):
+            result = asyncio.run(self.manager.generate_text(messages=[]))
+
+        self.assertEqual(result, {"choices": ["secondary"]})
+        self.assertEqual(self.cancelled, ["openrouter"])
+        stats = self.manager.get_statistics()["hedging"]
+        self.assertEqual(stats["hedges_launched"], 1)
+        self.assertEqual(stats["hedge_wins"], 1)
+
+    def test_failed_primary_hedges_immediately(self):
+        """Test that a primary error starts the secondary without waiting"""
+        self._fake_provider("openrouter", 0, {"error": "boom"})
+        self._fake_provider("pollinations", 0, {"choices": ["secondary"]})
+
+        async def run():
+            loop = asyncio.get_running_loop()
+            start = loop.time()
+            result = await self.manager.generate_text(messages=[])
+            return result, loop.time() - start
+
+        with patch("ai.ai_provider_manager.AI_HEDGE_DELAY", 10):
+            result, elapsed = asyncio.run(run())
+
+        self.assertEqual(result, {"choices": ["secondary"]})
+        self.assertLess(elapsed, 1)
+        # A plain failover is not a hedge
+        stats = self.manager.get_statistics()
+        self.assertEqual(stats["hedging"]["hedges_launched"], 0)
+        self.assertEqual(stats["hedging"]["hedge_wins"], 0)
+        self.assertEqual(stats["failover_count"], 1)
+
+    def test_all_providers_fail(self):
+        """Test that the last error is returned when both providers fail"""
+        self._fake_provider("openrouter", 0, {"error": "primary down"})
+        self._fake_provider("pollinations", 0, {"error": "secondary down"})
+
+        result = asyncio.run(self.manager.generate_text(messages=[]))
+        self.assertEqual(result, {"error": "secondary down"})
+
+    def test_hedge_delay_uses_latency_percentile(self):
+        """Test that the hedge delay follows the primary's p95 latency"""
+        with patch("ai.ai_provider_manager.AI_HEDGE_DELAY", 4.0):
+            self.assertEqual(self.manager.get_hedge_delay("openrouter"), 4.0)
+
+            self.manager._latency_history["openrouter"].extend(
+                [1.0] * 95 + [9.0] * 5
+            )
+            self.assertEqual(self.manager.get_hedge_delay("openrouter"), 9.0)
+
+
+class TestStreamingResponses(unittest.TestCase):
+    """Test SSE streaming, chunk assembly and streamed failover"""
+
+    CHUNKS = [
+        {"choices": [{"index": 0, "delta": {"role": "assistant", "content": "g"}}]},
+        {"choices": [{"index": 0, "delta": {"content": "m "}}]},
+        {"choices": [{"index": 0, "delta": {"tool_calls": [
+            {"index": 0, "id": "call_a", "type": "function",
+             "function": {"name": "get_crypto_price", "arguments": "{\"sym"}}
+        ]}}]},
+        {"choices": [{"index": 0, "delta": {"tool_calls": [
+            {"index": 0, "function": {"arguments": "bol\": \"BTC\"}"}}
+        ]}}]},
+        {"choices": [{"index": 0, "delta": {}, "finish_reason": "tool_calls"}]},
+    ]
+
+    async def _start_sse_server(self, chunks):
+        """Start a local server streaming chunks as server-sent events"""
+        received = []
+
+        async def handler(request):
+            received.append(await request.json())
+            response = web.StreamResponse(
+                headers={"Content-Type": "text/event-stream"}
+            )
+            await response.prepare(request)
+            await response.write(b": keep-alive\n\n")
+            for chunk in chunks:
+                await response.write(f"data: {json.dumps(chunk)}\n\n".encode())
+            await response.write(b"data: [DONE]\n\n")
+            return response
+
+        app = web.Application()
+        app.router.add_post("/openai", handler)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        return runner, f"http://127.0.0.1:{port}/openai", received
+
+    def test_accumulator_assembles_content_and_tool_calls(self):
+        """Test that content and split tool-call arguments are merged"""
+        accumulator = ChatCompletionAccumulator()
+        texts = [accumulator.add_chunk(chunk) for chunk in self.CHUNKS]
+
+        self.assertEqual(texts, ["g", "m ", "", "", ""])
+        choice = accumulator.to_response()["choices"][0]
+        self.assertEqual(choice["finish_reason"], "tool_calls")
+        self.assertEqual(choice["message"]["content"], "gm ")
+        self.assertEqual(
+            choice["message"]["tool_calls"],
+            [{
+                "id": "call_a",
+                "type": "function",
+                "function": {
+                    "name": "get_crypto_price",
+                    "arguments": '{"symbol": "BTC"}',
+                },
+            }],
+        )
+
+    def test_pollinations_streams_sse_chunks(self):
+        """Test that Pollinations requests stream=true and yields each chunk"""
+        async def run():
+            runner, url, received = await self._start_sse_server(self.CHUNKS)
+            api = PollinationsAPI()
+            api.text_api_url = url
+            try:
+                chunks = [
+                    chunk async for chunk in
+                    api.astream_text(messages=[{"role": "user", "content": "hi"}])
+                ]
+                return chunks, received
+            finally:
+                await api.aclose()
+                await runner.cleanup()
+
+        chunks, received = asyncio.run(run())
+        self.assertEqual(chunks, self.CHUNKS)
+        self.assertTrue(received[0]["stream"])
+
+    def test_manager_stream_fails_over_before_first_chunk(self):
+        """Test that stream_text falls back and yields content then done"""
+        manager = SimpleAIProviderManager()
+
+        async def failing_stream(**kwargs):
+            yield {"error": "primary down"}
+
+        async def working_stream(**kwargs):
+            for chunk in self.CHUNKS:
+                yield chunk
+
+        manager.openrouter_api.astream_text = failing_stream
+        manager.pollinations_api.astream_text = working_stream
+
+        async def run():
+            return [event async for event in manager.stream_text(messages=[])]
+
+        events = asyncio.run(run())
+        self.assertEqual(
+            [e["text"] for e in events if e["type"] == "content"], ["g", "m "]
+        )
+        self.assertEqual(events[-1]["type"], "done")
+        message = events[-1]["response"]["choices"][0]["message"]
+        self.assertEqual(message["tool_calls"][0]["id"], "call_a")
+        self.assertEqual(manager.get_statistics()["failover_count"], 1)
+
+    def test_manager_stream_does_not_fail_over_mid_stream(self):
+        """Test that an error after streamed content ends the stream"""
+        manager = SimpleAIProviderManager()
+
+        async def broken_stream(**kwargs):
+            yield self.CHUNKS[0]
+            yield {"error": "connection reset"}
+
+        manager.openrouter_api.astream_text = broken_stream
+        manager.pollinations_api.astream_text = AsyncMock()
+
+        async def run():
+            return [event async for event in manager.stream_text(messages=[])]
+
+        events = asyncio.run(run())
+        self.assertEqual(events[-1], {"type": "error", "error": "connection reset"})
+        manager.pollinations_api.astream_text.assert_not_called()
+
+    def test_streaming_reply_coalesces_edits(self):
+        """Test that the reply is sent early and edits are rate limited"""
+        channel = MagicMock()
+        sent = MagicMock()
+        sent.edit = AsyncMock()
+        channel.send = AsyncMock(return_value=sent)
+        reply = StreamingReply(channel, edit_interval=60, min_first_chunk=5)
+
+        async def run():
+            await reply.append("gm")
+            await reply.append(" degens")
+            await reply.append(", lfg")
+            await reply.finish("gm degens, lfg")
+
+        asyncio.run(run())
+        channel.send.assert_called_once_with("gm degens")
+        sent.edit.assert_called_once_with(content="gm degens, lfg")
+
+    def test_streaming_reply_without_stream_sends_once(self):
+        """Test that finish() sends a plain message when nothing streamed"""
+        channel = MagicMock()
+        channel.send = AsyncMock()
+        reply = StreamingReply(channel)
+
+        asyncio.run(reply.finish("gm"))
+        channel.send.assert_called_once_with("gm")
+
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
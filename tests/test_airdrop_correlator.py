@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Tests for correlating airdrop triggers with tip.cc embeds
+"""
+
+import asyncio
+import os
+import sys
+import unittest
+from types import SimpleNamespace
+
+# Add the project root to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from utils.airdrop_correlator import AirdropCorrelator, is_airdrop_trigger
+
+
+def snowflake(ms):
+    """Snowflake ID created ms milliseconds after the Discord epoch"""
+    return ms << 22
+
+
+def embed_message(ms, channel_id=1):
+    """Fake tip.cc embed message"""
+    return SimpleNamespace(id=snowflake(ms), channel=SimpleNamespace(id=channel_id), embeds=["embed"])
+
+
+class TestAirdropCorrelator(unittest.TestCase):
+    """Test cases for the per-channel trigger registry"""
+
+    def setUp(self):
+        self.correlator = AirdropCorrelator(ttl=0.5)
+
+    def test_is_airdrop_trigger(self):
+        """Test the trigger prefixes"""
+        self.assertTrue(is_airdrop_trigger("$AirDrop 1 doge 10s"))
+        self.assertTrue(is_airdrop_trigger("$ triviadrop 5 ltc"))
+        self.assertFalse(is_airdrop_trigger("$tip @jakey 1 doge"))
+
+    def test_embed_resolves_waiting_trigger(self):
+        """Test that on_message hands the embed to the waiter with its latency"""
+
+        async def run():
+            waiter = asyncio.ensure_future(self.correlator.wait(1, snowflake(1000)))
+            await asyncio.sleep(0)
+            self.assertTrue(self.correlator.resolve(embed_message(1450)))
+            return await waiter
+
+        message = asyncio.run(run())
+
+        self.assertEqual(message.id, snowflake(1450))
+        stats = self.correlator.get_stats()
+        self.assertEqual((stats["resolved"], stats["pending"]), (1, 0))
+        self.assertAlmostEqual(stats["latency"]["max"], 0.45)
+
+    def test_embed_before_registration_is_claimed(self):
+        """Test that an embed seen before the trigger registers isn't lost"""
+
+        async def run():
+            self.assertFalse(self.correlator.resolve(embed_message(2300)))
+            return await self.correlator.wait(1, snowflake(2000))
+
+        message = asyncio.run(run())
+
+        self.assertEqual(message.id, snowflake(2300))
+        self.assertEqual(self.correlator.get_stats()["early_embeds"], 1)
+
+    def test_triggers_matched_in_order_per_channel(self):
+        """Test FIFO matching, channel isolation and embeds older than the trigger"""
+
+        async def run():
+            self.correlator.register(1, snowflake(100))
+            self.correlator.register(1, snowflake(200))
+            self.correlator.register(2, snowflake(150))
+            # Older than every trigger: not an answer to any of them
+            self.assertFalse(self.correlator.resolve(embed_message(50)))
+            self.correlator.resolve(embed_message(300, channel_id=1))
+            self.correlator.resolve(embed_message(310, channel_id=2))
+            self.correlator.resolve(embed_message(320, channel_id=1))
+            return [
+                (await self.correlator.wait(channel, snowflake(ms))).id
+                for channel, ms in ((1, 100), (1, 200), (2, 150))
+            ]
+
+        self.assertEqual(asyncio.run(run()), [snowflake(300), snowflake(320), snowflake(310)])
+
+    def test_lifetimes_are_bounded(self):
+        """Test that timeouts, abandoned triggers and stray embeds are cleaned up"""
+
+        async def run():
+            with self.assertRaises(asyncio.TimeoutError):
+                await self.correlator.wait(1, snowflake(100), timeout=0.05)
+            self.correlator.register(1, snowflake(200))
+            self.correlator.resolve(embed_message(50, channel_id=3))
+            await asyncio.sleep(0.6)
+            self.correlator.resolve(embed_message(400, channel_id=4))
+            await asyncio.sleep(0.6)
+            self.correlator.register(5, snowflake(500))
+
+        asyncio.run(run())
+
+        stats = self.correlator.get_stats()
+        self.assertEqual(
+            (stats["timeouts"], stats["expired"], stats["unmatched_embeds"]), (1, 1, 2)
+        )
+        self.assertEqual(stats["pending"], 1)
+        self.assertEqual(set(self.correlator._by_trigger), {snowflake(500)})
+        self.assertEqual(self.correlator._unclaimed, {})
+
+
+if __name__ == '__main__':
+    unittest.main()
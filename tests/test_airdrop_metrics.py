@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Tests for per-stage airdrop latency metrics
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import time
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+# Add the project root to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from data.database import DatabaseManager
+from utils.airdrop_metrics import AirdropMetrics, DropTrace, drop_type_of, summarize_drops
+
+
+def trigger_message(content="$mathdrop 1 doge 10s"):
+    """Fake trigger message"""
+    return SimpleNamespace(
+        id=123 << 22,
+        content=content,
+        channel=SimpleNamespace(id=1),
+        guild=SimpleNamespace(id=2),
+    )
+
+
+class TestAirdropMetrics(unittest.TestCase):
+    """Test cases for drop traces and their storage"""
+
+    def setUp(self):
+        self.test_db = tempfile.NamedTemporaryFile(delete=False, suffix='.db')
+        self.test_db.close()
+        with patch('data.database.DATABASE_PATH', self.test_db.name):
+            self.db = DatabaseManager()
+
+    def tearDown(self):
+        self.db.close()
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(self.test_db.name + suffix):
+                os.unlink(self.test_db.name + suffix)
+
+    def test_drop_type_of(self):
+        """Test the drop type is read from the trigger"""
+        self.assertEqual(drop_type_of("$TriviaDrop 1 ltc"), "triviadrop")
+        self.assertEqual(drop_type_of("$ airdrop 1 doge 10s"), "airdrop")
+        self.assertEqual(drop_type_of("$"), "unknown")
+
+    def test_trace_marks_stages(self):
+        """Test each mark gets the time since the previous one"""
+        trace = DropTrace("mathdrop")
+        with patch("utils.airdrop_metrics.time.monotonic", side_effect=[
+            trace.started + 0.5, trace.started + 0.5, trace.started + 0.75, trace.started + 1.0,
+        ]):
+            trace.mark("embed")
+            trace.mark("delay")
+            trace.mark("answer")
+            trace.mark("submit")
+        trace.finish("entered")
+        trace.finish("failed", "click")
+
+        row = trace.as_row()
+        self.assertEqual(row["outcome"], "entered")
+        self.assertIsNone(row["detail"])
+        self.assertEqual(row["embed_ms"], 500)
+        self.assertEqual(row["delay_ms"], 0)
+        self.assertEqual(row["answer_ms"], 250)
+        self.assertIsNone(row["typing_ms"])
+        self.assertEqual(row["submit_ms"], 250)
+        self.assertEqual(row["total_ms"], 1000)
+
+    def test_unfinished_trace_is_skipped(self):
+        """Test a trace without an outcome is stored as skipped"""
+        self.assertEqual(DropTrace("airdrop").as_row()["outcome"], "skipped")
+
+    def test_summary(self):
+        """Test outcome counts and stage percentiles"""
+        rows = [
+            {"drop_type": "airdrop", "outcome": "entered", "embed_ms": 400, "submit_ms": 100, "total_ms": 500},
+            {"drop_type": "airdrop", "outcome": "failed", "embed_ms": 600, "submit_ms": 300, "total_ms": 900},
+            {"drop_type": "triviadrop", "outcome": "no_answer", "embed_ms": 500, "answer_ms": 2, "total_ms": 502},
+            {"drop_type": "triviadrop", "outcome": "guessed", "embed_ms": 500, "answer_ms": 4, "total_ms": 504},
+        ]
+        summary = summarize_drops(rows)
+        self.assertEqual(summary["drops"], 4)
+        self.assertEqual(summary["entered"], 2)
+        self.assertEqual(summary["missed"], 2)
+        self.assertEqual(summary["by_type"]["triviadrop"], {"no_answer": 1, "guessed": 1})
+        self.assertEqual(summary["stages"]["embed"]["samples"], 4)
+        self.assertAlmostEqual(summary["stages"]["embed"]["p50"], 0.5)
+        self.assertAlmostEqual(summary["stages"]["embed"]["max"], 0.6)
+        self.assertEqual(summary["stages"]["answer"]["samples"], 2)
+        self.assertEqual(summary["stages"]["typing"]["samples"], 0)
+
+    def test_records_are_stored_in_sqlite(self):
+        """Test recorded traces survive in SQLite, newest first"""
+        async def run():
+            metrics = AirdropMetrics(self.db)
+            for outcome in ("entered", "no_embed"):
+                trace = metrics.start(trigger_message())
+                trace.mark("embed")
+                trace.finish(outcome)
+                metrics.record(trace)
+            await metrics.flush()
+            # A fresh collector reads what the previous one stored
+            return await AirdropMetrics(self.db).get_recent()
+
+        rows = asyncio.run(run())
+        self.assertEqual([row["outcome"] for row in rows], ["no_embed", "entered"])
+        self.assertEqual(rows[0]["drop_type"], "mathdrop")
+        self.assertEqual(rows[0]["channel_id"], "1")
+        self.assertIsNotNone(rows[0]["embed_ms"])
+        self.assertIsNone(rows[0]["answer_ms"])
+
+    def test_recent_without_database(self):
+        """Test the in-memory window is used when there is no database"""
+        async def run():
+            metrics = AirdropMetrics(window=2)
+            for outcome in ("entered", "failed", "skipped"):
+                trace = DropTrace("redpacket")
+                trace.finish(outcome)
+                metrics.record(trace)
+            return await metrics.get_recent()
+
+        self.assertEqual([row["outcome"] for row in asyncio.run(run())], ["skipped", "failed"])
+
+
+if __name__ == '__main__':
+    unittest.main()
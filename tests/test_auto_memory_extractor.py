@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Tests for automatic memory extraction
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+# Add the project root to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from data.database import DatabaseManager
+from memory.auto_memory_extractor import AutoMemoryExtractor, auto_memory_extractor
+
+
+class TestAutoMemoryExtractor(unittest.TestCase):
+    """Test cases for the compiled, trigger-gated extractor"""
+
+    def setUp(self):
+        self.extractor = AutoMemoryExtractor()
+
+    def test_engine_shared_between_instances(self):
+        """Test that patterns are compiled once per process"""
+        self.assertIs(self.extractor.engine, AutoMemoryExtractor().engine)
+        self.assertIs(self.extractor.engine, auto_memory_extractor.engine)
+
+    def test_triggers_gate_patterns(self):
+        """Test that only patterns whose trigger phrases occur are active"""
+        engine = self.extractor.engine
+
+        self.assertEqual(engine.active_patterns("what's the spread tonight"), engine.always_active)
+        active = engine.active_patterns("I LIVE IN Las Vegas")
+        self.assertTrue(any("live in" in pattern for pattern in active - engine.always_active))
+
+    def test_extracts_personal_info(self):
+        """Test that gated extraction still finds the usual memories"""
+        memories = asyncio.run(self.extractor.extract_memories_from_conversation(
+            "my name is Alex. I live in Las Vegas", "bet", "42"
+        ))
+
+        values = {(m["type"], m["category"]): m["information"] for m in memories}
+        self.assertEqual(values[("personal_info", "name")], "Alex")
+        self.assertEqual(values[("personal_info", "location")], "Las Vegas")
+        self.assertTrue(all(m["id"] and m["timestamp"] for m in memories))
+
+    def test_batch_dedupes_per_user(self):
+        """Test that a backlog yields each fact once per user"""
+        exchanges = [
+            ("1", "I live in Las Vegas", "nice"),
+            ("1", "I live in Las Vegas", "you said"),
+            ("2", "I live in Las Vegas", "cool"),
+        ]
+
+        results = self.extractor.extract_batch(exchanges)
+
+        for user_id in ("1", "2"):
+            locations = [m for m in results[user_id] if m["category"] == "location"]
+            self.assertEqual(len(locations), 1)
+        self.assertNotEqual(results["1"][0]["id"], results["2"][0]["id"])
+
+    def test_extract_from_conversation_history(self):
+        """Test backfilling memories from stored conversations"""
+        test_db = tempfile.NamedTemporaryFile(delete=False, suffix='.db')
+        test_db.close()
+        try:
+            with patch('data.database.DATABASE_PATH', test_db.name):
+                db = DatabaseManager()
+            db.add_conversation("42", [{"user": "call me Alex", "assistant": "ok Alex"}])
+            db.add_conversation("42", [{"user": "I hate slots.", "assistant": "rigged"}])
+
+            memories = asyncio.run(self.extractor.extract_from_conversation_history("42", db=db))
+            db.close()
+
+            categories = {m["category"] for m in memories}
+            self.assertIn("name", categories)
+            self.assertIn("dislikes", categories)
+        finally:
+            for suffix in ("", "-wal", "-shm"):
+                if os.path.exists(test_db.name + suffix):
+                    os.unlink(test_db.name + suffix)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -29,9 +29,11 @@ class TestDatabaseManager(unittest.TestCase):
     
     def tearDown(self):
         """Tear down test fixtures after each test method"""
-        # Clean up temporary database file
-        if os.path.exists(self.test_db.name):
-            os.unlink(self.test_db.name)
+        self.db.close()
+        # Clean up temporary database file (and WAL side files)
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(self.test_db.name + suffix):
+                os.unlink(self.test_db.name + suffix)
     
     def test_init_database(self):
         """Test that database is initialized with correct tables"""
@@ -123,5 +125,229 @@ class TestDatabaseManager(unittest.TestCase):
         self.assertEqual(len(conversations), 1)
         self.assertEqual(conversations[0]['messages'], message_history)
 
+    def test_connection_uses_wal_mode(self):
+        """Test that pooled connections are opened in WAL mode"""
+        conn = self.db._get_connection()
+        journal_mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+        self.assertEqual(journal_mode.lower(), "wal")
+        synchronous = conn.execute("PRAGMA synchronous").fetchone()[0]
+        self.assertEqual(synchronous, 1)  # NORMAL
+
+    def test_connection_reused_per_thread(self):
+        """Test that each thread keeps its own long-lived connection"""
+        import threading
+
+        first = self.db._get_connection()
+        self.assertIs(first, self.db._get_connection())
+
+        other = []
+        thread = threading.Thread(target=lambda: other.append(self.db._get_connection()))
+        thread.start()
+        thread.join()
+        self.assertIsNot(first, other[0])
+
+    def test_failed_write_does_not_leave_open_transaction(self):
+        """Test that an uncommitted transaction is rolled back on next use"""
+        conn = self.db._get_connection()
+        conn.execute("INSERT INTO settings (key, value) VALUES ('k', 'v')")
+        self.assertTrue(conn.in_transaction)
+
+        conn = self.db._get_connection()
+        self.assertFalse(conn.in_transaction)
+        row = conn.execute("SELECT value FROM settings WHERE key = 'k'").fetchone()
+        self.assertIsNone(row)
+
+    def test_flush_database_reopens_connections(self):
+        """Test that flushing the database drops pooled connections"""
+        self.db.add_memory("123456789", "location", "Las Vegas")
+        old_conn = self.db._get_connection()
+
+        self.db.flush_database()
+
+        self.assertIsNot(old_conn, self.db._get_connection())
+        self.assertEqual(self.db.get_memories("123456789"), {})
+
+    def test_async_wrapper_uses_pool(self):
+        """Test that async wrappers still work through the executor"""
+        import asyncio
+
+        async def run():
+            await self.db.aadd_memory("123456789", "team", "Cowboys")
+            return await self.db.aget_memories("123456789")
+
+        self.assertEqual(asyncio.run(run()), {"team": "Cowboys"})
+
+    def _count_rows(self, table):
+        import sqlite3
+        conn = sqlite3.connect(self.test_db.name)
+        try:
+            return conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+        finally:
+            conn.close()
+
+    def test_write_behind_reads_own_writes(self):
+        """Test that buffered writes are batched but visible to reads"""
+        import asyncio
+        self.db.write_behind_max_latency = 60
+
+        async def run():
+            for i in range(3):
+                await self.db.aadd_conversation("42", [{"user": f"msg {i}"}], "chan")
+            await self.db.aadd_memory("42", "team", "Cowboys")
+            await self.db.aadd_memory("42", "team", "Raiders")
+            # Nothing has been committed yet
+            self.assertEqual(self._count_rows("conversations"), 0)
+            return await self.db.aget_recent_conversations("42", limit=2)
+
+        conversations = asyncio.run(run())
+
+        self.assertEqual(
+            [c["messages"][0]["user"] for c in conversations], ["msg 2", "msg 1"]
+        )
+        self.assertEqual(self._count_rows("conversations"), 3)
+        self.assertEqual(self.db.get_memories("42"), {"team": "Raiders"})
+        self.assertEqual(self._count_rows("memories"), 1)
+
+    def test_memory_writes_upsert_on_every_path(self):
+        """Test that sync, buffered and unbuffered memory writes keep one row per key"""
+        import asyncio
+
+        self.db.add_memory("1", "team", "Cowboys")
+        self.db.add_memory("1", "team", "Raiders")
+
+        for user_id, write_behind in (("2", True), ("3", False)):
+            self.db.write_behind_enabled = write_behind
+
+            async def run():
+                await self.db.aadd_memory(user_id, "team", "Cowboys")
+                await self.db.aadd_memory(user_id, "team", "Raiders")
+                await self.db.aflush_writes()
+
+            asyncio.run(run())
+
+        for user_id in ("1", "2", "3"):
+            self.assertEqual(self.db.get_memories(user_id), {"team": "Raiders"})
+            self.assertEqual(self.db.get_memory(user_id, "team"), "Raiders")
+        self.assertEqual(self._count_rows("memories"), 3)
+
+    def test_write_behind_flushes_after_max_latency(self):
+        """Test that buffered writes are committed without any read"""
+        import asyncio
+        self.db.write_behind_max_latency = 0.05
+
+        async def run():
+            await self.db.aadd_conversation("42", [{"user": "hi"}], "chan")
+            await asyncio.sleep(0.2)
+
+        asyncio.run(run())
+        self.assertEqual(self._count_rows("conversations"), 1)
+
+    def test_write_behind_retries_failed_flush(self):
+        """Test that a failed timed flush is retried without another write"""
+        import asyncio
+        import sqlite3
+        self.db.write_behind_max_latency = 0.05
+        get_connection = self.db._get_connection
+        failures = [sqlite3.OperationalError("database is locked")]
+
+        def flaky_connection():
+            if failures:
+                raise failures.pop()
+            return get_connection()
+
+        async def run():
+            with patch.object(self.db, "_get_connection", side_effect=flaky_connection):
+                await self.db.aadd_conversation("42", [{"user": "hi"}], "chan")
+                await asyncio.sleep(0.3)
+
+        asyncio.run(run())
+        self.assertEqual(failures, [])
+        self.assertEqual(self._count_rows("conversations"), 1)
+
+    def test_write_behind_flushes_on_close(self):
+        """Test that closing the database commits buffered writes"""
+        import asyncio
+        self.db.write_behind_max_latency = 60
+
+        asyncio.run(self.db.aadd_memory("42", "location", "Las Vegas"))
+        self.db.close()
+
+        self.assertEqual(self._count_rows("memories"), 1)
+
+    def test_recent_conversations_served_from_cache(self):
+        """Test that cached users are answered without SQLite and see new writes"""
+        for i in range(3):
+            self.db.add_conversation("42", [{"user": f"msg {i}"}], "chan")
+        self.assertEqual(len(self.db.get_recent_conversations("42", limit=2)), 2)
+
+        with patch.object(self.db, "_get_connection", side_effect=AssertionError("DB read")):
+            self.db._cache_conversation(
+                "42", {"messages": [{"user": "msg 3"}], "timestamp": "now", "channel_id": "chan"}
+            )
+            conversations = self.db.get_recent_conversations("42", limit=2)
+
+        self.assertEqual(
+            [c["messages"][0]["user"] for c in conversations], ["msg 3", "msg 2"]
+        )
+        self.assertEqual(conversations[0]["channel_id"], "chan")
+
+    def test_conversation_cache_invalidated_by_clear(self):
+        """Test that clearing history drops the cached conversations"""
+        self.db.add_conversation("42", [{"user": "hi"}], "chan")
+        self.db.add_conversation("43", [{"user": "yo"}], "other")
+        self.db.get_recent_conversations("42")
+        self.db.get_recent_conversations("43")
+
+        self.db.clear_channel_history("chan")
+
+        self.assertEqual(self.db.get_recent_conversations("42"), [])
+        self.assertEqual(len(self.db.get_recent_conversations("43")), 1)
+        self.assertIn("43", self.db._conversation_cache)
+
+        self.db.clear_user_history("43")
+        self.assertEqual(self.db.get_recent_conversations("43"), [])
+
+    def test_conversation_cache_is_lru_over_users(self):
+        """Test that the least recently used user is evicted"""
+        self.db.conversation_cache_users = 2
+        for user_id in ("1", "2", "3"):
+            self.db.add_conversation(user_id, [{"user": "hi"}])
+            self.db.get_recent_conversations(user_id)
+
+        self.assertEqual(list(self.db._conversation_cache), ["2", "3"])
+
+    def test_keyword_matching(self):
+        """Test whole-word and multi-word keyword triggers"""
+        self.db.add_keyword("BTC")
+        self.db.add_keyword("to the moon")
+
+        self.assertTrue(self.db.check_message_for_keywords("is btc pumping?"))
+        self.assertTrue(self.db.check_message_for_keywords("we going TO THE MOON"))
+        self.assertFalse(self.db.check_message_for_keywords("wbtc is wrapped"))
+        self.assertFalse(self.db.check_message_for_keywords("to the mall"))
+
+    def test_keyword_index_follows_table_changes(self):
+        """Test that the keyword index is rebuilt on add/disable/enable/remove"""
+        self.assertFalse(self.db.check_message_for_keywords("gm degens"))
+
+        self.db.add_keyword("gm")
+        self.assertTrue(self.db.check_message_for_keywords("gm degens"))
+
+        self.db.disable_keyword("gm")
+        self.assertFalse(self.db.check_message_for_keywords("gm degens"))
+
+        self.db.enable_keyword("gm")
+        self.assertTrue(self.db.check_message_for_keywords("gm degens"))
+
+        self.db.remove_keyword("gm")
+        self.assertFalse(self.db.check_message_for_keywords("gm degens"))
+
+    def test_keyword_check_does_not_query_database(self):
+        """Test that keyword checks are served from the in-memory index"""
+        self.db.add_keyword("rigged")
+        with patch.object(self.db, "get_keywords") as get_keywords:
+            self.assertTrue(self.db.check_message_for_keywords("eddie rigged it"))
+            get_keywords.assert_not_called()
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -15,7 +15,7 @@ class TestGuildBlacklist(unittest.TestCase):
         
         # Mock database methods
         self.bot.db = AsyncMock()
-        self.bot.db.acheck_message_for_keywords = AsyncMock(return_value=False)
+        self.bot.db.check_message_for_keywords = Mock(return_value=False)
         
         # Mock the response method
         self.bot.process_jakey_response = AsyncMock()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Tests for the event loop lag monitor
+"""
+
+import asyncio
+import time
+import unittest
+import sys
+import os
+
+# Add the project root to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from bot.commands import format_loop_lag
+from utils.loop_monitor import LagHistogram, LoopLagMonitor
+
+
+def blocking_handler():
+    """Stand-in for sync work done on the loop"""
+    time.sleep(0.4)
+
+
+async def slow_coroutine():
+    blocking_handler()
+
+
+class TestLoopLagMonitor(unittest.TestCase):
+    """Test cases for LoopLagMonitor"""
+
+    def test_histogram_buckets_and_percentiles(self):
+        """Test that samples land in the right buckets"""
+        histogram = LagHistogram(buckets=(0.01, 0.1, 1.0))
+        for value in (0.001, 0.002, 0.05, 0.5, 3.0):
+            histogram.record(value)
+
+        snapshot = histogram.snapshot()
+        self.assertEqual(
+            snapshot["buckets"], {"<=10ms": 2, "<=100ms": 1, "<=1s": 1, ">1s": 1}
+        )
+        self.assertEqual(snapshot["samples"], 5)
+        self.assertEqual(snapshot["p50"], 0.05)
+        self.assertEqual(snapshot["max"], 3.0)
+
+    def test_blocking_call_is_recorded_as_lag(self):
+        """Test that blocking the loop shows up in the lag histogram"""
+        monitor = LoopLagMonitor(interval=0.02, trace_slow_callbacks=False)
+
+        async def scenario():
+            monitor.start()
+            await asyncio.sleep(0.05)
+            time.sleep(0.2)
+            await asyncio.sleep(0.05)
+            await monitor.stop()
+
+        asyncio.run(scenario())
+
+        stats = monitor.get_stats()
+        self.assertFalse(stats["running"])
+        self.assertGreaterEqual(stats["lag"]["max"], 0.15)
+        self.assertGreater(stats["lag"]["samples"], 2)
+
+    def test_slow_callback_tracer_names_culprit(self):
+        """Test that the tracer reports the coroutine that blocked the loop"""
+        monitor = LoopLagMonitor(
+            interval=0.05, slow_callback_threshold=0.1, trace_slow_callbacks=True
+        )
+
+        async def scenario():
+            monitor.start()
+            await asyncio.sleep(0.15)
+            await slow_coroutine()
+            await asyncio.sleep(0.3)
+            await monitor.stop()
+
+        asyncio.run(scenario())
+
+        stats = monitor.get_stats()
+        slow = stats["slow_callbacks"]
+        self.assertTrue(slow["tracing"])
+        self.assertEqual(slow["count"], 1)
+        self.assertIn("slow_coroutine", slow["recent"][0]["culprit"])
+        self.assertGreaterEqual(slow["recent"][0]["duration"], 0.2)
+        self.assertIn("slow_coroutine", format_loop_lag(stats))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Tests for the shared math drop evaluator
+"""
+
+import os
+import sys
+import time
+import unittest
+
+# Add the project root to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from utils.math_evaluator import MathError, MathEvaluator, format_number
+
+
+class TestMathEvaluator(unittest.TestCase):
+    """Test cases for parsing, exact formatting and the size guards"""
+
+    def setUp(self):
+        self.evaluator = MathEvaluator(cache_size=4)
+
+    def test_python_precedence(self):
+        """Test results match Python's operator precedence"""
+        for expression in [
+            "(17 + 5) * 3 - 12 / 4",
+            "-2**2",
+            "2**-1",
+            "2**3**2",
+            "2**-1**2",
+            "-3 % 5",
+            "7 // 2",
+            "- - 3",
+            "10 - 4 - 3",
+            "100 / 10 / 5",
+        ]:
+            self.assertEqual(float(self.evaluator.evaluate(expression)), eval(expression), expression)
+
+    def test_exact_decimal_answers(self):
+        """Test answers are written like tip.cc expects them"""
+        self.assertEqual(self.evaluator.solve("0.1 + 0.2"), "0.3")
+        self.assertEqual(self.evaluator.solve("100 - 99.99"), "0.01")
+        self.assertEqual(self.evaluator.solve("7.5 * 4 + 0.25"), "30.25")
+        self.assertEqual(self.evaluator.solve("12 / 4"), "3")
+        self.assertEqual(self.evaluator.solve("-7.5 / 2"), "-3.75")
+        self.assertEqual(self.evaluator.solve("1 / 3"), "0.3333333333333333")
+        self.assertEqual(self.evaluator.solve("4 ** 0.5"), "2")
+        self.assertEqual(format_number(2.5), "2.5")
+
+    def test_invalid_expressions(self):
+        """Test malformed input gives no answer"""
+        for expression in ["", "2 +", "((1)", "2(3)", "1.2.3", "import os", "1e5", "1 < 2"]:
+            self.assertIsNone(self.evaluator.solve(expression), expression)
+        with self.assertRaises(ZeroDivisionError):
+            self.evaluator.evaluate("1 / 0")
+
+    def test_comparisons(self):
+        """Test chained comparisons when they are allowed"""
+        self.assertIs(self.evaluator.evaluate("1 < 2 < 3", allow_comparisons=True), True)
+        self.assertIs(self.evaluator.evaluate("3 > 2 > 5", allow_comparisons=True), False)
+        self.assertIs(self.evaluator.evaluate("2 + 2 == 4", allow_comparisons=True), True)
+
+    def test_pathological_powers_are_refused(self):
+        """Test huge powers fail fast instead of being computed"""
+        started = time.perf_counter()
+        for expression in [
+            "9**9**9",
+            "2**10**10",
+            "(10**999)**2",
+            "2.5**1000.5",
+            "9" * 300,
+            "9**999*9**999*9**999*9**999*9**999",
+            "-(9**999*9**999)",
+            "1/9**999/9**999",
+        ]:
+            with self.assertRaises(MathError, msg=expression):
+                self.evaluator.evaluate(expression)
+        self.assertLess(time.perf_counter() - started, 0.5)
+        self.assertIsNone(self.evaluator.solve("(-8) ** (1/3)"))
+        self.assertIsNone(self.evaluator.solve("9**999*9**999*9**999*9**999*9**999"))
+        self.assertEqual(len(self.evaluator.solve("10**999 * 9")), 1000)
+
+    def test_results_are_cached(self):
+        """Test repeated expressions come from the LRU, errors included"""
+        self.evaluator.evaluate("1 + 1")
+        self.evaluator.evaluate("1 + 1 ")
+        self.assertIsNone(self.evaluator.solve("9**9**9"))
+        self.assertIsNone(self.evaluator.solve("9**9**9"))
+        self.assertEqual(self.evaluator.get_stats(), {"cached": 2, "hits": 2, "misses": 2})
+
+        for value in range(5):
+            self.evaluator.evaluate(f"{value} * 2")
+        self.assertEqual(self.evaluator.get_stats()["cached"], 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -11,7 +11,7 @@ import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'tools'))
 
-from tools.mcp_memory_client import MCPMemoryClient, get_mcp_server_url
+from tools.mcp_memory_client import CircuitBreaker, MCPMemoryClient, get_mcp_auth_token, get_mcp_server_url
 from tools.tool_manager import ToolManager
 from config import MCP_MEMORY_ENABLED
 
@@ -53,6 +53,61 @@ class TestMCPMemoryClient(unittest.TestCase):
         self.assertEqual(result["error"], "MCP memory server not enabled")
 
 
+    def test_circuit_opens_and_fails_fast(self):
+        """Test that a dead server is only contacted until the circuit opens"""
+        import socket
+        with socket.socket() as sock:
+            sock.bind(("localhost", 0))
+            port = sock.getsockname()[1]
+
+        client = MCPMemoryClient(f"http://localhost:{port}", auth_token="token")
+        client.enabled = True
+        client.circuit_breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+
+        async def run():
+            try:
+                results = [await client.get_user_memories("user123") for _ in range(4)]
+            finally:
+                await client.aclose()
+            return results
+
+        results = asyncio.run(run())
+
+        self.assertTrue(all("error" in result for result in results))
+        self.assertIn("circuit open", results[2]["error"])
+        self.assertIn("circuit open", results[3]["error"])
+        self.assertEqual(client.circuit_breaker.state, "open")
+
+    def test_circuit_half_open_trial(self):
+        """Test that one trial request is let through after the reset timeout"""
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+        breaker.record_failure()
+
+        self.assertEqual(breaker.state, "half-open")
+        self.assertTrue(breaker.allow_request())
+        breaker.record_success()
+        self.assertEqual(breaker.state, "closed")
+
+    def test_token_file_read_once_until_modified(self):
+        """Test that the token file is only re-read when its mtime changes"""
+        import tempfile
+        os.environ.pop("MCP_MEMORY_TOKEN", None)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            token_file = os.path.join(temp_dir, ".mcp_token")
+            with open(token_file, "w") as f:
+                f.write("first")
+
+            with patch("tools.mcp_memory_client.os.path.join", return_value=token_file):
+                self.assertEqual(get_mcp_auth_token(), "first")
+                with patch("builtins.open", side_effect=AssertionError("re-read")):
+                    self.assertEqual(get_mcp_auth_token(), "first")
+
+                with open(token_file, "w") as f:
+                    f.write("second")
+                os.utime(token_file, ns=(0, os.stat(token_file).st_mtime_ns + 1_000_000))
+                self.assertEqual(get_mcp_auth_token(), "second")
+
+
 class TestToolManagerMCPIntegration(unittest.TestCase):
     """Test cases for ToolManager MCP integration"""
     
@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+Tests for the MCP memory server storage engine
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import unittest
+
+from aiohttp.test_utils import TestClient, TestServer
+
+# Add the project root to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from memory.backend import MemoryConfig
+from memory.mcp_backend import MCPMemoryBackend
+from tools.mcp_memory_client import MCPMemoryClient
+from tools.mcp_memory_server import MCPMemoryServer, MemoryStore
+
+
+class TestMemoryStore(unittest.TestCase):
+    """Test cases for MemoryStore indexes and persistence"""
+
+    def setUp(self):
+        self.test_db = tempfile.NamedTemporaryFile(delete=False, suffix='.db')
+        self.test_db.close()
+
+    def tearDown(self):
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(self.test_db.name + suffix):
+                os.unlink(self.test_db.name + suffix)
+
+    def _fill(self, store):
+        async def fill():
+            for i in range(5):
+                await store.add("42", "fact", f"memory number {i}")
+            await store.add("42", "preference_food", "loves spicy tacos")
+            await store.add("7", "preference_food", "tacos every day")
+        return fill()
+
+    def test_recent_pages_with_cursor(self):
+        """Test newest-first pages that chain through the cursor"""
+        store = MemoryStore()
+        asyncio.run(self._fill(store))
+
+        page, cursor = store.recent("42", 4)
+        self.assertEqual(page[0]["information"], "loves spicy tacos")
+        self.assertIsNotNone(cursor)
+
+        rest, end = store.recent("42", 4, cursor)
+        self.assertIsNone(end)
+        self.assertEqual(
+            [m["information"] for m in rest], ["memory number 1", "memory number 0"]
+        )
+        self.assertEqual(len({m["id"] for m in page + rest}), 6)
+
+    def test_search_uses_token_prefixes(self):
+        """Test that every query word must prefix a word of the memory"""
+        store = MemoryStore()
+        asyncio.run(self._fill(store))
+
+        self.assertEqual(
+            [m["information"] for m in store.search("42", "spicy taco", 10)[0]],
+            ["loves spicy tacos"],
+        )
+        self.assertEqual(store.search("42", "preference_food", 10)[0][0]["user_id"], "42")
+        self.assertEqual(store.search("42", "sushi", 10), ([], None))
+
+        page, cursor = store.search("42", "memory", 3)
+        self.assertEqual(len(page), 3)
+        self.assertEqual(len(store.search("42", "memory", 3, cursor)[0]), 2)
+        self.assertEqual(len(store.search("42", "num 4", 10)[0]), 1)
+
+        # The sorted token list used for prefix lookups follows deletes
+        asyncio.run(store.delete("42", "preference_food"))
+        self.assertEqual(store.search("42", "spic", 10), ([], None))
+        self.assertEqual(store._sorted_tokens["42"], sorted(store._tokens["42"]))
+        asyncio.run(store.delete("42"))
+        self.assertNotIn("42", store._sorted_tokens)
+
+    def test_persists_across_restarts_and_deletes(self):
+        """Test that memories survive reopening and deletes are persisted"""
+        async def run():
+            store = MemoryStore(self.test_db.name)
+            await store.open()
+            await self._fill(store)
+            self.assertEqual(await store.delete("42", "fact"), 5)
+            await store.close()
+
+            reopened = MemoryStore(self.test_db.name)
+            await reopened.open()
+            try:
+                return reopened.count(), reopened.search("42", "tacos", 10)[0]
+            finally:
+                await reopened.close()
+
+        count, found = asyncio.run(run())
+        self.assertEqual(count, 2)
+        self.assertEqual([m["information_type"] for m in found], ["preference_food"])
+
+    def test_endpoints_paginate(self):
+        """Test limit/cursor pagination through the HTTP API"""
+        server = MCPMemoryServer(db_path="")
+        asyncio.run(self._fill(server.store))
+        headers = {"Authorization": f"Bearer {server.auth_token}"}
+
+        async def run():
+            async with TestClient(TestServer(server.app)) as client:
+                first = await (await client.get(
+                    "/memories", params={"user_id": "42", "limit": 5}, headers=headers
+                )).json()
+                second = await (await client.get(
+                    "/memories",
+                    params={"user_id": "42", "limit": 5, "cursor": first["next_cursor"]},
+                    headers=headers,
+                )).json()
+                bad = await client.get(
+                    "/memories/search", params={"user_id": "42", "cursor": "nope"}, headers=headers
+                )
+                return first, second, bad.status
+
+        first, second, bad_status = asyncio.run(run())
+        self.assertEqual(first["total"], 5)
+        self.assertEqual(second["total"], 1)
+        self.assertIsNone(second["next_cursor"])
+        self.assertEqual(bad_status, 400)
+
+
+
+class TestMCPBatchEndpoints(unittest.TestCase):
+    """Test cases for batch and conditional requests"""
+
+    def setUp(self):
+        self.server = MCPMemoryServer(db_path="")
+
+    def _run_with_client(self, scenario):
+        async def run():
+            async with TestClient(TestServer(self.server.app)) as http:
+                client = MCPMemoryClient(
+                    server_url=str(http.make_url("")).rstrip("/"),
+                    auth_token=self.server.auth_token,
+                )
+                client.enabled = True
+                try:
+                    return await scenario(client)
+                finally:
+                    await client.aclose()
+        return asyncio.run(run())
+
+    def test_batch_store_and_get(self):
+        """Test storing for several users and reading keys back in one request each"""
+        async def scenario(client):
+            stored = await client.batch_store_memories([
+                {"user_id": "42", "information_type": "team", "information": "Cowboys"},
+                {"user_id": "42", "information_type": "food", "information": "tacos"},
+                {"user_id": "7", "information_type": "team", "information": "Raiders"},
+            ])
+            fetched = await client.batch_get_memories(["42", "7", "9"], information_types=["team"])
+            return stored, fetched
+
+        stored, fetched = self._run_with_client(scenario)
+
+        self.assertEqual(stored["stored"], 3)
+        results = fetched["results"]
+        self.assertEqual([m["information"] for m in results["42"]["memories"]], ["Cowboys"])
+        self.assertEqual([m["information"] for m in results["7"]["memories"]], ["Raiders"])
+        self.assertEqual(results["9"]["memories"], [])
+
+    def test_conditional_get_revalidates(self):
+        """Test that unchanged memories come back as 304 and are served from cache"""
+        asyncio.run(self.server.store.add("42", "team", "Cowboys"))
+        statuses = []
+
+        async def scenario(client):
+            original = client._make_request
+
+            async def tracking(endpoint, method="GET", data=None, extra_headers=None):
+                result = await original(endpoint, method, data, extra_headers)
+                statuses.append(result.get("not_modified", False))
+                return result
+
+            client._make_request = tracking
+            first = await client.get_user_memories("42")
+            second = await client.get_user_memories("42")
+            await self.server.store.add("42", "food", "tacos")
+            third = await client.get_user_memories("42")
+            return first, second, third
+
+        first, second, third = self._run_with_client(scenario)
+
+        self.assertEqual(statuses, [False, True, False])
+        self.assertEqual(first["memories"], second["memories"])
+        self.assertEqual(len(third["memories"]), 2)
+
+    def test_etags_are_per_page(self):
+        """Test that an ETag only revalidates the page it was issued for"""
+        for information in ("Cowboys", "tacos", "Raiders"):
+            asyncio.run(self.server.store.add("42", "team", information))
+        headers = {"Authorization": f"Bearer {self.server.auth_token}"}
+
+        async def run():
+            async with TestClient(TestServer(self.server.app)) as http:
+                async def get(etag=None, **params):
+                    response = await http.get(
+                        "/memories",
+                        params={"user_id": "42", **params},
+                        headers={**headers, "If-None-Match": etag} if etag else headers,
+                    )
+                    return response.status, response.headers.get("ETag"), (
+                        await response.json() if response.status == 200 else None
+                    )
+
+                async def batch(**data):
+                    response = await http.post(
+                        "/batch_get", json={"user_ids": ["42"], **data}, headers=headers
+                    )
+                    return (await response.json())["results"]["42"]
+
+                status, etag, first = await get(limit=2)
+                statuses = [
+                    (await get(etag, limit=2))[0],
+                    (await get(etag, limit=5))[0],
+                    (await get(etag, limit=2, cursor=first["next_cursor"]))[0],
+                    (await get(etag, limit=2, since="2000-01-01"))[0],
+                ]
+                typed = await batch(information_types=["team"], limit=5)
+                repeat = await batch(information_types=["team"], limit=5, etags={"42": typed["etag"]})
+                other = await batch(limit=5, etags={"42": typed["etag"]})
+                future = await batch(information_types=["team"], limit=5, since="9999")
+                return statuses, repeat, other, future
+
+        statuses, repeat, other, future = asyncio.run(run())
+
+        self.assertEqual(statuses, [304, 200, 200, 200])
+        self.assertTrue(repeat.get("not_modified"))
+        self.assertEqual(other["total"], 3)
+        self.assertEqual(future["memories"], [])
+
+    def test_since_returns_only_newer(self):
+        """Test that since limits the response to memories stored afterwards"""
+        old = asyncio.run(self.server.store.add("42", "team", "Cowboys"))
+        asyncio.run(self.server.store.add("42", "food", "tacos"))
+
+        memories, _ = self.server.store.recent("42", 10, since=old["timestamp"])
+        if memories and memories[0]["timestamp"] == old["timestamp"]:
+            self.skipTest("both memories stored within the same microsecond")
+        self.assertEqual([m["information"] for m in memories], ["tacos"])
+
+    def test_backend_store_many_is_one_request(self):
+        """Test that the MCP backend stores a batch with one call"""
+        async def scenario(client):
+            backend = MCPMemoryBackend(MemoryConfig(), client)
+            results = await backend.store_many(
+                "42", [("team", "Cowboys", None), ("food", "tacos", None)]
+            )
+            entries = await backend.retrieve_many("42", ["team", "food", "pet"])
+            return results, entries
+
+        results, entries = self._run_with_client(scenario)
+
+        self.assertEqual(results, [True, True])
+        self.assertEqual({k: e.value for k, e in entries.items()}, {"team": "Cowboys", "food": "tacos"})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+Tests for SQLite memory search
+"""
+
+import asyncio
+import gc
+import os
+import sys
+import tempfile
+import time
+import unittest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+# Add the project root to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from data.database import DatabaseManager
+from memory.backend import MemoryConfig, MemoryEntry
+from memory.sqlite_backend import SQLiteMemoryBackend, tokenize_query
+from memory.unified_backend import UnifiedMemoryBackend
+from tools.memory_search import MemorySearchTool
+
+
+class TestSQLiteMemorySearch(unittest.TestCase):
+    """Test cases for FTS5-backed memory search"""
+
+    def setUp(self):
+        self.test_db = tempfile.NamedTemporaryFile(delete=False, suffix='.db')
+        self.test_db.close()
+        with patch('data.database.DATABASE_PATH', self.test_db.name):
+            self.db = DatabaseManager()
+        self.backend = SQLiteMemoryBackend(MemoryConfig(), self.db)
+
+        self.db.add_memory("42", "preference_food", "loves spicy tacos")
+        self.db.add_memory("42", "personal_info_location", "lives in Las Vegas")
+        self.db.add_memory("42", "preference_team", "Dallas Cowboys fan")
+        self.db.add_memory("7", "preference_food", "tacos every day")
+
+    def tearDown(self):
+        self.db.close()
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(self.test_db.name + suffix):
+                os.unlink(self.test_db.name + suffix)
+
+    def test_tokenize_query(self):
+        """Test that stop words, duplicates and punctuation are dropped"""
+        self.assertEqual(
+            tokenize_query("Hey, what do you know about my favorite TACO taco?"),
+            ["favorite", "taco"],
+        )
+
+    def test_whole_message_query_finds_memories(self):
+        """Test that a full chat message matches on its individual words"""
+        results = asyncio.run(
+            self.backend.search("42", "yo where should i get tacos in vegas tonight?")
+        )
+
+        self.assertEqual(
+            {entry.key for entry in results},
+            {"preference_food", "personal_info_location"},
+        )
+        self.assertTrue(all(entry.user_id == "42" for entry in results))
+
+    def test_results_ranked_and_timestamped(self):
+        """Test BM25 ordering and real row timestamps"""
+        self.db.add_memory("42", "fact_tacos", "tacos tacos tacos taco tuesday")
+
+        results = asyncio.run(self.backend.search("42", "tacos", limit=5))
+
+        self.assertEqual(results[0].key, "fact_tacos")
+        self.assertLess(abs(results[0].created_at - time.time()), 120)
+        self.assertEqual(results[0].created_at, results[0].updated_at)
+
+    def test_index_follows_updates_and_deletes(self):
+        """Test that triggers keep the FTS index in sync with memories"""
+        asyncio.run(self.db.aadd_memory("42", "preference_food", "vegan sushi"))
+
+        self.assertEqual(asyncio.run(self.backend.search("42", "tacos")), [])
+        self.assertEqual(
+            [e.value for e in asyncio.run(self.backend.search("42", "sushi"))],
+            ["vegan sushi"],
+        )
+
+        self.db.delete_memories("42")
+        self.assertEqual(asyncio.run(self.backend.search("42", "sushi")), [])
+
+    def test_search_without_query_lists_recent(self):
+        """Test that no query returns the user's memories"""
+        results = asyncio.run(self.backend.search("42", None, limit=2))
+        self.assertEqual(len(results), 2)
+
+    def test_get_entries_in_one_query(self):
+        """Test that SQLite returns every entry, newest first"""
+        asyncio.run(self.db.aadd_memory("42", "preference_team", "Raiders fan"))
+
+        results = asyncio.run(self.backend.get_entries("42", limit=10))
+
+        self.assertEqual(len(results), 3)
+        self.assertEqual(results[0].value, "Raiders fan")
+
+    def test_like_fallback_without_fts(self):
+        """Test the LIKE fallback used when FTS5 is unavailable"""
+        self.db.memory_fts_enabled = False
+        results = asyncio.run(self.backend.search("42", "vegas"))
+        self.assertEqual([e.key for e in results], ["personal_info_location"])
+
+
+def entry(key, value, updated_at, confidence=None):
+    """Build a MemoryEntry with optional confidence metadata"""
+    metadata = {"confidence": confidence} if confidence is not None else None
+    return MemoryEntry("42", key, value, updated_at, updated_at, metadata)
+
+
+class TestMemoryGetEntries(unittest.TestCase):
+    """Test cases for bulk get_entries"""
+
+    def _unified(self, **backends):
+        """UnifiedMemoryBackend over fake backends given by name=(priority, entries)"""
+        fakes = {}
+        for name, (priority, entries) in backends.items():
+            backend = MagicMock()
+            backend.config = MemoryConfig(priority=priority)
+            backend.get_entries = AsyncMock(return_value=entries)
+            fakes[name] = backend
+        return UnifiedMemoryBackend(fakes, read_mode="priority")
+
+    def test_unified_merges_filters_and_sorts(self):
+        """Test one call per backend with priority, confidence and recency applied"""
+        unified = self._unified(
+            sqlite=(1, [entry("preference_food", "tacos", 100), entry("fact_job", "dev", 300)]),
+            mcp=(2, [entry("preference_food", "sushi", 200, 0.9), entry("context_mood", "meh", 400, 0.1)]),
+        )
+
+        results = asyncio.run(unified.get_entries("42", min_confidence=0.3, limit=5))
+
+        self.assertEqual([e.key for e in results], ["fact_job", "preference_food"])
+        self.assertEqual(results[1].value, "sushi")
+        for backend in unified.backends.values():
+            backend.get_entries.assert_awaited_once()
+
+    def test_search_without_query_uses_bulk_entries(self):
+        """Test that listing memories never calls retrieve per key"""
+        backend = MagicMock()
+        backend.get_entries = AsyncMock(return_value=[entry("preference_food", "tacos", 100)])
+        backend.retrieve = AsyncMock()
+
+        with patch("memory.memory_backend", backend):
+            result = asyncio.run(MemorySearchTool().search_user_memories("42", None, limit=5))
+
+        self.assertEqual(result["total_memories"], 1)
+        self.assertEqual(result["all_memories"][0]["confidence"], 1.0)
+        backend.get_entries.assert_awaited_once_with("42", min_confidence=0.3, limit=5)
+        backend.retrieve.assert_not_called()
+
+
+class FakeBackend:
+    """Memory backend answering after a fixed delay"""
+
+    def __init__(self, priority, delay=0.0, result=None, timeout=1.0):
+        self.config = MemoryConfig(priority=priority, timeout=timeout)
+        self.delay = delay
+        self.result = result
+        self.stored = []
+
+    async def _answer(self):
+        await asyncio.sleep(self.delay)
+        return self.result
+
+    async def retrieve(self, user_id, key):
+        return await self._answer()
+
+    async def store(self, user_id, key, value, metadata=None):
+        await asyncio.sleep(self.delay)
+        self.stored.append((key, value))
+        return True
+
+
+class TestUnifiedBackendRouting(unittest.TestCase):
+    """Test cases for concurrent fan-out and health-based routing"""
+
+    def test_first_healthy_responder_wins(self):
+        """Test that a slow backend doesn't delay a read another backend answers"""
+        fast = entry("preference_food", "tacos", 100)
+        unified = UnifiedMemoryBackend(
+            {"mcp": FakeBackend(2, delay=5.0), "sqlite": FakeBackend(1, result=fast)},
+            read_mode="first",
+        )
+
+        start = time.monotonic()
+        result = asyncio.run(unified.retrieve("42", "preference_food"))
+
+        self.assertIs(result, fast)
+        self.assertLess(time.monotonic() - start, 1.0)
+
+    def test_cancelled_loser_keeps_its_health(self):
+        """Test that cancelling the slower backend in first mode is not an error or a failure"""
+        unified = UnifiedMemoryBackend(
+            {"mcp": FakeBackend(2, delay=0.5), "sqlite": FakeBackend(1, result=entry("k", "v", 1))},
+            read_mode="first",
+        )
+        errors = []
+
+        async def run():
+            asyncio.get_running_loop().set_exception_handler(lambda loop, context: errors.append(context))
+            self.assertEqual((await unified.retrieve("42", "k")).value, "v")
+            # Let the cancelled loser finish unwinding, then collect it
+            await asyncio.sleep(0.05)
+            gc.collect()
+
+        asyncio.run(run())
+
+        self.assertEqual(errors, [])
+        loser = unified.health["mcp"]
+        self.assertEqual((loser.score, loser.latency, loser.failures, loser.timeouts), (1.0, 0.0, 0, 0))
+        self.assertEqual(unified.health["sqlite"].failures, 0)
+
+    def test_timeouts_demote_backend(self):
+        """Test that timed out backends lose health and are routed last"""
+        unified = UnifiedMemoryBackend(
+            {
+                "mcp": FakeBackend(2, delay=0.2, timeout=0.05),
+                "sqlite": FakeBackend(1, result=entry("k", "v", 1)),
+            },
+            read_mode="priority",
+        )
+        self.assertEqual([name for name, _ in unified._get_backends_by_priority()], ["mcp", "sqlite"])
+
+        async def run():
+            for _ in range(4):
+                self.assertEqual((await unified.retrieve("42", "k")).value, "v")
+
+        asyncio.run(run())
+
+        status = unified.get_backend_status()
+        self.assertEqual(status["mcp"]["timeouts"], 4)
+        self.assertLess(status["mcp"]["health_score"], 0.5)
+        self.assertEqual([name for name, _ in unified._get_backends_by_priority()], ["sqlite", "mcp"])
+
+    def test_store_replicates_after_primary_ack(self):
+        """Test that store returns once the primary acks and replicates in the background"""
+        primary = FakeBackend(2)
+        secondary = FakeBackend(1, delay=0.1)
+        unified = UnifiedMemoryBackend(
+            {"mcp": primary, "sqlite": secondary}, async_replication=True
+        )
+
+        async def run():
+            self.assertTrue(await unified.store("42", "team", "Cowboys"))
+            self.assertEqual(primary.stored, [("team", "Cowboys")])
+            self.assertEqual(secondary.stored, [])
+            await unified.wait_for_replication()
+
+        asyncio.run(run())
+        self.assertEqual(secondary.stored, [("team", "Cowboys")])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Tests for the heap-based reminder scheduler
+"""
+
+import asyncio
+import datetime
+import os
+import sys
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+
+# Add the project root to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from data.database import DatabaseManager
+from utils.reminder_scheduler import ReminderScheduler, parse_trigger_time
+
+
+def in_seconds(seconds):
+    """ISO trigger time the given number of seconds from now"""
+    return (datetime.datetime.now() + datetime.timedelta(seconds=seconds)).isoformat()
+
+
+class TestReminderScheduler(unittest.TestCase):
+    """Test cases for ReminderScheduler"""
+
+    def setUp(self):
+        self.test_db = tempfile.NamedTemporaryFile(delete=False, suffix='.db')
+        self.test_db.close()
+        with patch('data.database.DATABASE_PATH', self.test_db.name):
+            self.db = DatabaseManager()
+        self.fired = []
+
+    def tearDown(self):
+        self.db.close()
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(self.test_db.name + suffix):
+                os.unlink(self.test_db.name + suffix)
+
+    async def _fire(self, reminder):
+        self.fired.append((reminder["id"], time.time()))
+
+    def _run_scheduler(self, scenario):
+        async def main():
+            scheduler = ReminderScheduler(self.db, self._fire)
+            await scheduler.start()
+            try:
+                await scenario(scheduler)
+            finally:
+                await scheduler.stop()
+
+        asyncio.run(main())
+
+    def test_parse_trigger_time(self):
+        """Test that naive and UTC trigger times are understood"""
+        self.assertEqual(parse_trigger_time("2025-10-03T15:00:00Z"), 1759503600.0)
+        self.assertIsNotNone(parse_trigger_time(in_seconds(5)))
+        self.assertIsNone(parse_trigger_time("tomorrow-ish"))
+
+    def test_fires_on_time_and_marks_triggered(self):
+        """Test that overdue reminders fire at startup and new ones fire on time"""
+        overdue = self.db.add_reminder("1", "reminder", "late", "", in_seconds(-60))
+
+        async def scenario(scheduler):
+            await asyncio.sleep(0.05)
+            self.assertEqual([rid for rid, _ in self.fired], [overdue])
+
+            expected = time.time() + 0.3
+            soon = await self.db.aadd_reminder("1", "timer", "soon", "", in_seconds(0.3))
+            await asyncio.sleep(0.5)
+            self.assertEqual([rid for rid, _ in self.fired], [overdue, soon])
+            self.assertLess(abs(self.fired[1][1] - expected), 0.15)
+            self.assertEqual(scheduler.pending_count, 0)
+
+        self._run_scheduler(scenario)
+
+        self.assertEqual(self.db.get_reminder(overdue)["status"], "triggered")
+        self.assertEqual(self.db.get_pending_reminders(), [])
+
+    def test_cancelled_reminder_never_fires(self):
+        """Test that cancelling a reminder removes it from the schedule"""
+        kept = self.db.add_reminder("1", "reminder", "kept", "", in_seconds(0.2))
+        cancelled = self.db.add_reminder("2", "reminder", "gone", "", in_seconds(0.1))
+
+        async def scenario(scheduler):
+            self.assertEqual(scheduler.pending_count, 2)
+            await self.db.acancel_reminder(cancelled, "2")
+            await asyncio.sleep(0.4)
+
+        self._run_scheduler(scenario)
+
+        self.assertEqual([rid for rid, _ in self.fired], [kept])
+        self.assertEqual(self.db.get_reminder(cancelled)["status"], "cancelled")
+
+    def test_batch_status_update(self):
+        """Test that several statuses are updated at once"""
+        ids = [self.db.add_reminder("1", "reminder", f"r{i}", "", in_seconds(60)) for i in range(3)]
+
+        self.db.update_reminder_statuses(ids[:2], "triggered")
+
+        self.assertEqual([r["id"] for r in self.db.get_pending_reminders()], [ids[2]])
+
+
+if __name__ == '__main__':
+    unittest.main()
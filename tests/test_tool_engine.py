@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Tests for the multi-round tool execution engine
+"""
+
+import asyncio
+import json
+import time
+import unittest
+import sys
+import os
+from unittest.mock import ANY, MagicMock
+
+# Add the project root to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from ai.tool_engine import ToolExecutionEngine
+
+
+def tool_call(call_id, name, arguments):
+    """Build an OpenAI-format tool call"""
+    return {
+        "id": call_id,
+        "type": "function",
+        "function": {"name": name, "arguments": json.dumps(arguments)},
+    }
+
+
+def model_response(content="", tool_calls=None, total_tokens=None):
+    """Build an OpenAI-format model response"""
+    message = {"role": "assistant", "content": content}
+    if tool_calls:
+        message["tool_calls"] = tool_calls
+    response = {"choices": [{"message": message}]}
+    if total_tokens:
+        response["usage"] = {"total_tokens": total_tokens}
+    return response
+
+
+class TestToolExecutionEngine(unittest.TestCase):
+    """Test cases for ToolExecutionEngine"""
+
+    def setUp(self):
+        self.tool_manager = MagicMock()
+        self.executed = []
+
+        async def execute_tool(name, arguments, user_id):
+            self.executed.append((name, arguments))
+            await asyncio.sleep(self.delays.get(name, 0))
+            return f"{name} done"
+
+        self.delays = {}
+        self.tool_manager.execute_tool = execute_tool
+
+    def _scripted_model(self, responses):
+        """Return a generate() fake answering with the given responses in order"""
+        calls = []
+
+        async def generate(**request):
+            calls.append(request)
+            return responses[len(calls) - 1]
+
+        return generate, calls
+
+    def test_tool_calls_run_concurrently_in_order(self):
+        """Test that slow tools overlap and results keep tool_call_id order"""
+        self.delays = {"web_search": 0.2, "get_crypto_price": 0.05, "company_research": 0.1}
+        engine = ToolExecutionEngine(self.tool_manager)
+        tool_calls = [
+            tool_call("call_1", "web_search", {"query": "btc news"}),
+            tool_call("call_2", "get_crypto_price", {"symbol": "BTC"}),
+            tool_call("call_3", "company_research", {"company_name": "MSTR"}),
+        ]
+
+        start = time.monotonic()
+        results, _ = asyncio.run(engine.execute_tool_calls(tool_calls, "42", "1337"))
+        elapsed = time.monotonic() - start
+
+        self.assertLess(elapsed, 0.3)
+        self.assertEqual([r["tool_call_id"] for r in results], ["call_1", "call_2", "call_3"])
+        self.assertEqual(results[1]["content"], "get_crypto_price done")
+        self.assertEqual(self.tool_manager.record_execution_time.call_count, 3)
+
+    def test_tool_call_timeout_and_current_channel(self):
+        """Test that a hung tool times out without failing the other calls"""
+        self.delays = {"web_search": 5}
+        engine = ToolExecutionEngine(self.tool_manager, tool_timeout=0.05)
+        tool_calls = [
+            tool_call("call_1", "web_search", {"query": "slow"}),
+            tool_call("call_2", "discord_read_channel", {"channel_id": "current"}),
+        ]
+
+        results, _ = asyncio.run(engine.execute_tool_calls(tool_calls, "42", "1337"))
+
+        self.assertIn("timed out", results[0]["content"])
+        self.assertEqual(results[1]["content"], "discord_read_channel done")
+        self.assertIn(("discord_read_channel", {"channel_id": "1337"}), self.executed)
+        self.tool_manager.record_execution_time.assert_any_call("web_search", ANY, True)
+
+    def test_chains_rounds_and_deduplicates(self):
+        """Test that tools can be chained and repeated calls run only once"""
+        generate, calls = self._scripted_model([
+            model_response(tool_calls=[
+                tool_call("a", "web_search", {"query": "btc"}),
+                tool_call("b", "web_search", {"query": "btc"}),
+            ]),
+            model_response(tool_calls=[
+                tool_call("c", "web_search", {"query": "btc"}),
+                tool_call("d", "get_crypto_price", {"symbol": "BTC"}),
+            ]),
+            model_response(content="btc is pumping"),
+        ])
+        engine = ToolExecutionEngine(self.tool_manager, max_rounds=3)
+        messages = [{"role": "user", "content": "btc?"}]
+
+        result = asyncio.run(engine.run(generate, messages, [{"type": "function"}], "42", "1"))
+
+        self.assertEqual(result.content, "btc is pumping")
+        self.assertEqual(result.stop_reason, "final_content")
+        self.assertEqual(result.tool_rounds, 2)
+        self.assertEqual([r.deduplicated for r in result.rounds[:2]], [1, 1])
+        self.assertEqual(
+            self.executed,
+            [("web_search", {"query": "btc"}), ("get_crypto_price", {"symbol": "BTC"})],
+        )
+        # Every round may use tools and tool results are fed back in order
+        self.assertTrue(all("tools" in call for call in calls))
+        self.assertEqual(
+            [m.get("tool_call_id") for m in messages if m["role"] == "tool"],
+            ["a", "b", "c", "d"],
+        )
+
+    def test_final_answer_forced_after_max_rounds(self):
+        """Test that the model must answer without tools once rounds run out"""
+        generate, calls = self._scripted_model([
+            model_response(tool_calls=[tool_call("a", "web_search", {"query": "x"})]),
+            model_response(content="final"),
+        ])
+        engine = ToolExecutionEngine(self.tool_manager, max_rounds=1)
+
+        result = asyncio.run(engine.run(generate, [], [{"type": "function"}], "42", "1"))
+
+        self.assertEqual(result.content, "final")
+        self.assertEqual(result.stop_reason, "max_rounds")
+        self.assertNotIn("tools", calls[1])
+
+    def test_token_budget_stops_tool_rounds(self):
+        """Test that spending the token budget ends the tool rounds"""
+        generate, calls = self._scripted_model([
+            model_response(tool_calls=[tool_call("a", "web_search", {"query": "x"})], total_tokens=500),
+            model_response(content="final"),
+        ])
+        engine = ToolExecutionEngine(self.tool_manager, max_rounds=5, token_budget=100)
+
+        result = asyncio.run(engine.run(generate, [], [{"type": "function"}], "42", "1"))
+
+        self.assertEqual(result.stop_reason, "token_budget")
+        self.assertNotIn("tools", calls[1])
+
+    def test_error_is_reported(self):
+        """Test that a model error ends the loop with the error"""
+        generate, _ = self._scripted_model([{"error": "providers down"}])
+        engine = ToolExecutionEngine(self.tool_manager)
+
+        result = asyncio.run(engine.run(generate, [], None, "42", "1"))
+
+        self.assertEqual(result.error, "providers down")
+        self.assertEqual(result.tool_rounds, 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -124,5 +124,176 @@ class TestToolManager(unittest.TestCase):
         }))
         self.assertIn("Error executing", result)
 
+    def test_execution_stats(self):
+        """Test per-tool wall time and timeout counts"""
+        self.tool_manager.record_execution_time("web_search", 1.0)
+        self.tool_manager.record_execution_time("web_search", 3.0, timed_out=True)
+
+        self.assertEqual(
+            self.tool_manager.get_execution_stats()["web_search"],
+            {"samples": 2, "avg_time": 2.0, "max_time": 3.0, "timeouts": 1},
+        )
+
+class TestToolResultCache(unittest.TestCase):
+    """Test cases for the shared tool result cache"""
+
+    def setUp(self):
+        self.tool_manager = ToolManager()
+        self.tool_manager.result_cache_enabled = True
+        self.calls = []
+
+        def get_crypto_price(symbol, currency="USD", user_id="system"):
+            self.calls.append(symbol)
+            time.sleep(0.05)
+            return f"Current {symbol.upper()} price: $1.00 {currency}"
+
+        self.tool_manager.tools["get_crypto_price"] = get_crypto_price
+
+    def test_repeated_calls_are_served_from_cache(self):
+        """Test that normalized identical requests hit the cache"""
+        import asyncio
+
+        async def run():
+            first = await self.tool_manager.execute_tool(
+                "get_crypto_price", {"symbol": "BTC"}, "1"
+            )
+            second = await self.tool_manager.execute_tool(
+                "get_crypto_price", {"symbol": " btc "}, "2"
+            )
+            return first, second
+
+        first, second = asyncio.run(run())
+        self.assertEqual(first, second)
+        self.assertEqual(self.calls, ["BTC"])
+        stats = self.tool_manager.result_cache.get_stats()
+        self.assertEqual(stats["tools"]["get_crypto_price"]["hits"], 1)
+        self.assertEqual(stats["tools"]["get_crypto_price"]["misses"], 1)
+
+    def test_concurrent_requests_are_coalesced(self):
+        """Test that concurrent identical requests share one upstream call"""
+        import asyncio
+
+        async def run():
+            return await asyncio.gather(*(
+                self.tool_manager.execute_tool("get_crypto_price", {"symbol": "ETH"}, str(i))
+                for i in range(5)
+            ))
+
+        results = asyncio.run(run())
+        self.assertEqual(len(set(results)), 1)
+        self.assertEqual(self.calls, ["ETH"])
+        self.assertEqual(self.tool_manager.result_cache.get_stats()["coalesced"], 4)
+
+    def test_errors_and_expired_results_are_not_served(self):
+        """Test that failures aren't cached and entries expire with their TTL"""
+        import asyncio
+
+        self.tool_manager.tools["get_crypto_price"] = (
+            lambda symbol, currency="USD", user_id="system":
+            self.calls.append(symbol) or "Rate limit exceeded. Please wait."
+        )
+        for _ in range(2):
+            asyncio.run(self.tool_manager.execute_tool("get_crypto_price", {"symbol": "SOL"}))
+        self.assertEqual(self.calls, ["SOL", "SOL"])
+
+        cache = self.tool_manager.result_cache
+        cache.ttls["web_search"] = 0.01
+        key = cache.make_key("web_search", {"query": "gm"})
+        cache.set("web_search", key, "results")
+        self.assertEqual(cache.get(key), "results")
+        time.sleep(0.02)
+        self.assertIsNone(cache.get(key))
+
+class TestToolExecutionKinds(unittest.TestCase):
+    """Test cases for the tool workload registry and async-native tools"""
+
+    def setUp(self):
+        self.tool_manager = ToolManager()
+        self.tool_manager.result_cache_enabled = False
+
+    def test_every_tool_declares_its_workload(self):
+        """Test that the registry covers all tools with a known kind"""
+        self.assertEqual(set(self.tool_manager.tool_kinds), set(self.tool_manager.tools))
+        self.assertTrue(
+            set(self.tool_manager.tool_kinds.values()) <= {"io", "cpu", "inline"}
+        )
+
+    def test_blocking_tools_run_on_dedicated_pools(self):
+        """Test that sync tools run on the tool pools, not the default executor"""
+        import asyncio
+        import threading
+
+        def current_thread(**kwargs):
+            return threading.current_thread().name
+
+        self.tool_manager.tools["set_reminder"] = current_thread
+        self.tool_manager.tools["calculate"] = current_thread
+        self.tool_manager.tools["get_current_time"] = current_thread
+
+        async def run():
+            return (
+                await self.tool_manager.execute_tool("set_reminder", {}),
+                await self.tool_manager.execute_tool("calculate", {}),
+                await self.tool_manager.execute_tool("get_current_time", {}),
+            )
+
+        io_thread, cpu_thread, inline_thread = asyncio.run(run())
+        self.assertTrue(io_thread.startswith("tool-io"))
+        self.assertTrue(cpu_thread.startswith("tool-cpu"))
+        self.assertEqual(inline_thread, threading.current_thread().name)
+
+    def test_mcp_calls_use_the_bot_loop_before_any_pooled_tool(self):
+        """Test that a sync tool on another thread reaches the shared MCP client on the bot loop"""
+        import asyncio
+
+        loops = []
+
+        async def call(client):
+            loops.append((client, asyncio.get_running_loop()))
+            return {"status": "success"}
+
+        async def run():
+            self.tool_manager.set_event_loop(asyncio.get_running_loop())
+            result = await asyncio.to_thread(self.tool_manager._run_mcp_call, call)
+            return result, asyncio.get_running_loop()
+
+        with patch("tools.mcp_memory_client.mcp_memory_client", "shared client"):
+            result, loop = asyncio.run(run())
+
+        self.assertEqual(result, {"status": "success"})
+        self.assertEqual(loops, [("shared client", loop)])
+
+    def test_async_web_search_uses_shared_session(self):
+        """Test the async web_search against a local SearXNG-like server"""
+        import asyncio
+        from aiohttp import web
+
+        async def handler(request):
+            self.assertEqual(request.query["format"], "json")
+            return web.json_response({"results": [
+                {"title": "Bitcoin", "content": "BTC news", "url": "https://example.com"}
+            ]})
+
+        async def run():
+            app = web.Application()
+            app.router.add_get("/search", handler)
+            runner = web.AppRunner(app)
+            await runner.setup()
+            site = web.TCPSite(runner, "127.0.0.1", 0)
+            await site.start()
+            port = site._server.sockets[0].getsockname()[1]
+            try:
+                with patch.object(
+                    ToolManager, "_get_web_search_instances",
+                    return_value=["http://127.0.0.1:1", f"http://127.0.0.1:{port}"],
+                ):
+                    return await self.tool_manager.execute_tool("web_search", {"query": "btc"})
+            finally:
+                await self.tool_manager.aclose()
+                await runner.cleanup()
+
+        result = asyncio.run(run())
+        self.assertEqual(result, "• Bitcoin: BTC news (https://example.com)")
+
 if __name__ == '__main__':
     unittest.main()
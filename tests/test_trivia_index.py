@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+Tests for the in-memory trivia answer index
+"""
+
+import asyncio
+import os
+import sqlite3
+import sys
+import tempfile
+import unittest
+from unittest.mock import AsyncMock, patch
+
+# Add the project root to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from data.trivia_database import TriviaDatabase
+from data.trivia_index import TriviaAnswerIndex, normalize_text
+from utils.trivia_manager import TriviaManager
+
+
+class TestTriviaAnswerIndex(unittest.TestCase):
+    """Test cases for normalization, exact and fuzzy lookups"""
+
+    def setUp(self):
+        self.index = TriviaAnswerIndex(fuzzy_threshold=0.92)
+        self.index.add("Geography", "What is the capital of Australia?", "Canberra", 1)
+        self.index.add("Geography", "Which river flows through the city of Cairo?", "Nile", 2)
+        self.index.add("History", "What is the capital of Australia?", "Sydney?", 3)
+
+    def test_normalize_text(self):
+        """Test case, punctuation, whitespace, entity and accent folding"""
+        self.assertEqual(
+            normalize_text("  Who  wrote &quot;Les Misérables&quot;?! "),
+            "who wrote les miserables",
+        )
+        self.assertEqual(normalize_text("ＰＯＫÉＭＯＮ"), "pokemon")
+
+    def test_exact_lookup_ignores_formatting(self):
+        """Test that differently formatted questions hit the same entry"""
+        entry = self.index.lookup("geography", "what is the CAPITAL of australia")
+
+        self.assertEqual(entry.answer, "Canberra")
+        self.assertEqual(entry.question_id, 1)
+
+    def test_categories_are_separate(self):
+        """Test that the category is part of the key"""
+        self.assertEqual(self.index.lookup("History", "What is the capital of Australia?").answer, "Sydney?")
+        self.assertIsNone(self.index.lookup("Art", "What is the capital of Australia?"))
+
+    def test_fuzzy_lookup(self):
+        """Test typos and partial questions, but not a different question"""
+        self.assertEqual(self.index.lookup("Geography", "Which rivr flows through the city of Cairo").answer, "Nile")
+        self.assertEqual(self.index.lookup("Geography", "river flows through the city of Cai").answer, "Nile")
+        self.assertIsNone(self.index.lookup("Geography", "Which river flows through the city of Paris?"))
+        self.assertIsNone(self.index.lookup("Geography", "What is the capital of Austria?"))
+
+    def test_update_keeps_id(self):
+        """Test that re-adding a question updates its answer in place"""
+        self.index.add("Geography", "which river flows through the city of cairo", "The Nile")
+
+        entry = self.index.get("Geography", "Which river flows through the city of Cairo?")
+        self.assertEqual((entry.answer, entry.question_id), ("The Nile", 2))
+        self.assertEqual(len(self.index), 3)
+
+
+class TestTriviaManagerIndex(unittest.TestCase):
+    """Test cases for lookups through the warmed index"""
+
+    def setUp(self):
+        self.test_db = tempfile.NamedTemporaryFile(delete=False, suffix='.db')
+        self.test_db.close()
+        self.db = TriviaDatabase(self.test_db.name)
+        self.manager = TriviaManager()
+        self.manager.db = self.db
+
+    def tearDown(self):
+        self.db.close()
+        os.unlink(self.test_db.name)
+
+    def _times_asked(self, question_id):
+        conn = sqlite3.connect(self.test_db.name)
+        row = conn.execute(
+            "SELECT times_asked FROM trivia_questions WHERE id = ?", (question_id,)
+        ).fetchone()
+        conn.close()
+        return row[0]
+
+    def test_lookup_is_answered_from_memory(self):
+        """Test that a warmed index answers without querying the database"""
+
+        async def run():
+            question_id = await self.db.add_question("Science: Computers", "What does CPU stand for?", "Central Processing Unit")
+            await self.db.cache_category_questions("Animals", [{"question": "What is a baby cat called?", "answer": "Kitten"}])
+            self.assertEqual(await self.manager.warm_index(), 2)
+
+            self.db.find_answer = AsyncMock(side_effect=AssertionError("database queried"))
+            answers = [
+                await self.manager.find_trivia_answer("Science: Computers", "what does cpu stand for"),
+                await self.manager.find_trivia_answer("Science: Computers", "What does CPU stand for?"),
+                await self.manager.find_trivia_answer("Animals", "What is a baby cat called?"),
+            ]
+            await self.manager.flush()
+            return question_id, answers
+
+        question_id, answers = asyncio.run(run())
+
+        self.assertEqual(answers, ["Central Processing Unit", "Central Processing Unit", "Kitten"])
+        self.assertEqual(self._times_asked(question_id), 2)
+        # The cached answer was stored in the database and indexed with its id
+        self.assertIsNotNone(self.manager.index.get("Animals", "What is a baby cat called?").question_id)
+
+    def test_learned_answers_are_indexed(self):
+        """Test that unknown and then learned questions update the index"""
+
+        async def run():
+            await self.manager.warm_index()
+            await self.manager.record_unknown_question("Art", "Who painted the Mona Lisa?")
+            unknown = self.manager.index.get("Art", "Who painted the Mona Lisa?").answer
+            await self.manager.record_successful_answer("Art", "Who painted the Mona Lisa?", "Leonardo da Vinci")
+            learned = await self.manager.find_trivia_answer("Art", "Who painted the Mona Lisa?")
+            await self.manager.flush()
+            return unknown, learned
+
+        unknown, learned = asyncio.run(run())
+
+        self.assertEqual(unknown, "UNKNOWN_ANSWER")
+        self.assertEqual(learned, "Leonardo da Vinci")
+        self.assertEqual(len(self.manager.index), 1)
+
+    def test_unknown_questions_are_not_answers(self):
+        """Test that a recorded unknown question stays a miss, so drops use the random fallback"""
+
+        async def run():
+            await self.manager.warm_index()
+            await self.manager.record_unknown_question("Art", "Who painted the Mona Lisa?")
+            with patch.object(self.manager, "_fetch_from_external_source", AsyncMock(return_value=None)):
+                answers = [
+                    await self.manager.find_trivia_answer("Art", "Who painted the Mona Lisa?"),
+                    await self.manager.find_trivia_answer("Art", "Who painted the Mona Lisa"),
+                ]
+                self.manager.index.ready = False
+                answers.append(await self.manager.find_trivia_answer("Art", "Who painted the Mona Lisa?"))
+            await self.manager.flush()
+            return answers
+
+        self.assertEqual(asyncio.run(run()), [None, None, None])
+        self.assertIsNotNone(self.manager.index.get("Art", "Who painted the Mona Lisa?").question_id)
+
+
+class TestTriviaBackgroundSync(unittest.TestCase):
+    """Test cases for syncing categories from a local CSV server"""
+
+    def setUp(self):
+        self.test_db = tempfile.NamedTemporaryFile(delete=False, suffix='.db')
+        self.test_db.close()
+        self.db = TriviaDatabase(self.test_db.name)
+        self.manager = TriviaManager()
+        self.manager.db = self.db
+        self.requests = []
+        self.outage = 0
+
+    def tearDown(self):
+        self.db.close()
+        os.unlink(self.test_db.name)
+
+    async def _serve(self):
+        """Serve Geography.csv with an ETag, 404 for every other category"""
+        from aiohttp import web
+
+        async def handler(request):
+            name = request.match_info["name"]
+            self.requests.append((name, request.headers.get("If-None-Match")))
+            if name != "Geography.csv":
+                raise web.HTTPNotFound()
+            if self.outage:
+                self.outage -= 1
+                raise web.HTTPServiceUnavailable()
+            if request.headers.get("If-None-Match") == '"v1"':
+                return web.Response(status=304)
+            return web.Response(
+                text="What is the capital of Peru?,Lima\nLongest river in Africa?,Nile\n",
+                headers={"ETag": '"v1"'},
+            )
+
+        app = web.Application()
+        app.router.add_get("/{name}", handler)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.manager.github_base_url = f"http://127.0.0.1:{port}"
+        return runner
+
+    def test_sync_is_conditional_and_drops_stay_local(self):
+        """Test import, 304 revalidation, and lookups without the network"""
+        import aiohttp
+
+        async def run():
+            runner = await self._serve()
+            self.manager.session = aiohttp.ClientSession()
+            try:
+                await self.db.add_question("Geography", "Longest river in Africa?", "UNKNOWN_ANSWER")
+                first = await self.manager.sync_all_categories()
+                second = await self.manager.sync_all_categories()
+
+                with patch.object(
+                    self.manager, "_fetch_from_external_source",
+                    AsyncMock(side_effect=AssertionError("network used")),
+                ):
+                    self.manager.index.ready = True
+                    answer = await self.manager.find_trivia_answer("Geography", "what is the capital of peru")
+                    missing = await self.manager._find_trivia_answer_impl("Geography", "Capital of Chad?")
+                await self.manager.flush()
+                return first, second, answer, missing
+            finally:
+                await self.manager.session.close()
+                await runner.cleanup()
+
+        first, second, answer, missing = asyncio.run(run())
+
+        # One new question plus one unknown answer filled in
+        self.assertEqual((first["updated"], first["imported"]), (1, 2))
+        self.assertEqual((second["updated"], second["not_modified"]), (0, 1))
+        self.assertIn(("Geography.csv", '"v1"'), self.requests)
+        self.assertEqual(answer, "Lima")
+        self.assertIsNone(missing)
+        self.assertEqual(self.manager.index.get("Geography", "Longest river in Africa?").answer, "Nile")
+
+    def test_failed_categories_are_retried_before_next_sync(self):
+        """Test that a category whose first sync failed is retried on the short backoff"""
+        import aiohttp
+        self.outage = 2
+
+        async def run():
+            runner = await self._serve()
+            self.manager.session = aiohttp.ClientSession()
+            try:
+                with patch("utils.trivia_manager.TRIVIA_SYNC_INTERVAL", 3600), \
+                        patch("utils.trivia_manager.TRIVIA_SYNC_RETRY_INTERVAL", 0.05):
+                    self.manager.start_background_sync()
+                    for _ in range(100):
+                        await asyncio.sleep(0.02)
+                        if "Geography" not in await self.manager.unsynced_categories():
+                            break
+                    await self.manager.stop_background_sync()
+                await self.manager.flush()
+            finally:
+                await self.manager.session.close()
+                await runner.cleanup()
+
+        asyncio.run(run())
+
+        self.assertGreater([name for name, _ in self.requests].count("Geography.csv"), 1)
+        self.assertEqual(self.manager.index.get("Geography", "What is the capital of Peru?").answer, "Lima")
+
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -8,25 +8,50 @@ import json
 import logging
 import os
 import time
-from typing import Any, Dict, List, Optional, Union
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple, Union
+from urllib.parse import urlencode
 
 import aiohttp
 
-from config import MCP_MEMORY_ENABLED
+from ai.clients.http_session import SharedClientSession
+from config import (
+    MCP_CIRCUIT_FAILURE_THRESHOLD,
+    MCP_CIRCUIT_RESET_TIMEOUT,
+    MCP_HTTP_POOL_LIMIT_PER_HOST,
+    MCP_HTTP_TIMEOUT,
+    MCP_MEMORY_ENABLED,
+)
 
 logger = logging.getLogger(__name__)
 
+# path -> (mtime_ns, stripped contents) of the port and token files
+_file_cache: Dict[str, Tuple[int, str]] = {}
+
+
+def _read_cached_file(path: str) -> Optional[str]:
+    """Read a small file, re-reading it only when its mtime changes"""
+    if not os.path.exists(path):
+        return None
+    mtime = os.stat(path).st_mtime_ns
+    cached = _file_cache.get(path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    with open(path, "r") as f:
+        contents = f.read().strip()
+    _file_cache[path] = (mtime, contents)
+    return contents
+
 
 def get_mcp_server_url():
     """Get the MCP server URL from port file or use default"""
     port_file = os.path.join(os.path.dirname(__file__), "..", ".mcp_port")
-    if os.path.exists(port_file):
-        try:
-            with open(port_file, "r") as f:
-                port = f.read().strip()
-                return f"http://localhost:{port}"
-        except Exception as e:
-            logging.warning(f"Failed reading MCP port file: {e}")
+    try:
+        port = _read_cached_file(port_file)
+        if port:
+            return f"http://localhost:{port}"
+    except Exception as e:
+        logging.warning(f"Failed reading MCP port file: {e}")
 
     # Fallback to default port
     return "http://localhost:8001"
@@ -41,27 +66,88 @@ def get_mcp_auth_token():
 
     # Then try token file
     token_file = os.path.join(os.path.dirname(__file__), "..", ".mcp_token")
-    if os.path.exists(token_file):
-        try:
-            with open(token_file, "r") as f:
-                return f.read().strip()
-        except Exception as e:
-            logging.warning(f"MCP token file read error: {e}")
+    try:
+        return _read_cached_file(token_file)
+    except Exception as e:
+        logging.warning(f"MCP token file read error: {e}")
 
     # No token available
     return None
 
 
+class CircuitBreaker:
+    """
+    Fails requests fast while the MCP memory server is unreachable.
+
+    After failure_threshold consecutive connection failures the circuit
+    opens and requests are rejected without touching the network. Once
+    reset_timeout has passed a single trial request is let through; its
+    outcome closes the circuit again or restarts the wait.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = MCP_CIRCUIT_FAILURE_THRESHOLD,
+        reset_timeout: float = MCP_CIRCUIT_RESET_TIMEOUT,
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half-open"
+        return "open"
+
+    def allow_request(self) -> bool:
+        state = self.state
+        if state == "half-open":
+            # Restart the wait so only this request goes through as a trial
+            self.opened_at = time.monotonic()
+            return True
+        return state == "closed"
+
+    def record_success(self):
+        if self.opened_at is not None:
+            logger.info("MCP memory server reachable again, closing circuit")
+        self.failures = 0
+        self.opened_at = None
+
+    def record_failure(self):
+        self.failures += 1
+        if self.opened_at is not None or self.failures >= self.failure_threshold:
+            if self.opened_at is None:
+                logger.warning(
+                    f"MCP memory server unreachable after {self.failures} attempts, "
+                    f"failing fast for {self.reset_timeout:.0f}s"
+                )
+            self.opened_at = time.monotonic()
+
+
 class MCPMemoryClient:
-    """Simple HTTP client for MCP Memory Server with authentication"""
+    """Simple HTTP client for MCP Memory Server with authentication
+
+    Use the process-wide mcp_memory_client instead of creating clients: it
+    keeps one pooled keep-alive session and a circuit breaker, so a dead
+    server costs one short timeout instead of one per request. The server
+    URL and token follow the port and token files unless given explicitly.
+    """
 
     def __init__(
         self, server_url: Optional[str] = None, auth_token: Optional[str] = None
     ):
-        self.server_url = server_url or get_mcp_server_url()
-        self.auth_token = auth_token or get_mcp_auth_token()
+        self._server_url = server_url
+        self._auth_token = auth_token
         self.enabled = MCP_MEMORY_ENABLED
-        self.session: Optional[aiohttp.ClientSession] = None
+        self._http = SharedClientSession(
+            "mcp_memory", limit_per_host=MCP_HTTP_POOL_LIMIT_PER_HOST
+        )
+        self.timeout = aiohttp.ClientTimeout(total=MCP_HTTP_TIMEOUT)
+        self.circuit_breaker = CircuitBreaker()
         
         # Logging optimization
         self.verbose_logging = os.environ.get("MCP_VERBOSE_LOGGING", "false").lower() == "true"
@@ -69,40 +155,58 @@ class MCPMemoryClient:
         self._operation_counts = {}
         self._log_cooldown = 30  # seconds between similar logs
 
+        # Last response per (user_id, query) with its ETag, revalidated with
+        # conditional requests instead of downloading unchanged memories
+        self._etag_cache: "OrderedDict[tuple, Dict[str, Any]]" = OrderedDict()
+        self._etag_cache_size = 256
+
+    @property
+    def server_url(self) -> str:
+        return self._server_url or get_mcp_server_url()
+
+    @server_url.setter
+    def server_url(self, value: Optional[str]):
+        self._server_url = value
+
+    @property
+    def auth_token(self) -> Optional[str]:
+        return self._auth_token or get_mcp_auth_token()
+
+    @auth_token.setter
+    def auth_token(self, value: Optional[str]):
+        self._auth_token = value
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """The shared pooled session, created on the running loop"""
+        return self._http.get_session()
+
     async def __aenter__(self):
         """Async context manager entry"""
-        if self.enabled:
-            self.session = aiohttp.ClientSession(
-                timeout=aiohttp.ClientTimeout(total=30)
-            )
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        """Async context manager exit"""
-        if self.session:
-            await self.session.close()
+        """Async context manager exit, the pooled session stays open"""
+
+    async def aclose(self):
+        """Close the pooled session"""
+        await self._http.close()
 
     async def check_connection(self) -> bool:
         """Check if MCP memory server is accessible and authenticated"""
-        if not self.enabled or not self.session:
+        if not self.enabled:
             return False
 
-        try:
-            # Health check doesn't require authentication
-            async with self.session.get(
-                f"{self.server_url}/health", timeout=aiohttp.ClientTimeout(total=5)
-            ) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    # Check if server has authentication enabled
-                    auth_enabled = data.get("authentication_enabled", False)
-                    if auth_enabled and not self.auth_token:
-                        logger.warning("MCP server auth failed - no token")
-                        return False
-                    return True
-                return False
-        except Exception:
+        # Health check doesn't require authentication
+        data = await self._make_request("health", method="GET")
+        if "error" in data:
+            return False
+        # Check if server has authentication enabled
+        auth_enabled = data.get("authentication_enabled", False)
+        if auth_enabled and not self.auth_token:
+            logger.warning("MCP server auth failed - no token")
             return False
+        return True
 
     def _should_log_operation(self, operation: str) -> bool:
         """Check if operation should be logged based on rate limiting"""
@@ -175,54 +279,72 @@ class MCPMemoryClient:
             return True
         return False
 
+    def _cached_response(self, cache_key: tuple) -> Optional[Dict[str, Any]]:
+        cached = self._etag_cache.get(cache_key)
+        if cached is not None:
+            self._etag_cache.move_to_end(cache_key)
+        return cached
+
+    def _cache_response(self, cache_key: tuple, result: Dict[str, Any]):
+        if "error" in result or not result.get("etag"):
+            return
+        self._etag_cache[cache_key] = result
+        self._etag_cache.move_to_end(cache_key)
+        while len(self._etag_cache) > self._etag_cache_size:
+            self._etag_cache.popitem(last=False)
+
     async def _make_request(
-        self, endpoint: str, method: str = "GET", data: Optional[Dict] = None
+        self,
+        endpoint: str,
+        method: str = "GET",
+        data: Optional[Dict] = None,
+        extra_headers: Optional[Dict[str, str]] = None,
     ) -> Dict[str, Any]:
-        """Make authenticated HTTP request to MCP memory server"""
+        """Make authenticated HTTP request to MCP memory server
+
+        A 304 Not Modified answer is returned as {"not_modified": True}.
+        While the circuit breaker is open requests fail immediately.
+        """
         if not self.enabled:
             return {"error": "MCP memory server not enabled"}
 
-        if not self.session:
-            self.session = aiohttp.ClientSession(
-                timeout=aiohttp.ClientTimeout(total=30)
-            )
+        if method not in ("GET", "POST", "DELETE"):
+            return {"error": f"Unsupported HTTP method: {method}"}
+
+        if not self.circuit_breaker.allow_request():
+            return {"error": "MCP memory server unavailable (circuit open)"}
 
         url = f"{self.server_url}/{endpoint}"
 
         # Prepare headers with authentication
         headers = {}
-        if self.auth_token and endpoint != "health":  # Don't send auth for health check
-            headers["Authorization"] = f"Bearer {self.auth_token}"
+        auth_token = self.auth_token
+        if auth_token and endpoint != "health":  # Don't send auth for health check
+            headers["Authorization"] = f"Bearer {auth_token}"
+        if extra_headers:
+            headers.update(extra_headers)
 
         try:
-            if method == "GET":
-                async with self.session.get(url, headers=headers) as response:
-                    if response.status == 401:
-                        return {
-                            "error": "Authentication failed - invalid or missing token"
-                        }
-                    result = await response.json()
-            elif method == "POST":
-                async with self.session.post(
-                    url, json=data, headers=headers
-                ) as response:
-                    if response.status == 401:
-                        return {
-                            "error": "Authentication failed - invalid or missing token"
-                        }
-                    result = await response.json()
-            elif method == "DELETE":
-                async with self.session.delete(url, headers=headers) as response:
-                    if response.status == 401:
-                        return {
-                            "error": "Authentication failed - invalid or missing token"
-                        }
-                    result = await response.json()
-            else:
-                return {"error": f"Unsupported HTTP method: {method}"}
-
-            return result
-
+            async with self.session.request(
+                method,
+                url,
+                json=data if method == "POST" else None,
+                headers=headers,
+                timeout=self.timeout,
+            ) as response:
+                self.circuit_breaker.record_success()
+                if response.status == 401:
+                    return {
+                        "error": "Authentication failed - invalid or missing token"
+                    }
+                if response.status == 304:
+                    return {"not_modified": True}
+                return await response.json()
+
+        except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+            self.circuit_breaker.record_failure()
+            logger.error(f"MCP connection error: {e!r}")
+            return {"error": f"Connection error: {e!r}"}
         except aiohttp.ClientError as e:
             logger.error(f"MCP connection error: {e}")
             return {"error": f"Connection error: {str(e)}"}
@@ -248,27 +370,119 @@ class MCPMemoryClient:
         return self._log_operation_result("memory storage", user_id, result, information_type)
 
     async def search_user_memory(
-        self, user_id: str, query: Optional[str] = None
+        self,
+        user_id: str,
+        query: Optional[str] = None,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
     ) -> Dict[str, Any]:
-        """Search user memories in MCP memory server"""
+        """Search user memories in MCP memory server
+
+        Results are paginated, pass the returned next_cursor to get the
+        following page.
+        """
         params = {"user_id": user_id}
         if query:
             params["query"] = query
+        if limit:
+            params["limit"] = limit
+        if cursor:
+            params["cursor"] = cursor
 
-        # Build query string
-        query_string = "&".join([f"{k}={v}" for k, v in params.items()])
-        endpoint = f"memories/search?{query_string}"
+        endpoint = f"memories/search?{urlencode(params)}"
 
         result = await self._make_request(endpoint, method="GET")
         return self._log_operation_result("memory search", user_id, result)
 
-    async def get_user_memories(self, user_id: str, limit: int = 10) -> Dict[str, Any]:
-        """Get recent memories for a user"""
-        endpoint = f"memories?user_id={user_id}&limit={limit}"
-
-        result = await self._make_request(endpoint, method="GET")
+    async def get_user_memories(
+        self,
+        user_id: str,
+        limit: int = 10,
+        cursor: Optional[str] = None,
+        since: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Get recent memories for a user, one page at a time
+
+        First pages are revalidated with their ETag, so unchanged memories
+        are not downloaded again. With since, only memories stored after
+        that ISO timestamp are returned.
+        """
+        params = {"user_id": user_id, "limit": limit}
+        if cursor:
+            params["cursor"] = cursor
+        if since:
+            params["since"] = since
+        endpoint = f"memories?{urlencode(params)}"
+
+        cache_key = ("memories", user_id, limit) if not cursor and not since else None
+        cached = self._cached_response(cache_key) if cache_key else None
+        extra_headers = {"If-None-Match": cached["etag"]} if cached else None
+
+        result = await self._make_request(endpoint, method="GET", extra_headers=extra_headers)
+        if result.get("not_modified") and cached:
+            result = cached
+        elif cache_key:
+            self._cache_response(cache_key, result)
         return self._log_operation_result("memory retrieval", user_id, result)
 
+    async def batch_store_memories(self, memories: List[Dict[str, str]]) -> Dict[str, Any]:
+        """Store several memories in one request
+
+        Each memory is a dict with user_id, information_type and information.
+        """
+        if not memories:
+            return {"status": "success", "stored": 0, "memory_ids": []}
+
+        result = await self._make_request(
+            "batch_store", method="POST", data={"memories": memories}
+        )
+        return self._log_operation_result(
+            "memory storage", None, result, f"{len(memories)} memories"
+        )
+
+    async def batch_get_memories(
+        self,
+        user_ids: List[str],
+        information_types: Optional[List[str]] = None,
+        limit: int = 10,
+        since: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Get memories for several users (or several keys of them) in one request
+
+        Returns {"results": {user_id: {"memories": [...], ...}}}. Users whose
+        memories are unchanged since the last call are served from cache.
+        """
+        types = tuple(sorted(information_types or ()))
+        cache_keys = {
+            user_id: ("batch", user_id, types, limit) for user_id in user_ids
+        } if not since else {}
+        etags = {}
+        for user_id, cache_key in cache_keys.items():
+            cached = self._cached_response(cache_key)
+            if cached:
+                etags[user_id] = cached["etag"]
+
+        data = {"user_ids": list(user_ids), "limit": limit}
+        if information_types:
+            data["information_types"] = list(information_types)
+        if since:
+            data["since"] = since
+        if etags:
+            data["etags"] = etags
+
+        result = await self._make_request("batch_get", method="POST", data=data)
+        for user_id, user_result in result.get("results", {}).items():
+            cache_key = cache_keys.get(user_id)
+            if cache_key is None:
+                continue
+            if user_result.get("not_modified"):
+                cached = self._cached_response(cache_key)
+                if cached:
+                    result["results"][user_id] = cached
+            else:
+                self._cache_response(cache_key, user_result)
+        return self._log_operation_result("memory retrieval", None, result)
+
     async def delete_user_memories(
         self, user_id: str, memory_type: Optional[str] = None
     ) -> Dict[str, Any]:
@@ -277,8 +491,7 @@ class MCPMemoryClient:
         if memory_type:
             params["type"] = memory_type
 
-        query_string = "&".join([f"{k}={v}" for k, v in params.items()])
-        endpoint = f"memories?{query_string}"
+        endpoint = f"memories?{urlencode(params)}"
 
         result = await self._make_request(endpoint, method="DELETE")
         return self._log_operation_result("memory deletion", user_id, result)
@@ -5,9 +5,14 @@ Provides HTTP API endpoints for memory storage and retrieval
 
 import json
 import asyncio
+import base64
+import bisect
+import hashlib
+import re
 from datetime import datetime
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Set, Tuple
 from aiohttp import web, ClientSession
+import aiosqlite
 import logging
 import uuid
 import socket
@@ -21,6 +26,272 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+# Persistent storage, an empty MCP_MEMORY_DB_PATH keeps memories in memory only
+DEFAULT_DB_PATH = os.path.join(os.path.dirname(__file__), "..", "data", "mcp_memory.db")
+MCP_MEMORY_DB_PATH = os.getenv("MCP_MEMORY_DB_PATH", DEFAULT_DB_PATH)
+
+# Pagination defaults and the hard cap on memories per response
+DEFAULT_GET_LIMIT = 10
+DEFAULT_SEARCH_LIMIT = 50
+MAX_PAGE_SIZE = 1000
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> Set[str]:
+    """Split text into lowercase word tokens for the search index"""
+    return set(TOKEN_PATTERN.findall(text.lower()))
+
+
+def encode_cursor(key: Tuple[str, str]) -> str:
+    """Encode a (timestamp, id) timeline position as an opaque cursor"""
+    return base64.urlsafe_b64encode(f"{key[0]}|{key[1]}".encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[str, str]:
+    """Decode a cursor, raising ValueError if it is malformed"""
+    try:
+        timestamp, memory_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|", 1)
+    except Exception:
+        raise ValueError(f"Invalid cursor: {cursor!r}")
+    return timestamp, memory_id
+
+
+class MemoryStore:
+    """
+    Indexed memory storage for the MCP memory server.
+
+    Every user has a timeline of (timestamp, id) pairs kept sorted, so the
+    newest N memories (or the page after a cursor) are found by bisection
+    instead of sorting, and a token -> ids index used for search, with the
+    tokens also kept sorted so word prefixes are found by bisection. With a
+    db_path the memories are persisted in SQLite and reloaded on open().
+    """
+
+    def __init__(self, db_path: Optional[str] = None):
+        self.db_path = db_path
+        self._db: Optional[aiosqlite.Connection] = None
+        self._records: Dict[str, Dict[str, Dict[str, Any]]] = {}  # user_id -> id -> memory
+        self._timelines: Dict[str, List[Tuple[str, str]]] = {}  # user_id -> sorted (timestamp, id)
+        self._tokens: Dict[str, Dict[str, Set[str]]] = {}  # user_id -> token -> ids
+        self._sorted_tokens: Dict[str, List[str]] = {}  # user_id -> sorted tokens
+        # Per-user change counters for ETags; the epoch keeps ETags from a
+        # previous run from matching after a restart
+        self._versions: Dict[str, int] = {}
+        self._epoch = uuid.uuid4().hex[:8]
+
+    async def open(self):
+        """Open the database and load persisted memories into the indexes"""
+        if not self.db_path:
+            return
+
+        os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+        self._db = await aiosqlite.connect(self.db_path)
+        self._db.row_factory = aiosqlite.Row
+        await self._db.execute("PRAGMA journal_mode=WAL")
+        await self._db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS memories (
+                id TEXT PRIMARY KEY,
+                user_id TEXT NOT NULL,
+                information_type TEXT NOT NULL,
+                information TEXT NOT NULL,
+                timestamp TEXT NOT NULL,
+                created_at TEXT NOT NULL
+            )
+            """
+        )
+        await self._db.execute(
+            "CREATE INDEX IF NOT EXISTS idx_memories_user_timestamp ON memories (user_id, timestamp)"
+        )
+        await self._db.commit()
+
+        async with self._db.execute("SELECT * FROM memories") as cursor:
+            async for row in cursor:
+                self._index(dict(row))
+        logger.info(f"Loaded {self.count()} memories from {self.db_path}")
+
+    async def close(self):
+        """Close the database connection"""
+        if self._db is not None:
+            await self._db.close()
+            self._db = None
+
+    def count(self, user_id: Optional[str] = None) -> int:
+        """Number of stored memories, for one user or in total"""
+        if user_id is not None:
+            return len(self._records.get(user_id, {}))
+        return sum(len(records) for records in self._records.values())
+
+    def etag(self, user_id: str, *params: Any) -> str:
+        """ETag of a view of a user's memories
+
+        It changes whenever the user's memories are modified, and params
+        (limit, cursor, since, ...) make it specific to the page requested,
+        so an ETag from one page never validates another.
+        """
+        view = hashlib.sha1(repr(params).encode()).hexdigest()[:12]
+        return f'"{self._epoch}-{self._versions.get(user_id, 0)}-{view}"'
+
+    def _index(self, memory: Dict[str, Any]):
+        user_id = memory["user_id"]
+        self._versions[user_id] = self._versions.get(user_id, 0) + 1
+        self._records.setdefault(user_id, {})[memory["id"]] = memory
+        bisect.insort(self._timelines.setdefault(user_id, []), (memory["timestamp"], memory["id"]))
+        tokens = self._tokens.setdefault(user_id, {})
+        sorted_tokens = self._sorted_tokens.setdefault(user_id, [])
+        for token in tokenize(f"{memory['information_type']} {memory['information']}"):
+            if token not in tokens:
+                tokens[token] = set()
+                bisect.insort(sorted_tokens, token)
+            tokens[token].add(memory["id"])
+
+    def _unindex(self, memory: Dict[str, Any]):
+        user_id = memory["user_id"]
+        self._versions[user_id] += 1
+        del self._records[user_id][memory["id"]]
+
+        timeline = self._timelines[user_id]
+        position = bisect.bisect_left(timeline, (memory["timestamp"], memory["id"]))
+        del timeline[position]
+
+        tokens = self._tokens[user_id]
+        sorted_tokens = self._sorted_tokens[user_id]
+        for token in tokenize(f"{memory['information_type']} {memory['information']}"):
+            ids = tokens.get(token)
+            if ids is not None:
+                ids.discard(memory["id"])
+                if not ids:
+                    del tokens[token]
+                    del sorted_tokens[bisect.bisect_left(sorted_tokens, token)]
+
+        if not self._records[user_id]:
+            del self._records[user_id], self._timelines[user_id]
+            del self._tokens[user_id], self._sorted_tokens[user_id]
+
+    async def add(self, user_id: str, information_type: str, information: str) -> Dict[str, Any]:
+        """Store a new memory and return it"""
+        return (await self.add_many([(user_id, information_type, information)]))[0]
+
+    async def add_many(self, items: List[Tuple[str, str, str]]) -> List[Dict[str, Any]]:
+        """Store (user_id, information_type, information) items in one transaction"""
+        now = datetime.utcnow().isoformat()
+        memories = [
+            {
+                "id": str(uuid.uuid4()),
+                "user_id": user_id,
+                "information_type": information_type,
+                "information": information,
+                "timestamp": now,
+                "created_at": now,
+            }
+            for user_id, information_type, information in items
+        ]
+
+        if self._db is not None and memories:
+            await self._db.executemany(
+                "INSERT INTO memories (id, user_id, information_type, information, timestamp, created_at) "
+                "VALUES (:id, :user_id, :information_type, :information, :timestamp, :created_at)",
+                memories,
+            )
+            await self._db.commit()
+
+        for memory in memories:
+            self._index(memory)
+        return memories
+
+    async def delete(self, user_id: str, information_type: Optional[str] = None) -> int:
+        """Delete a user's memories, optionally only those of one type"""
+        doomed = [
+            memory
+            for memory in self._records.get(user_id, {}).values()
+            if information_type is None or memory["information_type"] == information_type
+        ]
+        if not doomed:
+            return 0
+
+        if self._db is not None:
+            if information_type is None:
+                await self._db.execute("DELETE FROM memories WHERE user_id = ?", (user_id,))
+            else:
+                await self._db.execute(
+                    "DELETE FROM memories WHERE user_id = ? AND information_type = ?",
+                    (user_id, information_type),
+                )
+            await self._db.commit()
+
+        for memory in doomed:
+            self._unindex(memory)
+        return len(doomed)
+
+    def recent(
+        self, user_id: str, limit: int, cursor: Optional[str] = None, since: Optional[str] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Newest memories first, starting after the cursor
+
+        With since, only memories stored after that ISO timestamp are
+        returned. Returns the page and the cursor of the next page (None at
+        the end).
+        """
+        timeline = self._timelines.get(user_id, [])
+        end = len(timeline) if cursor is None else bisect.bisect_left(timeline, decode_cursor(cursor))
+        floor = 0 if since is None else bisect.bisect_right(timeline, (since, "\uffff"))
+        start = max(floor, end - limit)
+
+        records = self._records.get(user_id, {})
+        page = [records[memory_id] for _, memory_id in reversed(timeline[start:end])]
+        next_cursor = encode_cursor(timeline[start]) if start > floor and page else None
+        return page, next_cursor
+
+    def by_type(
+        self, user_id: str, information_types: Set[str], limit: int, since: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Newest memories of the given information types, stored after since if given"""
+        records = self._records.get(user_id, {})
+        timeline = self._timelines.get(user_id, [])
+        floor = 0 if since is None else bisect.bisect_right(timeline, (since, "\uffff"))
+        page = []
+        for _, memory_id in reversed(timeline[floor:]):
+            memory = records[memory_id]
+            if memory["information_type"] in information_types:
+                page.append(memory)
+                if len(page) >= limit:
+                    break
+        return page
+
+    def search(
+        self, user_id: str, query: str, limit: int, cursor: Optional[str] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Memories containing every query word (as a word prefix), newest first"""
+        query_tokens = tokenize(query)
+        if not query_tokens:
+            return self.recent(user_id, limit, cursor)
+
+        tokens = self._tokens.get(user_id, {})
+        sorted_tokens = self._sorted_tokens.get(user_id, [])
+        matches: Optional[Set[str]] = None
+        for query_token in query_tokens:
+            # Tokens starting with the query token are one contiguous run
+            ids: Set[str] = set()
+            position = bisect.bisect_left(sorted_tokens, query_token)
+            while position < len(sorted_tokens) and sorted_tokens[position].startswith(query_token):
+                ids |= tokens[sorted_tokens[position]]
+                position += 1
+            matches = ids if matches is None else matches & ids
+            if not matches:
+                return [], None
+
+        records = self._records[user_id]
+        keys = sorted(((records[memory_id]["timestamp"], memory_id) for memory_id in matches), reverse=True)
+        if cursor is not None:
+            position = decode_cursor(cursor)
+            keys = [key for key in keys if key < position]
+
+        page_keys = keys[:limit]
+        next_cursor = encode_cursor(page_keys[-1]) if len(keys) > limit else None
+        return [records[memory_id] for _, memory_id in page_keys], next_cursor
+
+
 def get_available_port(start_port=8501, max_port=9000):
     """Find an available port in the given range"""
     for port in range(start_port, max_port):
@@ -37,9 +308,9 @@ def get_available_port(start_port=8501, max_port=9000):
 class MCPMemoryServer:
     """Simple HTTP server for MCP memory operations with authentication"""
 
-    def __init__(self, port=None):
+    def __init__(self, port=None, db_path: Optional[str] = MCP_MEMORY_DB_PATH):
         self.app = web.Application()
-        self.memories: Dict[str, List[Dict[str, Any]]] = {}  # user_id -> memories
+        self.store = MemoryStore(db_path)
         self.port = port or get_available_port()
         self.auth_token = self._generate_auth_token()
         self.token_file = os.path.join(os.path.dirname(__file__), "..", ".mcp_token")
@@ -98,6 +369,8 @@ class MCPMemoryServer:
         self.app.router.add_get("/memories", self.get_memories)
         self.app.router.add_get("/memories/search", self.search_memories)
         self.app.router.add_delete("/memories", self.delete_memories)
+        self.app.router.add_post("/batch_store", self.batch_store)
+        self.app.router.add_post("/batch_get", self.batch_get)
 
     async def health_check(self, request):
         """Health check endpoint (no authentication required)"""
@@ -124,27 +397,11 @@ class MCPMemoryServer:
                         {"error": f"Missing required field: {field}"}, status=400
                     )
 
-            user_id = data["user_id"]
-            information_type = data["information_type"]
-            information = data["information"]
-
-            # Create memory object
-            memory = {
-                "id": str(uuid.uuid4()),
-                "user_id": user_id,
-                "information_type": information_type,
-                "information": information,
-                "timestamp": datetime.utcnow().isoformat(),
-                "created_at": datetime.utcnow().isoformat(),
-            }
-
-            # Store memory
-            if user_id not in self.memories:
-                self.memories[user_id] = []
-
-            self.memories[user_id].append(memory)
+            memory = await self.store.add(
+                data["user_id"], data["information_type"], data["information"]
+            )
 
-            logger.info(f"Stored memory for user {user_id}: {information_type}")
+            logger.info(f"Stored memory for user {memory['user_id']}: {memory['information_type']}")
 
             return web.json_response(
                 {
@@ -160,8 +417,19 @@ class MCPMemoryServer:
             logger.error(f"Error storing memory: {e}")
             return web.json_response({"error": str(e)}, status=500)
 
+    @staticmethod
+    def _page_params(request, default_limit: int) -> Tuple[int, Optional[str]]:
+        """Read limit/cursor pagination parameters, raising ValueError if invalid"""
+        limit = int(request.query.get("limit", default_limit))
+        if limit < 1:
+            raise ValueError("limit must be positive")
+        cursor = request.query.get("cursor") or None
+        if cursor is not None:
+            decode_cursor(cursor)
+        return min(limit, MAX_PAGE_SIZE), cursor
+
     async def get_memories(self, request):
-        """Get memories for a user"""
+        """Get memories for a user, newest first, one page at a time"""
         try:
             user_id = request.query.get("user_id")
             if not user_id:
@@ -169,17 +437,21 @@ class MCPMemoryServer:
                     {"error": "user_id parameter required"}, status=400
                 )
 
-            limit = int(request.query.get("limit", 10))
+            try:
+                limit, cursor = self._page_params(request, DEFAULT_GET_LIMIT)
+            except ValueError as e:
+                return web.json_response({"error": str(e)}, status=400)
 
-            user_memories = self.memories.get(user_id, [])
+            since = request.query.get("since") or None
+            etag = self.store.etag(user_id, "memories", limit, cursor, since)
+            if request.headers.get("If-None-Match") == etag:
+                return web.Response(status=304, headers={"ETag": etag})
 
-            # Sort by timestamp (newest first) and limit
-            sorted_memories = sorted(
-                user_memories, key=lambda x: x["timestamp"], reverse=True
-            )[:limit]
+            memories, next_cursor = self.store.recent(user_id, limit, cursor, since)
 
             return web.json_response(
-                {"memories": sorted_memories, "total": len(sorted_memories)}
+                {"memories": memories, "total": len(memories), "next_cursor": next_cursor, "etag": etag},
+                headers={"ETag": etag},
             )
 
         except Exception as e:
@@ -187,7 +459,7 @@ class MCPMemoryServer:
             return web.json_response({"error": str(e)}, status=500)
 
     async def search_memories(self, request):
-        """Search memories for a user"""
+        """Search memories for a user, newest first, one page at a time"""
         try:
             user_id = request.query.get("user_id")
             if not user_id:
@@ -197,30 +469,19 @@ class MCPMemoryServer:
 
             query = request.query.get("query", "").lower()
 
-            user_memories = self.memories.get(user_id, [])
-
-            # Filter memories based on query
-            if query:
-                filtered_memories = []
-                for memory in user_memories:
-                    # Search in information_type and information fields
-                    if (
-                        query in memory.get("information_type", "").lower()
-                        or query in memory.get("information", "").lower()
-                    ):
-                        filtered_memories.append(memory)
-                user_memories = filtered_memories
-
-            # Sort by timestamp (newest first)
-            sorted_memories = sorted(
-                user_memories, key=lambda x: x["timestamp"], reverse=True
-            )
+            try:
+                limit, cursor = self._page_params(request, DEFAULT_SEARCH_LIMIT)
+            except ValueError as e:
+                return web.json_response({"error": str(e)}, status=400)
+
+            memories, next_cursor = self.store.search(user_id, query, limit, cursor)
 
             return web.json_response(
                 {
-                    "memories": sorted_memories,
-                    "total": len(sorted_memories),
+                    "memories": memories,
+                    "total": len(memories),
                     "query": query,
+                    "next_cursor": next_cursor,
                 }
             )
 
@@ -228,6 +489,93 @@ class MCPMemoryServer:
             logger.error(f"Error searching memories: {e}")
             return web.json_response({"error": str(e)}, status=500)
 
+    async def batch_store(self, request):
+        """Store several memories, for one or more users, in one request"""
+        try:
+            data = await request.json()
+            memories = data.get("memories") if isinstance(data, dict) else None
+            if not isinstance(memories, list) or not memories:
+                return web.json_response(
+                    {"error": "memories must be a non-empty list"}, status=400
+                )
+            if len(memories) > MAX_PAGE_SIZE:
+                return web.json_response(
+                    {"error": f"At most {MAX_PAGE_SIZE} memories per batch"}, status=400
+                )
+
+            items = []
+            for index, memory in enumerate(memories):
+                for field in ("user_id", "information_type", "information"):
+                    if not isinstance(memory, dict) or field not in memory:
+                        return web.json_response(
+                            {"error": f"Missing required field: {field} (memory {index})"},
+                            status=400,
+                        )
+                items.append((memory["user_id"], memory["information_type"], memory["information"]))
+
+            stored = await self.store.add_many(items)
+            logger.info(f"Stored {len(stored)} memories in batch")
+
+            return web.json_response(
+                {
+                    "status": "success",
+                    "stored": len(stored),
+                    "memory_ids": [memory["id"] for memory in stored],
+                    "timestamp": stored[0]["timestamp"],
+                }
+            )
+
+        except json.JSONDecodeError:
+            return web.json_response({"error": "Invalid JSON"}, status=400)
+        except Exception as e:
+            logger.error(f"Error storing memory batch: {e}")
+            return web.json_response({"error": str(e)}, status=500)
+
+    async def batch_get(self, request):
+        """Get memories for several users, or several keys of them, in one request
+
+        Body: user_ids, optional information_types, limit, since and etags
+        (user_id -> ETag from a previous response with the same limit,
+        information_types and since). Users whose ETag still matches are
+        answered with not_modified instead of their memories.
+        """
+        try:
+            data = await request.json()
+            user_ids = data.get("user_ids") if isinstance(data, dict) else None
+            if not isinstance(user_ids, list) or not user_ids:
+                return web.json_response(
+                    {"error": "user_ids must be a non-empty list"}, status=400
+                )
+
+            try:
+                limit = min(int(data.get("limit", DEFAULT_GET_LIMIT)), MAX_PAGE_SIZE)
+            except (TypeError, ValueError):
+                return web.json_response({"error": "limit must be an integer"}, status=400)
+            information_types = set(data.get("information_types") or ())
+            since = data.get("since")
+            etags = data.get("etags") or {}
+
+            results = {}
+            for user_id in user_ids:
+                etag = self.store.etag(user_id, "batch", limit, sorted(information_types), since)
+                if etags.get(user_id) == etag:
+                    results[user_id] = {"not_modified": True, "etag": etag}
+                    continue
+
+                if information_types:
+                    memories = self.store.by_type(user_id, information_types, limit, since)
+                else:
+                    memories, _ = self.store.recent(user_id, limit, since=since)
+                results[user_id] = {"memories": memories, "total": len(memories), "etag": etag}
+
+            return web.json_response({"results": results})
+
+        except json.JSONDecodeError:
+            return web.json_response({"error": "Invalid JSON"}, status=400)
+        except Exception as e:
+            logger.error(f"Error getting memory batch: {e}")
+            return web.json_response({"error": str(e)}, status=500)
+
     async def delete_memories(self, request):
         """Delete memories for a user"""
         try:
@@ -238,29 +586,11 @@ class MCPMemoryServer:
                 )
 
             memory_type = request.query.get("type")
-
-            if user_id in self.memories:
-                if memory_type:
-                    # Delete memories of specific type
-                    original_count = len(self.memories[user_id])
-                    self.memories[user_id] = [
-                        m
-                        for m in self.memories[user_id]
-                        if m.get("information_type") != memory_type
-                    ]
-                    deleted_count = original_count - len(self.memories[user_id])
-                else:
-                    # Delete all memories for user
-                    deleted_count = len(self.memories[user_id])
-                    del self.memories[user_id]
-
+            deleted_count = await self.store.delete(user_id, memory_type)
+            if deleted_count:
                 logger.info(f"Deleted {deleted_count} memories for user {user_id}")
 
-                return web.json_response(
-                    {"status": "success", "deleted_count": deleted_count}
-                )
-            else:
-                return web.json_response({"status": "success", "deleted_count": 0})
+            return web.json_response({"status": "success", "deleted_count": deleted_count})
 
         except Exception as e:
             logger.error(f"Error deleting memories: {e}")
@@ -270,6 +600,7 @@ class MCPMemoryServer:
         """Run the server"""
         port = port or self.port
         logger.info(f"Starting MCP Memory Server on {host}:{port}")
+        await self.store.open()
 
         # Save port to file for client to read
         port_file = os.path.join(os.path.dirname(__file__), "..", ".mcp_port")
@@ -304,6 +635,7 @@ class MCPMemoryServer:
         except asyncio.CancelledError:
             logger.info("Shutting down MCP Memory Server")
             await runner.cleanup()
+            await self.store.close()
             # Clean up files
             for file_path in [port_file, self.token_file]:
                 if os.path.exists(file_path):
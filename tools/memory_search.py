@@ -55,22 +55,11 @@ class MemorySearchTool:
             if query:
                 memories = await memory_backend.search(user_id, query, limit)
             else:
-                # Get all memories for the user
-                all_memories = await memory_backend.get_all(user_id)
-                memories = []
-                
-                # Convert to MemoryEntry objects and filter by confidence
-                for key, value in all_memories.items():
-                    # Get metadata if available
-                    memory_entry = await memory_backend.retrieve(user_id, key)
-                    if memory_entry and memory_entry.metadata:
-                        confidence = memory_entry.metadata.get('confidence', 1.0)
-                        if confidence >= min_confidence:
-                            memories.append(memory_entry)
-                
-                # Sort by most recent and limit
-                memories.sort(key=lambda x: x.updated_at, reverse=True)
-                memories = memories[:limit]
+                # Most recent memories above the confidence threshold, one
+                # bulk call per backend
+                memories = await memory_backend.get_entries(
+                    user_id, min_confidence=min_confidence, limit=limit
+                )
             
             # Format memories for AI consumption
             formatted_memories = []
@@ -295,7 +284,7 @@ class MemorySearchTool:
     ) -> str:
         """
         Get relevant memory context for a specific message.
-        OPTIMIZED: Single smart search + caching instead of 3 separate searches.
+        OPTIMIZED: Single ranked full-text search + caching, recent memories as fallback.
         
         Args:
             user_id: The Discord user ID
@@ -316,42 +305,10 @@ class MemorySearchTool:
                 self.logger.debug(f"Memory context from cache in {time.time() - start_time:.3f}s")
                 return cached_result if cached_result else ""
             
-            # Extract keywords from message for fallback
-            import re
-            words = re.findall(r'\b\w+\b', message_content.lower())
-            
-            # Skip common words
-            skip_words = {
-                'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for',
-                'of', 'with', 'by', 'is', 'are', 'was', 'were', 'be', 'been', 'have',
-                'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could', 'should',
-                'i', 'you', 'he', 'she', 'it', 'we', 'they', 'me', 'him', 'her', 'us',
-                'them', 'my', 'your', 'his', 'her', 'its', 'our', 'their', 'what',
-                'when', 'where', 'why', 'how', 'who', 'which', 'that', 'this', 'these',
-                'those', 'can', 'may', 'might', 'must', 'shall', 'hi', 'hello', 'hey',
-                'thanks', 'thank', 'yes', 'no', 'ok', 'okay', 'yeah', 'yep', 'nope'
-            }
-            
-            keywords = [w for w in words if w not in skip_words and len(w) > 2]
-            
-            # OPTIMIZED: Single comprehensive search strategy
-            # Start with full message search, get recent memories as fallback in same query
+            # The backend tokenizes the message and ranks memories by relevance,
+            # so the whole message can be used as the query
             search_result = await self.search_user_memories(user_id, message_content, limit)
             
-            # If full message search doesn't find enough memories, try keywords
-            # BUT only if we have keywords and the first search was poor
-            if (not search_result.get('success') or 
-                search_result.get('total_memories', 0) < 2) and keywords:
-                
-                # Use keywords as fallback query
-                keyword_query = ' '.join(keywords[:5])  # Use top 5 keywords
-                keyword_search = await self.search_user_memories(user_id, keyword_query, limit)
-                
-                # Use keyword search only if it finds more memories
-                if (keyword_search.get('success') and 
-                    keyword_search.get('total_memories', 0) > search_result.get('total_memories', 0)):
-                    search_result = keyword_search
-            
             # If still no good results, get recent memories (final fallback)
             if not search_result.get('success') or search_result.get('total_memories', 0) == 0:
                 recent_search = await self.search_user_memories(user_id, None, limit)
@@ -0,0 +1,147 @@
+import asyncio
+import json
+import logging
+import time
+from collections import OrderedDict, defaultdict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Tool results that describe a failure and must not be served from the cache
+UNCACHEABLE_RESULT_PREFIXES = (
+    "Error",
+    "Rate limit",
+    "Network error",
+    "Data format error",
+    "Invalid",
+    "Could not",
+    "No search results",
+    "CoinMarketCap API key not configured",
+    "URL crawling timed out",
+    "Unexpected error",
+)
+
+
+class ToolResultCache:
+    """
+    TTL cache for tool results with in-flight request coalescing.
+
+    Results are keyed by tool name plus normalized arguments. While a result
+    is being computed, identical requests await the same call instead of
+    hitting the upstream API again. Failed results are never stored.
+    """
+
+    def __init__(self, ttls: Dict[str, float], max_entries: int = 1000):
+        self.ttls = ttls
+        self.max_entries = max_entries
+
+        # key -> (expires_at, result), oldest first
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._in_flight: Dict[str, asyncio.Future] = {}
+
+        self.hits: Dict[str, int] = defaultdict(int)
+        self.misses: Dict[str, int] = defaultdict(int)
+        self.coalesced: Dict[str, int] = defaultdict(int)
+
+    def is_cacheable(self, tool_name: str) -> bool:
+        """Check whether results of a tool are cached"""
+        return self.ttls.get(tool_name, 0) > 0
+
+    @staticmethod
+    def make_key(
+        tool_name: str, arguments: Dict[str, Any], case_insensitive: bool = True
+    ) -> str:
+        """Build a cache key from the tool name and normalized arguments"""
+        normalized = {}
+        for name, value in arguments.items():
+            if name == "user_id":
+                # Injected per caller and doesn't change the result
+                continue
+            if isinstance(value, str):
+                value = " ".join(value.split())
+                if case_insensitive:
+                    value = value.lower()
+            normalized[name] = value
+        return f"{tool_name}:{json.dumps(normalized, sort_keys=True, default=str)}"
+
+    def get(self, key: str) -> Optional[str]:
+        """Return a cached result that hasn't expired yet"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, result = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        return result
+
+    def set(self, tool_name: str, key: str, result: Any):
+        """Store a successful result with the tool's TTL"""
+        if isinstance(result, str) and result.startswith(UNCACHEABLE_RESULT_PREFIXES):
+            return
+
+        self._entries[key] = (time.monotonic() + self.ttls[tool_name], result)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def get_or_compute(
+        self, tool_name: str, key: str, compute: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """Return the cached result or compute it once for all concurrent callers"""
+        result = self.get(key)
+        if result is not None:
+            self.hits[tool_name] += 1
+            return result
+
+        in_flight = self._in_flight.get(key)
+        if in_flight is not None:
+            self.coalesced[tool_name] += 1
+            return await asyncio.shield(in_flight)
+
+        self.misses[tool_name] += 1
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            result = await compute()
+        except BaseException as e:
+            if not isinstance(e, Exception):
+                # The original caller was cancelled, fail the waiters instead
+                e = RuntimeError(f"{tool_name} call was cancelled")
+            future.set_exception(e)
+            # Mark the exception as retrieved in case nobody else awaited it
+            future.exception()
+            raise
+        finally:
+            self._in_flight.pop(key, None)
+
+        future.set_result(result)
+        self.set(tool_name, key, result)
+        return result
+
+    def clear(self):
+        """Drop all cached results"""
+        self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get hit/miss counters overall and per tool"""
+        tools = sorted(set(self.hits) | set(self.misses) | set(self.coalesced))
+        per_tool = {
+            tool: {
+                "hits": self.hits[tool],
+                "misses": self.misses[tool],
+                "coalesced": self.coalesced[tool],
+            }
+            for tool in tools
+        }
+
+        hits = sum(self.hits.values()) + sum(self.coalesced.values())
+        total = hits + sum(self.misses.values())
+        return {
+            "entries": len(self._entries),
+            "hits": sum(self.hits.values()),
+            "misses": sum(self.misses.values()),
+            "coalesced": sum(self.coalesced.values()),
+            "hit_rate": hits / total if total else 0.0,
+            "tools": per_tool,
+        }
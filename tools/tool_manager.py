@@ -1,22 +1,43 @@
+import asyncio
+import functools
 import logging
 import os
 import random
 import sys
 import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 from urllib.parse import urljoin
 
+import aiohttp
 import pytz
 import requests
 import yfinance as yf
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from config import COINMARKETCAP_API_KEY, MCP_MEMORY_ENABLED, SEARXNG_URL
+from ai.clients.http_session import SharedClientSession
+from utils.math_evaluator import MathError, format_number, math_evaluator
+from config import (
+    COINMARKETCAP_API_KEY,
+    MCP_MEMORY_ENABLED,
+    SEARXNG_URL,
+    TOOL_CACHE_ENABLED,
+    TOOL_CACHE_MAX_ENTRIES,
+    TOOL_CACHE_TTL_COMPANY_RESEARCH,
+    TOOL_CACHE_TTL_CRAWLING,
+    TOOL_CACHE_TTL_CRYPTO_PRICE,
+    TOOL_CACHE_TTL_STOCK_PRICE,
+    TOOL_CACHE_TTL_WEB_SEARCH,
+    TOOL_CPU_POOL_SIZE,
+    TOOL_IO_POOL_SIZE,
+)
 
 from .discord_tools import DiscordTools
+from .result_cache import ToolResultCache
 
 logger = logging.getLogger(__name__)
 
@@ -31,6 +52,10 @@ except ImportError:
 
 
 class ToolManager:
+    CRAWL_HEADERS = {
+        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+    }
+
     def __init__(self):
         self.tools = {
             "set_reminder": self.set_reminder,
@@ -39,14 +64,14 @@ class ToolManager:
             "check_due_reminders": self.check_due_reminders,
             "remember_user_info": self.remember_user_info,
             "search_user_memory": self.search_user_memory,
-            "get_crypto_price": self.get_crypto_price,
+            "get_crypto_price": self.aget_crypto_price,
             "get_stock_price": self.get_stock_price,
             "tip_user": self.tip_user,
             "check_balance": self.check_balance,
             "get_bonus_schedule": self.get_bonus_schedule,
-            "web_search": self.web_search,
-            "company_research": self.company_research,
-            "crawling": self.crawling,
+            "web_search": self.aweb_search,
+            "company_research": self.acompany_research,
+            "crawling": self.acrawling,
             "generate_image": self.generate_image,
             "analyze_image": self.analyze_image,
             "calculate": self.calculate,
@@ -69,6 +94,62 @@ class ToolManager:
             "reset_user_rate_limits": self.reset_user_rate_limits,
         }
 
+        # How each tool runs. Coroutine tools are always awaited directly;
+        # synchronous tools are dispatched by their declared workload:
+        #   "io"     - blocking network/SQLite calls, run on the tool I/O pool
+        #   "cpu"    - CPU-bound work, run on the tool CPU pool
+        #   "inline" - fast in-memory work (or discord.py state that must stay
+        #              on the loop thread), called directly on the event loop
+        self.tool_kinds = {
+            "set_reminder": "io",
+            "list_reminders": "io",
+            "cancel_reminder": "io",
+            "check_due_reminders": "io",
+            "remember_user_info": "io",
+            "search_user_memory": "io",
+            "get_crypto_price": "io",
+            "get_stock_price": "io",
+            "tip_user": "inline",
+            "check_balance": "inline",
+            "get_bonus_schedule": "inline",
+            "web_search": "io",
+            "company_research": "io",
+            "crawling": "io",
+            "generate_image": "io",
+            "analyze_image": "io",
+            "calculate": "cpu",
+            "get_current_time": "inline",
+            "remember_user_mcp": "io",
+            "generate_keno_numbers": "inline",
+            "discord_get_user_info": "inline",
+            "discord_list_guilds": "inline",
+            "discord_list_channels": "inline",
+            "discord_read_channel": "io",
+            "discord_search_messages": "io",
+            "discord_list_guild_members": "inline",
+            "discord_send_message": "io",
+            "discord_send_dm": "io",
+            "discord_get_user_roles": "inline",
+            "get_user_rate_limit_status": "inline",
+            "get_system_rate_limit_stats": "inline",
+            "reset_user_rate_limits": "inline",
+        }
+
+        # Dedicated bounded pools so tools never compete with the default
+        # executor used by the AI clients and the rest of the bot
+        self._io_executor = ThreadPoolExecutor(
+            max_workers=TOOL_IO_POOL_SIZE, thread_name_prefix="tool-io"
+        )
+        self._cpu_executor = ThreadPoolExecutor(
+            max_workers=TOOL_CPU_POOL_SIZE, thread_name_prefix="tool-cpu"
+        )
+
+        # Shared keep-alive session for the async-native tools
+        self._http = SharedClientSession("tools")
+        # The bot's event loop, set by main.py; worker threads use it to
+        # reach loop-bound clients such as the shared MCP memory client
+        self._main_loop: Optional[asyncio.AbstractEventLoop] = None
+
         # Initialize Discord tools - will be set later by main.py after bot initialization
         self.discord_tools = None
 
@@ -149,6 +230,23 @@ class ToolManager:
             "discord_send_dm": 1.0,
         }
 
+        # Shared result cache for network-bound tools, TTL per tool
+        self.result_cache = ToolResultCache(
+            {
+                "get_crypto_price": TOOL_CACHE_TTL_CRYPTO_PRICE,
+                "get_stock_price": TOOL_CACHE_TTL_STOCK_PRICE,
+                "web_search": TOOL_CACHE_TTL_WEB_SEARCH,
+                "company_research": TOOL_CACHE_TTL_COMPANY_RESEARCH,
+                "crawling": TOOL_CACHE_TTL_CRAWLING,
+            },
+            max_entries=TOOL_CACHE_MAX_ENTRIES,
+        )
+        self.result_cache_enabled = TOOL_CACHE_ENABLED
+
+        # Wall-clock execution times of recent calls per tool
+        self.execution_times: Dict[str, deque] = {}
+        self.execution_timeouts: Dict[str, int] = {}
+
     def _validate_crypto_symbol(self, symbol: str) -> bool:
         """Validate cryptocurrency symbol using security framework."""
         try:
@@ -956,27 +1054,11 @@ class ToolManager:
             return self.remember_user_info(user_id, information_type, information)
 
         try:
-            # Create the async function to run the operation
-            async def _run_with_context():
-                async with MCPMemoryClient() as client:
-                    if not await client.check_connection():
-                        return {"error": "MCP memory server not accessible"}
-                    return await client.remember_user_info(
-                        user_id, information_type, information
-                    )
-
-            # Check if there's already a running event loop
-            try:
-                loop = asyncio.get_running_loop()
-                # If there's a running loop, create a task and wait for it
-                import concurrent.futures
-
-                with concurrent.futures.ThreadPoolExecutor() as executor:
-                    future = executor.submit(asyncio.run, _run_with_context())
-                    result = future.result()
-            except RuntimeError:
-                # No running event loop, safe to run directly
-                result = asyncio.run(_run_with_context())
+            result = self._run_mcp_call(
+                lambda client: client.remember_user_info(
+                    user_id, information_type, information
+                )
+            )
 
             if "error" in result:
                 # Fallback to SQLite when MCP fails
@@ -1063,28 +1145,11 @@ class ToolManager:
             )
 
         try:
-            # Import MCP memory client
-            from tools.mcp_memory_client import MCPMemoryClient
-
-            # Create the async function to run the search
-            async def _run_search_with_context():
-                async with MCPMemoryClient() as client:
-                    if not await client.check_connection():
-                        return {"error": "MCP memory server not accessible"}
-                    return await client.search_user_memory(
-                        user_id, query if query else None
-                    )
-
-            # Check if there's already a running event loop
-            try:
-                loop = asyncio.get_running_loop()
-                # If there's a running loop, create a task and wait for it
-                with concurrent.futures.ThreadPoolExecutor() as executor:
-                    future = executor.submit(asyncio.run, _run_search_with_context())
-                    result = future.result()
-            except RuntimeError:
-                # No running event loop, safe to run directly
-                result = asyncio.run(_run_search_with_context())
+            result = self._run_mcp_call(
+                lambda client: client.search_user_memory(
+                    user_id, query if query else None
+                )
+            )
 
             if "error" in result:
                 return f"MCP memory search failed: {result['error']}. Local search not available for this tool."
@@ -1127,30 +1192,11 @@ class ToolManager:
 
         try:
             # Use CoinMarketCap API
-            url = "https://pro-api.coinmarketcap.com/v1/cryptocurrency/quotes/latest"
-            parameters = {"symbol": symbol.upper(), "convert": currency.upper()}
-            headers = {
-                "Accepts": "application/json",
-                "X-CMC_PRO_API_KEY": COINMARKETCAP_API_KEY,
-            }
+            url, parameters, headers = self._crypto_price_request(symbol, currency)
 
             response = requests.get(url, headers=headers, params=parameters, timeout=10)
             response.raise_for_status()
-            data = response.json()
-
-            # Parse the response
-            if data.get("status", {}).get("error_code", 0) == 0:
-                crypto_data = data["data"][symbol.upper()]
-                price = crypto_data["quote"][currency.upper()]["price"]
-                volume_24h = crypto_data["quote"][currency.upper()]["volume_24h"]
-                market_cap = crypto_data["quote"][currency.upper()]["market_cap"]
-
-                return f"Current {symbol.upper()} price: ${price:.6f} {currency.upper()}\n24h Volume: ${volume_24h:,.2f}\nMarket Cap: ${market_cap:,.2f}"
-            else:
-                error_message = data.get("status", {}).get(
-                    "error_message", "Unknown error"
-                )
-                return f"Error getting crypto price: {error_message}"
+            return self._format_crypto_price(response.json(), symbol, currency)
 
         except requests.exceptions.RequestException as e:
             return f"Network error getting crypto price: {str(e)}"
@@ -1159,6 +1205,73 @@ class ToolManager:
         except Exception as e:
             return f"Error getting crypto price: {str(e)}"
 
+    async def aget_crypto_price(
+        self, symbol: str, currency: str = "USD", user_id: str = "system"
+    ) -> str:
+        """Async version of get_crypto_price on the shared keep-alive session"""
+        if not self._check_rate_limit("crypto_price", user_id):
+            return "Rate limit exceeded. Please wait before checking another price."
+
+        # Check if API key is available
+        if not COINMARKETCAP_API_KEY:
+            return "CoinMarketCap API key not configured. Cannot fetch crypto prices."
+
+        # VALIDATE inputs to prevent injection attacks
+        if not self._validate_crypto_symbol(symbol):
+            return f"Invalid cryptocurrency symbol: {symbol}"
+
+        if not self._validate_currency_code(currency):
+            return f"Invalid currency code: {currency}"
+
+        try:
+            url, parameters, headers = self._crypto_price_request(symbol, currency)
+
+            session = self._http.get_session()
+            async with session.get(
+                url,
+                headers=headers,
+                params=parameters,
+                timeout=aiohttp.ClientTimeout(total=10),
+            ) as response:
+                response.raise_for_status()
+                data = await response.json(content_type=None)
+            return self._format_crypto_price(data, symbol, currency)
+
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            return f"Network error getting crypto price: {str(e) or type(e).__name__}"
+        except KeyError as e:
+            return f"Data format error: {str(e)}"
+        except Exception as e:
+            return f"Error getting crypto price: {str(e)}"
+
+    @staticmethod
+    def _crypto_price_request(symbol: str, currency: str):
+        """Build the CoinMarketCap quotes request (url, params, headers)"""
+        url = "https://pro-api.coinmarketcap.com/v1/cryptocurrency/quotes/latest"
+        parameters = {"symbol": symbol.upper(), "convert": currency.upper()}
+        headers = {
+            "Accepts": "application/json",
+            "X-CMC_PRO_API_KEY": COINMARKETCAP_API_KEY,
+        }
+        return url, parameters, headers
+
+    @staticmethod
+    def _format_crypto_price(data: Dict, symbol: str, currency: str) -> str:
+        """Format a CoinMarketCap quotes response"""
+        # Parse the response
+        if data.get("status", {}).get("error_code", 0) == 0:
+            crypto_data = data["data"][symbol.upper()]
+            price = crypto_data["quote"][currency.upper()]["price"]
+            volume_24h = crypto_data["quote"][currency.upper()]["volume_24h"]
+            market_cap = crypto_data["quote"][currency.upper()]["market_cap"]
+
+            return f"Current {symbol.upper()} price: ${price:.6f} {currency.upper()}\n24h Volume: ${volume_24h:,.2f}\nMarket Cap: ${market_cap:,.2f}"
+        else:
+            error_message = data.get("status", {}).get(
+                "error_message", "Unknown error"
+            )
+            return f"Error getting crypto price: {error_message}"
+
     def get_stock_price(self, symbol: str) -> str:
         """Get stock price using yfinance with rate limiting"""
         if not self._check_rate_limit("stock_price"):
@@ -1356,19 +1469,7 @@ class ToolManager:
         if not self._validate_search_query(query):
             return "Invalid search query. Please check your input and try again."
 
-        # List of SearXNG instances (local first, then public fallback)
-        # Reduced list to speed up failover
-        public_instances = [
-            "http://localhost:8086",  # Local SearXNG instance (fastest if available)
-            "https://searx.be",
-            "https://metacat.online",
-        ]
-
-        # Shuffle the instances for better distribution (keep local first for speed)
-        local_first = public_instances[:1]
-        others = public_instances[1:]
-        random.shuffle(others)
-        public_instances = local_first + others
+        public_instances = self._get_web_search_instances()
 
         # Set overall timeout to prevent hanging
         import time
@@ -1390,13 +1491,7 @@ class ToolManager:
                 search_url = urljoin(instance, "search")
 
                 # Prepare search parameters for SearXNG
-                params = {
-                    "q": query,
-                    "format": "json",
-                    "categories": "general",
-                    "engines": "google,bing,duckduckgo,brave",
-                    "language": "en-US",
-                }
+                params = self._searxng_json_params(query)
 
                 response = requests.get(search_url, params=params, timeout=8)
 
@@ -1407,21 +1502,8 @@ class ToolManager:
 
                         # Parse and format results
                         if "results" in data and data["results"]:
-                            results = []
-                            for result in data["results"][
-                                :7
-                            ]:  # Limit to top 7 results for better context
-                                title = result.get("title", "No title")
-                                content = (
-                                    result.get("content", "")[:300] + "..."
-                                    if len(result.get("content", "")) > 300
-                                    else result.get("content", "")
-                                )
-                                url = result.get("url", "")
-                                results.append(f"• {title}: {content} ({url})")
-
                             logger.info(f"web_search success: {instance} returned {len(data['results'])} results")
-                            return "\n".join(results)
+                            return self._format_search_results(data["results"])
                         else:
                             logger.info(f"web_search no results from {instance}")
                             # Try next instance
@@ -1457,16 +1539,7 @@ class ToolManager:
         if not self._check_rate_limit("company_research"):
             return "Rate limit exceeded. Please wait before making another search."
 
-        # List of public SearXNG instances (fallback mechanism)
-        # Reduced list to speed up failover
-        public_instances = [
-            "https://searx.be",
-            "https://metacat.online",
-            "https://ooglester.com",
-        ]
-
-        # Shuffle the instances for better distribution
-        random.shuffle(public_instances)
+        public_instances = self._get_company_research_instances()
 
         # Set overall timeout to prevent hanging
         import time
@@ -1485,13 +1558,7 @@ class ToolManager:
                 search_url = urljoin(instance, "search")
 
                 # Prepare search parameters for company research
-                params = {
-                    "q": f"company {company_name}",
-                    "format": "json",
-                    "categories": "general",
-                    "engines": "google,bing,duckduckgo,brave",
-                    "language": "en-US",
-                }
+                params = self._searxng_json_params(f"company {company_name}")
 
                 response = requests.get(search_url, params=params, timeout=8)
 
@@ -1502,20 +1569,7 @@ class ToolManager:
 
                         # Parse and format results
                         if "results" in data and data["results"]:
-                            results = []
-                            for result in data["results"][
-                                :7
-                            ]:  # Limit to top 7 results for better context
-                                title = result.get("title", "No title")
-                                content = (
-                                    result.get("content", "")[:300] + "..."
-                                    if len(result.get("content", "")) > 300
-                                    else result.get("content", "")
-                                )
-                                url = result.get("url", "")
-                                results.append(f"• {title}: {content} ({url})")
-
-                            return "\n".join(results)
+                            return self._format_search_results(data["results"])
                         else:
                             # Try next instance
                             continue
@@ -1541,6 +1595,146 @@ class ToolManager:
             f"company {company_name}", public_instances
         )
 
+    @staticmethod
+    def _get_web_search_instances() -> List[str]:
+        """SearXNG instances for web_search, local first then shuffled public ones"""
+        # List of SearXNG instances (local first, then public fallback)
+        # Reduced list to speed up failover
+        public_instances = [
+            "http://localhost:8086",  # Local SearXNG instance (fastest if available)
+            "https://searx.be",
+            "https://metacat.online",
+        ]
+
+        # Shuffle the instances for better distribution (keep local first for speed)
+        local_first = public_instances[:1]
+        others = public_instances[1:]
+        random.shuffle(others)
+        return local_first + others
+
+    @staticmethod
+    def _get_company_research_instances() -> List[str]:
+        """Shuffled public SearXNG instances for company_research"""
+        # List of public SearXNG instances (fallback mechanism)
+        # Reduced list to speed up failover
+        public_instances = [
+            "https://searx.be",
+            "https://metacat.online",
+            "https://ooglester.com",
+        ]
+
+        # Shuffle the instances for better distribution
+        random.shuffle(public_instances)
+        return public_instances
+
+    @staticmethod
+    def _searxng_json_params(query: str) -> Dict[str, str]:
+        """Search parameters for a SearXNG JSON request"""
+        return {
+            "q": query,
+            "format": "json",
+            "categories": "general",
+            "engines": "google,bing,duckduckgo,brave",
+            "language": "en-US",
+        }
+
+    @staticmethod
+    def _format_search_results(results: List[Dict]) -> str:
+        """Format SearXNG JSON results as a bullet list"""
+        lines = []
+        for result in results[:7]:  # Limit to top 7 results for better context
+            title = result.get("title", "No title")
+            content = (
+                result.get("content", "")[:300] + "..."
+                if len(result.get("content", "")) > 300
+                else result.get("content", "")
+            )
+            url = result.get("url", "")
+            lines.append(f"• {title}: {content} ({url})")
+        return "\n".join(lines)
+
+    async def _asearxng_search(
+        self, tool_name: str, query: str, instances: List[str]
+    ) -> Optional[str]:
+        """
+        Query SearXNG instances in turn on the shared session.
+
+        Returns the formatted results of the first instance that has any,
+        or None if all of them failed within the overall time limit.
+        """
+        start_time = time.time()
+        max_total_time = 20  # Maximum 20 seconds total
+
+        session = self._http.get_session()
+        for instance in instances:
+            # Check if we've exceeded max total time
+            if time.time() - start_time > max_total_time:
+                logger.warning(f"{tool_name} exceeded max time, stopping")
+                break
+
+            try:
+                async with session.get(
+                    urljoin(instance, "search"),
+                    params=self._searxng_json_params(query),
+                    timeout=aiohttp.ClientTimeout(total=8),
+                ) as response:
+                    if response.status != 200:
+                        logger.info(f"{tool_name} HTTP {response.status} from {instance}")
+                        continue
+                    data = await response.json(content_type=None)
+
+                if isinstance(data, dict) and data.get("results"):
+                    logger.info(
+                        f"{tool_name} success: {instance} returned {len(data['results'])} results"
+                    )
+                    return self._format_search_results(data["results"])
+                logger.info(f"{tool_name} no results from {instance}")
+            except asyncio.TimeoutError:
+                logger.warning(f"{tool_name} timeout from {instance}")
+            except (aiohttp.ClientError, ValueError) as e:
+                logger.warning(f"{tool_name} request error from {instance}: {e}")
+
+        return None
+
+    async def aweb_search(self, query: str) -> str:
+        """Async version of web_search on the shared keep-alive session"""
+        if not self._check_rate_limit("web_search"):
+            return "Rate limit exceeded. Please wait before making another search."
+
+        # VALIDATE query to prevent injection attacks
+        if not self._validate_search_query(query):
+            return "Invalid search query. Please check your input and try again."
+
+        public_instances = self._get_web_search_instances()
+        logger.info(f"web_search trying instances: {public_instances}")
+
+        result = await self._asearxng_search("web_search", query, public_instances)
+        if result is not None:
+            return result
+
+        # If all instances failed, try HTML parsing as fallback
+        logger.warning("web_search all instances failed, trying HTML fallback")
+        return await self._run_in_pool(
+            "io", self._web_search_html_fallback, query, public_instances
+        )
+
+    async def acompany_research(self, company_name: str) -> str:
+        """Async version of company_research on the shared keep-alive session"""
+        if not self._check_rate_limit("company_research"):
+            return "Rate limit exceeded. Please wait before making another search."
+
+        public_instances = self._get_company_research_instances()
+        query = f"company {company_name}"
+
+        result = await self._asearxng_search("company_research", query, public_instances)
+        if result is not None:
+            return result
+
+        # If all instances failed, try HTML parsing as fallback
+        return await self._run_in_pool(
+            "io", self._web_search_html_fallback, query, public_instances
+        )
+
     def crawling(self, url: str, max_characters: int = 3000) -> str:
         """Extracts content from specific URLs using direct web scraping"""
         if not self._check_rate_limit("crawling"):
@@ -1548,38 +1742,67 @@ class ToolManager:
 
         try:
             # Use direct requests for content extraction
-            headers = {
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-            }
-
-            response = requests.get(url, headers=headers, timeout=15)
+            response = requests.get(url, headers=self.CRAWL_HEADERS, timeout=15)
             response.raise_for_status()
 
-            # Use BeautifulSoup to parse HTML and extract text
-            from bs4 import BeautifulSoup
-
-            soup = BeautifulSoup(response.content, "html.parser")
-
-            # Remove script and style elements
-            for script in soup(["script", "style"]):
-                script.decompose()
+            text = self._extract_page_text(response.content, max_characters)
+            return f"Content from {url}: {text}"
 
-            # Get text content
-            text = soup.get_text()
+        except requests.exceptions.Timeout:
+            return "URL crawling timed out. Try again later."
+        except requests.exceptions.RequestException as e:
+            return f"Error crawling URL: {str(e)}"
+        except Exception as e:
+            return f"Unexpected error during URL crawling: {str(e)}"
 
-            # Limit to max_characters
-            if len(text) > max_characters:
-                text = text[:max_characters] + "..."
+    async def acrawling(self, url: str, max_characters: int = 3000) -> str:
+        """Async version of crawling; HTML parsing runs on the tool CPU pool"""
+        if not self._check_rate_limit("crawling"):
+            return "Rate limit exceeded. Please wait before crawling another URL."
 
+        try:
+            session = self._http.get_session()
+            async with session.get(
+                url,
+                headers=self.CRAWL_HEADERS,
+                timeout=aiohttp.ClientTimeout(total=15),
+            ) as response:
+                response.raise_for_status()
+                content = await response.read()
+
+            text = await self._run_in_pool(
+                "cpu", self._extract_page_text, content, max_characters
+            )
             return f"Content from {url}: {text}"
 
-        except requests.exceptions.Timeout:
+        except asyncio.TimeoutError:
             return "URL crawling timed out. Try again later."
-        except requests.exceptions.RequestException as e:
+        except aiohttp.ClientError as e:
             return f"Error crawling URL: {str(e)}"
         except Exception as e:
             return f"Unexpected error during URL crawling: {str(e)}"
 
+    @staticmethod
+    def _extract_page_text(content: bytes, max_characters: int) -> str:
+        """Extract the visible text of an HTML page"""
+        # Use BeautifulSoup to parse HTML and extract text
+        from bs4 import BeautifulSoup
+
+        soup = BeautifulSoup(content, "html.parser")
+
+        # Remove script and style elements
+        for script in soup(["script", "style"]):
+            script.decompose()
+
+        # Get text content
+        text = soup.get_text()
+
+        # Limit to max_characters
+        if len(text) > max_characters:
+            text = text[:max_characters] + "..."
+
+        return text
+
     def generate_image(
         self,
         prompt: str,
@@ -1641,79 +1864,13 @@ class ToolManager:
             return "Rate limit exceeded. Please wait before making another calculation."
 
         try:
-            # Safe evaluation - allow basic math operations and comparison operators
-            allowed_chars = set("0123456789+-*/().<>=! ")
-            if not all(c in allowed_chars for c in expression):
-                return "Error: Invalid characters in expression"
-
-            # Use a safer evaluation method instead of eval
-            import ast
-            import operator
-
-            # Supported operators for math and comparisons
-            operators = {
-                ast.Add: operator.add,
-                ast.Sub: operator.sub,
-                ast.Mult: operator.mul,
-                ast.Div: operator.truediv,
-                ast.Mod: operator.mod,
-                ast.Pow: operator.pow,
-                ast.USub: operator.neg,
-                ast.UAdd: operator.pos,
-            }
-
-            # Supported comparison operators
-            comparison_operators = {
-                ast.Gt: operator.gt,  # >
-                ast.Lt: operator.lt,  # <
-                ast.GtE: operator.ge,  # >=
-                ast.LtE: operator.le,  # <=
-                ast.Eq: operator.eq,  # ==
-                ast.NotEq: operator.ne,  # !=
-            }
-
-            def eval_expr(expr):
-                """
-                Safe evaluation of mathematical expressions
-                """
-
-                def _eval(node):
-                    if isinstance(node, ast.Constant):  # For Python 3.8+
-                        return node.value
-                    elif isinstance(node, ast.Num):  # For Python < 3.8
-                        return node.n
-                    elif isinstance(node, ast.BinOp):
-                        left = _eval(node.left)
-                        right = _eval(node.right)
-                        return operators[type(node.op)](left, right)
-                    elif isinstance(node, ast.Compare):
-                        left = _eval(node.left)
-                        comparators = [_eval(comp) for comp in node.comparators]
-                        ops = [comparison_operators[type(op)] for op in node.ops]
-
-                        # For chained comparisons like 1 < 2 < 3
-                        result = True
-                        current_left = left
-                        for op, current_right in zip(ops, comparators):
-                            result = result and op(current_left, current_right)
-                            current_left = current_right
-                        return result
-                    elif isinstance(node, ast.UnaryOp):
-                        operand = _eval(node.operand)
-                        return operators[type(node.op)](operand)
-                    else:
-                        raise TypeError(node)
-
-                try:
-                    tree = ast.parse(expr, mode="eval")
-                    return _eval(tree.body)
-                except:
-                    raise ValueError("Invalid expression")
-
-            result = eval_expr(expression)
-            return f"Result: {result}"
+            # Shared compiled evaluator: exact arithmetic, comparisons allowed
+            result = math_evaluator.evaluate(expression, allow_comparisons=True)
+            return f"Result: {format_number(result)}"
         except ZeroDivisionError:
             return "Error: Division by zero"
+        except MathError as e:
+            return f"Error: {e}"
         except Exception as e:
             return f"Error calculating expression: {str(e)}"
 
@@ -2251,6 +2408,10 @@ class ToolManager:
 
         self.discord_tools = DiscordTools(bot_client)
 
+    def set_event_loop(self, loop: asyncio.AbstractEventLoop):
+        """Set the bot's event loop, which owns the shared MCP memory session"""
+        self._main_loop = loop
+
     def get_user_rate_limit_status(self, user_id: str) -> str:
         """Get rate limiting status for a specific user"""
         if not RATE_LIMITING_ENABLED:
@@ -2331,6 +2492,28 @@ class ToolManager:
         except Exception as e:
             return f"Error resetting user rate limits: {str(e)}"
 
+    def record_execution_time(
+        self, tool_name: str, elapsed: float, timed_out: bool = False
+    ):
+        """Record the wall-clock time of one tool call"""
+        self.execution_times.setdefault(tool_name, deque(maxlen=100)).append(elapsed)
+        if timed_out:
+            self.execution_timeouts[tool_name] = (
+                self.execution_timeouts.get(tool_name, 0) + 1
+            )
+
+    def get_execution_stats(self) -> Dict[str, Dict[str, float]]:
+        """Get sample count, average/max wall time and timeouts per tool"""
+        stats = {}
+        for tool_name, times in self.execution_times.items():
+            stats[tool_name] = {
+                "samples": len(times),
+                "avg_time": sum(times) / len(times),
+                "max_time": max(times),
+                "timeouts": self.execution_timeouts.get(tool_name, 0),
+            }
+        return stats
+
     async def execute_tool(
         self, tool_name: str, arguments: Dict, user_id: str = "system"
     ) -> str:
@@ -2386,47 +2569,84 @@ class ToolManager:
         ):
             mapped_arguments["user_id"] = user_id
 
+        # Serve network-bound tools from the shared result cache
+        if self.result_cache_enabled and self.result_cache.is_cacheable(tool_name):
+            key = self.result_cache.make_key(
+                tool_name,
+                mapped_arguments,
+                case_insensitive=tool_name != "crawling",  # URL paths are case sensitive
+            )
+            return await self.result_cache.get_or_compute(
+                tool_name, key, lambda: self._invoke_tool(tool_name, mapped_arguments)
+            )
+
+        return await self._invoke_tool(tool_name, mapped_arguments)
+
+    async def _invoke_tool(self, tool_name: str, mapped_arguments: Dict) -> str:
+        """Call a tool function according to its declared workload"""
         try:
             tool_func = self.tools[tool_name]
 
-            # Tools that make network requests and should run in thread pool to avoid blocking
-            blocking_tools = [
-                "web_search",
-                "crawling",
-                "company_research",
-                "get_crypto_price",
-                "get_stock_price",
-                "generate_image",
-                "analyze_image",
-                "check_balance",
-                "get_bonus_schedule",
-                "discord_search_messages",
-                "discord_read_channel",
-                "discord_list_guild_members",
-            ]
-
-            # Run blocking tools in thread pool to avoid event loop blocking
-            if tool_name in blocking_tools:
-                import asyncio
-                import functools
-
-                loop = asyncio.get_event_loop()
-                # Use functools.partial to handle keyword arguments properly
-                partial_func = functools.partial(tool_func, **mapped_arguments)
-                return await loop.run_in_executor(None, partial_func)
-
-            # Check if the function is a coroutine function
-            import asyncio
-
             if asyncio.iscoroutinefunction(tool_func):
                 return await tool_func(**mapped_arguments)
-            else:
+
+            kind = self.tool_kinds.get(tool_name, "io")
+            if kind == "inline":
                 return tool_func(**mapped_arguments)
+
+            return await self._run_in_pool(kind, tool_func, **mapped_arguments)
         except TypeError as e:
             return f"Error executing {tool_name}: Parameter mismatch - {str(e)}"
         except Exception as e:
             return f"Error executing {tool_name}: {str(e)}"
 
+    async def _run_in_pool(self, kind: str, func, *args, **kwargs):
+        """Run a blocking function on the tool pool for its workload kind"""
+        executor = self._cpu_executor if kind == "cpu" else self._io_executor
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            executor, functools.partial(func, *args, **kwargs)
+        )
+
+    async def aclose(self):
+        """Close the shared HTTP session of the async-native tools"""
+        await self._http.close()
+
+    def _run_mcp_call(self, call) -> Dict[str, Any]:
+        """Run ``call(client)`` with the shared MCP memory client from a sync tool
+
+        Pooled tools run on worker threads, so the call is sent to the bot's
+        event loop that owns the client's pooled session. Without one (e.g.
+        when called directly) a short-lived client on a private loop is used.
+        """
+        from tools.mcp_memory_client import MCPMemoryClient, mcp_memory_client
+
+        try:
+            asyncio.get_running_loop()
+            on_loop_thread = True
+        except RuntimeError:
+            on_loop_thread = False
+
+        main_loop = self._main_loop
+        if not on_loop_thread and main_loop is not None and main_loop.is_running():
+            return asyncio.run_coroutine_threadsafe(
+                call(mcp_memory_client), main_loop
+            ).result()
+
+        async def run_private():
+            client = MCPMemoryClient()
+            try:
+                return await call(client)
+            finally:
+                await client.aclose()
+
+        if on_loop_thread:
+            import concurrent.futures
+
+            with concurrent.futures.ThreadPoolExecutor() as executor:
+                return executor.submit(asyncio.run, run_private()).result()
+        return asyncio.run(run_private())
+
     def generate_keno_numbers(self, count: int = None) -> str:
         """Generate random Keno numbers (1-10 numbers from 1-40) with visual board
 
@@ -2487,21 +2707,19 @@ import asyncio
 async def _run_mcp_with_context(
     user_id: str, information_type: str, information: str
 ) -> Dict[str, Any]:
-    """Run MCP memory operation with proper context management"""
-    from tools.mcp_memory_client import MCPMemoryClient
+    """Run MCP memory operation with the shared client"""
+    from tools.mcp_memory_client import mcp_memory_client
 
-    async with MCPMemoryClient() as client:
-        return await client.remember_user_info(user_id, information_type, information)
+    return await mcp_memory_client.remember_user_info(user_id, information_type, information)
 
 
 async def _run_mcp_search_with_context(
     user_id: str, query: Optional[str] = None
 ) -> Dict[str, Any]:
-    """Run MCP memory search with proper context management"""
-    from tools.mcp_memory_client import MCPMemoryClient
+    """Run MCP memory search with the shared client"""
+    from tools.mcp_memory_client import mcp_memory_client
 
-    async with MCPMemoryClient() as client:
-        return await client.search_user_memory(user_id, query)
+    return await mcp_memory_client.search_user_memory(user_id, query)
 
 
 # Global tool manager instance
@@ -0,0 +1,206 @@
+"""
+Correlation of airdrop trigger messages with tip.cc's drop embeds.
+
+Each trigger (e.g. ``$airdrop``) registers a pending drop in its channel as
+soon as the bot sees it. When a tip.cc embed arrives in that channel it is
+handed straight to the oldest pending drop posted before it, so there are
+no per-message wait_for checks. Embeds that arrive before their trigger is
+registered are kept briefly and claimed on registration. Pending drops and
+unclaimed embeds live at most ``ttl`` seconds.
+"""
+
+import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, Optional
+
+from utils.logging_config import get_logger
+from utils.loop_monitor import LagHistogram
+
+logger = get_logger(__name__)
+
+# tip.cc bot user ID
+TIPCC_BOT_ID = 617037497574359050
+
+# Message prefixes that start a tip.cc drop
+AIRDROP_TRIGGER_PREFIXES = (
+    "$airdrop",
+    "$triviadrop",
+    "$mathdrop",
+    "$phrasedrop",
+    "$redpacket",
+    "$ airdrop",
+    "$ triviadrop",
+    "$ mathdrop",
+    "$ phrasedrop",
+    "$ redpacket",
+)
+
+# Upper bounds (seconds) of the trigger -> embed latency buckets
+LATENCY_BUCKETS = (0.1, 0.25, 0.5, 0.75, 1.0, 1.5, 2.0, 3.0, 5.0, 8.0)
+
+# Unclaimed tip.cc embeds kept per channel
+MAX_BUFFERED_EMBEDS = 10
+
+
+def is_airdrop_trigger(content: str) -> bool:
+    """Whether a message starts a tip.cc drop"""
+    return content.lower().startswith(AIRDROP_TRIGGER_PREFIXES)
+
+
+def snowflake_ms(snowflake_id: int) -> int:
+    """Discord epoch milliseconds encoded in a snowflake ID"""
+    return snowflake_id >> 22
+
+
+@dataclass
+class PendingDrop:
+    """A trigger waiting for its tip.cc embed"""
+
+    trigger_id: int
+    future: asyncio.Future
+    registered_at: float = field(default_factory=time.monotonic)
+
+
+class AirdropCorrelator:
+    """Per-channel registry of triggers waiting for tip.cc embeds"""
+
+    def __init__(self, ttl: float = 8.0):
+        self.ttl = ttl
+        self._pending: Dict[int, Deque[PendingDrop]] = {}
+        self._by_trigger: Dict[int, PendingDrop] = {}
+        # channel -> (received_at, message) of embeds nobody has claimed yet
+        self._unclaimed: Dict[int, Deque] = {}
+        self.latency = LagHistogram(LATENCY_BUCKETS)
+        self.resolved = 0
+        self.early_embeds = 0
+        self.timeouts = 0
+        self.expired = 0
+        self.unmatched_embeds = 0
+
+    def register(self, channel_id: int, trigger_id: int) -> asyncio.Future:
+        """
+        Register a trigger and return the future of its embed.
+
+        Registering the same trigger again returns the same future, so the
+        trigger can be registered as early as possible and awaited later.
+        """
+        self._prune()
+        pending = self._by_trigger.get(trigger_id)
+        if pending is not None:
+            return pending.future
+
+        pending = PendingDrop(trigger_id, asyncio.get_event_loop().create_future())
+        self._by_trigger[trigger_id] = pending
+
+        # The embed may already be here if registration was slow
+        unclaimed = self._unclaimed.get(channel_id)
+        if unclaimed:
+            for entry in unclaimed:
+                if entry[1].id > trigger_id:
+                    unclaimed.remove(entry)
+                    self.early_embeds += 1
+                    self._resolve(pending, entry[1])
+                    return pending.future
+
+        self._pending.setdefault(channel_id, deque()).append(pending)
+        return pending.future
+
+    def resolve(self, message) -> bool:
+        """
+        Hand a tip.cc embed message to the oldest pending trigger before it.
+
+        Returns False when no trigger is waiting; the embed is then kept
+        for a trigger that registers late.
+        """
+        self._prune()
+        channel_id = message.channel.id
+        queue = self._pending.get(channel_id)
+        if queue:
+            for pending in queue:
+                if pending.trigger_id < message.id and not pending.future.done():
+                    queue.remove(pending)
+                    self._resolve(pending, message)
+                    return True
+
+        self._unclaimed.setdefault(channel_id, deque(maxlen=MAX_BUFFERED_EMBEDS)).append(
+            (time.monotonic(), message)
+        )
+        return False
+
+    async def wait(self, channel_id: int, trigger_id: int, timeout: Optional[float] = None):
+        """
+        Wait for the embed of a trigger, registering it if needed.
+
+        By default the wait ends ``ttl`` seconds after the trigger was first
+        registered. Raises asyncio.TimeoutError when no embed arrives.
+        """
+        future = self.register(channel_id, trigger_id)
+        if timeout is None:
+            pending = self._by_trigger[trigger_id]
+            timeout = max(0.0, pending.registered_at + self.ttl - time.monotonic())
+        try:
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            raise
+        finally:
+            self._discard(channel_id, trigger_id)
+
+    def _resolve(self, pending: PendingDrop, message):
+        """Complete a pending drop and record the trigger -> embed latency"""
+        if pending.future.done():
+            return
+        pending.future.set_result(message)
+        self.resolved += 1
+        latency = max(0, snowflake_ms(message.id) - snowflake_ms(pending.trigger_id)) / 1000
+        self.latency.record(latency)
+        logger.debug(f"tip.cc embed arrived {latency * 1000:.0f}ms after its trigger")
+
+    def _discard(self, channel_id: int, trigger_id: int):
+        """Forget a trigger that is no longer awaited"""
+        pending = self._by_trigger.pop(trigger_id, None)
+        queue = self._pending.get(channel_id)
+        if pending is not None and queue is not None and pending in queue:
+            queue.remove(pending)
+        if queue is not None and not queue:
+            del self._pending[channel_id]
+
+    def _prune(self):
+        """Drop pending triggers and unclaimed embeds older than the ttl"""
+        cutoff = time.monotonic() - self.ttl
+        # Triggers stay registered until awaited, even once resolved, so a
+        # late register() still finds their embed
+        for trigger_id, pending in list(self._by_trigger.items()):
+            if pending.registered_at < cutoff:
+                del self._by_trigger[trigger_id]
+                if not pending.future.done():
+                    self.expired += 1
+
+        for channel_id in list(self._pending):
+            queue = self._pending[channel_id]
+            while queue and (queue[0].registered_at < cutoff or queue[0].future.done()):
+                queue.popleft()
+            if not queue:
+                del self._pending[channel_id]
+
+        for channel_id in list(self._unclaimed):
+            unclaimed = self._unclaimed[channel_id]
+            while unclaimed and unclaimed[0][0] < cutoff:
+                unclaimed.popleft()
+                self.unmatched_embeds += 1
+            if not unclaimed:
+                del self._unclaimed[channel_id]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Counters and the trigger -> embed latency histogram"""
+        return {
+            "pending": sum(len(queue) for queue in self._pending.values()),
+            "resolved": self.resolved,
+            "early_embeds": self.early_embeds,
+            "timeouts": self.timeouts,
+            "expired": self.expired,
+            "unmatched_embeds": self.unmatched_embeds,
+            "latency": self.latency.snapshot(),
+        }
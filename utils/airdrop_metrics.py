@@ -0,0 +1,192 @@
+"""
+Per-stage latency tracing of airdrop handling.
+
+Every drop the bot acts on gets a DropTrace. The handler marks each stage as
+it completes, so the time between the trigger and the click is split into:
+
+    embed   trigger seen -> tip.cc embed received
+    delay   smart delay / maybe_delay before acting
+    answer  answer computation (phrase cleanup, math, trivia lookup)
+    typing  simulated typing before sending an answer
+    submit  button click or answer message
+
+Finished traces are kept in memory and persisted to SQLite, and summarized
+into per-stage histograms and outcome counts for airdropstatus.
+"""
+
+import asyncio
+import time
+from collections import Counter, deque
+from typing import Any, Deque, Dict, Iterable, List, Optional
+
+from utils.logging_config import get_logger
+from utils.loop_monitor import LagHistogram
+
+logger = get_logger(__name__)
+
+# Stages in the order a drop goes through them
+STAGES = ("embed", "delay", "answer", "typing", "submit")
+
+# Upper bounds (seconds) of the stage latency buckets
+STAGE_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 3.0, 5.0, 10.0)
+
+# Outcomes where the bot got an entry in; tip.cc never reports who won
+ENTERED_OUTCOMES = ("entered", "guessed")
+
+
+def drop_type_of(content: str) -> str:
+    """Drop type named by a trigger message, e.g. "$ mathdrop 1 doge" -> "mathdrop" """
+    words = content.lstrip("$").split()
+    return words[0].lower() if words else "unknown"
+
+
+class DropTrace:
+    """Stage timings and outcome of one drop"""
+
+    def __init__(
+        self,
+        drop_type: str,
+        channel_id: Optional[int] = None,
+        guild_id: Optional[int] = None,
+        trigger_id: Optional[int] = None,
+    ):
+        self.drop_type = drop_type
+        self.channel_id = channel_id
+        self.guild_id = guild_id
+        self.trigger_id = trigger_id
+        self.started = time.monotonic()
+        self._last_mark = self.started
+        self.stages: Dict[str, float] = {}
+        self.outcome: Optional[str] = None
+        self.detail: Optional[str] = None
+
+    def mark(self, stage: str):
+        """Close a stage, attributing the time since the previous mark to it"""
+        now = time.monotonic()
+        self.stages[stage] = self.stages.get(stage, 0.0) + (now - self._last_mark)
+        self._last_mark = now
+
+    def finish(self, outcome: str, detail: Optional[str] = None):
+        """Set the outcome; the first outcome set wins"""
+        if self.outcome is None:
+            self.outcome = outcome
+            self.detail = detail
+
+    @property
+    def total(self) -> float:
+        """Seconds from the trigger to the last mark"""
+        return self._last_mark - self.started
+
+    def as_row(self) -> Dict[str, Any]:
+        """Flat record as stored in SQLite, stage times in milliseconds"""
+        row = {
+            "drop_type": self.drop_type,
+            "channel_id": str(self.channel_id) if self.channel_id else None,
+            "guild_id": str(self.guild_id) if self.guild_id else None,
+            "trigger_id": str(self.trigger_id) if self.trigger_id else None,
+            "outcome": self.outcome or "skipped",
+            "detail": self.detail,
+            "total_ms": round(self.total * 1000, 3),
+        }
+        for stage in STAGES:
+            seconds = self.stages.get(stage)
+            row[f"{stage}_ms"] = round(seconds * 1000, 3) if seconds is not None else None
+        return row
+
+
+def summarize_drops(rows: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """Outcome counts and per-stage histograms of drop records"""
+    rows = list(rows)
+    stages = {stage: LagHistogram(STAGE_BUCKETS, window=max(len(rows), 1)) for stage in STAGES}
+    total = LagHistogram(STAGE_BUCKETS, window=max(len(rows), 1))
+    outcomes: Counter = Counter()
+    by_type: Dict[str, Counter] = {}
+
+    for row in rows:
+        outcomes[row["outcome"]] += 1
+        by_type.setdefault(row["drop_type"], Counter())[row["outcome"]] += 1
+        for stage in STAGES:
+            value = row.get(f"{stage}_ms")
+            if value is not None:
+                stages[stage].record(value / 1000)
+        if row.get("total_ms") is not None:
+            total.record(row["total_ms"] / 1000)
+
+    entered = sum(outcomes[outcome] for outcome in ENTERED_OUTCOMES)
+    return {
+        "drops": len(rows),
+        "entered": entered,
+        "missed": len(rows) - entered,
+        "outcomes": dict(outcomes),
+        "by_type": {drop_type: dict(counts) for drop_type, counts in by_type.items()},
+        "stages": {stage: histogram.snapshot() for stage, histogram in stages.items()},
+        "total": total.snapshot(),
+    }
+
+
+class AirdropMetrics:
+    """Collects finished drop traces and persists them in the background"""
+
+    def __init__(self, db=None, window: int = 500):
+        self.db = db
+        self.window = window
+        self.recent: Deque[Dict[str, Any]] = deque(maxlen=window)
+        self._tasks = set()
+        self._last_write: Optional[asyncio.Task] = None
+
+    def start(self, message) -> DropTrace:
+        """Start tracing the drop started by a trigger message"""
+        return DropTrace(
+            drop_type_of(message.content),
+            channel_id=message.channel.id,
+            guild_id=message.guild.id if message.guild else None,
+            trigger_id=message.id,
+        )
+
+    def record(self, trace: DropTrace) -> Dict[str, Any]:
+        """Store a finished trace; the SQLite write happens off the handler"""
+        row = trace.as_row()
+        self.recent.append(row)
+        logger.debug(
+            f"{row['drop_type']} {row['outcome']} in {row['total_ms']:.0f}ms: "
+            + ", ".join(
+                f"{stage} {row[f'{stage}_ms']:.0f}ms"
+                for stage in STAGES
+                if row[f"{stage}_ms"] is not None
+            )
+        )
+        if self.db is not None:
+            task = asyncio.get_event_loop().create_task(self._persist(row, self._last_write))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+            self._last_write = task
+        return row
+
+    async def _persist(self, row: Dict[str, Any], previous: Optional[asyncio.Task]):
+        # Writes are chained so rows are stored in the order drops finished
+        if previous is not None and not previous.done():
+            await asyncio.wait([previous])
+        try:
+            await self.db.arecord_airdrop_drop(row)
+        except Exception as e:
+            logger.warning(f"Failed to store airdrop metrics: {e}")
+
+    async def flush(self):
+        """Wait for pending SQLite writes"""
+        if self._tasks:
+            await asyncio.gather(*list(self._tasks), return_exceptions=True)
+
+    async def get_recent(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Newest-first drop records, from SQLite when available"""
+        limit = limit or self.window
+        if self.db is not None:
+            try:
+                await self.flush()
+                return await self.db.aget_recent_airdrop_drops(limit)
+            except Exception as e:
+                logger.warning(f"Failed to load airdrop metrics: {e}")
+        return list(reversed(self.recent))[:limit]
+
+    async def get_summary(self, limit: Optional[int] = None) -> Dict[str, Any]:
+        """Summary of the most recent drops"""
+        return summarize_drops(await self.get_recent(limit))
@@ -13,7 +13,7 @@ from ai.pollinations import pollinations_api, PollinationsAPI
 from data.database import db, DatabaseManager
 from tools.tool_manager import tool_manager, ToolManager
 from utils.tipcc_manager import TipCCManager
-from tools.mcp_memory_client import MCPMemoryClient
+from tools.mcp_memory_client import MCPMemoryClient, mcp_memory_client as shared_mcp_memory_client
 from typing import Optional, Any
 
 # Import memory backend
@@ -41,9 +41,9 @@ class BotDependencies:
         # Create a placeholder TipCCManager that will be initialized later
         tipcc_manager = None  # Will be initialized properly after bot is created
         
-        # Create MCP memory client if enabled
+        # Use the process-wide MCP memory client if enabled
         from config import MCP_MEMORY_ENABLED
-        mcp_memory_client = MCPMemoryClient() if MCP_MEMORY_ENABLED else None
+        mcp_memory_client = shared_mcp_memory_client if MCP_MEMORY_ENABLED else None
         
         return cls(
             database=db,
@@ -1,5 +1,6 @@
 import re
-from typing import List, Dict, Any
+import time
+from typing import Any, Callable, Dict, List, Optional
 from datetime import datetime
 
 def extract_user_mentions(message_content: str) -> List[str]:
@@ -118,6 +119,78 @@ async def send_long_message(channel, text: str, max_length: int = 2000):
     for chunk in chunks:
         await channel.send(chunk)
 
+class StreamingReply:
+    """
+    Discord reply that is progressively edited while an AI response streams in.
+
+    The first message is sent as soon as ``min_first_chunk`` characters have
+    arrived; later updates are coalesced into edits at most every
+    ``edit_interval`` seconds to stay clear of Discord's edit rate limit.
+    If nothing was streamed, finish() simply sends the text as a new message.
+    """
+
+    def __init__(
+        self,
+        channel,
+        edit_interval: float = 1.2,
+        min_first_chunk: int = 20,
+        max_length: int = 2000,
+        render: Optional[Callable[[str], str]] = None,
+    ):
+        self.channel = channel
+        self.edit_interval = edit_interval
+        self.min_first_chunk = min_first_chunk
+        self.max_length = max_length
+        self.render = render or (lambda text: text)
+
+        self.message = None
+        self._text = ""
+        self._shown = ""
+        self._last_update = 0.0
+
+    def reset(self):
+        """Start buffering a new response, keeping the already sent message"""
+        self._text = ""
+
+    async def append(self, text: str):
+        """Add streamed text and update the Discord message if it's due"""
+        self._text += text
+
+        preview = self.render(self._text).strip()[: self.max_length]
+        if not preview or preview == self._shown:
+            return
+
+        now = time.monotonic()
+        if self.message is None:
+            if len(preview) < self.min_first_chunk:
+                return
+            self.message = await self.channel.send(preview)
+        else:
+            if now - self._last_update < self.edit_interval:
+                return
+            await self.message.edit(content=preview)
+
+        self._shown = preview
+        self._last_update = now
+
+    async def finish(self, text: str):
+        """Deliver the final text, replacing the streamed preview if there is one"""
+        if self.message is None:
+            await self.channel.send(text)
+            return
+
+        chunks = split_message_for_discord(text, self.max_length)
+        if chunks[0] != self._shown:
+            await self.message.edit(content=chunks[0])
+        for chunk in chunks[1:]:
+            await self.channel.send(chunk)
+
+    async def discard(self):
+        """Remove the streamed preview message, if one was sent"""
+        if self.message is not None:
+            await self.message.delete()
+            self.message = None
+
 def sanitize_username(username: str) -> str:
     """Sanitize username for database storage"""
     # Remove any potentially harmful characters
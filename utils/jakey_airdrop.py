@@ -1,6 +1,4 @@
 import asyncio
-import operator
-import re
 from logging import (
     INFO, DEBUG, WARNING, ERROR, CRITICAL,
     Formatter, StreamHandler, getLogger
@@ -14,6 +12,7 @@ from discord import Client, Message, Status, HTTPException, NotFound
 
 # Import phrase sanitization utilities
 from .phrase_sanitizer import clean_phrase_comprehensive
+from .math_evaluator import math_evaluator
 
 # ===================
 # Logging
@@ -77,22 +76,8 @@ def typing_delay(text: str) -> float:
     return len(text) / cpm * 60
 
 def safe_eval_math(expr: str):
-    """Safely evaluate basic math expressions (no eval)."""
-    allowed_ops = {
-        '+': operator.add,
-        '-': operator.sub,
-        '*': operator.mul,
-        '/': operator.truediv,
-        '**': operator.pow,
-        '%': operator.mod,
-    }
-    # crude but safer than eval – only digits and operators
-    if not re.match(r"^[\d\.\+\-\*/%\(\)\s]+$", expr):
-        return None
-    try:
-        return eval(expr, {"__builtins__": {}}, {})  # restricted eval
-    except Exception:
-        return None
+    """Answer to a math drop expression as tip.cc expects it typed, or None."""
+    return math_evaluator.solve(expr)
 
 async def maybe_delay(drop_ends_in: float):
     """Handle smart/range/manual delay before acting."""
@@ -176,10 +161,9 @@ async def on_message(original_message: Message):
             expr = embed.description.split("`")[1].strip()
             answer = safe_eval_math(expr)
             if answer is not None:
-                answer = int(answer) if isinstance(answer, float) and answer.is_integer() else answer
                 async with original_message.channel.typing():
-                    await asyncio.sleep(typing_delay(str(answer)))
-                await original_message.channel.send(str(answer))
+                    await asyncio.sleep(typing_delay(answer))
+                await original_message.channel.send(answer)
                 logger.info(f"Entered math drop in {original_message.channel.name}")
 
         # Trivia drop
@@ -0,0 +1,253 @@
+"""
+Event loop lag monitoring for JakeySelfBot.
+
+A sampler task measures how late the loop wakes it up (scheduling delay)
+and records the delays in a histogram. Optionally a watchdog thread pings
+the loop and, when a ping isn't answered within the threshold, captures the
+stack of the loop thread so the coroutine that blocked it can be named.
+"""
+
+import asyncio
+import inspect
+import sys
+import threading
+import time
+import traceback
+from bisect import bisect_left
+from collections import deque
+from typing import Any, Dict, List, Optional, Sequence
+
+from config import (
+    LOOP_MONITOR_INTERVAL,
+    SLOW_CALLBACK_THRESHOLD,
+    SLOW_CALLBACK_TRACING_ENABLED,
+)
+from utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Upper bounds (seconds) of the lag histogram buckets
+DEFAULT_LAG_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+# Frames from these paths are event loop plumbing, not the culprit
+_LOOP_INTERNAL_PATHS = ("/asyncio/", "/threading.py", "/selectors.py")
+
+
+def _format_bucket(bound: float) -> str:
+    """Render a bucket bound as ms or s"""
+    return f"{bound * 1000:g}ms" if bound < 1 else f"{bound:g}s"
+
+
+class LagHistogram:
+    """Fixed-bucket histogram of loop lag with percentiles over a recent window."""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_LAG_BUCKETS, window: int = 1000):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self._recent = deque(maxlen=window)
+
+    def record(self, value: float):
+        """Add one lag sample"""
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+        self._recent.append(value)
+
+    def percentile(self, pct: float) -> float:
+        """Percentile of the recent samples"""
+        if not self._recent:
+            return 0.0
+        ordered = sorted(self._recent)
+        index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+        return ordered[index]
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Summary and per-bucket counts"""
+        labels = [f"<={_format_bucket(bound)}" for bound in self.buckets]
+        labels.append(f">{_format_bucket(self.buckets[-1])}")
+        return {
+            "samples": self.count,
+            "avg": self.total / self.count if self.count else 0.0,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+            "max": self.max,
+            "buckets": dict(zip(labels, self.counts)),
+        }
+
+
+class SlowCallbackTracer:
+    """
+    Watchdog thread that reports what the loop was running while it stalled.
+
+    Every ``threshold`` seconds the watchdog schedules a no-op on the loop.
+    If the loop doesn't run it within ``threshold``, the stack of the loop
+    thread is captured, and once the loop recovers the stall is logged with
+    the innermost coroutine found on that stack.
+    """
+
+    def __init__(self, threshold: float, max_events: int = 20):
+        self.threshold = threshold
+        self.events = deque(maxlen=max_events)
+        self.count = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self, loop: asyncio.AbstractEventLoop):
+        """Start watching ``loop``; must be called from the loop's thread"""
+        self._loop = loop
+        self._loop_thread_id = threading.get_ident()
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._watch, name="loop-watchdog", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        """Stop the watchdog thread"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.threshold * 2)
+            self._thread = None
+
+    def _watch(self):
+        while not self._stop.wait(self.threshold):
+            answered = threading.Event()
+            sent_at = time.monotonic()
+            try:
+                self._loop.call_soon_threadsafe(answered.set)
+            except RuntimeError:
+                # Loop was closed
+                return
+            if answered.wait(self.threshold):
+                continue
+
+            # The loop is stuck, grab what it is running right now
+            frame = sys._current_frames().get(self._loop_thread_id)
+            stack = traceback.extract_stack(frame) if frame is not None else []
+            culprit = self._find_culprit(frame)
+            del frame
+
+            while not answered.wait(self.threshold):
+                if self._stop.is_set():
+                    return
+            self._record(time.monotonic() - sent_at, culprit, stack)
+
+    @staticmethod
+    def _find_culprit(frame) -> str:
+        """Name the innermost coroutine (or function) on the blocked stack"""
+        fallback = None
+        while frame is not None:
+            code = frame.f_code
+            filename = code.co_filename.replace("\\", "/")
+            if not any(path in filename for path in _LOOP_INTERNAL_PATHS):
+                location = f"{code.co_name} ({code.co_filename}:{frame.f_lineno})"
+                if code.co_flags & (inspect.CO_COROUTINE | inspect.CO_ASYNC_GENERATOR):
+                    return location
+                if fallback is None:
+                    fallback = location
+            frame = frame.f_back
+        return fallback or "unknown"
+
+    def _record(self, duration: float, culprit: str, stack: List[traceback.FrameSummary]):
+        self.count += 1
+        self.events.append(
+            {"time": time.time(), "duration": duration, "culprit": culprit}
+        )
+        # Only the innermost frames are interesting, the rest is loop plumbing
+        formatted = "".join(traceback.format_list(stack[-8:]))
+        logger.warning(
+            f"🐢 Event loop blocked for {duration:.2f}s in {culprit}\n{formatted}"
+        )
+
+
+class LoopLagMonitor:
+    """
+    Samples event loop scheduling delay and optionally traces slow callbacks.
+
+    The sampler sleeps ``interval`` seconds at a time; how much later than
+    requested it wakes up is the loop lag, i.e. how long other callbacks
+    kept the loop busy.
+    """
+
+    def __init__(
+        self,
+        interval: float = LOOP_MONITOR_INTERVAL,
+        slow_callback_threshold: float = SLOW_CALLBACK_THRESHOLD,
+        trace_slow_callbacks: bool = SLOW_CALLBACK_TRACING_ENABLED,
+        buckets: Sequence[float] = DEFAULT_LAG_BUCKETS,
+    ):
+        self.interval = interval
+        self.slow_callback_threshold = slow_callback_threshold
+        self.trace_slow_callbacks = trace_slow_callbacks
+        self.histogram = LagHistogram(buckets)
+        self.tracer: Optional[SlowCallbackTracer] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self):
+        """Start sampling the running loop (no-op if already running)"""
+        if self.running:
+            return
+        loop = asyncio.get_running_loop()
+        self._task = loop.create_task(self._sample())
+        if self.trace_slow_callbacks:
+            self.tracer = SlowCallbackTracer(self.slow_callback_threshold)
+            self.tracer.start(loop)
+        logger.info(
+            f"Started event loop monitor (interval {self.interval}s, "
+            f"slow callback tracing {'on' if self.tracer else 'off'})"
+        )
+
+    async def stop(self):
+        """Stop the sampler and the watchdog"""
+        if self.tracer is not None:
+            self.tracer.stop()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _sample(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, loop.time() - expected)
+            self.histogram.record(lag)
+            if lag >= self.slow_callback_threshold and self.tracer is None:
+                logger.warning(f"🐢 Event loop lagged {lag:.2f}s behind schedule")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Lag histogram and slow callback events"""
+        stats = {
+            "running": self.running,
+            "interval": self.interval,
+            "lag": self.histogram.snapshot(),
+            "slow_callbacks": {
+                "tracing": self.tracer is not None,
+                "threshold": self.slow_callback_threshold,
+                "count": 0,
+                "recent": [],
+            },
+        }
+        if self.tracer is not None:
+            stats["slow_callbacks"]["count"] = self.tracer.count
+            stats["slow_callbacks"]["recent"] = list(self.tracer.events)
+        return stats
+
+
+# Global loop monitor instance
+loop_monitor = LoopLagMonitor()
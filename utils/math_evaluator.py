@@ -0,0 +1,291 @@
+"""
+Shared arithmetic evaluator for math drops and the calculate tool.
+
+Expressions are split by one precompiled tokenizer and parsed by a Pratt
+parser with Python's precedence rules: ``**`` is right associative and binds
+tighter than a unary minus on its left, so ``-2**2`` is -4. Arithmetic is
+exact: integers stay ints and anything with a fractional part becomes a
+Fraction, so ``0.1 + 0.2`` answers 0.3; only non-integer powers fall back to
+floats. Powers whose result would exceed ``max_digits`` are refused before
+they are computed, so ``9**9**9`` fails immediately instead of stalling the
+event loop, and every other intermediate result is held to the same limit.
+Results of recent expressions are kept in an LRU.
+"""
+
+import math
+import operator
+import re
+import threading
+from collections import OrderedDict
+from fractions import Fraction
+from typing import List, Optional, Tuple, Union
+
+from config import MATH_EVAL_CACHE_SIZE, MATH_EVAL_MAX_DIGITS, MATH_EVAL_MAX_LENGTH
+
+Number = Union[int, Fraction, float]
+Value = Union[Number, bool]
+
+# Numbers, operators, and any other visible character (which is invalid)
+_TOKEN = re.compile(r"(\d+\.?\d*|\.\d+)|(\*\*|//|<=|>=|==|!=|[-+*/%()<>])|(\S)")
+
+
+def _divide(left: Number, right: Number) -> Number:
+    """Exact division, staying an int when it divides evenly"""
+    if type(left) is int and type(right) is int:
+        quotient, remainder = divmod(left, right)
+        return quotient if remainder == 0 else Fraction(left, right)
+    return left / right
+
+
+def _number(text: str) -> Number:
+    """Exact value of a number token"""
+    whole, _, decimals = text.partition(".")
+    if not decimals.strip("0"):
+        return int(whole or "0")
+    return Fraction(int(whole + decimals), 10 ** len(decimals))
+
+
+# Binary operator -> (binding power, function); higher binds tighter
+_BINARY = {
+    "+": (10, operator.add),
+    "-": (10, operator.sub),
+    "*": (20, operator.mul),
+    "/": (20, _divide),
+    "//": (20, operator.floordiv),
+    "%": (20, operator.mod),
+}
+_UNARY_POWER = 30
+_POW_POWER = 40
+
+_COMPARISONS = {
+    "<": operator.lt,
+    ">": operator.gt,
+    "<=": operator.le,
+    ">=": operator.ge,
+    "==": operator.eq,
+    "!=": operator.ne,
+}
+
+
+class MathError(ValueError):
+    """Expression that is malformed, unsupported or too large to evaluate"""
+
+
+def format_number(value: Value) -> str:
+    """
+    Render a result the way it is typed into a math drop.
+
+    Integers have no decimal point, terminating decimals are written out
+    exactly (7.5 * 4 + 0.25 -> "30.25") and anything else is rendered like
+    a float (1/3 -> "0.3333333333333333").
+    """
+    if isinstance(value, bool):
+        return str(value)
+    if isinstance(value, float):
+        if not math.isfinite(value):
+            raise MathError("Result too large")
+        return str(int(value)) if value.is_integer() else repr(value)
+    try:
+        return _format_exact(value)
+    except ValueError:
+        # Python refuses to render ints beyond sys.get_int_max_str_digits()
+        raise MathError("Result too large")
+
+
+def _format_exact(value: Number) -> str:
+    """Render an int or Fraction as an integer or decimal"""
+    if value.denominator == 1:
+        return str(value.numerator)
+
+    # A fraction is a terminating decimal when its denominator is 2^a * 5^b
+    denominator, twos, fives = value.denominator, 0, 0
+    while denominator % 2 == 0:
+        denominator //= 2
+        twos += 1
+    while denominator % 5 == 0:
+        denominator //= 5
+        fives += 1
+    if denominator != 1:
+        return repr(float(value))
+
+    places = max(twos, fives)
+    scaled = abs(value.numerator) * 10**places // value.denominator
+    whole, fraction = divmod(scaled, 10**places)
+    sign = "-" if value < 0 else ""
+    return f"{sign}{whole}.{str(fraction).zfill(places).rstrip('0')}"
+
+
+class _Parser:
+    """Pratt parser evaluating a token list as it goes"""
+
+    def __init__(self, tokens: List, max_digits: int, allow_comparisons: bool):
+        # None marks the end, so looking ahead never runs off the list
+        self.tokens = tokens + [None]
+        self.pos = 0
+        self.max_digits = max_digits
+        self.max_bits = math.ceil(max_digits * math.log2(10))
+        self.allow_comparisons = allow_comparisons
+
+    def parse(self) -> Value:
+        value = self.comparison()
+        if self.tokens[self.pos] is not None:
+            raise MathError("Invalid expression")
+        return value
+
+    def comparison(self) -> Value:
+        """Arithmetic, optionally chained with comparisons like 1 < 2 < 3"""
+        left = self.expression(0)
+        if not self.allow_comparisons:
+            return left
+
+        result = None
+        while self.tokens[self.pos] in _COMPARISONS:
+            compare = _COMPARISONS[self.tokens[self.pos]]
+            self.pos += 1
+            right = self.expression(0)
+            result = (result is None or result) and compare(left, right)
+            left = right
+        return left if result is None else bool(result)
+
+    def expression(self, min_power: int) -> Value:
+        left = self.prefix()
+        while True:
+            token = self.tokens[self.pos]
+            if token == "**":
+                # Right associative: the exponent may itself be a power
+                self.pos += 1
+                left = self.power(left, self.expression(_POW_POWER - 1))
+            elif token in _BINARY and _BINARY[token][0] > min_power:
+                power, function = _BINARY[token]
+                self.pos += 1
+                left = self.check_size(function(left, self.expression(power)))
+            else:
+                return left
+
+    def prefix(self) -> Value:
+        token = self.tokens[self.pos]
+        self.pos += 1
+        if token is None:
+            raise MathError("Invalid expression")
+        if type(token) is not str:
+            return token
+        if token == "-":
+            return self.check_size(-self.expression(_UNARY_POWER))
+        if token == "+":
+            return self.check_size(+self.expression(_UNARY_POWER))
+        if token == "(":
+            value = self.comparison()
+            if self.tokens[self.pos] != ")":
+                raise MathError("Invalid expression")
+            self.pos += 1
+            return value
+        raise MathError("Invalid expression")
+
+    def check_size(self, value: Value) -> Value:
+        """Refuse exact results with more than max_digits digits"""
+        if type(value) is not float and (
+            value.numerator.bit_length() > self.max_bits
+            or value.denominator.bit_length() > self.max_bits
+        ):
+            raise MathError("Result too large")
+        return value
+
+    def power(self, base: Value, exponent: Value) -> Number:
+        """base ** exponent, refusing results with more than max_digits digits"""
+        if type(exponent) is int and not isinstance(base, float):
+            size = max(abs(base.numerator), base.denominator)
+            if size > 1 and abs(exponent) * math.log10(size) > self.max_digits:
+                raise MathError("Result too large")
+            return Fraction(base) ** exponent if exponent < 0 else base ** exponent
+
+        try:
+            result = float(base) ** float(exponent)
+        except OverflowError:
+            raise MathError("Result too large")
+        if isinstance(result, complex):
+            raise MathError("Complex result")
+        return result
+
+
+class MathEvaluator:
+    """Tokenizes, parses and evaluates arithmetic with an LRU of recent results"""
+
+    def __init__(
+        self,
+        cache_size: int = MATH_EVAL_CACHE_SIZE,
+        max_length: int = MATH_EVAL_MAX_LENGTH,
+        max_digits: int = MATH_EVAL_MAX_DIGITS,
+    ):
+        self.cache_size = cache_size
+        self.max_length = max_length
+        self.max_digits = max_digits
+        # (expression, allow_comparisons) -> (value, error), oldest first
+        self._cache: "OrderedDict[Tuple[str, bool], Tuple[Optional[Value], Optional[Exception]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def tokenize(self, expression: str) -> List:
+        """Numbers as ints or Fractions and operators as strings"""
+        tokens = []
+        for number, symbol, invalid in _TOKEN.findall(expression):
+            if invalid:
+                raise MathError("Invalid characters in expression")
+            tokens.append(_number(number) if number else symbol)
+        return tokens
+
+    def evaluate(self, expression: str, allow_comparisons: bool = False) -> Value:
+        """
+        Evaluate an expression.
+
+        Raises MathError for malformed, unsupported or oversized expressions
+        and ZeroDivisionError for division by zero.
+        """
+        expression = expression.strip()
+        key = (expression, allow_comparisons)
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+        if cached is None:
+            cached = self._compute(expression, allow_comparisons)
+            with self._lock:
+                self.misses += 1
+                self._cache[key] = cached
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+
+        value, error = cached
+        if error is not None:
+            raise type(error)(*error.args)
+        return value
+
+    def _compute(self, expression: str, allow_comparisons: bool):
+        """(value, None) or (None, error) for an uncached expression"""
+        try:
+            if len(expression) > self.max_length:
+                raise MathError("Expression too long")
+            tokens = self.tokenize(expression)
+            return _Parser(tokens, self.max_digits, allow_comparisons).parse(), None
+        except (MathError, ZeroDivisionError) as e:
+            return None, e
+        except ValueError as e:
+            return None, MathError(str(e))
+        except (OverflowError, RecursionError):
+            return None, MathError("Result too large")
+
+    def solve(self, expression: str) -> Optional[str]:
+        """Answer text for a math drop expression, or None if it can't be evaluated"""
+        try:
+            return format_number(self.evaluate(expression))
+        except (ValueError, ZeroDivisionError):
+            return None
+
+    def get_stats(self):
+        """Cache size and hit counters"""
+        return {"cached": len(self._cache), "hits": self.hits, "misses": self.misses}
+
+
+# Shared evaluator used by the bot, the standalone airdrop script and tools
+math_evaluator = MathEvaluator()
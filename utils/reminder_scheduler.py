@@ -0,0 +1,167 @@
+"""
+Reminder scheduling for JakeySelfBot.
+
+Pending reminders are kept in a min-heap ordered by trigger time. The
+scheduler loads them once at startup, is kept in sync by the database's
+reminder listener hooks (add_reminder, cancel_reminder, status updates)
+and sleeps exactly until the next reminder is due, so reminders fire on
+time without polling the database.
+"""
+
+import asyncio
+import datetime
+import heapq
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+def parse_trigger_time(trigger_time: str) -> Optional[float]:
+    """Convert a stored ISO 8601 trigger time into a Unix timestamp
+
+    Naive times are interpreted as local time, the same way set_reminder
+    produces them.
+    """
+    try:
+        parsed = datetime.datetime.fromisoformat(str(trigger_time).replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return parsed.timestamp()
+
+
+class ReminderScheduler:
+    """
+    Fires pending reminders at their trigger time.
+
+    ``fire`` is awaited with the reminder dict once it is due. The status of
+    every reminder due at the same moment is set to 'triggered' in a single
+    transaction before they are sent.
+    """
+
+    def __init__(
+        self,
+        db,
+        fire: Callable[[Dict[str, Any]], Awaitable[None]],
+        max_sleep: float = 300.0,
+    ):
+        self.db = db
+        self.fire = fire
+        # Re-check the wall clock at least this often in case it jumps
+        self.max_sleep = max_sleep
+        self._heap: List[Tuple[float, int]] = []
+        # reminder_id -> (trigger timestamp, reminder); heap entries that no
+        # longer match are stale and skipped
+        self._pending: Dict[int, Tuple[float, Dict[str, Any]]] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def pending_count(self) -> int:
+        return len(self._pending)
+
+    async def start(self):
+        """Load pending reminders and start the scheduler task"""
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        # Listen before loading so reminders added meanwhile aren't missed
+        self.db.add_reminder_listener(self)
+        for reminder in await self.db.aget_pending_reminders():
+            self._schedule(reminder)
+        self._task = self._loop.create_task(self._run())
+        logger.info(f"Reminder scheduler started with {self.pending_count} pending reminders")
+
+    async def stop(self):
+        """Stop the scheduler task"""
+        self.db.remove_reminder_listener(self)
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    # Listener interface, called from whichever thread ran the database write
+    def reminder_added(self, reminder: Dict[str, Any]):
+        self._call_in_loop(self._schedule, reminder)
+
+    def reminder_removed(self, reminder_id: int):
+        self._call_in_loop(self._unschedule, reminder_id)
+
+    def _call_in_loop(self, func, *args):
+        if self._loop is None or self._loop.is_closed():
+            return
+        try:
+            running_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+        if running_loop is self._loop:
+            func(*args)
+        else:
+            self._loop.call_soon_threadsafe(func, *args)
+
+    def _schedule(self, reminder: Dict[str, Any]):
+        when = parse_trigger_time(reminder["trigger_time"])
+        if when is None:
+            logger.warning(
+                f"Ignoring reminder {reminder['id']} with invalid trigger time {reminder['trigger_time']!r}"
+            )
+            return
+
+        self._pending[reminder["id"]] = (when, reminder)
+        heapq.heappush(self._heap, (when, reminder["id"]))
+        if self._heap[0] == (when, reminder["id"]):
+            # New earliest reminder, shorten the current sleep
+            self._wakeup.set()
+
+    def _unschedule(self, reminder_id: int):
+        # The heap entry is dropped lazily once it reaches the top
+        self._pending.pop(reminder_id, None)
+
+    def _pop_due(self) -> List[Dict[str, Any]]:
+        """Remove and return every reminder whose trigger time has passed"""
+        now = time.time()
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            when, reminder_id = heapq.heappop(self._heap)
+            entry = self._pending.get(reminder_id)
+            if entry is not None and entry[0] == when:
+                del self._pending[reminder_id]
+                due.append(entry[1])
+        return due
+
+    async def _run(self):
+        while True:
+            self._wakeup.clear()
+            due = self._pop_due()
+            if due:
+                await self._fire_due(due)
+                continue
+
+            timeout = self.max_sleep
+            if self._heap:
+                timeout = min(timeout, max(0.0, self._heap[0][0] - time.time()))
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _fire_due(self, due: List[Dict[str, Any]]):
+        try:
+            await self.db.aupdate_reminder_statuses(
+                [reminder["id"] for reminder in due], "triggered"
+            )
+        except Exception as e:
+            logger.error(f"Error marking {len(due)} reminders as triggered: {e}")
+
+        await asyncio.gather(*(self._fire_one(reminder) for reminder in due))
+
+    async def _fire_one(self, reminder: Dict[str, Any]):
+        try:
+            await self.fire(reminder)
+        except Exception as e:
+            logger.error(f"Error processing reminder {reminder['id']}: {e}")
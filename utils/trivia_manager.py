@@ -1,11 +1,20 @@
 import asyncio
 import logging
-from typing import Dict, List, Optional, Tuple
+import time
+from typing import Dict, Iterable, List, Optional, Set, Tuple
 from urllib.parse import quote, unquote
 
 import aiohttp
 
+from config import (
+    TRIVIA_FUZZY_MATCH_THRESHOLD,
+    TRIVIA_SYNC_CONCURRENCY,
+    TRIVIA_SYNC_ENABLED,
+    TRIVIA_SYNC_INTERVAL,
+    TRIVIA_SYNC_RETRY_INTERVAL,
+)
 from data.trivia_database import trivia_db
+from data.trivia_index import UNKNOWN_ANSWER, TriviaAnswerIndex
 from utils.logging_config import get_logger
 
 logger = get_logger(__name__)
@@ -22,6 +31,20 @@ class TriviaManager:
         )
         self.cache_ttl = 3600  # 1 hour cache for external sources
 
+        # Every known question, loaded by warm_index() and kept current as
+        # questions are learned
+        self.index = TriviaAnswerIndex(TRIVIA_FUZZY_MATCH_THRESHOLD)
+        self._warm_task: Optional[asyncio.Task] = None
+        # times_asked increments not yet written, question_id -> count
+        self._pending_usage: Dict[int, int] = {}
+        self._usage_task: Optional[asyncio.Task] = None
+        self._background_tasks: Set[asyncio.Task] = set()
+        # Background sync of every category from the external source
+        self._sync_task: Optional[asyncio.Task] = None
+        self.last_sync: Optional[Dict] = None
+        # Categories whose last sync failed or found no CSV
+        self._failed_syncs: Set[str] = set()
+
         # Common category mappings for better matching
         self.category_mappings = {
             "Entertainment: Music": "Entertainment: Music",
@@ -53,15 +76,102 @@ class TriviaManager:
         # Refresh cache for categories that have questions but no cache
         await self._refresh_cache_if_needed()
 
+        # Load every known answer so drops never wait on the database
+        await self.warm_index()
+
+        # Keep every category synced so drops never wait on the network
+        if TRIVIA_SYNC_ENABLED:
+            self.start_background_sync()
+
         logger.info("Trivia manager initialized")
 
     async def close(self):
         """Close the trivia manager"""
+        await self.stop_background_sync()
+        await self.flush()
         if self.session:
             await self.session.close()
         self.db.close()
         logger.info("Trivia manager closed")
 
+    async def warm_index(self) -> int:
+        """
+        Load every stored and cached question into the answer index.
+
+        The index is built off the event loop and swapped in; anything
+        learned while it was loading is carried over. Returns its size.
+        """
+        try:
+            rows = await self.db.get_all_questions()
+            cached = await self.db.get_all_cached_questions()
+
+            def _build():
+                index = TriviaAnswerIndex(self.index.fuzzy_threshold)
+                for category, questions in cached.items():
+                    index.add_many(self._cached_rows(category, questions))
+                # Stored questions last, so their answers and ids win
+                index.add_many(rows)
+                return index
+
+            index = await asyncio.get_event_loop().run_in_executor(None, _build)
+            index.merge(self.index)
+            index.ready = True
+            self.index = index
+            logger.info(f"Trivia answer index warmed with {len(index)} questions")
+            return len(index)
+
+        except Exception as e:
+            logger.error(f"Error warming trivia answer index: {e}")
+            return 0
+
+    def _ensure_index_warming(self):
+        """Start loading the index in the background if nobody has yet"""
+        if not self.index.ready and (self._warm_task is None or self._warm_task.done()):
+            self._warm_task = asyncio.create_task(self.warm_index())
+
+    @staticmethod
+    def _cached_rows(
+        category: str, questions: List[Dict]
+    ) -> Iterable[Tuple[str, str, str, Optional[int]]]:
+        """Index rows for cached questions, in either cached format"""
+        for q in questions:
+            question = q.get("question") or q.get("question_text")
+            answer = q.get("answer") or q.get("answer_text")
+            if question and answer:
+                yield category, question, answer, None
+
+    async def _cache_questions(self, category: str, questions: List[Dict]):
+        """Cache fetched questions in the database and the answer index"""
+        await self.db.cache_category_questions(category, questions)
+        self.index.add_many(self._cached_rows(category, questions))
+
+    def _spawn(self, coro):
+        """Run a coroutine in the background, keeping a reference until done"""
+        task = asyncio.create_task(coro)
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+
+    def _record_usage(self, question_id: int):
+        """Count a lookup hit; the UPDATE happens later in a batch"""
+        self._pending_usage[question_id] = self._pending_usage.get(question_id, 0) + 1
+        if self._usage_task is None or self._usage_task.done():
+            self._usage_task = asyncio.create_task(self._flush_usage())
+
+    async def _flush_usage(self):
+        """Write deferred usage counters, folding in hits that arrive meanwhile"""
+        while self._pending_usage:
+            usage, self._pending_usage = self._pending_usage, {}
+            try:
+                await self.db.record_question_usage(usage)
+            except Exception as e:
+                logger.error(f"Error recording trivia question usage: {e}")
+
+    async def flush(self):
+        """Wait for background writes and deferred usage counters"""
+        if self._background_tasks:
+            await asyncio.gather(*self._background_tasks, return_exceptions=True)
+        await self._flush_usage()
+
     async def _ensure_common_categories(self):
         """Ensure common trivia categories exist in database"""
         common_categories = [
@@ -149,29 +259,45 @@ class TriviaManager:
         self, category: str, question: str
     ) -> Optional[str]:
         """Implementation of find_trivia_answer without timeout wrapper"""
-        # Strategy 1: Local database lookup
-        answer = await self.db.find_answer(category, question)
-        if answer:
-            logger.info(f"Found answer in local database for category: {category}")
-            return answer
-
-        # Strategy 2: Try cached external source
-        cached_questions = await self.db.get_cached_questions(category)
-        if cached_questions:
-            answer = self._search_in_cached_questions(cached_questions, question)
-            if answer:
-                logger.info(f"Found answer in cache for category: {category}")
-                # Store in local database for future use
-                await self.db.add_question(category, question, answer, source="cache")
+        if self.index.ready:
+            # Strategy 1+2: In-memory index of stored and cached questions
+            entry = self.index.lookup(category, question)
+            if entry:
+                logger.info(f"Found answer in trivia index for category: {category}")
+                if entry.question_id is None:
+                    # Known from a cached source only; store it for future use
+                    self._spawn(self._store_question(category, question, entry.answer, "cache"))
+                else:
+                    self._record_usage(entry.question_id)
+                return entry.answer
+        else:
+            self._ensure_index_warming()
+
+            # Strategy 1: Local database lookup
+            answer = await self.db.find_answer(category, question)
+            if answer and answer != UNKNOWN_ANSWER:
+                logger.info(f"Found answer in local database for category: {category}")
                 return answer
 
-        # Strategy 3: Fetch from external source
-        answer = await self._fetch_from_external_source(category, question)
-        if answer:
-            logger.info(f"Found answer from external source for category: {category}")
-            # Store in local database and cache
-            await self.db.add_question(category, question, answer, source="external")
-            return answer
+            # Strategy 2: Try cached external source
+            cached_questions = await self.db.get_cached_questions(category)
+            if cached_questions:
+                answer = self._search_in_cached_questions(cached_questions, question)
+                if answer:
+                    logger.info(f"Found answer in cache for category: {category}")
+                    # Store in local database for future use
+                    await self._store_question(category, question, answer, "cache")
+                    return answer
+
+        # Strategy 3: Fetch from external source (only without background
+        # sync; with it, every category is already local)
+        if not TRIVIA_SYNC_ENABLED:
+            answer = await self._fetch_from_external_source(category, question)
+            if answer:
+                logger.info(f"Found answer from external source for category: {category}")
+                # Store in local database and cache
+                self._spawn(self._store_question(category, question, answer, "external"))
+                return answer
 
         logger.warning(f"No answer found for question in category: {category}")
 
@@ -180,6 +306,13 @@ class TriviaManager:
 
         return None
 
+    async def _store_question(self, category: str, question: str, answer: str, source: str):
+        """Store a found question in the database and index it with its id"""
+        question_id = await self.db.add_or_update_question(
+            category, question, answer, source=source
+        )
+        self.index.add(category, question, answer, question_id)
+
     def _search_in_cached_questions(
         self, questions: List[Dict], question_text: str
     ) -> Optional[str]:
@@ -222,7 +355,7 @@ class TriviaManager:
                             questions = self._parse_csv_content(content)
 
                             # Cache the questions for future use
-                            await self.db.cache_category_questions(category, questions)
+                            await self._cache_questions(category, questions)
 
                             # Search for the specific question
                             answer = self._search_in_cached_questions(
@@ -274,54 +407,217 @@ class TriviaManager:
             return 0, 0
 
         try:
-            normalized_category = self._normalize_category_name(category)
+            found, imported, _ = await self._sync_category(category)
+            return found, imported
 
-            for cat_to_try in [category, normalized_category]:
-                url = f"{self.github_base_url}/{quote(cat_to_try)}.csv"
+        except Exception as e:
+            logger.error(f"Error syncing category {category}: {e}")
+            return 0, 0
 
-                try:
-                    async with self.session.get(
-                        url, timeout=aiohttp.ClientTimeout(total=15)
-                    ) as resp:
-                        if resp.status == 200:
-                            content = await resp.text()
-                            questions = self._parse_csv_content(content)
+    async def _fetch_category_csv(
+        self, category: str, validators: Optional[Dict] = None
+    ) -> Tuple[int, Optional[str], Optional[str], Optional[str]]:
+        """
+        Download a category CSV, conditionally when validators are given.
 
-                            # Convert to bulk import format
-                            import_data = []
-                            for q in questions:
-                                import_data.append(
-                                    {
-                                        "category": category,
-                                        "question": q["question"],
-                                        "answer": q["answer"],
-                                        "source": "github_sync",
-                                        "difficulty": 1,
-                                    }
-                                )
-
-                            # Bulk import to database
-                            imported_count = await self.db.bulk_import_questions(
-                                import_data
-                            )
+        Returns (status, content, etag, last_modified); content is only
+        set for a 200 response.
+        """
+        headers = {}
+        if validators:
+            if validators.get("etag"):
+                headers["If-None-Match"] = validators["etag"]
+            if validators.get("last_modified"):
+                headers["If-Modified-Since"] = validators["last_modified"]
+
+        url = f"{self.github_base_url}/{quote(category)}.csv"
+        async with self.session.get(
+            url, headers=headers, timeout=aiohttp.ClientTimeout(total=15)
+        ) as resp:
+            content = await resp.text() if resp.status == 200 else None
+            return (
+                resp.status,
+                content,
+                resp.headers.get("ETag"),
+                resp.headers.get("Last-Modified"),
+            )
 
-                            # Cache for performance
-                            await self.db.cache_category_questions(category, questions)
+    async def _sync_category(
+        self, category: str, validators: Optional[Dict] = None
+    ) -> Tuple[int, int, str]:
+        """
+        Download, parse and import one category.
 
-                            logger.info(
-                                f"Synced {imported_count} questions for category: {category}"
-                            )
-                            return len(questions), imported_count
+        Returns (questions_found, questions_imported, outcome) where outcome
+        is "updated", "not_modified", "missing" or "failed".
+        """
+        normalized_category = self._normalize_category_name(category)
+        outcome = "failed"
 
-                except Exception as e:
-                    logger.debug(f"Failed to sync {cat_to_try}: {e}")
-                    continue
+        for cat_to_try in dict.fromkeys([category, normalized_category]):
+            try:
+                status, content, etag, last_modified = await self._fetch_category_csv(
+                    cat_to_try, validators
+                )
+            except Exception as e:
+                logger.debug(f"Failed to sync {cat_to_try}: {e}")
+                continue
+
+            if status == 304:
+                return 0, 0, "not_modified"
+            if status != 200:
+                if status == 404:
+                    outcome = "missing"
+                continue
+
+            # Parsing a large CSV would stall the event loop
+            questions = await asyncio.get_event_loop().run_in_executor(
+                None, self._parse_csv_content, content
+            )
 
-            return 0, 0
+            # Convert to bulk import format
+            import_data = [
+                {
+                    "category": category,
+                    "question": q["question"],
+                    "answer": q["answer"],
+                    "source": "github_sync",
+                    "difficulty": 1,
+                }
+                for q in questions
+            ]
+
+            # Bulk import to database
+            imported_count = await self.db.bulk_import_questions(import_data)
+
+            # Cache for performance
+            await self.db.cache_category_questions(category, questions, ttl_hours=168)
+            await self._index_category(category)
+            await self.db.set_sync_state(category, etag, last_modified, len(questions))
+
+            logger.info(f"Synced {imported_count} questions for category: {category}")
+            return len(questions), imported_count, "updated"
+
+        return 0, 0, outcome
+
+    async def _index_category(self, category: str):
+        """Index a category's stored questions with their ids"""
+        questions = await self.db.get_questions_by_category(category, limit=-1)
+        rows = [
+            (category, q["question_text"], q["answer_text"], q["id"]) for q in questions
+        ]
+        # Index in slices so a large category doesn't hold up drops
+        for start in range(0, len(rows), 200):
+            self.index.add_many(rows[start:start + 200])
+            await asyncio.sleep(0)
+
+    async def _known_categories(self) -> Set[str]:
+        """Mapped categories plus every category in the database"""
+        categories = set(self.category_mappings)
+        categories.update(cat["name"] for cat in await self.db.get_all_categories())
+        return categories
+
+    async def unsynced_categories(self) -> Set[str]:
+        """Categories whose last sync failed or that have never been synced"""
+        synced = await self.db.get_all_sync_states()
+        return self._failed_syncs | (await self._known_categories() - set(synced))
+
+    async def sync_all_categories(self, categories: Optional[Iterable[str]] = None) -> Dict:
+        """
+        Refresh every known category (or the given ones) from the external source.
 
-        except Exception as e:
-            logger.error(f"Error syncing category {category}: {e}")
-            return 0, 0
+        Categories are fetched concurrently, each with the ETag and
+        Last-Modified of its last sync, so unchanged CSVs cost one 304.
+        Returns a summary of the outcomes.
+        """
+        if not self.session:
+            return {}
+
+        categories = set(categories) if categories is not None else await self._known_categories()
+        validators = await self.db.get_all_sync_states()
+        semaphore = asyncio.Semaphore(TRIVIA_SYNC_CONCURRENCY)
+
+        async def _sync(category: str):
+            async with semaphore:
+                return await self._sync_category(category, validators.get(category))
+
+        start_time = time.time()
+        categories = sorted(categories)
+        results = await asyncio.gather(
+            *(_sync(category) for category in categories),
+            return_exceptions=True,
+        )
+
+        summary = {"updated": 0, "not_modified": 0, "missing": 0, "failed": 0, "imported": 0}
+        for category, result in zip(categories, results):
+            if isinstance(result, Exception):
+                logger.debug(f"Trivia category sync failed: {result}")
+                outcome, imported = "failed", 0
+            else:
+                _, imported, outcome = result
+            summary[outcome] += 1
+            summary["imported"] += imported
+            if outcome in ("failed", "missing"):
+                self._failed_syncs.add(category)
+            else:
+                self._failed_syncs.discard(category)
+
+        self.last_sync = dict(
+            summary, finished_at=time.time(), duration_s=round(time.time() - start_time, 2)
+        )
+        logger.info(
+            f"Trivia sync: {summary['updated']} updated, {summary['not_modified']} unchanged, "
+            f"{summary['missing']} missing, {summary['failed']} failed, "
+            f"{summary['imported']} questions imported"
+        )
+        return summary
+
+    def start_background_sync(self):
+        """Start syncing every category now and every TRIVIA_SYNC_INTERVAL seconds"""
+        if self._sync_task is None or self._sync_task.done():
+            self._sync_task = asyncio.create_task(self._sync_loop())
+
+    async def stop_background_sync(self):
+        """Stop the background sync"""
+        if self._sync_task is not None:
+            self._sync_task.cancel()
+            try:
+                await self._sync_task
+            except asyncio.CancelledError:
+                pass
+            self._sync_task = None
+
+    async def _sync_loop(self):
+        """
+        Background sync loop.
+
+        Every category is refreshed each TRIVIA_SYNC_INTERVAL. In between,
+        categories that failed, had no CSV or were never synced (e.g. first
+        seen in a drop) are retried every TRIVIA_SYNC_RETRY_INTERVAL, the
+        delay doubling while they keep failing, so a failed startup sync
+        doesn't leave them unanswerable until the next full refresh.
+        """
+        loop = asyncio.get_event_loop()
+        next_full_sync = loop.time()
+        retry_delay = TRIVIA_SYNC_RETRY_INTERVAL
+        while True:
+            try:
+                if loop.time() >= next_full_sync:
+                    next_full_sync = loop.time() + TRIVIA_SYNC_INTERVAL
+                    retry_delay = TRIVIA_SYNC_RETRY_INTERVAL
+                    await self.sync_all_categories()
+                else:
+                    retrying = await self.unsynced_categories()
+                    if retrying:
+                        logger.info(f"Retrying sync of {len(retrying)} trivia categories")
+                        await self.sync_all_categories(retrying)
+                        # Back off while categories keep failing
+                        retry_delay = min(retry_delay * 2, TRIVIA_SYNC_INTERVAL)
+                    else:
+                        retry_delay = TRIVIA_SYNC_RETRY_INTERVAL
+            except Exception as e:
+                logger.error(f"Error syncing trivia categories: {e}")
+            await asyncio.sleep(max(min(retry_delay, next_full_sync - loop.time()), 0))
 
     async def get_category_statistics(self, category: str) -> Dict:
         """Get comprehensive statistics for a category"""
@@ -410,9 +706,14 @@ class TriviaManager:
         """Record a successful trivia answer for learning and statistics"""
         try:
             # Check if question already exists in database
-            existing_answer = await self.db.find_answer(category, question)
+            if self.index.ready:
+                entry = self.index.get(category, question)
+                existing_answer = entry.answer if entry and entry.question_id else None
+            else:
+                entry = None
+                existing_answer = await self.db.find_answer(category, question)
 
-            if not existing_answer or existing_answer == "UNKNOWN_ANSWER":
+            if not existing_answer or existing_answer == UNKNOWN_ANSWER:
                 # Add new question or update unknown answer
                 question_id = await self.db.add_or_update_question(
                     category,
@@ -423,6 +724,7 @@ class TriviaManager:
                 )
 
                 if question_id:
+                    self.index.add(category, question, answer, question_id)
                     logger.info(
                         f"Learned new trivia question from successful drop: {category}"
                     )
@@ -435,6 +737,15 @@ class TriviaManager:
                         answered=True,
                         response_time_ms=None,
                     )
+            elif entry is not None:
+                # Question is indexed with its ID, just record the attempt
+                await self.db.record_trivia_attempt(
+                    question_id=entry.question_id,
+                    channel_id=channel_id or "unknown",
+                    guild_id=guild_id or "unknown",
+                    answered=True,
+                    response_time_ms=None,
+                )
             else:
                 # Question exists with known answer, just update usage statistics
                 # Find question ID to record attempt
@@ -468,12 +779,13 @@ class TriviaManager:
             question_id = await self.db.add_question(
                 category,
                 question,
-                "UNKNOWN_ANSWER",
+                UNKNOWN_ANSWER,
                 difficulty=1,
                 source="unknown_trivia_drop",
             )
 
             if question_id:
+                self.index.add(category, question, UNKNOWN_ANSWER, question_id)
                 logger.info(
                     f"Recorded unknown trivia question for future learning: {category}"
                 )
@@ -527,6 +839,7 @@ class TriviaManager:
                 health_score += 30
 
             stats["health_score"] = min(health_score, 100)
+            stats["last_sync"] = self.last_sync
             stats["health_status"] = (
                 "excellent"
                 if health_score >= 80